@@ -21,6 +21,8 @@ class ComplexityDefaults:
     COGNITIVE_THRESHOLD = 15
     NESTING_THRESHOLD = 4
     LENGTH_THRESHOLD = 50
+    SCAN_CHUNK_FILES = 1000  # Files per single-pass function extraction scan
+    SLOWEST_FILES_REPORTED = 10  # Slowest-to-parse files listed in AST engine parse stats
 
 
 class CriticalComplexityThresholds:
@@ -79,6 +81,19 @@ class CacheDefaults:
     DEFAULT_CACHE_SIZE = 100  # Number of cached items
     CACHE_KEY_LENGTH = 16  # Length of truncated SHA256 hash for cache keys
     RULE_ID_HASH_LENGTH = 8  # Length of truncated SHA256 hash for rule IDs
+    VALIDATE_FILES = True  # Re-validate entries against file mtimes/sizes on get(); off means TTL-only
+    MAX_PATCH_FILES = 50  # Changed files above this drop the entry instead of patching it
+    PERSIST = False  # Mirror entries to the on-disk store under ~/.ast-grep-mcp/
+    DISK_COMPRESSION_LEVEL = 6  # zlib level for on-disk match payloads
+    CONTENT_DIGEST_BYTES = 16  # blake2b digest size for content-addressed cache keys
+    CONTENT_ENTRY_OVERHEAD_BYTES = 256  # Per-entry bookkeeping added to each value's array size
+    SIGNATURE_CACHE_MAX_MB = 64  # Shared memory budget for MinHash signatures
+    TOKEN_COUNT_CACHE_MAX_MB = 8  # Shared memory budget for per-snippet token counts
+    EMBEDDING_CACHE_MAX_MB = 256  # Shared memory budget for CodeBERT embeddings
+    CONTENT_SPILL_MAX_MB = 512  # Size budget for ~/.ast-grep-mcp/content_cache.db
+    CONTENT_SPILL_QUERY_CHUNK = 500  # Digests per IN (...) lookup against the spill store
+    TEST_REFERENCE_CACHE_MAX_FILES = 20000  # Parsed test files kept between coverage batches
+    SECURITY_FINDINGS_CACHE_MAX_MB = 32  # Shared memory budget for per-file vulnerability scan findings
 
 
 class FilePatterns:
@@ -164,12 +179,29 @@ class StreamDefaults:
     SIGTERM_RETURN_CODE = -15  # Return code for SIGTERM signal
     PROCESS_TERMINATE_TIMEOUT_SECONDS = 2  # Grace period after SIGTERM before escalating to SIGKILL
     PROCESS_KILL_TIMEOUT_SECONDS = 5  # Timeout for process.wait after SIGKILL / thread.join
+    CANCEL_POLL_SECONDS = 0.2  # How often a running stream checks its cancel event
+    DEFAULT_PAGE_SIZE = 50  # Matches per page in streaming find_code/find_code_by_rule
+    MAX_PAGE_SIZE = 1000
 
 
 class ExecutorDefaults:
     """Defaults for the ast-grep executor."""
 
     AST_GREP_COMMAND = "ast-grep"
+    SKIP_DIRECTORIES = frozenset({"node_modules", "venv", ".venv", "build", "dist"})
+    MAX_CONCURRENT_PROCESSES = 8  # Blocking ast-grep calls allowed to run at once; extra callers queue
+    LATENCY_SAMPLE_SIZE = 1000  # Recent call latencies kept for percentile metrics
+
+
+class FileDiscoveryDefaults:
+    """Defaults for the shared file discovery service."""
+
+    SKIP_DIRECTORIES = ExecutorDefaults.SKIP_DIRECTORIES | {".git", ".hg", ".svn"}  # never descended into
+    IGNORE_FILES = (".gitignore", ".ignore")  # read in this order; later rules win
+    MAX_WORKERS = 8  # Threads used to scan a level of the tree in parallel
+    PARALLEL_THRESHOLD_DIRS = 16  # Directories in one level before the thread pool is used
+    MAX_CACHED_ROOTS = 16  # Project roots whose listings are kept
+    RACY_MTIME_WINDOW_SECONDS = 2.0  # Directories modified this close to their scan are rescanned (coarse fs clocks)
 
 
 class ValidationDefaults:
@@ -186,6 +218,7 @@ class FileConstants:
     BYTES_PER_MB = 1024 * 1024
     BYTES_PER_GB = 1024 * 1024 * 1024
     LINE_PREVIEW_LENGTH = 100  # Maximum characters to show in line preview
+    BINARY_SNIFF_BYTES = 8192  # Leading bytes checked for NUL to tell binary files from text
 
 
 class DeduplicationDefaults:
@@ -194,6 +227,7 @@ class DeduplicationDefaults:
     MIN_SIMILARITY = 0.8  # Minimum similarity threshold (0-1)
     MIN_LINES = 5  # Minimum lines to consider for duplication
     MAX_CANDIDATES = 100  # Maximum candidate pairs to analyze
+    MAX_CONSTRUCTS = 1000  # Constructs find_duplication analyzes by default (0 = unlimited)
 
     # Scoring weights (must sum to 1.0)
     SAVINGS_WEIGHT = 0.40
@@ -207,6 +241,10 @@ class DeduplicationDefaults:
     REGRESSION_FULL_WORKFLOW = 0.20  # 20% slowdown allowed
     REGRESSION_SCORING = 0.05  # 5% slowdown allowed
     REGRESSION_TEST_COVERAGE = 0.15  # 15% slowdown allowed
+    REGRESSION_SYNTHETIC_CORPUS = 0.25  # 25% slowdown allowed (end-to-end, includes ast-grep I/O)
+    REGRESSION_PRECISION_DROP = 0.02  # Absolute precision drop allowed on synthetic corpora
+    REGRESSION_RECALL_DROP = 0.02  # Absolute recall drop allowed on synthetic corpora
+    REGRESSION_PEAK_RSS = 0.25  # 25% peak RSS growth allowed
 
     # Analysis pipeline progress stages
     PROGRESS_RANKING = 0.25
@@ -309,6 +347,9 @@ class SemanticSimilarityDefaults:
     # Default batch size for embedding inference
     DEFAULT_BATCH_SIZE = 8
 
+    # Intra-op threads for CPU inference (0 keeps torch's default)
+    DEFAULT_NUM_THREADS = 0
+
 
 class SecurityScanDefaults:
     """Defaults for security scanning."""
@@ -324,6 +365,13 @@ class SecurityScanDefaults:
     MEDIUM_CONFIDENCE = 0.7
     LOW_CONFIDENCE = 0.5
 
+    # Hardcoded-secret scanning
+    SECRET_SCAN_THREADS = 8  # Threads reading and scanning files
+    SECRET_MMAP_MIN_BYTES = 1024 * 1024  # Files at least this large are memory-mapped instead of read
+
+    # Single-pass vulnerability scanning
+    SCAN_CHUNK_FILES = 1000  # Uncached files passed to one ast-grep scan
+
 
 class SemanticVolumeDefaults:
     """Shared list-volume limits from high-overlap magic-number clusters."""
@@ -357,19 +405,20 @@ class LoggingDefaults:
     MAX_BREADCRUMBS = 50  # Maximum Sentry breadcrumbs to keep
 
 
-# Language-specific extensions mapping
+# Language-specific extensions mapping; each list includes every extension ast-grep
+# parses for the language, so filtering by it never misses a file a --lang query reads
 LANGUAGE_EXTENSIONS = {
-    "python": [".py"],
-    "typescript": [".ts", ".tsx"],
-    "javascript": [".js", ".jsx"],
+    "python": [".py", ".py3", ".pyi", ".bzl"],
+    "typescript": [".ts", ".tsx", ".cts", ".mts"],
+    "javascript": [".js", ".jsx", ".cjs", ".mjs"],
     "java": [".java"],
-    "kotlin": [".kt", ".kts"],
+    "kotlin": [".kt", ".kts", ".ktm"],
     "go": [".go"],
     "rust": [".rs"],
-    "ruby": [".rb"],
+    "ruby": [".rb", ".rbw", ".gemspec"],
     "php": [".php"],
     "c": [".c", ".h"],
-    "cpp": [".cpp", ".cc", ".cxx", ".hpp", ".hxx"],
+    "cpp": [".cpp", ".cc", ".cxx", ".hpp", ".hxx", ".c++", ".hh", ".cu", ".ino"],
     "csharp": [".cs"],
     "swift": [".swift"],
 }
@@ -467,6 +516,22 @@ class BenchmarkExpectationDefaults:
     BATCH_PARALLEL_PASS_MIN_PERCENT = 60
 
 
+class SyntheticCorpusDefaults:
+    """Defaults for synthetic-corpus deduplication benchmarks."""
+
+    FUNCTION_COUNT = 1000
+    MIN_FUNCTION_COUNT = 2
+    MAX_FUNCTION_COUNT = 100_000
+    CLONE_RATE = 0.2  # Fraction of functions that are clones of another function
+    FUNCTIONS_PER_FILE = 25
+    MAX_FAMILY_SIZE = 4  # Original plus up to three clones
+    MIN_STATEMENTS = 6
+    MAX_STATEMENTS = 10
+    TYPE3_EDITS = 1  # Statements inserted, deleted or replaced in a Type-3 clone
+    SEED = 0
+    BASELINE_FILE = "tests/dedup_corpus_benchmark_baseline.json"
+
+
 class CodeAnalysisDefaults:
     """Defaults for code structure analysis."""
 
@@ -507,6 +572,14 @@ class UsageTrackingDefaults:
     AVG_RESPONSE_TIME_CRITICAL_MS = 30000
     DEFAULT_PAGINATION_LIMIT = 100
     DEFAULT_STATS_LOOKBACK_DAYS = 7
+    WRITE_BATCH_SIZE = 50  # buffered entries that trigger an immediate flush
+    WRITE_FLUSH_INTERVAL_SECONDS = 2.0  # max time an entry waits in the write buffer
+    RAW_RETENTION_DAYS = 30  # raw usage_logs rows older than this are pruned
+    HOURLY_ROLLUP_RETENTION_DAYS = 90  # hourly rollups older than this are pruned (daily rollups are kept)
+    PRUNE_INTERVAL_SECONDS = 3600
+    ROLLUP_BACKFILL_CHUNK = 5000
+    # Upper bounds of the latency histogram buckets kept per rollup; larger values go to an overflow bucket
+    LATENCY_HISTOGRAM_BOUNDS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000, 300000)
 
 
 class ReportingDefaults:
@@ -571,6 +644,14 @@ class MinHashDefaults:
     SEQUENCEMATCHER_TOKEN_THRESHOLD = 15  # Below this, use SequenceMatcher instead of MinHash
     LSH_RECALL_MARGIN = 0.2  # LSH threshold margin below min_similarity for recall
     MAX_FALLBACK_ITEMS = 100  # Max items before all-pairs O(n²) becomes too expensive
+    BATCH_MAX_SHINGLES = 8192  # Shingle rows per vectorized signature chunk (x NUM_PERMUTATIONS uint64s)
+
+
+class VerificationPoolDefaults:
+    """Process-pool verification of similarity candidate pairs."""
+
+    MIN_PAIRS = 2000  # Below this, worker start-up and task overhead outweigh the parallel speedup
+    SHARDS_PER_WORKER = 4  # Several shards per worker even out uneven pair costs
 
 
 class ASTFingerprintDefaults:
@@ -772,6 +853,13 @@ class DetectorDefaults:
     CONSTRUCTOR_NAMES = frozenset({"__init__", "constructor", "__new__", "init"})
     PARALLEL_FORMATTER_PREFIXES = ("to_", "from_", "as_", "into_")
 
+    # Grouping engine: "auto" switches from structure-hash buckets to one LSH index at this size;
+    # kept below DeduplicationDefaults.MAX_CONSTRUCTS so default runs of large projects reach LSH
+    LSH_GROUPING_MIN_ITEMS = 500
+
+    # Clone index: files passed to one ast-grep call when re-extracting changed files
+    CLONE_INDEX_RESCAN_CHUNK = 200
+
 
 class ComplexityStorageDefaults:
     """Defaults for complexity trend storage and queries."""
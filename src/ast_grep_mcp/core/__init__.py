@@ -1,18 +1,29 @@
 """Core infrastructure for ast-grep MCP server."""
 
 from ast_grep_mcp.core.cache import (
+    FileFingerprint,
     QueryCache,
     get_query_cache,
     init_query_cache,
 )
+from ast_grep_mcp.core.cache_store import PersistentCacheStore
 from ast_grep_mcp.core.config import (
     CACHE_ENABLED,
     CACHE_SIZE,
     CACHE_TTL,
+    CACHE_VALIDATE_FILES,
     CONFIG_PATH,
     parse_args_and_get_config,
     validate_config_file,
 )
+from ast_grep_mcp.core.content_cache import (
+    ContentCache,
+    ContentSpillStore,
+    content_digest,
+    get_content_cache,
+    get_content_cache_stats,
+    init_content_caches,
+)
 from ast_grep_mcp.core.exceptions import (
     AstGrepError,
     AstGrepExecutionError,
@@ -22,12 +33,23 @@ from ast_grep_mcp.core.exceptions import (
     NoMatchesError,
 )
 from ast_grep_mcp.core.executor import (
+    ExecutorMetrics,
+    build_inline_rules,
     filter_files_by_size,
+    get_executor_metrics,
     get_supported_languages,
+    reset_executor_metrics,
     run_ast_grep,
+    run_ast_grep_batch,
     run_command,
     stream_ast_grep_results,
 )
+from ast_grep_mcp.core.file_discovery import (
+    DiscoveredFile,
+    FileDiscovery,
+    discover_files,
+    get_file_discovery,
+)
 from ast_grep_mcp.core.logging import (
     configure_logging,
     get_logger,
@@ -64,6 +86,7 @@ __all__ = [
     "CACHE_ENABLED",
     "CACHE_SIZE",
     "CACHE_TTL",
+    "CACHE_VALIDATE_FILES",
     "CustomLanguageConfig",
     "AstGrepConfig",
     "validate_config_file",
@@ -71,13 +94,31 @@ __all__ = [
     # Sentry
     "init_sentry",
     # Cache
+    "FileFingerprint",
     "QueryCache",
     "get_query_cache",
     "init_query_cache",
+    "PersistentCacheStore",
+    "ContentCache",
+    "ContentSpillStore",
+    "content_digest",
+    "get_content_cache",
+    "get_content_cache_stats",
+    "init_content_caches",
     # Executor
     "get_supported_languages",
     "run_command",
     "filter_files_by_size",
     "run_ast_grep",
+    "run_ast_grep_batch",
+    "build_inline_rules",
     "stream_ast_grep_results",
+    "ExecutorMetrics",
+    "get_executor_metrics",
+    "reset_executor_metrics",
+    # File discovery
+    "DiscoveredFile",
+    "FileDiscovery",
+    "discover_files",
+    "get_file_discovery",
 ]
@@ -1,11 +1,148 @@
 """Query caching for ast-grep MCP server."""
 
 import hashlib
+import os
 import time
 from collections import OrderedDict
-from typing import Any, Dict, List, Optional, Tuple
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 
-from ast_grep_mcp.constants import CacheDefaults, FormattingDefaults
+from ast_grep_mcp.constants import LANGUAGE_EXTENSIONS, CacheDefaults, FormattingDefaults
+from ast_grep_mcp.core.cache_store import PersistentCacheStore
+from ast_grep_mcp.core.file_discovery import iter_searched_files
+from ast_grep_mcp.core.logging import get_logger
+
+# Re-runs a query against the given files and returns their matches
+RescanFn = Callable[[List[str]], List[Dict[str, Any]]]
+
+
+@dataclass
+class FileFingerprint:
+    """Snapshot of the files a cached query searched.
+
+    Attributes:
+        roots: Search targets (directories or files) as passed to ast-grep
+        extensions: Optional file extension filter applied during the walk
+        files: Mapping of absolute file path to (mtime_ns, size)
+    """
+
+    roots: Tuple[str, ...]
+    extensions: Optional[Tuple[str, ...]]
+    files: Dict[str, Tuple[int, int]] = field(default_factory=dict)
+
+
+@dataclass
+class _CacheEntry:
+    results: List[Dict[str, Any]]
+    timestamp: float
+    fingerprint: Optional[FileFingerprint] = None
+
+
+def _entry_to_payload(entry: _CacheEntry) -> Dict[str, Any]:
+    """Serialize an entry for the persistent store."""
+    fp = entry.fingerprint
+    return {
+        "results": entry.results,
+        "fingerprint": (
+            None
+            if fp is None
+            else {"roots": list(fp.roots), "extensions": list(fp.extensions) if fp.extensions else None, "files": fp.files}
+        ),
+    }
+
+
+def _entry_from_payload(payload: Dict[str, Any], timestamp: float) -> _CacheEntry:
+    """Rebuild an entry loaded from the persistent store."""
+    fp_data = payload.get("fingerprint")
+    fingerprint = None
+    if fp_data is not None:
+        fingerprint = FileFingerprint(
+            roots=tuple(fp_data["roots"]),
+            extensions=tuple(fp_data["extensions"]) if fp_data.get("extensions") else None,
+            files={path: (stamp[0], stamp[1]) for path, stamp in fp_data["files"].items()},
+        )
+    return _CacheEntry(results=payload["results"], timestamp=timestamp, fingerprint=fingerprint)
+
+
+# ast-grep's short language names
+_LANGUAGE_ALIASES = {
+    "js": "javascript",
+    "ts": "typescript",
+    "py": "python",
+    "rs": "rust",
+    "golang": "go",
+    "c++": "cpp",
+    "cs": "csharp",
+    "yml": "yaml",
+}
+
+
+def language_extensions(language: Optional[str]) -> Optional[List[str]]:
+    """Extensions ast-grep searches for a language, or None to fingerprint every file.
+
+    Args:
+        language: Language passed to ast-grep (aliases such as "ts" are accepted)
+
+    Returns:
+        Extension list from LANGUAGE_EXTENSIONS, or None for no or unlisted language
+    """
+    if not language:
+        return None
+    name = language.lower()
+    extensions = LANGUAGE_EXTENSIONS.get(_LANGUAGE_ALIASES.get(name, name))
+    return list(extensions) if extensions else None
+
+
+def compute_fingerprint(roots: Sequence[str], extensions: Optional[Sequence[str]] = None) -> FileFingerprint:
+    """Stat every file ast-grep would search under the roots.
+
+    Directories are walked with ast-grep's own filters (hidden entries and
+    ignore files; see iter_searched_files), so edits anywhere ast-grep looks
+    invalidate the entry.
+
+    Args:
+        roots: Directories or files the query searches, as passed to ast-grep
+        extensions: Optional extension filter (e.g. [".py", ".pyi"])
+
+    Returns:
+        FileFingerprint for the roots
+    """
+    ext_filter = tuple(extensions) if extensions else None
+    fingerprint = FileFingerprint(roots=tuple(roots), extensions=ext_filter)
+    for root in roots:
+        abs_root = os.path.abspath(root)
+        if os.path.isdir(abs_root):
+            for path, st in iter_searched_files(abs_root, ext_filter):
+                fingerprint.files[path] = (st.st_mtime_ns, st.st_size)
+        else:
+            try:
+                st = os.stat(abs_root)
+            except OSError:
+                continue
+            fingerprint.files[abs_root] = (st.st_mtime_ns, st.st_size)
+    return fingerprint
+
+
+def _as_reported(path: str, roots: Sequence[str]) -> str:
+    """Express an absolute file path the way ast-grep reports files found under roots."""
+    for root in roots:
+        abs_root = os.path.abspath(root)
+        if path == abs_root:
+            return os.path.normpath(root)
+        if path.startswith(os.path.join(abs_root, "")):
+            return os.path.normpath(os.path.join(root, os.path.relpath(path, abs_root)))
+    return path
+
+
+def diff_fingerprints(old: FileFingerprint, new: FileFingerprint) -> Tuple[List[str], List[str]]:
+    """Compare two fingerprints of the same roots.
+
+    Returns:
+        Tuple of (changed_or_added, removed) file paths
+    """
+    changed = [path for path, stamp in new.files.items() if old.files.get(path) != stamp]
+    removed = [path for path in old.files if path not in new.files]
+    return changed, removed
 
 
 class QueryCache:
@@ -13,20 +150,46 @@ class QueryCache:
 
     Caches query results to avoid redundant ast-grep executions for identical queries.
     Uses OrderedDict for LRU eviction and timestamps for TTL expiration.
+
+    With ``validate_files`` enabled, entries stored with a FileFingerprint are
+    re-validated on every ``get()``. Unchanged files yield a plain hit; a small
+    number of changed files are re-scanned through the caller's ``rescan``
+    callback and patched into the cached match list; anything else is a miss.
+
+    With a ``disk_store``, every entry is mirrored to a PersistentCacheStore so
+    results survive restarts; memory misses fall back to the store and promote
+    the loaded entry into memory.
     """
 
-    def __init__(self, max_size: int = CacheDefaults.DEFAULT_CACHE_SIZE, ttl_seconds: int = CacheDefaults.CLEANUP_INTERVAL_SECONDS) -> None:
+    def __init__(
+        self,
+        max_size: int = CacheDefaults.DEFAULT_CACHE_SIZE,
+        ttl_seconds: int = CacheDefaults.CLEANUP_INTERVAL_SECONDS,
+        validate_files: bool = CacheDefaults.VALIDATE_FILES,
+        max_patch_files: int = CacheDefaults.MAX_PATCH_FILES,
+        disk_store: Optional[PersistentCacheStore] = None,
+    ) -> None:
         """Initialize the cache.
 
         Args:
             max_size: Maximum number of entries to cache (default: CacheDefaults.DEFAULT_CACHE_SIZE)
             ttl_seconds: Time-to-live for cache entries in seconds (default: CacheDefaults.CLEANUP_INTERVAL_SECONDS)
+            validate_files: Re-validate entries against file mtimes/sizes on get()
+            max_patch_files: Maximum changed files to patch in place before dropping the entry
+            disk_store: Optional persistent store that mirrors in-memory entries
         """
         self.max_size = max_size
         self.ttl_seconds = ttl_seconds
-        self.cache: OrderedDict[str, Tuple[List[Dict[str, Any]], float]] = OrderedDict()
+        self.validate_files = validate_files
+        self.max_patch_files = max_patch_files
+        self.disk_store = disk_store
+        self.cache: OrderedDict[str, _CacheEntry] = OrderedDict()
         self.hits = 0
         self.misses = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.patches = 0
+        self.invalidations = 0
 
     def _make_key(self, command: str, args: List[str], project_folder: str) -> str:
         """Create a cache key from query parameters.
@@ -44,38 +207,133 @@ class QueryCache:
         key_str = "|".join(key_parts)
         return hashlib.sha256(key_str.encode()).hexdigest()[: CacheDefaults.CACHE_KEY_LENGTH]
 
-    def get(self, command: str, args: List[str], project_folder: str) -> Optional[List[Dict[str, Any]]]:
+    def fingerprint(self, roots: List[str], extensions: Optional[List[str]] = None) -> Optional[FileFingerprint]:
+        """Fingerprint search roots when file validation is enabled.
+
+        Callers should take the fingerprint before running the query so that
+        edits made during the scan are detected on the next lookup.
+
+        Returns:
+            FileFingerprint, or None when validate_files is disabled
+        """
+        if not self.validate_files:
+            return None
+        return compute_fingerprint(roots, extensions)
+
+    def _store_in_memory(self, key: str, entry: _CacheEntry) -> None:
+        # Remove oldest entry if at capacity
+        if len(self.cache) >= self.max_size and key not in self.cache:
+            self.cache.popitem(last=False)  # Remove oldest (first) item
+        self.cache[key] = entry
+        # Move to end (mark as recently used)
+        self.cache.move_to_end(key)
+
+    def _lookup(self, key: str) -> Tuple[Optional[_CacheEntry], bool]:
+        """Find an entry in memory, then on disk; return (entry, loaded_from_disk)."""
+        entry = self.cache.get(key)
+        if entry is not None or self.disk_store is None:
+            return entry, False
+        loaded = self.disk_store.get(key)
+        if loaded is None:
+            return None, False
+        entry = _entry_from_payload(*loaded)
+        self._store_in_memory(key, entry)
+        return entry, True
+
+    def _remove(self, key: str) -> None:
+        self.cache.pop(key, None)
+        if self.disk_store is not None:
+            self.disk_store.delete(key)
+
+    def _invalidate(self, key: str) -> None:
+        self._remove(key)
+        self.invalidations += 1
+
+    def _patch_entry(self, key: str, entry: _CacheEntry, rescan: Optional[RescanFn]) -> Optional[List[Dict[str, Any]]]:
+        """Bring a fingerprinted entry up to date; return None if it had to be dropped."""
+        assert entry.fingerprint is not None
+        current = compute_fingerprint(entry.fingerprint.roots, entry.fingerprint.extensions)
+        changed, removed = diff_fingerprints(entry.fingerprint, current)
+        if not changed and not removed:
+            return entry.results
+
+        logger = get_logger("cache")
+        if rescan is None or len(changed) + len(removed) > self.max_patch_files:
+            logger.info("cache_entry_invalidated", changed_files=len(changed), removed_files=len(removed))
+            self._invalidate(key)
+            return None
+
+        try:
+            fresh = rescan(changed) if changed else []
+        except Exception as e:
+            logger.warning("cache_patch_failed", changed_files=len(changed), error=str(e))
+            self._invalidate(key)
+            return None
+
+        stale = set(changed) | set(removed)
+        kept = [m for m in entry.results if os.path.abspath(m.get("file", "")) not in stale]
+        # Rescans get absolute paths; report their files like the original scan did
+        fresh = [{**m, "file": _as_reported(os.path.abspath(m.get("file", "")), entry.fingerprint.roots)} for m in fresh]
+        entry.results = kept + fresh
+        entry.fingerprint = current
+        entry.timestamp = time.time()
+        if self.disk_store is not None:
+            self.disk_store.put(key, _entry_to_payload(entry), entry.timestamp)
+        self.patches += 1
+        logger.info("cache_entry_patched", changed_files=len(changed), removed_files=len(removed), rescanned_matches=len(fresh))
+        return entry.results
+
+    def get(self, command: str, args: List[str], project_folder: str, rescan: Optional[RescanFn] = None) -> Optional[List[Dict[str, Any]]]:
         """Get cached results if available and not expired.
 
         Args:
             command: ast-grep command (run/scan)
             args: Command arguments
             project_folder: Project folder path
+            rescan: Optional callback that re-runs the query on a list of files;
+                used to patch fingerprinted entries instead of dropping them
 
         Returns:
             Cached results if found and valid, None otherwise
         """
         key = self._make_key(command, args, project_folder)
 
-        if key not in self.cache:
+        entry, from_disk = self._lookup(key)
+        if entry is None:
             self.misses += 1
             return None
 
-        results, timestamp = self.cache[key]
-
         # Check TTL
-        if time.time() - timestamp > self.ttl_seconds:
+        if time.time() - entry.timestamp > self.ttl_seconds:
             # Expired, remove from cache
-            del self.cache[key]
+            self._remove(key)
             self.misses += 1
             return None
 
+        results: Optional[List[Dict[str, Any]]] = entry.results
+        if self.validate_files and entry.fingerprint is not None:
+            results = self._patch_entry(key, entry, rescan)
+            if results is None:
+                self.misses += 1
+                return None
+
         # Move to end (mark as recently used)
         self.cache.move_to_end(key)
         self.hits += 1
+        if from_disk:
+            self.disk_hits += 1
+        else:
+            self.memory_hits += 1
         return results
 
-    def put(self, command: str, args: List[str], project_folder: str, results: List[Dict[str, Any]]) -> None:
+    def put(
+        self,
+        command: str,
+        args: List[str],
+        project_folder: str,
+        results: List[Dict[str, Any]],
+        fingerprint: Optional[FileFingerprint] = None,
+    ) -> None:
         """Store results in cache.
 
         Args:
@@ -83,23 +341,27 @@ class QueryCache:
             args: Command arguments
             project_folder: Project folder path
             results: Query results to cache
+            fingerprint: Optional snapshot of the searched files, taken before the query ran
         """
         key = self._make_key(command, args, project_folder)
 
-        # Remove oldest entry if at capacity
-        if len(self.cache) >= self.max_size and key not in self.cache:
-            self.cache.popitem(last=False)  # Remove oldest (first) item
-
         # Store with current timestamp
-        self.cache[key] = (results, time.time())
-        # Move to end (mark as recently used)
-        self.cache.move_to_end(key)
+        entry = _CacheEntry(results=results, timestamp=time.time(), fingerprint=fingerprint)
+        self._store_in_memory(key, entry)
+        if self.disk_store is not None:
+            self.disk_store.put(key, _entry_to_payload(entry), entry.timestamp)
 
     def clear(self) -> None:
-        """Clear all cache entries."""
+        """Clear all cache entries, including the persistent store if configured."""
         self.cache.clear()
+        if self.disk_store is not None:
+            self.disk_store.clear()
         self.hits = 0
         self.misses = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.patches = 0
+        self.invalidations = 0
 
     def get_stats(self) -> Dict[str, Any]:
         """Get cache statistics.
@@ -109,14 +371,22 @@ class QueryCache:
         """
         total = self.hits + self.misses
         hit_rate = self.hits / total if total > 0 else 0
-        return {
+        stats: Dict[str, Any] = {
             "size": len(self.cache),
             "max_size": self.max_size,
             "hits": self.hits,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
             "misses": self.misses,
             "hit_rate": round(hit_rate, FormattingDefaults.ROUNDING_PRECISION),
             "ttl_seconds": self.ttl_seconds,
+            "validate_files": self.validate_files,
+            "patches": self.patches,
+            "invalidations": self.invalidations,
         }
+        if self.disk_store is not None:
+            stats["disk"] = self.disk_store.get_stats()
+        return stats
 
 
 # Global cache instance (initialized after config is parsed)
@@ -130,12 +400,22 @@ def get_query_cache() -> Optional[QueryCache]:
     return _query_cache if CACHE_ENABLED else None
 
 
-def init_query_cache(max_size: int, ttl_seconds: int) -> None:
+def init_query_cache(
+    max_size: int,
+    ttl_seconds: int,
+    validate_files: bool = CacheDefaults.VALIDATE_FILES,
+    persist: bool = CacheDefaults.PERSIST,
+    disk_max_size_mb: int = CacheDefaults.MAX_SIZE_MB,
+) -> None:
     """Initialize the global query cache.
 
     Args:
         max_size: Maximum number of entries to cache
         ttl_seconds: Time-to-live for cache entries in seconds
+        validate_files: Re-validate entries against file mtimes/sizes on get()
+        persist: Mirror entries to ~/.ast-grep-mcp/query_cache.db so they survive restarts
+        disk_max_size_mb: Size budget for the persistent store
     """
     global _query_cache
-    _query_cache = QueryCache(max_size=max_size, ttl_seconds=ttl_seconds)
+    disk_store = PersistentCacheStore(max_size_mb=disk_max_size_mb) if persist else None
+    _query_cache = QueryCache(max_size=max_size, ttl_seconds=ttl_seconds, validate_files=validate_files, disk_store=disk_store)
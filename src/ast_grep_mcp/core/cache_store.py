@@ -0,0 +1,165 @@
+"""
+Persistent on-disk storage for query cache entries.
+
+This module provides a SQLite-backed store that lets QueryCache results
+survive server restarts and be shared by several server processes:
+- zlib-compressed JSON payloads
+- LRU eviction bounded by total payload bytes
+- WAL journaling with a busy timeout for concurrent access
+"""
+
+import json
+import sqlite3
+import time
+import zlib
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Generator, Optional, Tuple, cast
+
+from ast_grep_mcp.constants import CacheDefaults, FileConstants, PerformanceDefaults
+from ast_grep_mcp.core.logging import get_logger
+
+logger = get_logger("cache.store")
+
+QUERY_CACHE_DB_SCHEMA = """
+CREATE TABLE IF NOT EXISTS query_cache (
+    key TEXT PRIMARY KEY,
+    payload BLOB NOT NULL,
+    size_bytes INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_query_cache_accessed ON query_cache(accessed_at);
+"""
+
+_UPSERT_SQL = """
+    INSERT OR REPLACE INTO query_cache (key, payload, size_bytes, created_at, accessed_at)
+    VALUES (?, ?, ?, ?, ?)
+"""
+
+# Deletes least-recently-accessed rows until the running total fits under the byte budget
+_EVICT_SQL = """
+    DELETE FROM query_cache WHERE key IN (
+        SELECT key FROM (
+            SELECT key, SUM(size_bytes) OVER (ORDER BY accessed_at DESC, key) AS running_total
+            FROM query_cache
+        ) WHERE running_total > ?
+    )
+"""
+
+
+def _encode_payload(payload: Dict[str, Any]) -> bytes:
+    return zlib.compress(json.dumps(payload, separators=(",", ":")).encode("utf-8"), CacheDefaults.DISK_COMPRESSION_LEVEL)
+
+
+def _decode_payload(blob: bytes) -> Dict[str, Any]:
+    return cast(Dict[str, Any], json.loads(zlib.decompress(blob).decode("utf-8")))
+
+
+class PersistentCacheStore:
+    """SQLite store for query cache payloads shared across processes."""
+
+    def __init__(self, db_path: Optional[Path] = None, max_size_mb: int = CacheDefaults.MAX_SIZE_MB) -> None:
+        """Initialize the store.
+
+        Args:
+            db_path: Path to SQLite database. Defaults to ~/.ast-grep-mcp/query_cache.db
+            max_size_mb: Upper bound on total compressed payload size before LRU eviction
+        """
+        self.db_path = db_path or self._get_default_db_path()
+        self.max_size_bytes = max_size_mb * FileConstants.BYTES_PER_MB
+        self._init_db()
+
+    def _get_default_db_path(self) -> Path:
+        """Get default database path next to the usage database."""
+        base = Path.home() / ".ast-grep-mcp"
+        base.mkdir(parents=True, exist_ok=True)
+        return base / "query_cache.db"
+
+    @contextmanager
+    def _get_connection(self) -> Generator[sqlite3.Connection, None, None]:
+        """Context manager for database connections."""
+        conn = sqlite3.connect(str(self.db_path), timeout=PerformanceDefaults.DATABASE_TIMEOUT_SECONDS)
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        ok = False
+        try:
+            yield conn
+            ok = True
+        finally:
+            if ok:
+                conn.commit()
+            else:
+                conn.rollback()
+            conn.close()
+
+    def _init_db(self) -> None:
+        """Initialize database schema."""
+        with self._get_connection() as conn:
+            conn.executescript(QUERY_CACHE_DB_SCHEMA)
+
+    def get(self, key: str) -> Optional[Tuple[Dict[str, Any], float]]:
+        """Load a payload and mark it as recently used.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Tuple of (payload, created_at), or None if absent or unreadable
+        """
+        try:
+            with self._get_connection() as conn:
+                row = conn.execute("SELECT payload, created_at FROM query_cache WHERE key = ?", (key,)).fetchone()
+                if row is None:
+                    return None
+                conn.execute("UPDATE query_cache SET accessed_at = ? WHERE key = ?", (time.time(), key))
+            return _decode_payload(row[0]), float(row[1])
+        except (sqlite3.Error, zlib.error, ValueError) as e:
+            logger.warning("cache_store_read_failed", key=key, error=str(e))
+            return None
+
+    def put(self, key: str, payload: Dict[str, Any], created_at: float) -> None:
+        """Store a payload and evict least-recently-used entries over the size budget.
+
+        Args:
+            key: Cache key
+            payload: JSON-serializable entry payload
+            created_at: Entry creation time, used for TTL checks on load
+        """
+        try:
+            blob = _encode_payload(payload)
+            with self._get_connection() as conn:
+                conn.execute("BEGIN IMMEDIATE")
+                conn.execute(_UPSERT_SQL, (key, blob, len(blob), created_at, time.time()))
+                conn.execute(_EVICT_SQL, (self.max_size_bytes,))
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            logger.warning("cache_store_write_failed", key=key, error=str(e))
+
+    def delete(self, key: str) -> None:
+        """Remove a payload if present."""
+        try:
+            with self._get_connection() as conn:
+                conn.execute("DELETE FROM query_cache WHERE key = ?", (key,))
+        except sqlite3.Error as e:
+            logger.warning("cache_store_delete_failed", key=key, error=str(e))
+
+    def clear(self) -> None:
+        """Remove all payloads."""
+        with self._get_connection() as conn:
+            conn.execute("DELETE FROM query_cache")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get store statistics.
+
+        Returns:
+            Dictionary with entry count and size information
+        """
+        with self._get_connection() as conn:
+            count, total = conn.execute("SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM query_cache").fetchone()
+        return {
+            "path": str(self.db_path),
+            "entries": count,
+            "size_bytes": total,
+            "max_size_bytes": self.max_size_bytes,
+        }
@@ -19,6 +19,9 @@ CONFIG_PATH: Optional[str] = None
 CACHE_ENABLED: bool = True
 CACHE_SIZE: int = CacheDefaults.DEFAULT_CACHE_SIZE
 CACHE_TTL: int = CacheDefaults.TTL_SECONDS
+CACHE_VALIDATE_FILES: bool = CacheDefaults.VALIDATE_FILES
+CACHE_PERSIST: bool = CacheDefaults.PERSIST
+CACHE_DISK_MAX_MB: int = CacheDefaults.MAX_SIZE_MB
 
 # Global cache instance (will be set after cache.py is extracted)
 _query_cache: Optional[Any] = None
@@ -80,6 +83,28 @@ def _add_cache_arguments(parser: argparse.ArgumentParser) -> None:
         default=None,
         help=(f"Cache TTL in seconds (default: {CacheDefaults.TTL_SECONDS}). Also settable via CACHE_TTL env var."),
     )
+    parser.add_argument(
+        "--cache-validate-files",
+        action=argparse.BooleanOptionalAction,
+        default=None,
+        help=(
+            "Re-validate cached results against file mtimes/sizes and re-scan only changed files (default: on). "
+            "--no-cache-validate-files serves cached results until their TTL expires. "
+            "Can also be set via CACHE_VALIDATE_FILES=0/1 env var."
+        ),
+    )
+    parser.add_argument(
+        "--cache-persist",
+        action="store_true",
+        help="Persist cached query results to ~/.ast-grep-mcp/query_cache.db across restarts. Can also be set via CACHE_PERSIST=1 env var.",
+    )
+    parser.add_argument(
+        "--cache-disk-mb",
+        type=int,
+        metavar="MB",
+        default=None,
+        help=(f"Size budget for the persistent cache (default: {CacheDefaults.MAX_SIZE_MB}). Also settable via CACHE_DISK_MB env var."),
+    )
 
 
 def _create_argument_parser() -> argparse.ArgumentParser:
@@ -187,7 +212,7 @@ def _resolve_int_from_env(env_key: str, default: int, warn_key: str) -> int:
         return default
 
 
-def _configure_cache_from_args(args: argparse.Namespace) -> tuple[bool, int, int]:
+def _configure_cache_from_args(args: argparse.Namespace) -> tuple[bool, int, int, bool]:
     """Configure cache settings from command-line arguments and environment.
 
     Precedence: command-line flags > env vars > defaults
@@ -196,7 +221,7 @@ def _configure_cache_from_args(args: argparse.Namespace) -> tuple[bool, int, int
         args: Parsed command-line arguments.
 
     Returns:
-        Tuple of (cache_enabled, cache_size, cache_ttl).
+        Tuple of (cache_enabled, cache_size, cache_ttl, cache_validate_files).
     """
     cache_logger = get_logger("cache.init")
 
@@ -212,14 +237,50 @@ def _configure_cache_from_args(args: argparse.Namespace) -> tuple[bool, int, int
     else:
         cache_ttl = _resolve_int_from_env("CACHE_TTL", CacheDefaults.CLEANUP_INTERVAL_SECONDS, "invalid_cache_ttl_env")
 
-    cache_logger.info("cache_config", cache_enabled=cache_enabled, cache_size=cache_size, cache_ttl=cache_ttl)
+    if args.cache_validate_files is not None:
+        cache_validate_files = args.cache_validate_files
+    elif os.environ.get("CACHE_VALIDATE_FILES"):
+        cache_validate_files = os.environ["CACHE_VALIDATE_FILES"].strip().lower() not in ("0", "false", "no", "off")
+    else:
+        cache_validate_files = CacheDefaults.VALIDATE_FILES
+
+    cache_logger.info(
+        "cache_config",
+        cache_enabled=cache_enabled,
+        cache_size=cache_size,
+        cache_ttl=cache_ttl,
+        cache_validate_files=cache_validate_files,
+    )
+
+    return cache_enabled, cache_size, cache_ttl, cache_validate_files
+
+
+def _configure_cache_persistence_from_args(args: argparse.Namespace) -> tuple[bool, int]:
+    """Configure persistent cache settings from command-line arguments and environment.
+
+    Precedence: command-line flags > env vars > defaults
+
+    Args:
+        args: Parsed command-line arguments.
+
+    Returns:
+        Tuple of (cache_persist, cache_disk_max_mb).
+    """
+    cache_persist = args.cache_persist or bool(os.environ.get("CACHE_PERSIST"))
+
+    if args.cache_disk_mb is not None:
+        cache_disk_max_mb = args.cache_disk_mb
+    else:
+        cache_disk_max_mb = _resolve_int_from_env("CACHE_DISK_MB", CacheDefaults.MAX_SIZE_MB, "invalid_cache_disk_mb_env")
+
+    get_logger("cache.init").info("cache_persistence_config", cache_persist=cache_persist, cache_disk_max_mb=cache_disk_max_mb)
 
-    return cache_enabled, cache_size, cache_ttl
+    return cache_persist, cache_disk_max_mb
 
 
 def parse_args_and_get_config() -> None:
     """Parse command-line arguments and determine config path."""
-    global CONFIG_PATH, CACHE_ENABLED, CACHE_SIZE, CACHE_TTL
+    global CONFIG_PATH, CACHE_ENABLED, CACHE_SIZE, CACHE_TTL, CACHE_VALIDATE_FILES, CACHE_PERSIST, CACHE_DISK_MAX_MB
 
     # Parse arguments
     parser = _create_argument_parser()
@@ -232,4 +293,5 @@ def parse_args_and_get_config() -> None:
     _configure_logging_from_args(args)
 
     # Configure cache
-    CACHE_ENABLED, CACHE_SIZE, CACHE_TTL = _configure_cache_from_args(args)
+    CACHE_ENABLED, CACHE_SIZE, CACHE_TTL, CACHE_VALIDATE_FILES = _configure_cache_from_args(args)
+    CACHE_PERSIST, CACHE_DISK_MAX_MB = _configure_cache_persistence_from_args(args)
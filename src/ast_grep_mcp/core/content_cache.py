@@ -0,0 +1,381 @@
+"""
+Bounded, content-addressed caches for values derived from source code.
+
+MinHash signatures and CodeBERT embeddings are keyed by a stable digest of the
+code they were computed from, inside a namespace that encodes the settings that
+affect them. Unlike ``hash()``, the digests are identical across processes:
+- LRU eviction bounded by total value bytes, not entry count
+- hit/miss/eviction statistics
+- optional spill to a SQLite store so entries survive restarts and are shared
+  by several server processes
+"""
+
+import hashlib
+import io
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Generator, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from ast_grep_mcp.constants import CacheDefaults, FileConstants, FormattingDefaults, PerformanceDefaults
+from ast_grep_mcp.core.logging import get_logger
+
+logger = get_logger("cache.content")
+
+CONTENT_CACHE_DB_SCHEMA = """
+CREATE TABLE IF NOT EXISTS content_cache (
+    namespace TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    value BLOB NOT NULL,
+    size_bytes INTEGER NOT NULL,
+    accessed_at REAL NOT NULL,
+    PRIMARY KEY (namespace, digest)
+);
+
+CREATE INDEX IF NOT EXISTS idx_content_cache_accessed ON content_cache(accessed_at);
+"""
+
+_UPSERT_SQL = """
+    INSERT OR REPLACE INTO content_cache (namespace, digest, value, size_bytes, accessed_at)
+    VALUES (?, ?, ?, ?, ?)
+"""
+
+# Deletes least-recently-accessed rows until the running total fits under the byte budget
+_EVICT_SQL = """
+    DELETE FROM content_cache WHERE rowid IN (
+        SELECT rowid FROM (
+            SELECT rowid, SUM(size_bytes) OVER (ORDER BY accessed_at DESC, rowid) AS running_total
+            FROM content_cache
+        ) WHERE running_total > ?
+    )
+"""
+
+
+def content_digest(text: str) -> str:
+    """Return a stable hex digest of text, usable as a cross-process cache key."""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=CacheDefaults.CONTENT_DIGEST_BYTES).hexdigest()
+
+
+def _encode_array(array: np.ndarray) -> bytes:
+    buffer = io.BytesIO()
+    np.save(buffer, array, allow_pickle=False)
+    return buffer.getvalue()
+
+
+def _decode_array(blob: bytes) -> np.ndarray:
+    array: np.ndarray = np.load(io.BytesIO(blob), allow_pickle=False)
+    return array
+
+
+@dataclass(frozen=True)
+class ArrayCodec:
+    """Converts cached values to NumPy arrays (for sizing and spilling) and back."""
+
+    to_array: Callable[[Any], np.ndarray]
+    from_array: Callable[[np.ndarray], Any]
+
+
+IDENTITY_CODEC = ArrayCodec(to_array=np.asarray, from_array=lambda array: array)
+
+
+class ContentSpillStore:
+    """SQLite store for content-cache arrays shared across processes."""
+
+    def __init__(self, db_path: Optional[Path] = None, max_size_mb: int = CacheDefaults.CONTENT_SPILL_MAX_MB) -> None:
+        """Initialize the store.
+
+        Args:
+            db_path: Path to SQLite database. Defaults to ~/.ast-grep-mcp/content_cache.db
+            max_size_mb: Upper bound on total stored array size before LRU eviction
+        """
+        self.db_path = db_path or self._get_default_db_path()
+        self.max_size_bytes = max_size_mb * FileConstants.BYTES_PER_MB
+        self._init_db()
+
+    def _get_default_db_path(self) -> Path:
+        """Get default database path next to the query cache database."""
+        base = Path.home() / ".ast-grep-mcp"
+        base.mkdir(parents=True, exist_ok=True)
+        return base / "content_cache.db"
+
+    @contextmanager
+    def _get_connection(self) -> Generator[sqlite3.Connection, None, None]:
+        """Context manager for database connections."""
+        conn = sqlite3.connect(str(self.db_path), timeout=PerformanceDefaults.DATABASE_TIMEOUT_SECONDS)
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        ok = False
+        try:
+            yield conn
+            ok = True
+        finally:
+            if ok:
+                conn.commit()
+            else:
+                conn.rollback()
+            conn.close()
+
+    def _init_db(self) -> None:
+        """Initialize database schema."""
+        with self._get_connection() as conn:
+            conn.executescript(CONTENT_CACHE_DB_SCHEMA)
+
+    def get_many(self, namespace: str, digests: List[str]) -> Dict[str, np.ndarray]:
+        """Load the stored arrays for digests and mark them as recently used.
+
+        Returns:
+            Mapping of digest to array for the digests that were found
+        """
+        found: Dict[str, np.ndarray] = {}
+        chunk_size = CacheDefaults.CONTENT_SPILL_QUERY_CHUNK
+        try:
+            with self._get_connection() as conn:
+                for start in range(0, len(digests), chunk_size):
+                    chunk = digests[start : start + chunk_size]
+                    placeholders = ",".join("?" * len(chunk))
+                    rows = conn.execute(
+                        f"SELECT digest, value FROM content_cache WHERE namespace = ? AND digest IN ({placeholders})",
+                        (namespace, *chunk),
+                    ).fetchall()
+                    found.update((digest, _decode_array(blob)) for digest, blob in rows)
+                now = time.time()
+                conn.executemany(
+                    "UPDATE content_cache SET accessed_at = ? WHERE namespace = ? AND digest = ?",
+                    [(now, namespace, digest) for digest in found],
+                )
+        except (sqlite3.Error, ValueError) as e:
+            logger.warning("content_spill_read_failed", namespace=namespace, error=str(e))
+        return found
+
+    def put_many(self, namespace: str, items: Iterable[Tuple[str, np.ndarray]]) -> None:
+        """Store arrays in one transaction and evict least-recently-used rows over the size budget."""
+        now = time.time()
+        rows = []
+        for digest, array in items:
+            blob = _encode_array(array)
+            rows.append((namespace, digest, blob, len(blob), now))
+        if not rows:
+            return
+        try:
+            with self._get_connection() as conn:
+                conn.execute("BEGIN IMMEDIATE")
+                conn.executemany(_UPSERT_SQL, rows)
+                conn.execute(_EVICT_SQL, (self.max_size_bytes,))
+        except (sqlite3.Error, ValueError) as e:
+            logger.warning("content_spill_write_failed", namespace=namespace, error=str(e))
+
+    def clear(self, namespace: Optional[str] = None) -> None:
+        """Remove stored arrays for one namespace, or all of them."""
+        with self._get_connection() as conn:
+            if namespace is None:
+                conn.execute("DELETE FROM content_cache")
+            else:
+                conn.execute("DELETE FROM content_cache WHERE namespace = ?", (namespace,))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get store statistics.
+
+        Returns:
+            Dictionary with entry count and size information
+        """
+        with self._get_connection() as conn:
+            count, total = conn.execute("SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM content_cache").fetchone()
+        return {
+            "path": str(self.db_path),
+            "entries": count,
+            "size_bytes": total,
+            "max_size_bytes": self.max_size_bytes,
+        }
+
+
+class ContentCache:
+    """Thread-safe LRU cache of derived values, bounded by total value bytes.
+
+    Values are sized through the codec's array form. With a spill store, new
+    entries are mirrored to disk in batches and memory misses fall back to the
+    store, promoting loaded entries into memory.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        max_bytes: int,
+        codec: ArrayCodec = IDENTITY_CODEC,
+        spill_store: Optional[ContentSpillStore] = None,
+    ) -> None:
+        """Initialize the cache.
+
+        Args:
+            namespace: Key prefix that encodes the settings values depend on
+            max_bytes: Upper bound on total value bytes held in memory
+            codec: Converts values to and from arrays
+            spill_store: Optional persistent store mirroring in-memory entries
+        """
+        self.namespace = namespace
+        self.max_bytes = max_bytes
+        self.codec = codec
+        self.spill_store = spill_store
+        self._entries: OrderedDict[str, Tuple[Any, int]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.spill_hits = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, digest: object) -> bool:
+        return digest in self._entries
+
+    def _size_of(self, value: Any) -> int:
+        return int(self.codec.to_array(value).nbytes) + CacheDefaults.CONTENT_ENTRY_OVERHEAD_BYTES
+
+    def _store_in_memory(self, digest: str, value: Any, size: int) -> None:
+        """Insert or refresh an entry and evict least-recently-used ones over the byte budget."""
+        previous = self._entries.pop(digest, None)
+        if previous is not None:
+            self.total_bytes -= previous[1]
+        self._entries[digest] = (value, size)
+        self.total_bytes += size
+        while self.total_bytes > self.max_bytes and len(self._entries) > 1:
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self.total_bytes -= evicted_size
+            self.evictions += 1
+
+    def _lookup_memory(self, digest: str) -> Optional[Any]:
+        entry = self._entries.get(digest)
+        if entry is None:
+            return None
+        self._entries.move_to_end(digest)
+        return entry[0]
+
+    def get(self, digest: str) -> Optional[Any]:
+        """Return the cached value for digest, or None."""
+        return self.get_many([digest]).get(digest)
+
+    def get_many(self, digests: Iterable[str]) -> Dict[str, Any]:
+        """Return cached values for the digests present in memory or the spill store.
+
+        The spill store is queried once for all memory misses.
+        """
+        found: Dict[str, Any] = {}
+        missing: List[str] = []
+        with self._lock:
+            for digest in dict.fromkeys(digests):
+                value = self._lookup_memory(digest)
+                if value is None:
+                    missing.append(digest)
+                else:
+                    found[digest] = value
+            self.hits += len(found)
+        loaded: Dict[str, Any] = {}
+        if missing and self.spill_store is not None:
+            arrays = self.spill_store.get_many(self.namespace, missing)
+            loaded = {digest: self.codec.from_array(array) for digest, array in arrays.items()}
+        with self._lock:
+            for digest, value in loaded.items():
+                self._store_in_memory(digest, value, self._size_of(value))
+            self.spill_hits += len(loaded)
+            self.hits += len(loaded)
+            self.misses += len(missing) - len(loaded)
+        found.update(loaded)
+        return found
+
+    def put(self, digest: str, value: Any) -> None:
+        """Store a value for digest."""
+        self.put_many([(digest, value)])
+
+    def put_many(self, items: Iterable[Tuple[str, Any]]) -> None:
+        """Store several values, mirroring them to the spill store in one transaction."""
+        items = list(items)
+        with self._lock:
+            for digest, value in items:
+                self._store_in_memory(digest, value, self._size_of(value))
+        if self.spill_store is not None:
+            self.spill_store.put_many(self.namespace, ((digest, self.codec.to_array(value)) for digest, value in items))
+
+    def clear(self) -> None:
+        """Clear in-memory entries and statistics (the spill store is left intact)."""
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+            self.hits = 0
+            self.misses = 0
+            self.spill_hits = 0
+            self.evictions = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics.
+
+        Returns:
+            Dictionary with cache stats
+        """
+        total = self.hits + self.misses
+        hit_rate = self.hits / total if total > 0 else 0
+        return {
+            "namespace": self.namespace,
+            "size": len(self._entries),
+            "bytes": self.total_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "spill_hits": self.spill_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(hit_rate, FormattingDefaults.ROUNDING_PRECISION),
+            "spill": self.spill_store is not None,
+        }
+
+
+# Process-wide caches, one per namespace, so every calculator shares one memory budget
+_content_caches: Dict[str, ContentCache] = {}
+_spill_store: Optional[ContentSpillStore] = None
+_registry_lock = threading.Lock()
+
+
+def get_content_cache(namespace: str, max_bytes: int, codec: ArrayCodec = IDENTITY_CODEC) -> ContentCache:
+    """Return the shared cache for namespace, creating it on first use.
+
+    Args:
+        namespace: Key prefix that encodes the settings values depend on
+        max_bytes: Memory budget used when the cache is created
+        codec: Converts values to and from arrays, used when the cache is created
+    """
+    with _registry_lock:
+        cache = _content_caches.get(namespace)
+        if cache is None:
+            cache = _content_caches[namespace] = ContentCache(namespace, max_bytes, codec, _spill_store)
+        return cache
+
+
+def init_content_caches(persist: bool = CacheDefaults.PERSIST, spill_max_size_mb: int = CacheDefaults.CONTENT_SPILL_MAX_MB) -> None:
+    """Configure spilling for shared content caches, including ones already created.
+
+    Args:
+        persist: Spill signatures and embeddings to ~/.ast-grep-mcp/content_cache.db
+        spill_max_size_mb: Size budget for the spill store
+    """
+    global _spill_store
+    with _registry_lock:
+        _spill_store = ContentSpillStore(max_size_mb=spill_max_size_mb) if persist else None
+        for cache in _content_caches.values():
+            cache.spill_store = _spill_store
+
+
+def get_content_spill_store() -> Optional[ContentSpillStore]:
+    """Return the configured spill store, or None when content caches are memory-only."""
+    return _spill_store
+
+
+def get_content_cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Return statistics for every shared content cache, keyed by namespace."""
+    with _registry_lock:
+        caches = list(_content_caches.values())
+    return {cache.namespace: cache.get_stats() for cache in caches}
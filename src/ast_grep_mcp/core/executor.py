@@ -8,7 +8,9 @@ import sys
 import tempfile
 import threading
 import time
-from typing import Any, Dict, Generator, List, Optional, Tuple, cast
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Deque, Dict, Generator, List, Optional, Tuple, cast
 
 import sentry_sdk
 import yaml
@@ -19,10 +21,110 @@ from ast_grep_mcp.core.exceptions import (
     AstGrepExecutionError,
     AstGrepNotFoundError,
 )
+from ast_grep_mcp.core.file_discovery import discover_files
 from ast_grep_mcp.core.logging import get_logger
 from ast_grep_mcp.utils.tool_context import tool_context
 
 
+class ExecutorMetrics:
+    """Thread-safe counters for ast-grep process usage.
+
+    Tracks process spawns, callers queued for a process slot, and per-call
+    latency so batching and concurrency limits can be evaluated.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Zero all counters."""
+        with self._lock:
+            self.spawn_count = 0
+            self.active_processes = 0
+            self.queue_depth = 0
+            self.max_queue_depth = 0
+            self.call_count = 0
+            self.total_latency = 0.0
+            self.max_latency = 0.0
+            self.batch_calls = 0
+            self.batched_rules = 0
+            self._latencies: Deque[float] = deque(maxlen=ExecutorDefaults.LATENCY_SAMPLE_SIZE)
+
+    def record_spawn(self) -> None:
+        with self._lock:
+            self.spawn_count += 1
+
+    def record_latency(self, seconds: float) -> None:
+        with self._lock:
+            self.call_count += 1
+            self.total_latency += seconds
+            self.max_latency = max(self.max_latency, seconds)
+            self._latencies.append(seconds)
+
+    def record_batch(self, rule_count: int) -> None:
+        with self._lock:
+            self.batch_calls += 1
+            self.batched_rules += rule_count
+
+    @contextmanager
+    def process_slot(self, slots: threading.BoundedSemaphore) -> Generator[None, None, None]:
+        """Wait for a process slot, tracking queue depth and active processes."""
+        with self._lock:
+            self.queue_depth += 1
+            self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+        slots.acquire()
+        with self._lock:
+            self.queue_depth -= 1
+            self.active_processes += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.active_processes -= 1
+            slots.release()
+
+    def _percentile(self, ordered: List[float], fraction: float) -> float:
+        if not ordered:
+            return 0.0
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return current metrics as a dictionary."""
+        with self._lock:
+            ordered = sorted(self._latencies)
+            precision = FormattingDefaults.ROUNDING_PRECISION
+            return {
+                "spawn_count": self.spawn_count,
+                "active_processes": self.active_processes,
+                "queue_depth": self.queue_depth,
+                "max_queue_depth": self.max_queue_depth,
+                "call_count": self.call_count,
+                "avg_latency_seconds": round(self.total_latency / self.call_count, precision) if self.call_count else 0.0,
+                "p50_latency_seconds": round(self._percentile(ordered, 0.5), precision),
+                "p95_latency_seconds": round(self._percentile(ordered, 0.95), precision),
+                "max_latency_seconds": round(self.max_latency, precision),
+                "batch_calls": self.batch_calls,
+                "batched_rules": self.batched_rules,
+                "spawns_saved_by_batching": self.batched_rules - self.batch_calls,
+            }
+
+
+_metrics = ExecutorMetrics()
+# Bounds concurrent blocking ast-grep processes so thread-pool fan-out queues instead of oversubscribing cores
+_process_slots = threading.BoundedSemaphore(ExecutorDefaults.MAX_CONCURRENT_PROCESSES)
+
+
+def get_executor_metrics() -> Dict[str, Any]:
+    """Get ast-grep process metrics (spawn count, queue depth, latency)."""
+    return _metrics.snapshot()
+
+
+def reset_executor_metrics() -> None:
+    """Reset ast-grep process metrics."""
+    _metrics.reset()
+
+
 def _load_custom_languages() -> List[str]:
     """Load custom language names from sgconfig.yml.
 
@@ -90,9 +192,11 @@ def _execute_subprocess(
     Returns:
         CompletedProcess instance
     """
-    with sentry_sdk.start_span(op="subprocess.run", name=f"Running {args[0]}") as span:
+    with sentry_sdk.start_span(op="subprocess.run", name=f"Running {args[0]}") as span, _metrics.process_slot(_process_slots):
         span.set_data("command", args[0])
         span.set_data("has_stdin", input_text is not None)
+        _metrics.record_spawn()
+        started = time.perf_counter()
         try:
             result = subprocess.run(
                 args,
@@ -105,6 +209,8 @@ def _execute_subprocess(
         except subprocess.CalledProcessError as e:
             span.set_data("returncode", e.returncode)
             raise
+        finally:
+            _metrics.record_latency(time.perf_counter() - started)
         span.set_data("returncode", result.returncode)
     return result
 
@@ -175,68 +281,10 @@ def _get_language_extensions(language: str) -> Optional[List[str]]:
     return lang_map.get(language.lower())
 
 
-def _should_skip_directory(dirname: str) -> bool:
-    """Check if directory should be skipped.
-
-    Args:
-        dirname: Directory name
-
-    Returns:
-        True if should skip, False otherwise
-    """
-    if dirname.startswith("."):
-        return True
-    return dirname in ["node_modules", "venv", ".venv", "build", "dist"]
-
-
-def _process_file(
-    file: str, root: str, lang_extensions: Optional[List[str]], max_size_bytes: int, logger: Any
-) -> Tuple[Optional[str], Optional[str]]:
-    """Process a single file for size filtering.
-
-    Args:
-        file: File name
-        root: Root directory path
-        lang_extensions: Language-specific extensions
-        max_size_bytes: Maximum size in bytes
-        logger: Logger instance
-
-    Returns:
-        Tuple of (file_to_search, skipped_file) - only one will be non-None
-    """
-    # Skip hidden files
-    if file.startswith("."):
-        return (None, None)
-
-    # Check language filter
-    if lang_extensions and not any(file.endswith(ext) for ext in lang_extensions):
-        return (None, None)
-
-    file_path = os.path.join(root, file)
-
-    try:
-        file_size = os.path.getsize(file_path)
-
-        if file_size > max_size_bytes:
-            logger.debug(
-                "file_skipped_size",
-                file=file_path,
-                size_mb=round(file_size / FileConstants.BYTES_PER_MB, 2),
-                max_size_mb=max_size_bytes / FileConstants.BYTES_PER_MB,
-            )
-            return (None, file_path)
-
-        return (file_path, None)
-
-    except OSError as e:
-        logger.debug("file_stat_error", file=file_path, error=str(e))
-        return (None, None)
-
-
 def _walk_and_classify(
     directory: str, lang_extensions: Optional[List[str]], max_size_bytes: int, logger: Any
 ) -> Tuple[List[str], List[str]]:
-    """Walk directory tree and classify files by size.
+    """List directory files (via the shared discovery service) and classify them by size.
 
     Returns:
         Tuple of (files_to_search, skipped_files)
@@ -244,15 +292,22 @@ def _walk_and_classify(
     files_to_search: List[str] = []
     skipped_files: List[str] = []
 
-    for root, dirs, files in os.walk(directory):
-        dirs[:] = [d for d in dirs if not _should_skip_directory(d)]
-
-        for file in files:
-            found, skipped = _process_file(file, root, lang_extensions, max_size_bytes, logger)
-            if found:
-                files_to_search.append(found)
-            elif skipped:
-                skipped_files.append(skipped)
+    for found in discover_files(directory, extensions=lang_extensions):
+        # Stat afresh: discovery listings only notice in-place edits when the directory changes
+        try:
+            size = os.stat(found.path).st_size
+        except OSError:
+            continue
+        if size > max_size_bytes:
+            logger.debug(
+                "file_skipped_size",
+                file=found.path,
+                size_mb=round(size / FileConstants.BYTES_PER_MB, 2),
+                max_size_mb=max_size_bytes / FileConstants.BYTES_PER_MB,
+            )
+            skipped_files.append(found.path)
+        else:
+            files_to_search.append(found.path)
 
     return files_to_search, skipped_files
 
@@ -377,7 +432,9 @@ def _create_stream_process(full_command: List[str]) -> subprocess.Popen[str]:
         FileNotFoundError: If command not found
     """
     use_shell = sys.platform == "win32" and full_command[0] == ExecutorDefaults.AST_GREP_COMMAND
-    return subprocess.Popen(full_command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, shell=use_shell)
+    process = subprocess.Popen(full_command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, shell=use_shell)
+    _metrics.record_spawn()
+    return process
 
 
 def _parse_json_line(line: str, logger: Any) -> Optional[Dict[str, Any]]:
@@ -505,6 +562,15 @@ def _cleanup_process(process: Optional[subprocess.Popen[str]]) -> None:
             pass
 
 
+def _terminate_on_cancel(process: subprocess.Popen[str], cancel_event: threading.Event) -> None:
+    """Terminate the process once cancel_event is set (unblocks a reader waiting on stdout)."""
+    while process.poll() is None:
+        if cancel_event.wait(timeout=StreamDefaults.CANCEL_POLL_SECONDS) and process.poll() is None:
+            get_logger("stream_results").info("stream_cancelled", pid=process.pid)
+            _cleanup_process(process)
+            return
+
+
 def _drain_stderr_to_list(process: subprocess.Popen[str], output: List[str]) -> None:
     """Read stderr in background to prevent pipe buffer deadlock."""
     if process.stderr:
@@ -582,6 +648,7 @@ def stream_ast_grep_results(
     max_results: int = 0,
     progress_interval: int = StreamDefaults.PROGRESS_INTERVAL,
     language_globs: Optional[Dict[str, List[str]]] = None,
+    cancel_event: Optional[threading.Event] = None,
 ) -> Generator[Dict[str, Any], None, None]:
     """Stream ast-grep JSON results line-by-line with early termination support.
 
@@ -596,6 +663,9 @@ def stream_ast_grep_results(
         language_globs: Optional mapping of language → glob patterns written to a
             temporary sgconfig.yml and passed via --config.  When provided, takes
             precedence over the global CONFIG_PATH.
+        cancel_event: Optional event that terminates ast-grep when set, even while
+            the consumer is blocked waiting for the next match (the stream then ends).
+            Closing the generator also terminates the process.
 
     Yields:
         Individual match dictionaries from ast-grep JSON output
@@ -625,6 +695,8 @@ def stream_ast_grep_results(
 
         stderr_thread = threading.Thread(target=_drain_stderr_to_list, args=(process, stderr_chunks), daemon=True)
         stderr_thread.start()
+        if cancel_event is not None:
+            threading.Thread(target=_terminate_on_cancel, args=(process, cancel_event), daemon=True).start()
 
         match_count = yield from _iter_stdout_matches(process, max_results, progress_interval, start_time, logger)
 
@@ -639,5 +711,67 @@ def stream_ast_grep_results(
 
     finally:
         _cleanup_process(process)
+        if process is not None:
+            _metrics.record_latency(time.time() - start_time)
         if tmpdir:
             shutil.rmtree(tmpdir, ignore_errors=True)
+
+
+def build_inline_rules(rules: List[Dict[str, Any]]) -> str:
+    """Serialize rule documents into a multi-document --inline-rules string.
+
+    Args:
+        rules: Rule documents, each with ``id``, ``language`` and ``rule`` keys
+
+    Returns:
+        YAML documents joined with ``---`` separators
+
+    Raises:
+        ValueError: If rule ids are missing or not unique
+    """
+    ids = [rule.get("id") for rule in rules]
+    if any(not rule_id for rule_id in ids) or len(set(ids)) != len(ids):
+        raise ValueError("Batched rules need unique, non-empty ids")
+    return "---\n".join(yaml.safe_dump(rule, sort_keys=False) for rule in rules)
+
+
+def run_ast_grep_batch(
+    rules: List[Dict[str, Any]],
+    paths: List[str],
+    max_results: int = 0,
+    extra_args: Optional[List[str]] = None,
+    language_globs: Optional[Dict[str, List[str]]] = None,
+) -> Dict[str, List[Dict[str, Any]]]:
+    """Run several rules in a single ast-grep scan and route matches by rule id.
+
+    One process walks and parses the targets once for all rules, instead of
+    one ``ast-grep run`` per pattern.
+
+    Args:
+        rules: Rule documents, each with unique ``id``, ``language`` and ``rule`` keys
+        paths: Files or directories to scan
+        max_results: Maximum total matches across all rules (0 = unlimited)
+        extra_args: Additional ast-grep scan arguments (e.g. ``["--threads", "4"]``)
+        language_globs: Optional mapping of language → extra glob patterns, e.g. to
+            parse ``*.tsx`` files with the ``typescript`` rules
+
+    Returns:
+        Mapping of rule id to its matches (every requested id is present)
+
+    Raises:
+        ValueError: If rule ids are missing or not unique
+        AstGrepNotFoundError: If ast-grep binary not found
+        AstGrepExecutionError: If ast-grep execution fails
+    """
+    results: Dict[str, List[Dict[str, Any]]] = {rule["id"]: [] for rule in rules if rule.get("id")}
+    if not rules:
+        return results
+    inline_rules = build_inline_rules(rules)
+    _metrics.record_batch(len(rules))
+
+    args = ["--inline-rules", inline_rules, "--json=stream", *(extra_args or []), *paths]
+    for match in stream_ast_grep_results("scan", args, max_results=max_results, language_globs=language_globs):
+        bucket = results.get(match.get("ruleId", ""))
+        if bucket is not None:
+            bucket.append(match)
+    return results
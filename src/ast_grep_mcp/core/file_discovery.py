@@ -0,0 +1,478 @@
+"""Shared, gitignore-aware file discovery.
+
+One walk per project root serves every feature that needs a file listing:
+- ``os.scandir`` with the directory-entry stat reused for size and mtime
+- ``.gitignore``/``.ignore`` files (and ``.git/info/exclude``) honoured per directory
+- each level of a large tree scanned on a thread pool
+- listings cached per root and revalidated by directory mtimes; only directories
+  whose mtime changed are rescanned
+
+Sizes and mtimes are those seen when a file's directory was last scanned; editing
+a file in place does not change its directory's mtime.
+"""
+
+import glob
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from ast_grep_mcp.constants import FileDiscoveryDefaults
+
+from .logging import get_logger
+
+logger = get_logger("file_discovery")
+
+
+@dataclass(frozen=True)
+class DiscoveredFile:
+    """A file found under a project root.
+
+    Attributes:
+        path: Absolute path
+        rel_path: Path relative to the root, with "/" separators
+        size: Size in bytes
+        mtime: Modification time (epoch seconds)
+    """
+
+    path: str
+    rel_path: str
+    size: int
+    mtime: float
+
+
+# =============================================================================
+# Ignore files
+# =============================================================================
+
+
+@dataclass(frozen=True)
+class _IgnoreRule:
+    base: str  # directory of the ignore file, relative to the root ("" for the root)
+    regex: "re.Pattern[str]"
+    negate: bool
+    dir_only: bool
+
+
+def _translate_ignore_pattern(pattern: str) -> str:
+    """Translate one gitignore glob (already stripped of "!", leading and trailing "/") to a regex."""
+    out: List[str] = []
+    i, n = 0, len(pattern)
+    while i < n:
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("/**", i) and i + 3 == n:
+            out.append("/.*")
+            i += 3
+        elif pattern.startswith("**", i):
+            out.append(".*")
+            i += 2
+        elif pattern[i] == "*":
+            out.append("[^/]*")
+            i += 1
+        elif pattern[i] == "?":
+            out.append("[^/]")
+            i += 1
+        elif pattern[i] == "[" and "]" in pattern[i + 2 :]:
+            end = pattern.index("]", i + 2)
+            body = pattern[i + 1 : end]
+            out.append("[" + ("^" + body[1:] if body.startswith("!") else body) + "]")
+            i = end + 1
+        elif pattern[i] == "\\" and i + 1 < n:
+            out.append(re.escape(pattern[i + 1]))
+            i += 2
+        else:
+            out.append(re.escape(pattern[i]))
+            i += 1
+    return "".join(out)
+
+
+def _parse_ignore_line(line: str, base: str) -> Optional[_IgnoreRule]:
+    line = line.rstrip("\n").rstrip()
+    if not line or line.startswith("#"):
+        return None
+    negate = line.startswith("!")
+    if negate:
+        line = line[1:]
+    elif line.startswith("\\"):
+        line = line[1:]
+    dir_only = line.endswith("/")
+    line = line.rstrip("/")
+    if not line:
+        return None
+    anchored = "/" in line
+    body = _translate_ignore_pattern(line.lstrip("/"))
+    regex = re.compile(body if anchored else f"(?:.*/)?{body}")
+    return _IgnoreRule(base=base, regex=regex, negate=negate, dir_only=dir_only)
+
+
+def _read_ignore_file(path: str, base: str) -> List[_IgnoreRule]:
+    try:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            lines = f.readlines()
+    except OSError:
+        return []
+    return [rule for rule in (_parse_ignore_line(line, base) for line in lines) if rule is not None]
+
+
+def _is_ignored(rel_path: str, is_dir: bool, rules: Sequence[_IgnoreRule]) -> bool:
+    """Apply ignore rules in order; the last matching rule decides."""
+    ignored = False
+    for rule in rules:
+        if rule.dir_only and not is_dir:
+            continue
+        if rule.base:
+            if not rel_path.startswith(rule.base + "/"):
+                continue
+            sub = rel_path[len(rule.base) + 1 :]
+        else:
+            sub = rel_path
+        if rule.regex.fullmatch(sub):
+            ignored = not rule.negate
+    return ignored
+
+
+# =============================================================================
+# Glob helpers
+# =============================================================================
+
+
+@lru_cache(maxsize=256)
+def _compile_glob(pattern: str) -> "re.Pattern[str]":
+    return re.compile(glob.translate(pattern, recursive=True, include_hidden=True))
+
+
+def matches_any_glob(rel_path: str, patterns: Iterable[str]) -> bool:
+    """Check a root-relative path against glob patterns ("**" spans directories).
+
+    Args:
+        rel_path: Path relative to the root, with "/" separators
+        patterns: Glob patterns relative to the same root
+
+    Returns:
+        True if any pattern matches
+    """
+    return any(_compile_glob(pattern).match(rel_path) for pattern in patterns)
+
+
+# =============================================================================
+# Discovery service
+# =============================================================================
+
+
+@dataclass
+class _DirListing:
+    mtime_ns: int
+    scanned_ns: int
+    inherited: Tuple[_IgnoreRule, ...]
+    rules: Tuple[_IgnoreRule, ...]
+    ignore_mtimes: Dict[str, int]
+    files: List[DiscoveredFile] = field(default_factory=list)
+    subdirs: List[str] = field(default_factory=list)
+
+
+@dataclass
+class _RootListing:
+    dirs: Dict[str, _DirListing]
+    files: Optional[List[DiscoveredFile]] = None
+
+
+_RACY_WINDOW_NS = int(FileDiscoveryDefaults.RACY_MTIME_WINDOW_SECONDS * 1_000_000_000)
+
+
+def _abs_dir(root: str, rel_dir: str) -> str:
+    return os.path.join(root, rel_dir) if rel_dir else root
+
+
+def _stat_mtime_ns(path: str) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+class FileDiscovery:
+    """Lists project files once per root and keeps the listing up to date."""
+
+    def __init__(
+        self,
+        max_workers: int = FileDiscoveryDefaults.MAX_WORKERS,
+        parallel_threshold: int = FileDiscoveryDefaults.PARALLEL_THRESHOLD_DIRS,
+        max_cached_roots: int = FileDiscoveryDefaults.MAX_CACHED_ROOTS,
+    ) -> None:
+        """Initialize the service.
+
+        Args:
+            max_workers: Threads used to scan directories in parallel (1 disables the pool)
+            parallel_threshold: Directories in one tree level before the pool is used
+            max_cached_roots: Project roots kept in the listing cache (LRU)
+        """
+        self.max_workers = max_workers
+        self.parallel_threshold = parallel_threshold
+        self.max_cached_roots = max_cached_roots
+        self._cache: "OrderedDict[str, _RootListing]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._stats = {"full_scans": 0, "cache_hits": 0, "incremental_updates": 0, "dirs_scanned": 0}
+
+    def list_files(
+        self,
+        root: str,
+        extensions: Optional[Iterable[str]] = None,
+        include_hidden: bool = False,
+    ) -> List[DiscoveredFile]:
+        """List files under root, honouring ignore files.
+
+        Args:
+            root: Project root directory
+            extensions: Only return files ending with one of these suffixes
+            include_hidden: Include files with a hidden ("." prefixed) path component
+
+        Returns:
+            Files sorted by relative path
+        """
+        files = self._get_listing(os.path.abspath(root))
+        suffixes = tuple(extensions) if extensions is not None else None
+        return [
+            f
+            for f in files
+            if (suffixes is None or f.rel_path.endswith(suffixes))
+            and (include_hidden or not any(part.startswith(".") for part in f.rel_path.split("/")))
+        ]
+
+    def invalidate(self, root: Optional[str] = None) -> None:
+        """Drop the cached listing for root, or for every root when None."""
+        with self._lock:
+            if root is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(os.path.abspath(root), None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self._stats, "cached_roots": len(self._cache)}
+
+    def _get_listing(self, root: str) -> List[DiscoveredFile]:
+        with self._lock:
+            cached = self._cache.get(root)
+        listing = self._revalidate(root, cached) if cached is not None else None
+        if listing is None:
+            listing = _RootListing(dirs={})
+            self._walk(root, [("", self._root_rules(root))], listing.dirs)
+            self._count("full_scans")
+            logger.debug("file_discovery_scan", root=root, directories=len(listing.dirs))
+        if listing.files is None:
+            listing.files = sorted((f for d in listing.dirs.values() for f in d.files), key=lambda f: f.rel_path)
+        with self._lock:
+            self._cache[root] = listing
+            self._cache.move_to_end(root)
+            while len(self._cache) > self.max_cached_roots:
+                self._cache.popitem(last=False)
+        return listing.files
+
+    def _count(self, key: str, amount: int = 1) -> None:
+        with self._lock:
+            self._stats[key] += amount
+
+    def _root_rules(self, root: str) -> Tuple[_IgnoreRule, ...]:
+        return tuple(_read_ignore_file(os.path.join(root, ".git", "info", "exclude"), ""))
+
+    def _scan_dir(self, root: str, rel_dir: str, inherited: Tuple[_IgnoreRule, ...]) -> Optional[_DirListing]:
+        abs_dir = _abs_dir(root, rel_dir)
+        scanned_ns = time.time_ns()
+        try:
+            mtime_ns = os.stat(abs_dir).st_mtime_ns
+            with os.scandir(abs_dir) as it:
+                entries = list(it)
+        except OSError:
+            return None
+
+        own: List[_IgnoreRule] = []
+        ignore_mtimes: Dict[str, int] = {}
+        names = {entry.name: entry for entry in entries}
+        for name in FileDiscoveryDefaults.IGNORE_FILES:
+            entry = names.get(name)
+            if entry is not None and entry.is_file():
+                own.extend(_read_ignore_file(entry.path, rel_dir))
+                ignore_mtimes[entry.path] = entry.stat().st_mtime_ns
+        rules = inherited + tuple(own)
+
+        listing = _DirListing(mtime_ns=mtime_ns, scanned_ns=scanned_ns, inherited=inherited, rules=rules, ignore_mtimes=ignore_mtimes)
+        for entry in entries:
+            rel = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in FileDiscoveryDefaults.SKIP_DIRECTORIES and not _is_ignored(rel, True, rules):
+                        listing.subdirs.append(rel)
+                elif entry.is_file() and not _is_ignored(rel, False, rules):
+                    st = entry.stat()
+                    listing.files.append(DiscoveredFile(entry.path, rel, st.st_size, st.st_mtime))
+            except OSError:
+                continue
+        return listing
+
+    def _scan_level(self, root: str, frontier: List[Tuple[str, Tuple[_IgnoreRule, ...]]]) -> List[Optional[_DirListing]]:
+        if self.max_workers > 1 and len(frontier) >= self.parallel_threshold:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="file-discovery")
+            return list(self._pool.map(lambda item: self._scan_dir(root, *item), frontier))
+        return [self._scan_dir(root, rel_dir, inherited) for rel_dir, inherited in frontier]
+
+    def _walk(self, root: str, frontier: List[Tuple[str, Tuple[_IgnoreRule, ...]]], dirs: Dict[str, _DirListing]) -> None:
+        """Scan the frontier directories and everything below them, one tree level at a time."""
+        while frontier:
+            results = self._scan_level(root, frontier)
+            self._count("dirs_scanned", len(frontier))
+            next_frontier: List[Tuple[str, Tuple[_IgnoreRule, ...]]] = []
+            for (rel_dir, _), listing in zip(frontier, results, strict=True):
+                if listing is None:
+                    continue
+                dirs[rel_dir] = listing
+                next_frontier.extend((sub, listing.rules) for sub in listing.subdirs)
+            frontier = next_frontier
+
+    def _is_stale(self, root: str, rel_dir: str, listing: _DirListing) -> bool:
+        # Like git's "racy" check: a change in the same clock tick as the scan would not move the mtime
+        if listing.scanned_ns - listing.mtime_ns < _RACY_WINDOW_NS:
+            return True
+        if _stat_mtime_ns(_abs_dir(root, rel_dir)) != listing.mtime_ns:
+            return True
+        return any(_stat_mtime_ns(path) != mtime for path, mtime in listing.ignore_mtimes.items())
+
+    def _revalidate(self, root: str, cached: _RootListing) -> Optional[_RootListing]:
+        """Rescan directories whose mtime changed; None means a full rescan is needed."""
+        root_listing = cached.dirs.get("")
+        if root_listing is None or self._root_rules(root) != root_listing.inherited:
+            return None
+        stale = [rel_dir for rel_dir, listing in cached.dirs.items() if self._is_stale(root, rel_dir, listing)]
+        if not stale:
+            self._count("cache_hits")
+            return cached
+
+        dirs = dict(cached.dirs)
+        for rel_dir in sorted(stale, key=lambda d: d.count("/") if d else -1):
+            old = dirs.get(rel_dir)
+            if old is None:
+                continue  # already dropped with a removed parent
+            listing = self._scan_dir(root, rel_dir, old.inherited)
+            if listing is None:
+                _drop_subtree(dirs, rel_dir)
+                continue
+            if listing.rules != old.rules:
+                return None  # ignore rules changed; every directory below inherits them
+            dirs[rel_dir] = listing
+            for removed in set(old.subdirs) - set(listing.subdirs):
+                _drop_subtree(dirs, removed)
+            self._walk(root, [(sub, listing.rules) for sub in listing.subdirs if sub not in dirs], dirs)
+        self._count("incremental_updates")
+        logger.debug("file_discovery_incremental", root=root, stale_directories=len(stale))
+        return _RootListing(dirs=dirs)
+
+
+def _drop_subtree(dirs: Dict[str, _DirListing], rel_dir: str) -> None:
+    prefix = rel_dir + "/"
+    for key in [k for k in dirs if k == rel_dir or k.startswith(prefix)]:
+        del dirs[key]
+
+
+_file_discovery: Optional[FileDiscovery] = None
+_discovery_lock = threading.Lock()
+
+
+def get_file_discovery() -> FileDiscovery:
+    """Get the global file discovery service."""
+    global _file_discovery
+    if _file_discovery is None:
+        with _discovery_lock:
+            if _file_discovery is None:
+                _file_discovery = FileDiscovery()
+    return _file_discovery
+
+
+def discover_files(
+    root: str,
+    extensions: Optional[Iterable[str]] = None,
+    include_hidden: bool = False,
+) -> List[DiscoveredFile]:
+    """List files under root with the global discovery service.
+
+    Args:
+        root: Project root directory
+        extensions: Only return files ending with one of these suffixes
+        include_hidden: Include files with a hidden ("." prefixed) path component
+
+    Returns:
+        Files sorted by relative path
+    """
+    return get_file_discovery().list_files(root, extensions=extensions, include_hidden=include_hidden)
+
+
+def _in_git_repo(directory: str) -> bool:
+    current = os.path.abspath(directory)
+    while True:
+        if os.path.exists(os.path.join(current, ".git")):
+            return True
+        parent = os.path.dirname(current)
+        if parent == current:
+            return False
+        current = parent
+
+
+def _searched_entries(
+    root: str, rel_dir: str, inherited: Tuple[_IgnoreRule, ...], ignore_files: Tuple[str, ...], suffixes: Optional[Tuple[str, ...]]
+) -> Tuple[List[Tuple[str, Tuple[_IgnoreRule, ...]]], List[Tuple[str, os.stat_result]]]:
+    """Scan one directory the way ast-grep does, returning (subdirectories to walk, files)."""
+    try:
+        with os.scandir(_abs_dir(root, rel_dir)) as it:
+            entries = list(it)
+    except OSError:
+        return [], []
+    names = {entry.name: entry for entry in entries}
+    own = [rule for name in ignore_files if name in names for rule in _read_ignore_file(names[name].path, rel_dir)]
+    rules = inherited + tuple(own)
+    subdirs: List[Tuple[str, Tuple[_IgnoreRule, ...]]] = []
+    files: List[Tuple[str, os.stat_result]] = []
+    for entry in entries:
+        if entry.name.startswith("."):
+            continue
+        rel = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+        try:
+            if entry.is_dir(follow_symlinks=False):
+                if not _is_ignored(rel, True, rules):
+                    subdirs.append((rel, rules))
+            elif entry.is_file() and (suffixes is None or entry.name.endswith(suffixes)) and not _is_ignored(rel, False, rules):
+                files.append((entry.path, entry.stat()))
+        except OSError:
+            continue
+    return subdirs, files
+
+
+def iter_searched_files(root: str, extensions: Optional[Sequence[str]] = None) -> Iterator[Tuple[str, os.stat_result]]:
+    """Yield (absolute path, stat) for every file ast-grep searches under a directory.
+
+    Unlike the cached listing, files are stat'ed on every call and only
+    ast-grep's own filters apply: hidden entries are skipped, ``.ignore`` files
+    are honoured, and ``.gitignore`` and ``.git/info/exclude`` only inside a git
+    repository. Dependency and build directories are not skipped.
+
+    Args:
+        root: Directory to walk
+        extensions: Only yield files ending with one of these suffixes
+    """
+    in_git = _in_git_repo(root)
+    ignore_files = tuple(name for name in FileDiscoveryDefaults.IGNORE_FILES if in_git or name != ".gitignore")
+    suffixes = tuple(extensions) if extensions else None
+    root = os.path.abspath(root)
+    root_rules = tuple(_read_ignore_file(os.path.join(root, ".git", "info", "exclude"), "")) if in_git else ()
+    stack: List[Tuple[str, Tuple[_IgnoreRule, ...]]] = [("", root_rules)]
+    while stack:
+        rel_dir, inherited = stack.pop()
+        subdirs, files = _searched_entries(root, rel_dir, inherited, ignore_files, suffixes)
+        stack.extend(subdirs)
+        yield from files
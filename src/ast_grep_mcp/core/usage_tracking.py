@@ -8,15 +8,21 @@ This module provides comprehensive tracking for MCP tool executions including:
 - Performance metrics
 - Usage alerts and thresholds
 
-Storage: SQLite database for lightweight, file-based persistence.
+Storage: SQLite database for lightweight, file-based persistence. Entries are
+buffered and written in batches by a background thread (WAL mode), so tracked
+tool calls never wait on a commit. Hourly and daily rollups are updated with
+each batch and serve stats/alert queries; raw rows are pruned after a retention
+period.
 """
 
+import bisect
 import hashlib
 import json
 import os
 import sqlite3
 import threading
 import time
+import weakref
 from contextlib import contextmanager
 from dataclasses import dataclass, field
 from datetime import UTC, datetime, timedelta
@@ -27,7 +33,7 @@ from typing import Any, Callable, Dict, Generator, List, Optional, TypeVar, cast
 
 from pydantic import BaseModel, Field
 
-from ast_grep_mcp.constants import ConversionFactors, DisplayDefaults, FormattingDefaults, UsageTrackingDefaults
+from ast_grep_mcp.constants import ConversionFactors, DisplayDefaults, FormattingDefaults, PerformanceDefaults, UsageTrackingDefaults
 
 from .logging import get_logger
 
@@ -217,9 +223,13 @@ class UsageStats(BaseModel):
     average_cost: float = 0.0
     total_response_time_ms: int = 0
     average_response_time_ms: float = 0.0
+    p50_response_time_ms: float = 0.0
+    p95_response_time_ms: float = 0.0
     calls_by_tool: Dict[str, int] = Field(default_factory=dict)
     calls_by_operation: Dict[str, int] = Field(default_factory=dict)
     cost_by_tool: Dict[str, float] = Field(default_factory=dict)
+    failures_by_tool: Dict[str, int] = Field(default_factory=dict)
+    p95_response_time_by_tool: Dict[str, float] = Field(default_factory=dict)
 
 
 class UsageAlert(BaseModel):
@@ -301,60 +311,322 @@ def _row_to_log_entry(row: sqlite3.Row) -> UsageLogEntry:
     )
 
 
-_STATS_AGGREGATE_SQL = """
-    SELECT
-        COUNT(*) as total_calls,
-        SUM(CASE WHEN success = 1 THEN 1 ELSE 0 END) as successful_calls,
-        SUM(CASE WHEN success = 0 THEN 1 ELSE 0 END) as failed_calls,
-        SUM(estimated_cost) as total_cost,
-        AVG(estimated_cost) as avg_cost,
-        SUM(response_time_ms) as total_response_time,
-        AVG(response_time_ms) as avg_response_time
+_ROLLUP_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS usage_rollups (
+        granularity TEXT NOT NULL,
+        bucket TEXT NOT NULL,
+        tool_name TEXT NOT NULL,
+        operation_type TEXT NOT NULL,
+        calls INTEGER NOT NULL DEFAULT 0,
+        failures INTEGER NOT NULL DEFAULT 0,
+        total_cost REAL NOT NULL DEFAULT 0.0,
+        total_response_time_ms INTEGER NOT NULL DEFAULT 0,
+        max_response_time_ms INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (granularity, bucket, tool_name, operation_type)
+    );
+
+    CREATE TABLE IF NOT EXISTS usage_latency_histogram (
+        granularity TEXT NOT NULL,
+        bucket TEXT NOT NULL,
+        tool_name TEXT NOT NULL,
+        upper_ms INTEGER NOT NULL,
+        count INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (granularity, bucket, tool_name, upper_ms)
+    );
+
+    -- Oldest instant still held by each pruned source ('raw' or 'hour'), as an ISO timestamp
+    CREATE TABLE IF NOT EXISTS usage_retention (
+        source TEXT PRIMARY KEY,
+        retained_since TEXT NOT NULL
+    );
+"""
+
+_UPSERT_RETENTION_SQL = """
+    INSERT INTO usage_retention (source, retained_since) VALUES (?, ?)
+    ON CONFLICT (source) DO UPDATE SET retained_since = MAX(retained_since, excluded.retained_since)
+"""
+
+_UPSERT_ROLLUP_SQL = """
+    INSERT INTO usage_rollups (
+        granularity, bucket, tool_name, operation_type,
+        calls, failures, total_cost, total_response_time_ms, max_response_time_ms
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (granularity, bucket, tool_name, operation_type) DO UPDATE SET
+        calls = calls + excluded.calls,
+        failures = failures + excluded.failures,
+        total_cost = total_cost + excluded.total_cost,
+        total_response_time_ms = total_response_time_ms + excluded.total_response_time_ms,
+        max_response_time_ms = MAX(max_response_time_ms, excluded.max_response_time_ms)
+"""
+
+_UPSERT_HISTOGRAM_SQL = """
+    INSERT INTO usage_latency_histogram (granularity, bucket, tool_name, upper_ms, count)
+    VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT (granularity, bucket, tool_name, upper_ms) DO UPDATE SET count = count + excluded.count
+"""
+
+_RAW_TOTALS_SQL = """
+    SELECT tool_name, operation_type, COUNT(*) AS calls,
+        SUM(CASE WHEN success = 0 THEN 1 ELSE 0 END) AS failures,
+        SUM(estimated_cost) AS total_cost,
+        SUM(response_time_ms) AS total_response_time,
+        MAX(response_time_ms) AS max_response_time
     FROM usage_logs
-    WHERE timestamp >= ? AND timestamp <= ?
+    WHERE timestamp >= ? AND timestamp < ?
+    GROUP BY tool_name, operation_type
 """
 
+_RAW_LATENCIES_SQL = """
+    SELECT tool_name, response_time_ms, COUNT(*) AS count
+    FROM usage_logs
+    WHERE timestamp >= ? AND timestamp < ?
+    GROUP BY tool_name, response_time_ms
+"""
 
-def _parse_stats_row(row: sqlite3.Row, start_time: datetime, end_time: datetime) -> dict[str, Any]:
-    total_calls = row["total_calls"] or 0
-    successful_calls = row["successful_calls"] or 0
-    rate = (successful_calls / total_calls * ConversionFactors.PERCENT_MULTIPLIER) if total_calls > 0 else 0.0
-    return {
-        "period_start": start_time,
-        "period_end": end_time,
-        "total_calls": total_calls,
-        "successful_calls": successful_calls,
-        "failed_calls": row["failed_calls"] or 0,
-        "success_rate": rate,
-        "total_cost": row["total_cost"] or 0.0,
-        "average_cost": row["avg_cost"] or 0.0,
-        "total_response_time_ms": row["total_response_time"] or 0,
-        "average_response_time_ms": row["avg_response_time"] or 0.0,
-    }
+_ROLLUP_TOTALS_SQL = """
+    SELECT tool_name, operation_type, SUM(calls) AS calls,
+        SUM(failures) AS failures,
+        SUM(total_cost) AS total_cost,
+        SUM(total_response_time_ms) AS total_response_time,
+        MAX(max_response_time_ms) AS max_response_time
+    FROM usage_rollups
+    WHERE granularity = ? AND bucket >= ? AND bucket < ?
+    GROUP BY tool_name, operation_type
+"""
 
+_ROLLUP_LATENCIES_SQL = """
+    SELECT tool_name, upper_ms, SUM(count) AS count
+    FROM usage_latency_histogram
+    WHERE granularity = ? AND bucket >= ? AND bucket < ?
+    GROUP BY tool_name, upper_ms
+"""
 
-def _db_calls_by_tool(conn: sqlite3.Connection, start_iso: str, end_iso: str) -> Dict[str, int]:
-    rows = conn.execute(
-        "SELECT tool_name, COUNT(*) as count FROM usage_logs WHERE timestamp >= ? AND timestamp <= ? GROUP BY tool_name",
-        (start_iso, end_iso),
-    )
-    return {r["tool_name"]: r["count"] for r in rows}
+# Rollup granularity -> bucket key format (UTC); keys sort chronologically as text
+_ROLLUP_BUCKET_FORMATS: Dict[str, str] = {"hour": "%Y-%m-%dT%H", "day": "%Y-%m-%d"}
+_LATENCY_OVERFLOW_MS = 2**62
+
+
+def _as_utc(ts: datetime) -> datetime:
+    return ts.replace(tzinfo=UTC) if ts.tzinfo is None else ts.astimezone(UTC)
+
+
+def _latency_upper_bound(response_time_ms: int) -> int:
+    bounds = UsageTrackingDefaults.LATENCY_HISTOGRAM_BOUNDS_MS
+    idx = bisect.bisect_left(bounds, response_time_ms)
+    return bounds[idx] if idx < len(bounds) else _LATENCY_OVERFLOW_MS
+
+
+def _apply_rollups(conn: sqlite3.Connection, batch: List[tuple[Any, ...]]) -> None:
+    """Add a batch of usage_logs rows (insert parameter order) to the hourly and daily rollups."""
+    totals: Dict[tuple[str, str, str, str], List[Any]] = {}
+    histogram: Dict[tuple[str, str, str, int], int] = {}
+    for params in batch:
+        ts = _as_utc(datetime.fromisoformat(params[1]))
+        tool, operation, success, response_time, cost = params[2], params[3], params[4], params[6], params[7]
+        upper = _latency_upper_bound(response_time)
+        for granularity, fmt in _ROLLUP_BUCKET_FORMATS.items():
+            bucket = ts.strftime(fmt)
+            agg = totals.setdefault((granularity, bucket, tool, operation), [0, 0, 0.0, 0, 0])
+            agg[0] += 1
+            agg[1] += 0 if success else 1
+            agg[2] += cost
+            agg[3] += response_time
+            agg[4] = max(agg[4], response_time)
+            hist_key = (granularity, bucket, tool, upper)
+            histogram[hist_key] = histogram.get(hist_key, 0) + 1
+    conn.executemany(_UPSERT_ROLLUP_SQL, [(*key, *agg) for key, agg in totals.items()])
+    conn.executemany(_UPSERT_HISTOGRAM_SQL, [(*key, count) for key, count in histogram.items()])
+
+
+def _write_entries(conn: sqlite3.Connection, batch: List[tuple[Any, ...]]) -> None:
+    """Insert raw rows and update the rollups in one transaction."""
+    with conn:
+        conn.executemany(_INSERT_USAGE_SQL, batch)
+        _apply_rollups(conn, batch)
+
+
+def _backfill_rollups(conn: sqlite3.Connection) -> None:
+    """Build rollups from raw rows for databases created before rollups existed."""
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        if conn.execute("SELECT 1 FROM usage_rollups LIMIT 1").fetchone() is None:
+            cursor = conn.execute(
+                "SELECT id, timestamp, tool_name, operation_type, success, error_message, response_time_ms, estimated_cost FROM usage_logs"
+            )
+            while rows := cursor.fetchmany(UsageTrackingDefaults.ROLLUP_BACKFILL_CHUNK):
+                _apply_rollups(conn, [tuple(row) for row in rows])
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
 
 
-def _db_calls_by_operation(conn: sqlite3.Connection, start_iso: str, end_iso: str) -> Dict[str, int]:
-    rows = conn.execute(
-        "SELECT operation_type, COUNT(*) as count FROM usage_logs WHERE timestamp >= ? AND timestamp <= ? GROUP BY operation_type",
-        (start_iso, end_iso),
-    )
-    return {r["operation_type"]: r["count"] for r in rows}
+def _prune_usage(conn: sqlite3.Connection, raw_retention_days: int, hourly_retention_days: int) -> Dict[str, int]:
+    """Delete raw rows and hourly rollups past their retention; daily rollups are kept."""
+    now = datetime.now(UTC)
+    raw_since = now - timedelta(days=raw_retention_days)
+    hourly_since = _floor_bucket(now - timedelta(days=hourly_retention_days), "hour")
+    raw_cutoff = raw_since.isoformat()
+    hour_cutoff = hourly_since.strftime(_ROLLUP_BUCKET_FORMATS["hour"])
+    with conn:
+        raw = conn.execute("DELETE FROM usage_logs WHERE timestamp < ?", (raw_cutoff,)).rowcount
+        hourly = conn.execute("DELETE FROM usage_rollups WHERE granularity = 'hour' AND bucket < ?", (hour_cutoff,)).rowcount
+        conn.execute("DELETE FROM usage_latency_histogram WHERE granularity = 'hour' AND bucket < ?", (hour_cutoff,))
+        conn.executemany(_UPSERT_RETENTION_SQL, [("raw", raw_cutoff), ("hour", hourly_since.isoformat())])
+    logger.info("usage_pruned", raw_rows=raw, hourly_rollups=hourly)
+    return {"raw_rows": raw, "hourly_rollups": hourly}
+
+
+def _floor_bucket(ts: datetime, granularity: str) -> datetime:
+    floored = ts.replace(minute=0, second=0, microsecond=0)
+    return floored.replace(hour=0) if granularity == "day" else floored
 
 
-def _db_cost_by_tool(conn: sqlite3.Connection, start_iso: str, end_iso: str) -> Dict[str, float]:
-    rows = conn.execute(
-        "SELECT tool_name, SUM(estimated_cost) as total_cost FROM usage_logs WHERE timestamp >= ? AND timestamp <= ? GROUP BY tool_name",
-        (start_iso, end_iso),
+def _ceil_bucket(ts: datetime, granularity: str) -> datetime:
+    floored = _floor_bucket(ts, granularity)
+    if floored == ts:
+        return ts
+    return floored + (timedelta(days=1) if granularity == "day" else timedelta(hours=1))
+
+
+def _split_period(
+    start: datetime, end: datetime, raw_since: Optional[datetime] = None, hourly_since: Optional[datetime] = None
+) -> List[tuple[str, datetime, datetime]]:
+    """Cover [start, end) with whole days, then whole hours, then raw rows at the edges.
+
+    An edge that falls before ``raw_since`` (or ``hourly_since``) has lost its
+    raw rows (or hourly rollups) to pruning, so it is widened to the whole
+    hour (or day) around it and read from the coarser rollup instead.
+    """
+    if raw_since is not None:
+        if start < raw_since:
+            start = _floor_bucket(start, "hour")
+        if _floor_bucket(end, "hour") < raw_since:
+            end = _ceil_bucket(end, "hour")
+    if hourly_since is not None:
+        if _ceil_bucket(start, "hour") < hourly_since:
+            start = _floor_bucket(start, "day")
+        if _floor_bucket(end, "day") < hourly_since:
+            end = _ceil_bucket(end, "day")
+    first_hour, last_hour = _ceil_bucket(start, "hour"), _floor_bucket(end, "hour")
+    if first_hour >= last_hour:
+        return [("raw", start, end)] if start < end else []
+    segments = [("raw", start, first_hour), ("raw", last_hour, end)]
+    first_day, last_day = _ceil_bucket(first_hour, "day"), _floor_bucket(last_hour, "day")
+    if first_day < last_day:
+        segments += [("hour", first_hour, first_day), ("hour", last_day, last_hour), ("day", first_day, last_day)]
+    else:
+        segments.append(("hour", first_hour, last_hour))
+    return [segment for segment in segments if segment[1] < segment[2]]
+
+
+def _histogram_percentile(histogram: Dict[int, int], fraction: float, max_response_time: int) -> float:
+    """Percentile from bucketed latencies, reported as the bucket's upper bound (capped at the observed max)."""
+    total = sum(histogram.values())
+    if total == 0:
+        return 0.0
+    rank, cumulative = fraction * total, 0
+    for upper in sorted(histogram):
+        cumulative += histogram[upper]
+        if cumulative >= rank:
+            return float(min(upper, max_response_time))
+    return float(max_response_time)
+
+
+@dataclass
+class _PeriodTotals:
+    """Usage totals for a period, merged from rollups and raw edge rows."""
+
+    # (tool_name, operation_type) -> [calls, failures, total_cost, total_response_time, max_response_time]
+    by_key: Dict[tuple[str, str], List[Any]] = field(default_factory=dict)
+    # tool_name -> latency upper bound -> count
+    latencies: Dict[str, Dict[int, int]] = field(default_factory=dict)
+
+    def add_totals(self, row: sqlite3.Row) -> None:
+        agg = self.by_key.setdefault((row["tool_name"], row["operation_type"]), [0, 0, 0.0, 0, 0])
+        agg[0] += row["calls"] or 0
+        agg[1] += row["failures"] or 0
+        agg[2] += row["total_cost"] or 0.0
+        agg[3] += row["total_response_time"] or 0
+        agg[4] = max(agg[4], row["max_response_time"] or 0)
+
+    def add_latency(self, tool_name: str, upper_ms: int, count: int) -> None:
+        tool_hist = self.latencies.setdefault(tool_name, {})
+        tool_hist[upper_ms] = tool_hist.get(upper_ms, 0) + count
+
+    def total(self, index: int) -> Any:
+        return sum(agg[index] for agg in self.by_key.values())
+
+    def by_tool(self, index: int) -> Dict[str, Any]:
+        result: Dict[str, Any] = {}
+        for (tool, _), agg in self.by_key.items():
+            result[tool] = result.get(tool, 0) + agg[index]
+        return result
+
+    def max_response_time(self, tool_name: Optional[str] = None) -> int:
+        return max((agg[4] for (tool, _), agg in self.by_key.items() if tool_name in (None, tool)), default=0)
+
+    def percentile(self, fraction: float, tool_name: Optional[str] = None) -> float:
+        merged: Dict[int, int] = {}
+        for tool, tool_hist in self.latencies.items():
+            if tool_name in (None, tool):
+                for upper, count in tool_hist.items():
+                    merged[upper] = merged.get(upper, 0) + count
+        return _histogram_percentile(merged, fraction, self.max_response_time(tool_name))
+
+
+def _period_totals(conn: sqlite3.Connection, start: datetime, end: datetime) -> _PeriodTotals:
+    """Aggregate usage in [start, end] from daily/hourly rollups plus raw rows for partial hours."""
+    totals = _PeriodTotals()
+    retained = {
+        row["source"]: _as_utc(datetime.fromisoformat(row["retained_since"])) for row in conn.execute("SELECT * FROM usage_retention")
+    }
+    # end is inclusive; segments are half-open
+    segments = _split_period(_as_utc(start), _as_utc(end) + timedelta(microseconds=1), retained.get("raw"), retained.get("hour"))
+    for source, lo, hi in segments:
+        if source == "raw":
+            bounds: tuple[Any, ...] = (lo.isoformat(), hi.isoformat())
+            for row in conn.execute(_RAW_TOTALS_SQL, bounds):
+                totals.add_totals(row)
+            for row in conn.execute(_RAW_LATENCIES_SQL, bounds):
+                totals.add_latency(row["tool_name"], _latency_upper_bound(row["response_time_ms"]), row["count"])
+        else:
+            fmt = _ROLLUP_BUCKET_FORMATS[source]
+            bounds = (source, lo.strftime(fmt), hi.strftime(fmt))
+            for row in conn.execute(_ROLLUP_TOTALS_SQL, bounds):
+                totals.add_totals(row)
+            for row in conn.execute(_ROLLUP_LATENCIES_SQL, bounds):
+                totals.add_latency(row["tool_name"], row["upper_ms"], row["count"])
+    return totals
+
+
+def _stats_from_totals(totals: _PeriodTotals, start_time: datetime, end_time: datetime) -> UsageStats:
+    total_calls = totals.total(0)
+    failed_calls = totals.total(1)
+    total_cost = totals.total(2)
+    total_response_time = totals.total(3)
+    calls_by_operation: Dict[str, int] = {}
+    for (_, operation), agg in totals.by_key.items():
+        calls_by_operation[operation] = calls_by_operation.get(operation, 0) + agg[0]
+    return UsageStats(
+        period_start=start_time,
+        period_end=end_time,
+        total_calls=total_calls,
+        successful_calls=total_calls - failed_calls,
+        failed_calls=failed_calls,
+        success_rate=((total_calls - failed_calls) / total_calls * ConversionFactors.PERCENT_MULTIPLIER) if total_calls else 0.0,
+        total_cost=total_cost,
+        average_cost=total_cost / total_calls if total_calls else 0.0,
+        total_response_time_ms=total_response_time,
+        average_response_time_ms=total_response_time / total_calls if total_calls else 0.0,
+        p50_response_time_ms=totals.percentile(0.5),
+        p95_response_time_ms=totals.percentile(0.95),
+        calls_by_tool=totals.by_tool(0),
+        calls_by_operation=calls_by_operation,
+        cost_by_tool=totals.by_tool(2),
+        failures_by_tool=totals.by_tool(1),
+        p95_response_time_by_tool={tool: totals.percentile(0.95, tool) for tool in totals.by_tool(0)},
     )
-    return {r["tool_name"]: r["total_cost"] or 0.0 for r in rows}
 
 
 def _make_alert(level: str, metric: str, value: float, threshold: float, fmt: str = "") -> UsageAlert:
@@ -382,14 +654,116 @@ def _threshold_alert(
         alerts.append(_make_alert("warning", metric, value, warning, fmt))
 
 
+class _UsageWriter:
+    """Buffers usage rows and writes them in batches from a background thread.
+
+    A batch is written when the buffer reaches ``batch_size`` entries, when the
+    oldest entry has waited ``flush_interval`` seconds, or on ``flush()``/``close()``.
+    Each batch is a single ``executemany`` plus rollup upserts in one commit;
+    retention pruning runs at most every ``PRUNE_INTERVAL_SECONDS``.
+    """
+
+    def __init__(self, db_path: str, batch_size: int, flush_interval: float) -> None:
+        self.db_path = db_path
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self._buffer: List[tuple[Any, ...]] = []
+        self._cond = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+        self.batches_written = 0
+        self.entries_written = 0
+        self._last_prune = float("-inf")
+
+    def enqueue(self, params: tuple[Any, ...]) -> bool:
+        """Buffer a row; returns False once the writer is closed."""
+        with self._cond:
+            if self._closed:
+                return False
+            self._buffer.append(params)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="usage-writer", daemon=True)
+                self._thread.start()
+            if len(self._buffer) == 1 or len(self._buffer) >= self.batch_size:
+                self._cond.notify()
+        return True
+
+    def flush(self) -> None:
+        """Write all buffered rows from the calling thread."""
+        with self._cond:
+            batch, self._buffer = self._buffer, []
+        self._write(batch)
+
+    def close(self) -> None:
+        """Stop the background thread and write anything still buffered."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+            thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+        self.flush()
+        with self._write_lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                # Idle until an entry arrives, then give the batch flush_interval to fill
+                while not self._closed and not self._buffer:
+                    self._cond.wait()
+                deadline = time.monotonic() + self.flush_interval
+                while not self._closed and len(self._buffer) < self.batch_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch, self._buffer = self._buffer, []
+                closed = self._closed
+            self._write(batch)
+            if closed:
+                return
+
+    def _get_connection(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self._connection = sqlite3.connect(self.db_path, timeout=PerformanceDefaults.DATABASE_TIMEOUT_SECONDS, check_same_thread=False)
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+        return self._connection
+
+    def _write(self, batch: List[tuple[Any, ...]]) -> None:
+        if not batch:
+            return
+        with self._write_lock:
+            try:
+                conn = self._get_connection()
+                _write_entries(conn, batch)
+                self.batches_written += 1
+                self.entries_written += len(batch)
+                logger.debug("usage_batch_written", entries=len(batch))
+                if time.monotonic() - self._last_prune >= UsageTrackingDefaults.PRUNE_INTERVAL_SECONDS:
+                    self._last_prune = time.monotonic()
+                    _prune_usage(conn, UsageTrackingDefaults.RAW_RETENTION_DAYS, UsageTrackingDefaults.HOURLY_ROLLUP_RETENTION_DAYS)
+            except Exception as e:
+                logger.error(
+                    "usage_batch_write_failed",
+                    entries=len(batch),
+                    error=str(e)[: DisplayDefaults.ERROR_OUTPUT_PREVIEW_LENGTH],
+                )
+
+
 class UsageDatabase:
     """SQLite-based usage tracking database."""
 
-    def __init__(self, db_path: Optional[str] = None):
+    def __init__(self, db_path: Optional[str] = None, async_writes: bool = True):
         """Initialize the database.
 
         Args:
             db_path: Path to SQLite database. Defaults to ~/.ast-grep-mcp/usage.db
+            async_writes: Buffer entries and write them in batches from a background thread
         """
         if db_path is None:
             config_dir = Path.home() / ".ast-grep-mcp"
@@ -399,12 +773,23 @@ class UsageDatabase:
         self.db_path = db_path
         self._local = threading.local()
         self._init_schema()
+        self._writer: Optional[_UsageWriter] = None
+        self._close_writer: "Optional[weakref.finalize[[], UsageDatabase]]" = None
+        if async_writes:
+            self._writer = _UsageWriter(
+                db_path,
+                batch_size=UsageTrackingDefaults.WRITE_BATCH_SIZE,
+                flush_interval=UsageTrackingDefaults.WRITE_FLUSH_INTERVAL_SECONDS,
+            )
+            # Stops the writer thread when this instance is collected or the interpreter exits
+            self._close_writer = weakref.finalize(self, self._writer.close)
 
     def _get_connection(self) -> sqlite3.Connection:
         """Get thread-local database connection."""
         if not hasattr(self._local, "connection"):
             self._local.connection = sqlite3.connect(
                 self.db_path,
+                timeout=PerformanceDefaults.DATABASE_TIMEOUT_SECONDS,
                 check_same_thread=False,
             )
             self._local.connection.row_factory = sqlite3.Row
@@ -413,6 +798,7 @@ class UsageDatabase:
     def _init_schema(self) -> None:
         """Initialize database schema."""
         conn = self._get_connection()
+        conn.execute("PRAGMA journal_mode=WAL")
         conn.executescript("""
             CREATE TABLE IF NOT EXISTS usage_logs (
                 id TEXT PRIMARY KEY,
@@ -434,19 +820,23 @@ class UsageDatabase:
             CREATE INDEX IF NOT EXISTS idx_usage_operation ON usage_logs(operation_type);
             CREATE INDEX IF NOT EXISTS idx_usage_success ON usage_logs(success);
         """)
+        conn.executescript(_ROLLUP_SCHEMA)
         conn.commit()
+        _backfill_rollups(conn)
 
     def log_usage(self, entry: UsageLogEntry) -> None:
         """Log a usage entry to the database.
 
+        With async writes the entry is buffered and written by the background
+        writer; readers on this instance flush the buffer first.
+
         Args:
             entry: Usage log entry to persist
         """
         try:
-            conn = self._get_connection()
             params = _entry_to_params(entry)
-            conn.execute(_INSERT_USAGE_SQL, params)
-            conn.commit()
+            if self._writer is None or not self._writer.enqueue(params):
+                _write_entries(self._get_connection(), [params])
             logger.debug(
                 "usage_logged",
                 tool=entry.tool_name,
@@ -456,6 +846,19 @@ class UsageDatabase:
         except Exception as e:
             logger.error("usage_log_failed", error=str(e)[: DisplayDefaults.ERROR_OUTPUT_PREVIEW_LENGTH])
 
+    def flush(self) -> None:
+        """Write any buffered entries now."""
+        if self._writer is not None:
+            self._writer.flush()
+
+    def close(self) -> None:
+        """Flush buffered entries and stop the background writer.
+
+        Later ``log_usage`` calls are written synchronously.
+        """
+        if self._close_writer is not None:
+            self._close_writer()
+
     def get_stats(
         self,
         start_time: Optional[datetime] = None,
@@ -463,6 +866,11 @@ class UsageDatabase:
     ) -> UsageStats:
         """Get aggregated usage statistics.
 
+        Whole days and hours are read from the rollup tables; only the partial
+        hours at either end of the period touch raw rows. Edges older than the
+        retained raw rows or hourly rollups are widened to the whole hour or
+        day and read from the rollup that still covers them.
+
         Args:
             start_time: Start of period (default: 7 days ago)
             end_time: End of period (default: now)
@@ -475,17 +883,9 @@ class UsageDatabase:
         if end_time is None:
             end_time = datetime.now(UTC)
 
-        conn = self._get_connection()
-        start_iso, end_iso = start_time.isoformat(), end_time.isoformat()
-
-        row = conn.execute(_STATS_AGGREGATE_SQL, (start_iso, end_iso)).fetchone()
-        fields = _parse_stats_row(row, start_time, end_time)
-        return UsageStats(
-            **fields,
-            calls_by_tool=_db_calls_by_tool(conn, start_iso, end_iso),
-            calls_by_operation=_db_calls_by_operation(conn, start_iso, end_iso),
-            cost_by_tool=_db_cost_by_tool(conn, start_iso, end_iso),
-        )
+        self.flush()
+        totals = _period_totals(self._get_connection(), start_time, end_time)
+        return _stats_from_totals(totals, start_time, end_time)
 
     def get_alerts(
         self,
@@ -506,27 +906,18 @@ class UsageDatabase:
         now = datetime.now(UTC)
         today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
         hour_ago = now - timedelta(hours=1)
+        self.flush()
         conn = self._get_connection()
+        daily = _period_totals(conn, today_start, now)
+        hourly = _period_totals(conn, hour_ago, now)
 
-        daily_calls = conn.execute(
-            "SELECT COUNT(*) FROM usage_logs WHERE timestamp >= ?",
-            (today_start.isoformat(),),
-        ).fetchone()[0]
+        daily_calls = daily.total(0)
         _threshold_alert(alerts, "daily_calls", daily_calls, thresholds.daily_calls_warning, thresholds.daily_calls_critical)
 
-        daily_cost = (
-            conn.execute(
-                "SELECT SUM(estimated_cost) FROM usage_logs WHERE timestamp >= ?",
-                (today_start.isoformat(),),
-            ).fetchone()[0]
-            or 0.0
-        )
+        daily_cost = daily.total(2)
         _threshold_alert(alerts, "daily_cost", daily_cost, thresholds.daily_cost_warning, thresholds.daily_cost_critical, ".4f")
 
-        hourly_failures = conn.execute(
-            "SELECT COUNT(*) FROM usage_logs WHERE timestamp >= ? AND success = 0",
-            (hour_ago.isoformat(),),
-        ).fetchone()[0]
+        hourly_failures = hourly.total(1)
         _threshold_alert(
             alerts,
             "hourly_failures",
@@ -535,16 +926,34 @@ class UsageDatabase:
             thresholds.hourly_failures_critical,
         )
 
-        hourly_total = conn.execute(
-            "SELECT COUNT(*) FROM usage_logs WHERE timestamp >= ?",
-            (hour_ago.isoformat(),),
-        ).fetchone()[0]
+        hourly_total = hourly.total(0)
         if hourly_total > 0:
             failure_rate = hourly_failures / hourly_total
             _threshold_alert(alerts, "failure_rate", failure_rate, thresholds.failure_rate_warning, thresholds.failure_rate_critical, ".1%")
 
         return alerts
 
+    def prune(
+        self,
+        raw_retention_days: int = UsageTrackingDefaults.RAW_RETENTION_DAYS,
+        hourly_retention_days: int = UsageTrackingDefaults.HOURLY_ROLLUP_RETENTION_DAYS,
+    ) -> Dict[str, int]:
+        """Apply the retention policy.
+
+        Raw rows older than ``raw_retention_days`` and hourly rollups older than
+        ``hourly_retention_days`` are deleted; daily rollups are kept, so stats
+        for older periods remain available at day resolution.
+
+        Args:
+            raw_retention_days: Days of raw usage_logs rows to keep
+            hourly_retention_days: Days of hourly rollups to keep
+
+        Returns:
+            Number of deleted raw rows and hourly rollup rows
+        """
+        self.flush()
+        return _prune_usage(self._get_connection(), raw_retention_days, hourly_retention_days)
+
     def get_recent_logs(
         self,
         limit: int = UsageTrackingDefaults.DEFAULT_PAGINATION_LIMIT,
@@ -561,6 +970,7 @@ class UsageDatabase:
         Returns:
             List of recent usage log entries
         """
+        self.flush()
         conn = self._get_connection()
 
         query = "SELECT * FROM usage_logs WHERE 1=1"
@@ -855,6 +1265,7 @@ def _format_report_header(stats: UsageStats) -> List[str]:
         f"Total Cost:       {stats.total_cost:.6f} units",
         f"Average Cost:     {stats.average_cost:.6f} units",
         f"Avg Response:     {stats.average_response_time_ms:.0f}ms",
+        f"P95 Response:     {stats.p95_response_time_ms:.0f}ms",
         "",
     ]
 
@@ -12,7 +12,9 @@ This module provides comprehensive code complexity analysis including:
 
 from .analyzer import (
     analyze_file_complexity,
+    analyze_files_complexity,
     extract_functions_from_file,
+    extract_functions_from_files,
 )
 from .metrics import (
     COMPLEXITY_PATTERNS,
@@ -35,7 +37,9 @@ __all__ = [
     "get_complexity_patterns",
     # Analyzer
     "analyze_file_complexity",
+    "analyze_files_complexity",
     "extract_functions_from_file",
+    "extract_functions_from_files",
     # Storage
     "ComplexityStorage",
     # Tools
@@ -6,11 +6,14 @@ extracting functions, and calculating complexity metrics for each function.
 """
 
 import json
+import os
 import re
 import subprocess
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
-from ast_grep_mcp.constants import SubprocessDefaults
+from ast_grep_mcp.constants import ComplexityDefaults, SubprocessDefaults
+from ast_grep_mcp.core.exceptions import AstGrepExecutionError, AstGrepNotFoundError
+from ast_grep_mcp.core.executor import run_ast_grep_batch
 from ast_grep_mcp.core.logging import get_logger
 from ast_grep_mcp.models.complexity import (
     ComplexityMetrics,
@@ -28,7 +31,10 @@ from .metrics import (
 
 __all__ = [
     "extract_functions_from_file",
+    "extract_functions_from_files",
+    "extract_definitions_from_file",
     "analyze_file_complexity",
+    "analyze_files_complexity",
     "calculate_nesting_depth",
 ]
 
@@ -36,6 +42,45 @@ __all__ = [
 _FUNCTION_PATTERN_KEYS = ("function", "async_function", "arrow_function", "method")
 
 
+def _named_kind_rule(rule_id: str, language: str, kind: str) -> Dict[str, Any]:
+    """Rule matching a node kind and capturing its ``name`` field as $NAME."""
+    return {"id": rule_id, "language": language, "rule": {"kind": kind, "has": {"field": "name", "pattern": "$NAME"}}}
+
+
+def _js_function_rules(language: str) -> List[Dict[str, Any]]:
+    # The "method" pattern ``$NAME($$$) { $$$ }`` never matches under `ast-grep run`
+    # (it parses as a call followed by a block), so per-file extraction only finds
+    # functions and arrow functions. method_definition covers class and object
+    # methods, getters, setters, static and async methods, so single-pass
+    # analysis reports those as functions as well.
+    return [
+        _named_kind_rule(f"{language}-function", language, "function_declaration"),
+        {"id": f"{language}-arrow-function", "language": language, "rule": {"pattern": "const $NAME = ($$$) => { $$$ }"}},
+        _named_kind_rule(f"{language}-method", language, "method_definition"),
+    ]
+
+
+# Kind-based equivalents of the function patterns, combined into one scan per chunk
+# of files. Scan rules must parse as complete nodes, so `def $NAME($$$)` style
+# fragments accepted by `ast-grep run` are expressed by node kind instead.
+_FUNCTION_SCAN_RULES: Dict[str, List[Dict[str, Any]]] = {
+    "python": [_named_kind_rule("python-function", "python", "function_definition")],
+    "typescript": _js_function_rules("typescript"),
+    "javascript": _js_function_rules("javascript"),
+    "java": [_named_kind_rule("java-method", "java", "method_declaration")],
+}
+
+_CLASS_SCAN_RULES: Dict[str, Dict[str, Any]] = {
+    "python": _named_kind_rule("python-class", "python", "class_definition"),
+    "typescript": _named_kind_rule("typescript-class", "typescript", "class_declaration"),
+    "javascript": _named_kind_rule("javascript-class", "javascript", "class_declaration"),
+    "java": _named_kind_rule("java-class", "java", "class_declaration"),
+}
+
+# `--lang typescript` parses .tsx files too; scan needs the mapping spelled out
+_FUNCTION_SCAN_LANGUAGE_GLOBS: Dict[str, Dict[str, List[str]]] = {"typescript": {"typescript": ["*.tsx"]}}
+
+
 def _run_pattern_search(file_path: str, language: str, pattern: str) -> List[Dict[str, Any]]:
     """Run ast-grep for one pattern against a file and return matches."""
     try:
@@ -73,6 +118,88 @@ def extract_functions_from_file(file_path: str, language: str) -> List[Dict[str,
     return all_functions
 
 
+def supports_single_pass_extraction(language: str) -> bool:
+    """Whether extract_functions_from_files has scan rules for a language."""
+    return language.lower() in _FUNCTION_SCAN_RULES
+
+
+def _scan_function_chunk(files: List[str], language: str) -> List[Dict[str, Any]]:
+    """Run one ast-grep scan with every function rule over a chunk of files."""
+    rules = _FUNCTION_SCAN_RULES[language]
+    by_rule = run_ast_grep_batch(rules, files, language_globs=_FUNCTION_SCAN_LANGUAGE_GLOBS.get(language))
+    return [match for rule in rules for match in by_rule[rule["id"]]]
+
+
+def extract_functions_from_files(
+    files: List[str], language: str, chunk_size: int = ComplexityDefaults.SCAN_CHUNK_FILES
+) -> Dict[str, List[Dict[str, Any]]]:
+    """Extract functions from many files with one ast-grep scan per chunk.
+
+    All function kinds are matched in a single pass, so the cost scales with
+    the bytes scanned rather than files x patterns.
+
+    Args:
+        files: Paths of source files
+        language: Programming language (must satisfy supports_single_pass_extraction)
+        chunk_size: Maximum files passed to a single scan
+
+    Returns:
+        Mapping of each input file path to its function matches
+
+    Raises:
+        ValueError: If the language has no single-pass rules
+        AstGrepNotFoundError: If ast-grep binary not found
+        AstGrepExecutionError: If ast-grep execution fails
+    """
+    lang = language.lower()
+    if lang not in _FUNCTION_SCAN_RULES:
+        raise ValueError(f"Single-pass extraction is not supported for {language}")
+
+    grouped: Dict[str, List[Dict[str, Any]]] = {f: [] for f in files}
+    # ast-grep reports paths as given; normalize so both spellings land in the same bucket
+    canonical = {os.path.normpath(f): f for f in files}
+    for start in range(0, len(files), chunk_size):
+        for match in _scan_function_chunk(files[start : start + chunk_size], lang):
+            key = canonical.get(os.path.normpath(match.get("file", "")))
+            if key is not None:
+                grouped[key].append(match)
+    return grouped
+
+
+def extract_definitions_from_file(
+    file_path: str, language: str, functions: bool = True, classes: bool = True
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Extract functions and classes from a file with one ast-grep scan.
+
+    Args:
+        file_path: Path to source file
+        language: Programming language (must satisfy supports_single_pass_extraction)
+        functions: Whether to match functions
+        classes: Whether to match classes
+
+    Returns:
+        Tuple of (function matches, class matches); a kind not requested is empty
+
+    Raises:
+        ValueError: If the language has no single-pass rules
+        AstGrepNotFoundError: If ast-grep binary not found
+        AstGrepExecutionError: If ast-grep execution fails
+    """
+    lang = language.lower()
+    if lang not in _FUNCTION_SCAN_RULES:
+        raise ValueError(f"Single-pass extraction is not supported for {language}")
+
+    function_rules = _FUNCTION_SCAN_RULES[lang] if functions else []
+    class_rules = [_CLASS_SCAN_RULES[lang]] if classes else []
+    if not function_rules and not class_rules:
+        return [], []
+    by_rule = run_ast_grep_batch(function_rules + class_rules, [file_path], language_globs=_FUNCTION_SCAN_LANGUAGE_GLOBS.get(lang))
+    return (
+        [match for rule in function_rules for match in by_rule[rule["id"]]],
+        [match for rule in class_rules for match in by_rule[rule["id"]]],
+    )
+
+
 def _extract_classes_from_file(file_path: str, language: str) -> List[Dict[str, Any]]:
     """Extract all classes from a file using ast-grep.
 
@@ -444,6 +571,48 @@ def _build_function_complexity(
     )
 
 
+def _build_file_results(
+    file_path: str, functions: List[Dict[str, Any]], language: str, thresholds: ComplexityThresholds
+) -> List[FunctionComplexity]:
+    results: List[FunctionComplexity] = []
+    for func in functions:
+        fc = _build_function_complexity(func, file_path, language, thresholds)
+        if fc is not None:
+            results.append(fc)
+    return results
+
+
+def analyze_files_complexity(files: List[str], language: str, thresholds: ComplexityThresholds) -> Optional[List[FunctionComplexity]]:
+    """Analyze complexity of all functions in many files using single-pass extraction.
+
+    Args:
+        files: Paths of source files
+        language: Programming language
+        thresholds: Complexity thresholds
+
+    Returns:
+        List of FunctionComplexity objects, or None when single-pass extraction
+        is unavailable or failed and callers should fall back to per-file analysis
+    """
+    lang = language.lower()
+    if not supports_single_pass_extraction(lang):
+        return None
+    logger = get_logger("complexity.analyze")
+    try:
+        grouped = extract_functions_from_files(files, lang)
+    except (AstGrepExecutionError, AstGrepNotFoundError) as e:
+        logger.warning("single_pass_extraction_failed", file_count=len(files), error=str(e))
+        return None
+
+    results: List[FunctionComplexity] = []
+    for file_path, functions in grouped.items():
+        try:
+            results.extend(_build_file_results(file_path, functions, lang, thresholds))
+        except Exception as e:
+            logger.error("analyze_file_failed", file=file_path, error=str(e))
+    return results
+
+
 def analyze_file_complexity(file_path: str, language: str, thresholds: ComplexityThresholds) -> List[FunctionComplexity]:
     """Analyze complexity of all functions in a file.
 
@@ -455,14 +624,10 @@ def analyze_file_complexity(file_path: str, language: str, thresholds: Complexit
     Returns:
         List of FunctionComplexity objects
     """
-    results: List[FunctionComplexity] = []
     try:
         functions = extract_functions_from_file(file_path, language)
-        for func in functions:
-            fc = _build_function_complexity(func, file_path, language, thresholds)
-            if fc is not None:
-                results.append(fc)
+        return _build_file_results(file_path, functions, language, thresholds)
     except Exception as e:
         logger = get_logger("complexity.analyze")
         logger.error("analyze_file_failed", file=file_path, error=str(e))
-    return results
+    return []
@@ -0,0 +1,511 @@
+"""
+Syntax-tree based complexity metrics.
+
+This module computes cyclomatic complexity, cognitive complexity, nesting depth
+and parameter count from one parsed syntax tree per file instead of substring
+counting and per-pattern ast-grep processes:
+- Python files are parsed with the stdlib ``ast`` module
+- Other languages use one ast-grep scan per chunk of files whose matches
+  (functions and decision points) are nested by byte range
+
+Parse time is measured per file for Python; for ast-grep languages the scan
+time of each chunk is reported, since parsing happens inside ast-grep.
+"""
+
+import ast
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from ast_grep_mcp.constants import ComplexityDefaults, FormattingDefaults
+from ast_grep_mcp.core.executor import run_ast_grep_batch
+from ast_grep_mcp.core.logging import get_logger
+from ast_grep_mcp.models.complexity import ComplexityMetrics, ComplexityThresholds, FunctionComplexity
+
+from .analyzer import (
+    _FUNCTION_SCAN_LANGUAGE_GLOBS,
+    _FUNCTION_SCAN_RULES,
+    _check_threshold_violations,
+    _count_function_parameters,
+)
+
+__all__ = [
+    "AstMetricsResult",
+    "analyze_files_ast",
+    "analyze_python_source",
+]
+
+METRICS_ENGINES = ("pattern", "ast")
+
+_FunctionNode = Union[ast.FunctionDef, ast.AsyncFunctionDef]
+
+
+@dataclass
+class AstMetricsResult:
+    """Functions analyzed by the syntax-tree engine plus parse timings.
+
+    Attributes:
+        functions: Complexity results for every function found
+        parse_seconds: Per-file parse time (Python only)
+        scan_seconds: Per-chunk ast-grep scan time (non-Python languages)
+        parse_errors: Files that could not be read or parsed
+    """
+
+    functions: List[FunctionComplexity] = field(default_factory=list)
+    parse_seconds: Dict[str, float] = field(default_factory=dict)
+    scan_seconds: List[float] = field(default_factory=list)
+    parse_errors: List[str] = field(default_factory=list)
+
+    def summary(self) -> Dict[str, Any]:
+        """Summarize parse timings for the tool response."""
+        precision = FormattingDefaults.ROUNDING_PRECISION
+        slowest = sorted(self.parse_seconds.items(), key=lambda item: item[1], reverse=True)
+        return {
+            "engine": "ast",
+            "files_parsed": len(self.parse_seconds),
+            "parse_errors": len(self.parse_errors),
+            "total_parse_seconds": round(sum(self.parse_seconds.values()), precision),
+            "max_parse_seconds": round(slowest[0][1], precision) if slowest else 0.0,
+            "slowest_files": [
+                {"file": path, "parse_seconds": round(seconds, precision)}
+                for path, seconds in slowest[: ComplexityDefaults.SLOWEST_FILES_REPORTED]
+            ],
+            "scan_chunks": len(self.scan_seconds),
+            "total_scan_seconds": round(sum(self.scan_seconds), precision),
+        }
+
+
+# =============================================================================
+# PYTHON (stdlib ast)
+# =============================================================================
+
+
+class _PythonFunctionMetrics(ast.NodeVisitor):
+    """Walks one function body; nested functions and classes are left to their own pass."""
+
+    def __init__(self, source_lines: List[str]) -> None:
+        self.source_lines = source_lines
+        self.cyclomatic = 1
+        self.cognitive = 0
+        self.max_depth = 0
+        self._nesting = 0  # Cognitive nesting level
+        self._depth = 1  # Block depth; the function body is depth 1
+
+    def run(self, node: _FunctionNode) -> None:
+        if node.body:
+            self.max_depth = 1
+        for stmt in node.body:
+            self.visit(stmt)
+
+    def _visit_indented(self, statements: List[ast.stmt]) -> None:
+        """Visit a block that is indented one level but adds no cognitive nesting."""
+        self._depth += 1
+        if statements:
+            self.max_depth = max(self.max_depth, self._depth)
+        for stmt in statements:
+            self.visit(stmt)
+        self._depth -= 1
+
+    def _visit_block(self, statements: List[ast.stmt]) -> None:
+        """Visit the body of a control-flow structure one nesting level deeper."""
+        self._nesting += 1
+        self._visit_indented(statements)
+        self._nesting -= 1
+
+    def _is_elif(self, node: ast.If) -> bool:
+        line = self.source_lines[node.lineno - 1] if node.lineno <= len(self.source_lines) else ""
+        return line[node.col_offset :].startswith("elif")
+
+    def _increment(self) -> None:
+        self.cognitive += 1 + self._nesting
+
+    # Nested scopes are reported as separate functions
+    def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
+        return
+
+    def visit_AsyncFunctionDef(self, node: ast.AsyncFunctionDef) -> None:
+        return
+
+    def visit_ClassDef(self, node: ast.ClassDef) -> None:
+        return
+
+    def visit_If(self, node: ast.If, is_elif: bool = False) -> None:
+        self.cyclomatic += 1
+        if is_elif:
+            self.cognitive += 1
+        else:
+            self._increment()
+        self.visit(node.test)
+        self._visit_block(node.body)
+        if len(node.orelse) == 1 and isinstance(node.orelse[0], ast.If) and self._is_elif(node.orelse[0]):
+            self.visit_If(node.orelse[0], is_elif=True)
+        else:
+            self._visit_block(node.orelse)
+
+    def _visit_loop(self, node: Union[ast.For, ast.AsyncFor, ast.While]) -> None:
+        self.cyclomatic += 1
+        self._increment()
+        if isinstance(node, ast.While):
+            self.visit(node.test)
+        else:
+            self.visit(node.iter)
+        self._visit_block(node.body)
+        self._visit_block(node.orelse)
+
+    def visit_For(self, node: ast.For) -> None:
+        self._visit_loop(node)
+
+    def visit_AsyncFor(self, node: ast.AsyncFor) -> None:
+        self._visit_loop(node)
+
+    def visit_While(self, node: ast.While) -> None:
+        self._visit_loop(node)
+
+    def _visit_with(self, node: Union[ast.With, ast.AsyncWith]) -> None:
+        for item in node.items:
+            self.visit(item.context_expr)
+        # Context managers indent their body but are not a decision point
+        self._visit_indented(node.body)
+
+    def visit_With(self, node: ast.With) -> None:
+        self._visit_with(node)
+
+    def visit_AsyncWith(self, node: ast.AsyncWith) -> None:
+        self._visit_with(node)
+
+    def _visit_try(self, node: Union[ast.Try, ast.TryStar]) -> None:
+        self._visit_indented(node.body)
+        for handler in node.handlers:
+            self.cyclomatic += 1
+            self._increment()
+            self._visit_block(handler.body)
+        self._visit_indented(node.orelse)
+        self._visit_indented(node.finalbody)
+
+    def visit_Try(self, node: ast.Try) -> None:
+        self._visit_try(node)
+
+    def visit_TryStar(self, node: ast.TryStar) -> None:
+        self._visit_try(node)
+
+    def visit_Match(self, node: ast.Match) -> None:
+        self._increment()
+        self.visit(node.subject)
+        # Case bodies sit two indentation levels below the match statement
+        self._depth += 1
+        for case in node.cases:
+            self.cyclomatic += 1
+            self._visit_block(case.body)
+        self._depth -= 1
+
+    def visit_IfExp(self, node: ast.IfExp) -> None:
+        self.cyclomatic += 1
+        self._increment()
+        self.generic_visit(node)
+
+    def visit_BoolOp(self, node: ast.BoolOp, parent_op: Optional[ast.boolop] = None) -> None:
+        self.cyclomatic += len(node.values) - 1
+        if type(node.op) is not type(parent_op):
+            self.cognitive += 1
+        for value in node.values:
+            if isinstance(value, ast.BoolOp):
+                self.visit_BoolOp(value, parent_op=node.op)
+            else:
+                self.visit(value)
+
+    def visit_comprehension(self, node: ast.comprehension) -> None:
+        self.cyclomatic += 1 + len(node.ifs)
+        self.generic_visit(node)
+
+    def visit_Lambda(self, node: ast.Lambda) -> None:
+        self._nesting += 1
+        self.generic_visit(node)
+        self._nesting -= 1
+
+
+def _python_docstring_lines(node: _FunctionNode) -> int:
+    first = node.body[0] if node.body else None
+    if isinstance(first, ast.Expr) and isinstance(first.value, ast.Constant) and isinstance(first.value.value, str):
+        return (first.end_lineno or first.lineno) - first.lineno + 1
+    return 0
+
+
+def _python_parameter_count(node: _FunctionNode) -> int:
+    args = node.args
+    names = [a.arg for a in (*args.posonlyargs, *args.args, *args.kwonlyargs)]
+    names += [a.arg for a in (args.vararg, args.kwarg) if a is not None]
+    return len([n for n in names if n not in ("self", "cls")])
+
+
+def _python_function_metrics(node: _FunctionNode, source_lines: List[str]) -> ComplexityMetrics:
+    visitor = _PythonFunctionMetrics(source_lines)
+    visitor.run(node)
+    lines = (node.end_lineno or node.lineno) - node.lineno + 1 - _python_docstring_lines(node)
+    return ComplexityMetrics(
+        cyclomatic=visitor.cyclomatic,
+        cognitive=visitor.cognitive,
+        nesting_depth=visitor.max_depth,
+        lines=lines,
+        parameter_count=_python_parameter_count(node),
+    )
+
+
+def analyze_python_source(source: str, file_path: str, thresholds: ComplexityThresholds) -> List[FunctionComplexity]:
+    """Compute metrics for every function in a Python module from one parse.
+
+    Args:
+        source: Module source code
+        file_path: Path reported on each result
+        thresholds: Complexity thresholds
+
+    Returns:
+        List of FunctionComplexity objects (nested functions included)
+
+    Raises:
+        SyntaxError: If the source cannot be parsed
+    """
+    return _analyze_python_tree(ast.parse(source, filename=file_path), source, file_path, thresholds)
+
+
+def _analyze_python_tree(tree: ast.Module, source: str, file_path: str, thresholds: ComplexityThresholds) -> List[FunctionComplexity]:
+    source_lines = source.splitlines()
+    results: List[FunctionComplexity] = []
+    for node in ast.walk(tree):
+        if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            continue
+        metrics = _python_function_metrics(node, source_lines)
+        results.append(
+            FunctionComplexity(
+                file_path=file_path,
+                function_name=node.name,
+                start_line=node.lineno,
+                end_line=node.end_lineno or node.lineno,
+                metrics=metrics,
+                language="python",
+                exceeds=_check_threshold_violations(metrics, thresholds),
+            )
+        )
+    return results
+
+
+def _analyze_python_files(files: List[str], thresholds: ComplexityThresholds, result: AstMetricsResult) -> None:
+    logger = get_logger("complexity.ast_metrics")
+    for file_path in files:
+        try:
+            with open(file_path, "r", encoding="utf-8") as f:
+                source = f.read()
+            started = time.perf_counter()
+            tree = ast.parse(source, filename=file_path)
+            result.parse_seconds[file_path] = time.perf_counter() - started
+            result.functions.extend(_analyze_python_tree(tree, source, file_path, thresholds))
+        except (OSError, UnicodeDecodeError, SyntaxError, ValueError) as e:
+            logger.warning("ast_parse_failed", file=file_path, error=str(e))
+            result.parse_errors.append(file_path)
+
+
+# =============================================================================
+# OTHER LANGUAGES (ast-grep scan)
+# =============================================================================
+
+# Decision-point categories:
+#   nest     +1 cyclomatic, +1 + nesting cognitive, deepens nesting for descendants
+#   else_if  +1 cyclomatic, +1 cognitive
+#   ternary  +1 cyclomatic, +1 + nesting cognitive
+#   case     +1 cyclomatic
+#   and/or/nullish  +1 cyclomatic per operator, +1 cognitive per operator sequence
+#   switch   +1 + nesting cognitive, deepens nesting (cases carry the cyclomatic count)
+_C_STYLE_NEST_KINDS = ["for_statement", "while_statement", "do_statement", "catch_clause"]
+
+
+def _decision_rules(
+    language: str, else_if_parent: Dict[str, Any], nest_kinds: List[str], switch_kind: str, case_rule: Dict[str, Any]
+) -> List[Dict[str, Any]]:
+    def rule(category: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        return {"id": f"{language}-{category}", "language": language, "rule": body}
+
+    def operator(symbol: str) -> Dict[str, Any]:
+        return {"kind": "binary_expression", "has": {"field": "operator", "regex": f"^{symbol}$"}}
+
+    rules = [
+        rule("if", {"kind": "if_statement", "not": {"inside": else_if_parent}}),
+        rule("else_if", {"kind": "if_statement", "inside": else_if_parent}),
+        rule("nest", {"any": [{"kind": kind} for kind in nest_kinds]}),
+        rule("switch", {"kind": switch_kind}),
+        rule("ternary", {"kind": "ternary_expression"}),
+        rule("case", case_rule),
+        rule("and", operator("&&")),
+        rule("or", operator(r"\|\|")),
+    ]
+    if language != "java":
+        rules.append(rule("nullish", operator(r"\?\?")))
+    return rules
+
+
+def _js_decision_rules(language: str) -> List[Dict[str, Any]]:
+    return _decision_rules(
+        language, {"kind": "else_clause"}, [*_C_STYLE_NEST_KINDS, "for_in_statement"], "switch_statement", {"kind": "switch_case"}
+    )
+
+
+_DECISION_SCAN_RULES: Dict[str, List[Dict[str, Any]]] = {
+    "typescript": _js_decision_rules("typescript"),
+    "javascript": _js_decision_rules("javascript"),
+    "java": _decision_rules(
+        "java",
+        {"kind": "if_statement", "field": "alternative"},
+        [*_C_STYLE_NEST_KINDS, "enhanced_for_statement"],
+        "switch_expression",
+        {"kind": "switch_label", "regex": "^case"},
+    ),
+}
+
+_NESTING_CATEGORIES = frozenset({"if", "nest", "switch"})
+_OPERATOR_CATEGORIES = frozenset({"and", "or", "nullish"})
+
+
+@dataclass
+class _ScanNode:
+    category: str  # "function" or a decision-point category
+    start: int
+    end: int
+    match: Dict[str, Any]
+    nesting: int = 0
+    depth_max: int = 0
+    decisions: List["_ScanNode"] = field(default_factory=list)
+
+
+def _to_scan_node(category: str, match: Dict[str, Any]) -> _ScanNode:
+    offsets = match.get("range", {}).get("byteOffset", {})
+    return _ScanNode(category, offsets.get("start", 0), offsets.get("end", 0), match)
+
+
+def _nest_nodes(nodes: List[_ScanNode]) -> List[_ScanNode]:
+    """Attach each decision node to its innermost function and record its nesting level."""
+    functions: List[_ScanNode] = []
+    stack: List[_ScanNode] = []
+    for node in sorted(nodes, key=lambda n: (n.start, -n.end)):
+        while stack and stack[-1].end <= node.start:
+            stack.pop()
+        owner_index = next((i for i in range(len(stack) - 1, -1, -1) if stack[i].category == "function"), None)
+        if node.category == "function":
+            functions.append(node)
+            stack.append(node)
+            continue
+        if owner_index is None:
+            continue
+        owner = stack[owner_index]
+        node.nesting = sum(1 for entry in stack[owner_index + 1 :] if entry.category in _NESTING_CATEGORIES)
+        owner.decisions.append(node)
+        if node.category in _NESTING_CATEGORIES:
+            owner.depth_max = max(owner.depth_max, node.nesting + 1)
+            stack.append(node)
+    return functions
+
+
+def _is_operator_continuation(node: _ScanNode, same_operator: List[_ScanNode]) -> bool:
+    # Binary chains are left-associative, so `a && b && c` nests `a && b` at the same start offset
+    return any(other is not node and other.start == node.start and other.end > node.end for other in same_operator)
+
+
+def _scan_function_metrics(function: _ScanNode, language: str) -> ComplexityMetrics:
+    cyclomatic = 1
+    cognitive = 0
+    by_operator: Dict[str, List[_ScanNode]] = {}
+    for node in function.decisions:
+        if node.category in _OPERATOR_CATEGORIES:
+            by_operator.setdefault(node.category, []).append(node)
+            cyclomatic += 1
+        elif node.category == "case":
+            cyclomatic += 1
+        elif node.category == "else_if":
+            cyclomatic += 1
+            cognitive += 1
+        elif node.category == "switch":
+            cognitive += 1 + node.nesting
+        else:
+            cyclomatic += 1
+            cognitive += 1 + node.nesting
+    for operators in by_operator.values():
+        cognitive += sum(1 for node in operators if not _is_operator_continuation(node, operators))
+
+    text = function.match.get("text", "")
+    rng = function.match.get("range", {})
+    lines = rng.get("end", {}).get("line", 0) - rng.get("start", {}).get("line", 0) + 1
+    return ComplexityMetrics(
+        cyclomatic=cyclomatic,
+        cognitive=cognitive,
+        nesting_depth=function.depth_max + (1 if lines > 1 else 0),
+        lines=lines,
+        parameter_count=_count_function_parameters(text, language),
+    )
+
+
+def _function_name(match: Dict[str, Any]) -> str:
+    name = match.get("metaVariables", {}).get("single", {}).get("NAME", {})
+    return str(name.get("text", "unknown")) if isinstance(name, dict) else "unknown"
+
+
+def _analyze_scanned_files(files: List[str], language: str, thresholds: ComplexityThresholds, result: AstMetricsResult) -> None:
+    function_rules = _FUNCTION_SCAN_RULES[language]
+    function_ids = {rule["id"] for rule in function_rules}
+    rules = function_rules + _DECISION_SCAN_RULES[language]
+    prefix = f"{language}-"
+    chunk_size = ComplexityDefaults.SCAN_CHUNK_FILES
+    for start in range(0, len(files), chunk_size):
+        started = time.perf_counter()
+        by_rule = run_ast_grep_batch(rules, files[start : start + chunk_size], language_globs=_FUNCTION_SCAN_LANGUAGE_GLOBS.get(language))
+        result.scan_seconds.append(time.perf_counter() - started)
+
+        by_file: Dict[str, List[_ScanNode]] = {}
+        for rule_id, matches in by_rule.items():
+            category = "function" if rule_id in function_ids else rule_id[len(prefix) :]
+            for match in matches:
+                by_file.setdefault(match.get("file", ""), []).append(_to_scan_node(category, match))
+
+        for file_path, nodes in by_file.items():
+            for function in _nest_nodes(nodes):
+                metrics = _scan_function_metrics(function, language)
+                start_line, end_line = _function_lines(function.match)
+                result.functions.append(
+                    FunctionComplexity(
+                        file_path=file_path,
+                        function_name=_function_name(function.match),
+                        start_line=start_line,
+                        end_line=end_line,
+                        metrics=metrics,
+                        language=language,
+                        exceeds=_check_threshold_violations(metrics, thresholds),
+                    )
+                )
+
+
+def _function_lines(match: Dict[str, Any]) -> Tuple[int, int]:
+    rng = match.get("range", {})
+    return rng.get("start", {}).get("line", 0) + 1, rng.get("end", {}).get("line", 0) + 1
+
+
+def analyze_files_ast(files: List[str], language: str, thresholds: ComplexityThresholds) -> AstMetricsResult:
+    """Analyze files with the syntax-tree metrics engine.
+
+    Args:
+        files: Paths of source files
+        language: python, typescript, javascript or java
+        thresholds: Complexity thresholds
+
+    Returns:
+        AstMetricsResult with function results and parse timings
+
+    Raises:
+        ValueError: If the language is not supported
+        AstGrepNotFoundError: If ast-grep binary not found (non-Python languages)
+        AstGrepExecutionError: If ast-grep execution fails (non-Python languages)
+    """
+    lang = language.lower()
+    result = AstMetricsResult()
+    if lang == "python":
+        _analyze_python_files(files, thresholds, result)
+    elif lang in _DECISION_SCAN_RULES:
+        _analyze_scanned_files(files, lang, thresholds, result)
+    else:
+        raise ValueError(f"AST metrics engine does not support {language}")
+    return result
@@ -10,7 +10,7 @@ from typing import Any, List
 from ...constants import ParallelProcessing
 from ...core.logging import get_logger
 from ...models.complexity import ComplexityThresholds, FunctionComplexity
-from .analyzer import analyze_file_complexity
+from .analyzer import analyze_file_complexity, analyze_files_complexity
 
 
 class ParallelComplexityAnalyzer:
@@ -21,7 +21,12 @@ class ParallelComplexityAnalyzer:
         self.logger = get_logger("complexity.parallel_analyzer")
 
     def analyze_files(
-        self, files: List[str], language: str, thresholds: ComplexityThresholds, max_threads: int = ParallelProcessing.DEFAULT_WORKERS
+        self,
+        files: List[str],
+        language: str,
+        thresholds: ComplexityThresholds,
+        max_threads: int = ParallelProcessing.DEFAULT_WORKERS,
+        single_pass: bool = True,
     ) -> List[FunctionComplexity]:
         """Analyze multiple files in parallel.
 
@@ -30,21 +35,30 @@ class ParallelComplexityAnalyzer:
             language: Programming language
             thresholds: Complexity thresholds
             max_threads: Number of parallel threads
+            single_pass: Extract functions for all files with one ast-grep scan per
+                chunk instead of one process per file and pattern. Falls back to
+                per-file extraction for unsupported languages or scan failures.
 
         Returns:
             List of all function complexity results
         """
-        self.logger.info("analyze_files_start", file_count=len(files), language=language, max_threads=max_threads)
+        self.logger.info("analyze_files_start", file_count=len(files), language=language, max_threads=max_threads, single_pass=single_pass)
 
-        all_functions: List[FunctionComplexity] = []
         lang = language.lower()
+        if single_pass and files:
+            single_pass_results = analyze_files_complexity(files, lang, thresholds)
+            if single_pass_results is not None:
+                self.logger.info("analyze_files_complete", total_functions=len(single_pass_results), mode="single_pass")
+                return single_pass_results
+
+        all_functions: List[FunctionComplexity] = []
 
         with ThreadPoolExecutor(max_workers=max_threads) as executor:
             futures = {executor.submit(analyze_file_complexity, f, lang, thresholds): f for f in files}
             for future in as_completed(futures):
                 self._collect_future_result(future, futures[future], all_functions)
 
-        self.logger.info("analyze_files_complete", total_functions=len(all_functions))
+        self.logger.info("analyze_files_complete", total_functions=len(all_functions), mode="per_file")
 
         return all_functions
 
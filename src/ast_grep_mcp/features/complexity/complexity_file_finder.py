@@ -4,10 +4,11 @@ This module handles finding files to analyze based on include/exclude
 patterns and language-specific file extensions.
 """
 
-import glob
+import os
 from pathlib import Path
 from typing import List, Set
 
+from ...core.file_discovery import discover_files, matches_any_glob
 from ...core.logging import get_logger
 
 
@@ -76,14 +77,12 @@ class ComplexityFileFinder:
         return base + f"/**/*{ext}"
 
     def _find_matching_files(self, project_path: Path, include_patterns: List[str], extensions: List[str]) -> Set[str]:
-        """Find all files matching include patterns and extensions."""
-        all_files: Set[str] = set()
-        for pattern in include_patterns:
-            base = str(project_path / pattern)
-            for ext in extensions:
-                glob_pattern = self._build_glob_pattern(base, ext)
-                all_files.update(glob.glob(glob_pattern, recursive=True))
-        return all_files
+        """Find all files matching include patterns and extensions (ignore files are honoured)."""
+        globs = [
+            os.path.normpath(os.path.relpath(glob_pattern, project_path) if os.path.isabs(glob_pattern) else glob_pattern)
+            for glob_pattern in (self._build_glob_pattern(pattern, ext) for pattern in include_patterns for ext in extensions)
+        ]
+        return {f.path for f in discover_files(str(project_path), extensions=extensions) if matches_any_glob(f.rel_path, globs)}
 
     def _is_excluded(self, file_path: str, exclude_patterns: List[str]) -> bool:
         for exclude_pattern in exclude_patterns:
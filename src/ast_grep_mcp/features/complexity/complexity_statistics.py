@@ -5,7 +5,7 @@ retrieving trends, and formatting the final response.
 """
 
 import subprocess
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from ...constants import ComplexityStorageDefaults, ConversionFactors, FormattingDefaults, ValidationDefaults
 from ...core.logging import get_logger
@@ -98,7 +98,14 @@ class ComplexityStatisticsAggregator:
         return commit_hash, branch_name
 
     def store_results(
-        self, project_folder: str, summary: Dict[str, Any], all_functions: List[FunctionComplexity]
+        self,
+        project_folder: str,
+        summary: Dict[str, Any],
+        all_functions: List[FunctionComplexity],
+        language: Optional[str] = None,
+        metrics_engine: Optional[str] = None,
+        analyzed_files: Optional[List[str]] = None,
+        file_stamps: Optional[Dict[str, Tuple[int, int]]] = None,
     ) -> tuple[Optional[str], Optional[str]]:
         """Store analysis results in database.
 
@@ -106,6 +113,10 @@ class ComplexityStatisticsAggregator:
             project_folder: Project root folder
             summary: Summary statistics
             all_functions: All analyzed functions
+            language: Language analyzed
+            metrics_engine: Metrics engine used
+            analyzed_files: Every file covered by the run, for later incremental runs
+            file_stamps: (mtime_ns, size) of the analyzed files when the run read them
 
         Returns:
             Tuple of (run_id, stored_at) or (None, None) if storage failed
@@ -125,9 +136,13 @@ class ComplexityStatisticsAggregator:
                 "max_nesting": summary["max_nesting"],
                 "violation_count": summary["exceeding_threshold"],
                 "duration_ms": int(summary["analysis_time_seconds"] * ConversionFactors.MILLISECONDS_PER_SECOND),
+                "language": language,
+                "metrics_engine": metrics_engine,
             }
 
-            run_id = storage.store_analysis_run(project_folder, results_data, all_functions, commit_hash, branch_name)
+            run_id = storage.store_analysis_run(
+                project_folder, results_data, all_functions, commit_hash, branch_name, analyzed_files, file_stamps
+            )
 
             self.logger.info("results_stored", run_id=run_id)
             return str(run_id), str(storage.db_path)
@@ -0,0 +1,173 @@
+"""Incremental complexity analysis.
+
+This module decides which files need re-analysis since the last stored run
+for a project and supplies the stored metrics for everything else:
+- ``git diff --name-only`` against the stored commit plus untracked files
+- file modification times relative to the stored run as a fallback
+- per-file (mtime_ns, size) stamps recorded by the stored run, which catch
+  files that were dirty during that run and have since been reverted
+"""
+
+import os
+import subprocess
+from calendar import timegm
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from ...constants import ConversionFactors, ValidationDefaults
+from ...core.logging import get_logger
+from ...models.complexity import ComplexityThresholds, FunctionComplexity
+from .analyzer import _check_threshold_violations
+from .storage import ComplexityStorage
+
+
+@dataclass
+class IncrementalPlan:
+    """Files to re-analyze plus reusable results from the base run.
+
+    Attributes:
+        base_run_id: Stored run the plan builds on
+        base_commit: Commit hash recorded for the base run
+        strategy: How changed files were detected ("git" or "mtime")
+        files_to_analyze: Files that are new, changed, or missing from the base run
+        reused_functions: Stored function metrics for unchanged files
+        reused_files: Number of unchanged files whose metrics are reused
+    """
+
+    base_run_id: int
+    base_commit: Optional[str]
+    strategy: str
+    files_to_analyze: List[str]
+    reused_functions: List[FunctionComplexity] = field(default_factory=list)
+    reused_files: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "base_run_id": self.base_run_id,
+            "base_commit": self.base_commit,
+            "strategy": self.strategy,
+            "changed_files": len(self.files_to_analyze),
+            "reused_files": self.reused_files,
+            "reused_functions": len(self.reused_functions),
+        }
+
+
+def _run_git(args: List[str], cwd: str) -> Optional[List[str]]:
+    """Run git and return stdout lines, or None if git fails."""
+    try:
+        result = subprocess.run(
+            ["git", *args], cwd=cwd, capture_output=True, text=True, timeout=ValidationDefaults.SYNTAX_CHECK_TIMEOUT_SECONDS
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    if result.returncode != 0:
+        return None
+    return [line for line in result.stdout.splitlines() if line]
+
+
+def _git_changed_files(project_folder: str, base_commit: str) -> Optional[Set[str]]:
+    """Files changed since base_commit (committed, staged, unstaged or untracked)."""
+    diff = _run_git(["diff", "--name-only", "--relative", base_commit], project_folder)
+    if diff is None:
+        return None
+    untracked = _run_git(["ls-files", "--others", "--exclude-standard"], project_folder) or []
+    return {os.path.abspath(os.path.join(project_folder, path)) for path in (*diff, *untracked)}
+
+
+def _run_started_at(run: Dict[str, Any]) -> float:
+    """Epoch seconds at which the base run started analyzing (run_timestamp is stored in UTC)."""
+    stored = timegm(datetime.strptime(str(run["run_timestamp"]), "%Y-%m-%d %H:%M:%S").timetuple())
+    duration = (run.get("analysis_duration_ms") or 0) / ConversionFactors.MILLISECONDS_PER_SECOND
+    # run_timestamp has one-second resolution; subtract a second so edits during that second count as changes
+    return stored - duration - 1
+
+
+def _mtime_changed_files(files: List[str], since: float) -> Set[str]:
+    changed: Set[str] = set()
+    for path in files:
+        try:
+            if os.stat(path).st_mtime >= since:
+                changed.add(os.path.abspath(path))
+        except OSError:
+            changed.add(os.path.abspath(path))
+    return changed
+
+
+def file_stamps(files: List[str]) -> Dict[str, Tuple[int, int]]:
+    """(mtime_ns, size) for each readable file, taken before analysis reads it."""
+    stamps: Dict[str, Tuple[int, int]] = {}
+    for path in files:
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        stamps[path] = (st.st_mtime_ns, st.st_size)
+    return stamps
+
+
+def _stamp_changed_files(base_stamps: Dict[str, Optional[Tuple[int, int]]]) -> Set[str]:
+    """Base-run files whose current stamp differs from (or lacks) the recorded one."""
+    current = file_stamps(list(base_stamps))
+    return {os.path.abspath(path) for path, stamp in base_stamps.items() if stamp is None or current.get(path) != stamp}
+
+
+def plan_incremental_analysis(
+    project_folder: str,
+    files: List[str],
+    language: str,
+    metrics_engine: str,
+    thresholds: ComplexityThresholds,
+    storage: Optional[ComplexityStorage] = None,
+) -> Optional[IncrementalPlan]:
+    """Work out which files changed since the last stored run.
+
+    Args:
+        project_folder: Project root folder (as used when storing runs)
+        files: Files matched for the current analysis
+        language: Programming language
+        metrics_engine: Metrics engine of the current analysis
+        thresholds: Current thresholds, re-applied to reused metrics
+        storage: Storage to read runs from (defaults to ComplexityStorage())
+
+    Returns:
+        IncrementalPlan, or None when there is no compatible stored run
+    """
+    logger = get_logger("complexity.incremental")
+    storage = storage or ComplexityStorage()
+    run = storage.get_latest_run(project_folder, language.lower(), metrics_engine)
+    if run is None:
+        logger.info("incremental_no_base_run", project_folder=project_folder)
+        return None
+
+    changed = _git_changed_files(project_folder, run["commit_hash"]) if run["commit_hash"] else None
+    strategy = "git"
+    if changed is None:
+        changed = _mtime_changed_files(files, _run_started_at(run))
+        strategy = "mtime"
+
+    base_stamps = storage.get_run_file_stamps(run["id"])
+    # git only sees differences from the base commit, so a file that was dirty
+    # during the base run and later reverted needs its stamp compared as well
+    changed |= _stamp_changed_files(base_stamps)
+    base_files = {os.path.abspath(f) for f in base_stamps}
+    current = {os.path.abspath(f): f for f in files}
+    to_analyze = [original for path, original in current.items() if path in changed or path not in base_files]
+    unchanged = set(current) - {os.path.abspath(f) for f in to_analyze}
+
+    reused: List[FunctionComplexity] = []
+    for fc in storage.get_run_functions(run["id"], language.lower()):
+        if os.path.abspath(fc.file_path) in unchanged:
+            fc.exceeds = _check_threshold_violations(fc.metrics, thresholds)
+            reused.append(fc)
+
+    plan = IncrementalPlan(
+        base_run_id=run["id"],
+        base_commit=run["commit_hash"],
+        strategy=strategy,
+        files_to_analyze=to_analyze,
+        reused_functions=reused,
+        reused_files=len(unchanged),
+    )
+    logger.info("incremental_plan", **plan.to_dict())
+    return plan
@@ -10,10 +10,10 @@ import platform
 import sqlite3
 from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Dict, Generator, List, Optional
+from typing import Any, Dict, Generator, List, Optional, Tuple
 
 from ast_grep_mcp.constants import ComplexityStorageDefaults, PerformanceDefaults
-from ast_grep_mcp.models.complexity import FunctionComplexity
+from ast_grep_mcp.models.complexity import ComplexityMetrics, FunctionComplexity
 
 # =============================================================================
 # DATABASE SCHEMA
@@ -43,9 +43,19 @@ CREATE TABLE IF NOT EXISTS analysis_runs (
     max_nesting INTEGER,
     threshold_violations INTEGER DEFAULT 0,
     analysis_duration_ms INTEGER,
+    language TEXT,
+    metrics_engine TEXT,
     FOREIGN KEY (project_id) REFERENCES projects(id) ON DELETE CASCADE
 );
 
+CREATE TABLE IF NOT EXISTS run_files (
+    run_id INTEGER NOT NULL,
+    file_path TEXT NOT NULL,
+    mtime_ns INTEGER,
+    size INTEGER,
+    FOREIGN KEY (run_id) REFERENCES analysis_runs(id) ON DELETE CASCADE
+);
+
 CREATE TABLE IF NOT EXISTS function_metrics (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     run_id INTEGER NOT NULL,
@@ -66,8 +76,21 @@ CREATE INDEX IF NOT EXISTS idx_runs_project_timestamp ON analysis_runs(project_i
 CREATE INDEX IF NOT EXISTS idx_runs_commit ON analysis_runs(commit_hash);
 CREATE INDEX IF NOT EXISTS idx_function_metrics_run ON function_metrics(run_id);
 CREATE INDEX IF NOT EXISTS idx_function_metrics_complexity ON function_metrics(cyclomatic_complexity DESC);
+CREATE INDEX IF NOT EXISTS idx_run_files_run ON run_files(run_id);
 """
 
+# Columns added after the initial schema; applied to existing databases on open
+_COLUMN_MIGRATIONS = {
+    "analysis_runs": {
+        "language": "ALTER TABLE analysis_runs ADD COLUMN language TEXT",
+        "metrics_engine": "ALTER TABLE analysis_runs ADD COLUMN metrics_engine TEXT",
+    },
+    "run_files": {
+        "mtime_ns": "ALTER TABLE run_files ADD COLUMN mtime_ns INTEGER",
+        "size": "ALTER TABLE run_files ADD COLUMN size INTEGER",
+    },
+}
+
 
 # =============================================================================
 # MODULE-LEVEL HELPERS
@@ -93,6 +116,8 @@ def _build_run_params(
         results.get("max_nesting"),
         results.get("violation_count", 0),
         results.get("duration_ms"),
+        results.get("language"),
+        results.get("metrics_engine"),
     )
 
 
@@ -120,8 +145,9 @@ _INSERT_RUN_SQL = """
         total_functions, total_files,
         avg_cyclomatic, avg_cognitive,
         max_cyclomatic, max_cognitive, max_nesting,
-        threshold_violations, analysis_duration_ms
-    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        threshold_violations, analysis_duration_ms,
+        language, metrics_engine
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
 """
 
 _INSERT_METRICS_SQL = """
@@ -152,6 +178,27 @@ _SELECT_TRENDS_SQL = """
     ORDER BY ar.run_timestamp ASC
 """
 
+# Only runs that recorded their analyzed files can seed an incremental analysis
+_SELECT_LATEST_RUN_SQL = """
+    SELECT ar.id, ar.commit_hash, ar.branch_name, ar.run_timestamp, ar.analysis_duration_ms, ar.language, ar.metrics_engine
+    FROM analysis_runs ar
+    JOIN projects p ON ar.project_id = p.id
+    WHERE p.project_path = ?
+        AND ar.language = ?
+        AND ar.metrics_engine = ?
+        AND EXISTS (SELECT 1 FROM run_files rf WHERE rf.run_id = ar.id)
+    ORDER BY ar.id DESC
+    LIMIT 1
+"""
+
+_SELECT_RUN_FUNCTIONS_SQL = """
+    SELECT file_path, function_name, start_line, end_line,
+        cyclomatic_complexity, cognitive_complexity, nesting_depth, line_count, parameter_count, exceeds_threshold
+    FROM function_metrics
+    WHERE run_id = ?
+    ORDER BY id
+"""
+
 
 def _insert_run(conn: sqlite3.Connection, run_params: tuple[Any, ...]) -> int:
     cursor = conn.execute(_INSERT_RUN_SQL, run_params)
@@ -164,6 +211,40 @@ def _insert_function_metrics(conn: sqlite3.Connection, run_id: int, function_row
         conn.executemany(_INSERT_METRICS_SQL, rows_with_id)
 
 
+def _insert_run_files(
+    conn: sqlite3.Connection, run_id: int, analyzed_files: List[str], file_stamps: Optional[Dict[str, Tuple[int, int]]]
+) -> None:
+    stamps = file_stamps or {}
+    rows = [(run_id, f, *stamps.get(f, (None, None))) for f in analyzed_files]
+    conn.executemany("INSERT INTO run_files (run_id, file_path, mtime_ns, size) VALUES (?, ?, ?, ?)", rows)
+
+
+def _row_to_function(row: sqlite3.Row, language: str) -> FunctionComplexity:
+    return FunctionComplexity(
+        file_path=row["file_path"],
+        function_name=row["function_name"],
+        start_line=row["start_line"],
+        end_line=row["end_line"],
+        metrics=ComplexityMetrics(
+            cyclomatic=row["cyclomatic_complexity"],
+            cognitive=row["cognitive_complexity"],
+            nesting_depth=row["nesting_depth"],
+            lines=row["line_count"],
+            parameter_count=row["parameter_count"] or 0,
+        ),
+        language=language,
+        exceeds=row["exceeds_threshold"].split(",") if row["exceeds_threshold"] else [],
+    )
+
+
+def _apply_migrations(conn: sqlite3.Connection) -> None:
+    for table, migrations in _COLUMN_MIGRATIONS.items():
+        existing = {row["name"] for row in conn.execute(f"PRAGMA table_info({table})")}
+        for column, statement in migrations.items():
+            if column not in existing:
+                conn.execute(statement)
+
+
 # =============================================================================
 # STORAGE CLASS
 # =============================================================================
@@ -210,6 +291,7 @@ class ComplexityStorage:
         """Initialize database schema."""
         with self._get_connection() as conn:
             conn.executescript(COMPLEXITY_DB_SCHEMA)
+            _apply_migrations(conn)
 
     def get_or_create_project(self, project_path: str) -> int:
         """Get or create project entry, return project ID."""
@@ -229,8 +311,16 @@ class ComplexityStorage:
         functions: List[FunctionComplexity],
         commit_hash: Optional[str] = None,
         branch_name: Optional[str] = None,
+        analyzed_files: Optional[List[str]] = None,
+        file_stamps: Optional[Dict[str, Tuple[int, int]]] = None,
     ) -> int:
-        """Store complete analysis run with all metrics."""
+        """Store complete analysis run with all metrics.
+
+        ``analyzed_files`` records every file the run covered (including files
+        without functions) so later incremental runs can reuse its metrics.
+        ``file_stamps`` maps those files to the (mtime_ns, size) they had when
+        the run read them.
+        """
         project_id = self.get_or_create_project(project_path)
         run_params = _build_run_params(project_id, commit_hash, branch_name, results)
         function_rows = _build_function_rows(functions)
@@ -238,8 +328,41 @@ class ComplexityStorage:
         with self._get_connection() as conn:
             run_id = _insert_run(conn, run_params)
             _insert_function_metrics(conn, run_id, function_rows)
+            if analyzed_files:
+                _insert_run_files(conn, run_id, analyzed_files, file_stamps)
             return run_id
 
+    def get_latest_run(self, project_path: str, language: str, metrics_engine: str) -> Optional[Dict[str, Any]]:
+        """Get the most recent run for a project that recorded its analyzed files.
+
+        Returns:
+            Run row as a dictionary, or None if there is no usable run
+        """
+        with self._get_connection() as conn:
+            row = conn.execute(_SELECT_LATEST_RUN_SQL, (project_path, language, metrics_engine)).fetchone()
+        return dict(row) if row else None
+
+    def get_run_files(self, run_id: int) -> List[str]:
+        """Get the files covered by a run."""
+        with self._get_connection() as conn:
+            rows = conn.execute("SELECT file_path FROM run_files WHERE run_id = ?", (run_id,)).fetchall()
+        return [row["file_path"] for row in rows]
+
+    def get_run_file_stamps(self, run_id: int) -> Dict[str, Optional[Tuple[int, int]]]:
+        """Get the files covered by a run with their (mtime_ns, size), or None if not recorded."""
+        with self._get_connection() as conn:
+            rows = conn.execute("SELECT file_path, mtime_ns, size FROM run_files WHERE run_id = ?", (run_id,)).fetchall()
+        return {
+            row["file_path"]: (row["mtime_ns"], row["size"]) if row["mtime_ns"] is not None and row["size"] is not None else None
+            for row in rows
+        }
+
+    def get_run_functions(self, run_id: int, language: str) -> List[FunctionComplexity]:
+        """Load the function metrics stored for a run."""
+        with self._get_connection() as conn:
+            rows = conn.execute(_SELECT_RUN_FUNCTIONS_SQL, (run_id,)).fetchall()
+        return [_row_to_function(row, language) for row in rows]
+
     def get_project_trends(self, project_path: str, days: int = ComplexityStorageDefaults.TRENDS_LOOKBACK_DAYS) -> List[Dict[str, Any]]:
         """Get complexity trends for a project over time."""
         with self._get_connection() as conn:
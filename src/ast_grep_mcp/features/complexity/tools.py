@@ -26,9 +26,11 @@ from ast_grep_mcp.core.logging import get_logger
 from ast_grep_mcp.models.complexity import ComplexityThresholds
 from ast_grep_mcp.utils.tool_context import tool_context
 
+from .ast_metrics import METRICS_ENGINES, analyze_files_ast
 from .complexity_analyzer import ParallelComplexityAnalyzer
 from .complexity_file_finder import ComplexityFileFinder
 from .complexity_statistics import ComplexityStatisticsAggregator
+from .incremental import IncrementalPlan, file_stamps, plan_incremental_analysis
 
 # Note: detect_code_smells_impl is imported inside detect_code_smells_tool()
 # to avoid circular import (quality.smells imports from complexity.analyzer)
@@ -40,18 +42,21 @@ _SMELLS_EXCLUDE_DEFAULTS = [*_COMPLEXITY_EXCLUDE_DEFAULTS, "**/test*/**", "**/*t
 # Helper functions extracted from analyze_complexity_tool
 
 
-def _validate_inputs(language: str) -> None:
+def _validate_inputs(language: str, metrics_engine: str = "pattern") -> None:
     """Validate input parameters for complexity analysis.
 
     Args:
         language: The programming language to validate
+        metrics_engine: The metrics engine to validate
 
     Raises:
-        ValueError: If the language is not supported
+        ValueError: If the language or metrics engine is not supported
     """
     supported_langs = ["python", "typescript", "javascript", "java"]
     if language.lower() not in supported_langs:
         raise ValueError(f"Unsupported language '{language}'. Supported: {', '.join(supported_langs)}")
+    if metrics_engine not in METRICS_ENGINES:
+        raise ValueError(f"Unsupported metrics engine '{metrics_engine}'. Supported: {', '.join(METRICS_ENGINES)}")
 
 
 def _normalize_complexity_exclude_patterns(exclude_patterns: List[str] | None) -> List[str]:
@@ -107,6 +112,24 @@ def _analyze_files_parallel(
     return all_functions, exceeding_functions, analyzer
 
 
+def _analyze_files_ast(
+    files_to_analyze: List[str], language: str, thresholds: ComplexityThresholds
+) -> tuple[List[Any], List[Any], Dict[str, Any]]:
+    """Analyze files with the syntax-tree metrics engine.
+
+    Args:
+        files_to_analyze: List of files to analyze
+        language: The programming language
+        thresholds: Complexity thresholds
+
+    Returns:
+        Tuple of (all functions, exceeding functions, parse statistics)
+    """
+    result = analyze_files_ast(files_to_analyze, language, thresholds)
+    exceeding_functions = ParallelComplexityAnalyzer().filter_exceeding_functions(result.functions)
+    return result.functions, exceeding_functions, result.summary()
+
+
 def _calculate_summary_statistics(
     all_functions: List[Any], exceeding_functions: List[Any], total_files: int, execution_time: float
 ) -> tuple[Dict[str, Any], ComplexityStatisticsAggregator]:
@@ -134,6 +157,7 @@ def _store_and_generate_trends(
     summary: Dict[str, Any],
     all_functions: List[Any],
     statistics: ComplexityStatisticsAggregator,
+    run_context: Dict[str, Any] | None = None,
 ) -> tuple[Any, Any, Any]:
     """Store results and generate trends if requested.
 
@@ -144,6 +168,7 @@ def _store_and_generate_trends(
         summary: Summary statistics
         all_functions: All analyzed functions
         statistics: Statistics aggregator instance
+        run_context: Optional language, metrics_engine, analyzed_files and file_stamps to record with the run
 
     Returns:
         Tuple of (run_id, stored_at, trends)
@@ -153,7 +178,7 @@ def _store_and_generate_trends(
     trends = None
 
     if store_results:
-        run_id, stored_at = statistics.store_results(project_folder, summary, all_functions)
+        run_id, stored_at = statistics.store_results(project_folder, summary, all_functions, **(run_context or {}))
 
     if include_trends:
         trends = statistics.get_trends(project_folder, days=ComplexityStorageDefaults.TRENDS_LOOKBACK_DAYS)
@@ -218,6 +243,29 @@ def _thresholds_to_dict(thresholds: ComplexityThresholds) -> Dict[str, int]:
     }
 
 
+def _run_metrics_engine(
+    files: List[str], language: str, thresholds: ComplexityThresholds, max_threads: int, metrics_engine: str
+) -> tuple[List[Any], Dict[str, Any] | None]:
+    """Analyze files with the selected engine; return (all functions, parse stats or None)."""
+    if not files:
+        return [], None
+    if metrics_engine == "ast":
+        all_functions, _, parse_stats = _analyze_files_ast(files, language, thresholds)
+        return all_functions, parse_stats
+    all_functions, _, _ = _analyze_files_parallel(files, language, thresholds, max_threads)
+    return all_functions, None
+
+
+def _plan_incremental(
+    project_folder: str, files_to_analyze: List[str], language: str, metrics_engine: str, thresholds: ComplexityThresholds, logger: Any
+) -> IncrementalPlan | None:
+    try:
+        return plan_incremental_analysis(project_folder, files_to_analyze, language, metrics_engine, thresholds)
+    except Exception as e:
+        logger.warning("incremental_plan_failed", error=str(e))
+        return None
+
+
 def _execute_analysis(
     project_folder: str,
     language: str,
@@ -228,12 +276,26 @@ def _execute_analysis(
     max_threads: int,
     start_time: float,
     logger: Any,
+    metrics_engine: str = "pattern",
+    incremental: bool = False,
 ) -> Dict[str, Any]:
-    all_functions, exceeding_functions, _ = _analyze_files_parallel(files_to_analyze, language, thresholds, max_threads)
+    stamps = file_stamps(files_to_analyze) if store_results else None
+    plan = _plan_incremental(project_folder, files_to_analyze, language, metrics_engine, thresholds, logger) if incremental else None
+    changed_files = plan.files_to_analyze if plan is not None else files_to_analyze
+    all_functions, parse_stats = _run_metrics_engine(changed_files, language, thresholds, max_threads, metrics_engine)
+    if plan is not None:
+        all_functions = plan.reused_functions + all_functions
+    exceeding_functions = ParallelComplexityAnalyzer().filter_exceeding_functions(all_functions)
     execution_time = time.time() - start_time
     summary, statistics = _calculate_summary_statistics(all_functions, exceeding_functions, len(files_to_analyze), execution_time)
+    run_context = {
+        "language": language.lower(),
+        "metrics_engine": metrics_engine,
+        "analyzed_files": files_to_analyze,
+        "file_stamps": stamps,
+    }
     run_id, stored_at, trends = _store_and_generate_trends(
-        store_results, include_trends, project_folder, summary, all_functions, statistics
+        store_results, include_trends, project_folder, summary, all_functions, statistics, run_context
     )
     logger.info(
         "tool_completed",
@@ -242,8 +304,14 @@ def _execute_analysis(
         total_functions=summary["total_functions"],
         exceeding_threshold=len(exceeding_functions),
         status="success",
+        metrics_engine=metrics_engine,
     )
-    return _format_response(summary, _thresholds_to_dict(thresholds), exceeding_functions, run_id, stored_at, trends, statistics)
+    response = _format_response(summary, _thresholds_to_dict(thresholds), exceeding_functions, run_id, stored_at, trends, statistics)
+    if parse_stats is not None:
+        response["parse_stats"] = parse_stats
+    if incremental:
+        response["incremental"] = plan.to_dict() if plan is not None else {"base_run_id": None, "changed_files": len(files_to_analyze)}
+    return response
 
 
 def analyze_complexity_tool(
@@ -258,10 +326,15 @@ def analyze_complexity_tool(
     store_results: bool = True,
     include_trends: bool = False,
     max_threads: int = ParallelProcessing.DEFAULT_WORKERS,
+    metrics_engine: str = "pattern",
+    incremental: bool = False,
 ) -> Dict[str, Any]:
     """Analyze cyclomatic, cognitive, nesting, and length complexity for all functions in a project.
 
-    Returns summary with only functions exceeding configured thresholds.
+    Returns summary with only functions exceeding configured thresholds. With
+    ``metrics_engine="ast"`` metrics come from one syntax tree per file and the
+    response includes ``parse_stats``. With ``incremental=True`` only files changed
+    since the last stored run are re-analyzed and merged with its stored metrics.
     """
     if include_patterns is None:
         include_patterns = ["**/*"]
@@ -277,10 +350,12 @@ def analyze_complexity_tool(
         nesting_threshold=nesting_threshold,
         length_threshold=length_threshold,
         max_threads=max_threads,
+        metrics_engine=metrics_engine,
+        incremental=incremental,
     )
 
     with tool_context("analyze_complexity", project_folder=project_folder, language=language) as start_time:
-        _validate_inputs(language)
+        _validate_inputs(language, metrics_engine)
         thresholds = ComplexityThresholds(
             cyclomatic=cyclomatic_threshold, cognitive=cognitive_threshold, nesting_depth=nesting_threshold, lines=length_threshold
         )
@@ -288,7 +363,17 @@ def analyze_complexity_tool(
         if not files_to_analyze:
             return _handle_no_files_found(language, time.time() - start_time)
         return _execute_analysis(
-            project_folder, language, thresholds, files_to_analyze, store_results, include_trends, max_threads, start_time, logger
+            project_folder,
+            language,
+            thresholds,
+            files_to_analyze,
+            store_results,
+            include_trends,
+            max_threads,
+            start_time,
+            logger,
+            metrics_engine,
+            incremental,
         )
 
 
@@ -474,6 +559,14 @@ def _register_analyze_complexity(mcp: FastMCP) -> None:
         store_results: bool = Field(default=True, description="Store results in database for trend tracking"),
         include_trends: bool = Field(default=False, description="Include historical trend data in response"),
         max_threads: int = Field(default=ParallelProcessing.DEFAULT_WORKERS, description="Number of parallel threads for analysis"),
+        metrics_engine: Literal["pattern", "ast"] = Field(
+            default="pattern",
+            description="Metrics engine: 'pattern' (text heuristics) or 'ast' (one syntax tree per file; adds per-file parse_stats)",
+        ),
+        incremental: bool = Field(
+            default=False,
+            description="Re-analyze only files changed since the last stored run (git diff or mtimes) and reuse its metrics",
+        ),
     ) -> Dict[str, Any]:
         """Wrapper that calls the standalone analyze_complexity_tool function."""
         return analyze_complexity_tool(
@@ -488,6 +581,8 @@ def _register_analyze_complexity(mcp: FastMCP) -> None:
             store_results=store_results,
             include_trends=include_trends,
             max_threads=max_threads,
+            metrics_engine=metrics_engine,
+            incremental=incremental,
         )
 
 
@@ -4,10 +4,12 @@ Runs extraction patterns in dry-run mode to estimate token/byte reduction
 without modifying any files.
 """
 
+import os
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 from ...constants import CondenseDefaults, CondenseFileRouting, ConversionFactors
+from ...core.file_discovery import discover_files
 from ...core.logging import get_logger
 from .strategies import STRATEGY_REDUCTION_RATIOS as _STRATEGY_REDUCTION
 
@@ -86,15 +88,15 @@ def _collect_file_stats(
 
 
 def _collect_files(root: Path, language: Optional[str]) -> List[Path]:
-    """Collect code files under root, filtered by language if given."""
+    """Collect code files under root (ignore files honoured), filtered by language if given."""
     ext_filter: Optional[frozenset[str]] = _language_to_extensions(language) if language else None
     exclude: set[str] = set(CondenseFileRouting.EXCLUDE_PATTERNS)
     files: List[Path] = []
+    base = Path(os.path.abspath(root))
 
-    for fp in root.rglob("*"):
-        if not fp.is_file():
-            continue
-        if not _should_include_file(fp, root, exclude, ext_filter):
+    for found in discover_files(str(root), include_hidden=True):
+        fp = Path(found.path)
+        if not _should_include_file(fp, base, exclude, ext_filter):
             continue
         files.append(fp)
         if len(files) >= CondenseDefaults.MAX_FILES_PER_RUN:
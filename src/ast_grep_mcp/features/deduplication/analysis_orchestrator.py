@@ -87,6 +87,7 @@ class DeduplicationAnalysisOrchestrator:
         max_candidates: int = DeduplicationDefaults.MAX_CANDIDATES,
         exclude_patterns: List[str] | None = None,
         progress_callback: Optional[ProgressCallback] = None,
+        max_constructs: int = DeduplicationDefaults.MAX_CONSTRUCTS,
     ) -> Dict[str, Any]:
         """Analyze a project for deduplication candidates (legacy interface).
 
@@ -103,6 +104,7 @@ class DeduplicationAnalysisOrchestrator:
             include_test_coverage=include_test_coverage,
             min_lines=min_lines,
             max_candidates=max_candidates,
+            max_constructs=max_constructs,
             exclude_patterns=exclude_patterns,
             progress_callback=progress_callback,
         )
@@ -138,6 +140,7 @@ class DeduplicationAnalysisOrchestrator:
             construct_type="function_definition",
             min_similarity=config.min_similarity,
             min_lines=config.min_lines,
+            max_constructs=config.max_constructs,
             exclude_patterns=config.exclude_patterns or [],
         )
 
@@ -5,18 +5,14 @@ This module provides functionality for analyzing code patterns,
 identifying variations, and classifying differences between duplicate code blocks.
 """
 
-import json
-import os
-import subprocess
-import tempfile
-from typing import Any, Callable, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 
-import yaml
-
-from ...constants import DifficultyThresholds, RegexCaptureGroups, SemanticVolumeDefaults, SubprocessDefaults
+from ...constants import DifficultyThresholds, RegexCaptureGroups, SemanticVolumeDefaults
+from ...core.exceptions import AstGrepError
 from ...core.logging import get_logger
 from ...models.deduplication import VariationCategory, VariationSeverity
 from .scoring_scales import VariationScoreCutoff, VariationScoreScale
+from .snippet_constructs import LITERAL_TYPES, SnippetConstructs, extract_snippet_constructs
 
 IDENTIFIER_CONTEXT_WINDOW_CHARS = 20
 
@@ -148,6 +144,33 @@ class PatternAnalyzer:
                 )
         return result
 
+    def extract_constructs(self, codes: Sequence[str], language: str) -> Optional[List[SnippetConstructs]]:
+        """
+        Extract literals, conditionals and calls from several snippets in one pass.
+
+        Args:
+            codes: Code snippets to analyze
+            language: Programming language
+
+        Returns:
+            One SnippetConstructs per snippet, or None if the constructs cannot be
+            extracted (unsupported language or ast-grep unavailable)
+        """
+        try:
+            return extract_snippet_constructs(codes, language)
+        except (AstGrepError, ValueError) as e:
+            self.logger.warning("construct_extraction_failed", language=language, error=str(e))
+            return None
+
+    def _varying_literals_between(self, constructs1: SnippetConstructs, constructs2: SnippetConstructs) -> List[Dict[str, Any]]:
+        varying_literals = []
+        for literal_type in LITERAL_TYPES:
+            pos_map1 = {(lit["line"], lit["column"]): lit for lit in constructs1.literals[literal_type]}
+            pos_map2 = {(lit["line"], lit["column"]): lit for lit in constructs2.literals[literal_type]}
+            varying_literals.extend(self._compare_literal_maps(pos_map1, pos_map2, literal_type))
+        varying_literals.sort(key=lambda x: (x["position"], x.get("column", 0)))
+        return varying_literals
+
     def identify_varying_literals(self, code1: str, code2: str, language: str = "python") -> List[Dict[str, Any]]:
         """
         Identify varying literal values between two similar code blocks.
@@ -162,90 +185,12 @@ class PatternAnalyzer:
         """
         self.logger.info("identifying_varying_literals", language=language)
 
-        varying_literals = []
+        constructs = self.extract_constructs([code1, code2], language)
+        varying_literals = self._varying_literals_between(*constructs) if constructs else []
 
-        for literal_type in ["string", "number", "boolean"]:
-            literals1 = self._extract_literals_with_ast_grep(code1, literal_type, language)
-            literals2 = self._extract_literals_with_ast_grep(code2, literal_type, language)
-            pos_map1 = {(lit["line"], lit["column"]): lit for lit in literals1}
-            pos_map2 = {(lit["line"], lit["column"]): lit for lit in literals2}
-            varying_literals.extend(self._compare_literal_maps(pos_map1, pos_map2, literal_type))
-
-        varying_literals.sort(key=lambda x: (x["position"], x.get("column", 0)))
         self.logger.info("varying_literals_found", count=len(varying_literals))
         return varying_literals
 
-    _LITERAL_EXT_MAP: Dict[str, str] = {
-        "python": ".py",
-        "javascript": ".js",
-        "typescript": ".ts",
-        "jsx": ".jsx",
-        "tsx": ".tsx",
-        "java": ".java",
-        "csharp": ".cs",
-        "cpp": ".cpp",
-        "c": ".c",
-    }
-
-    _LITERAL_RULES: Dict[str, Dict[str, Any]] = {
-        "number": {"rule": {"any": [{"kind": "integer"}, {"kind": "float"}, {"kind": "number"}]}},
-        "string": {"rule": {"any": [{"kind": "string"}, {"kind": "string_literal"}]}},
-        "boolean": {"rule": {"any": [{"kind": "true"}, {"kind": "false"}, {"kind": "none"}, {"kind": "null"}]}},
-    }
-
-    def _parse_literal_matches(self, stdout: str, literal_type: str) -> List[Dict[str, Any]]:
-        """Parse ast-grep JSON output into literal match dicts."""
-        try:
-            matches = json.loads(stdout)
-        except json.JSONDecodeError:
-            self.logger.warning("literal_parse_error", literal_type=literal_type)
-            return []
-        return [
-            {
-                "line": m.get("range", {}).get("start", {}).get("line", 0),
-                "column": m.get("range", {}).get("start", {}).get("column", 0),
-                "value": m.get("text", ""),
-                "type": literal_type,
-            }
-            for m in matches
-        ]
-
-    def _run_literal_scan(self, temp_path: str, rule: Dict[str, Any], literal_type: str) -> List[Dict[str, Any]]:
-        try:
-            result = subprocess.run(
-                ["ast-grep", "scan", "--rule", "-", "--json", temp_path],
-                input=yaml.dump(rule),
-                capture_output=True,
-                text=True,
-                timeout=SubprocessDefaults.GREP_TIMEOUT_SECONDS,
-            )
-            if result.returncode == 0 and result.stdout.strip():
-                return self._parse_literal_matches(result.stdout, literal_type)
-            return []
-        except subprocess.TimeoutExpired:
-            self.logger.warning("literal_extraction_timeout", literal_type=literal_type)
-            return []
-        except Exception as e:
-            self.logger.error("literal_extraction_error", error=str(e), literal_type=literal_type)
-            return []
-
-    def _extract_literals_with_ast_grep(self, code: str, literal_type: str, language: str) -> List[Dict[str, Any]]:
-        """Extract literals from code using ast-grep."""
-        rule = self._LITERAL_RULES.get(literal_type)
-        if rule is None:
-            return []
-        ext = self._LITERAL_EXT_MAP.get(language, ".py")
-        with tempfile.NamedTemporaryFile(mode="w", suffix=ext, delete=False) as f:
-            f.write(code)
-            temp_path = f.name
-        try:
-            return self._run_literal_scan(temp_path, rule, literal_type)
-        finally:
-            try:
-                os.unlink(temp_path)
-            except Exception:
-                pass
-
     def analyze_duplicate_group_literals(self, group: List[Dict[str, Any]], language: str = "python") -> Dict[str, Any]:
         """
         Analyze a group of duplicates to find all varying literals.
@@ -260,8 +205,7 @@ class PatternAnalyzer:
         if len(group) < 2:
             return {"total_variations": 0, "variations": [], "suggested_parameters": []}
 
-        base_code = group[0].get("text", "")
-        all_variations = self._accumulate_literal_variations(base_code, group[1:], language)
+        all_variations = self._accumulate_literal_variations([item.get("text", "") for item in group], language)
         formatted_variations, suggested_parameters = self._format_literal_variations(all_variations)
         return {
             "total_variations": len(formatted_variations),
@@ -269,21 +213,21 @@ class PatternAnalyzer:
             "suggested_parameters": suggested_parameters,
         }
 
-    def _accumulate_one_item(self, base_code: str, code: str, all_variations: Dict[tuple[Any, ...], List[str]], language: str) -> None:
-        for var in self.identify_varying_literals(base_code, code, language):
-            key = (var["position"], var.get("column", 0), var["literal_type"])
-            vals = all_variations.setdefault(key, [var["value1"]])
-            if var["value2"] not in vals:
-                vals.append(var["value2"])
-
-    def _accumulate_literal_variations(
-        self, base_code: str, items: List[Dict[str, Any]], language: str
-    ) -> Dict[tuple[Any, ...], List[str]]:
+    def _accumulate_literal_variations(self, codes: List[str], language: str) -> Dict[tuple[Any, ...], List[str]]:
+        """Compare every instance against the first, extracting the whole group at once."""
         all_variations: Dict[tuple[Any, ...], List[str]] = {}
-        for item in items:
-            code = item.get("text", "")
-            if code != base_code:
-                self._accumulate_one_item(base_code, code, all_variations, language)
+        constructs = self.extract_constructs(codes, language)
+        if not constructs:
+            return all_variations
+        base_code, base = codes[0], constructs[0]
+        for code, item in zip(codes[1:], constructs[1:]):
+            if code == base_code:
+                continue
+            for var in self._varying_literals_between(base, item):
+                key = (var["position"], var.get("column", 0), var["literal_type"])
+                vals = all_variations.setdefault(key, [var["value1"]])
+                if var["value2"] not in vals:
+                    vals.append(var["value2"])
         return all_variations
 
     def _format_literal_variations(self, all_variations: Dict[tuple[Any, ...], List[str]]) -> tuple[List[Dict[str, Any]], List[str]]:
@@ -605,6 +549,25 @@ class PatternAnalyzer:
             return {"position": i + 1, "type": "added", "condition1": None, "condition2": cond2["text"], "line2": cond2.get("line", 0)}
         return None
 
+    def _conditional_variations_between(
+        self, conditionals1: List[Dict[str, Any]], conditionals2: List[Dict[str, Any]], language: str
+    ) -> List[Dict[str, Any]]:
+        variations: List[Dict[str, Any]] = []
+        for i in range(max(len(conditionals1), len(conditionals2))):
+            c1 = conditionals1[i] if i < len(conditionals1) else None
+            c2 = conditionals2[i] if i < len(conditionals2) else None
+            v = self._compare_conditional_pair(i, c1, c2, language)
+            if v is not None:
+                variations.append(v)
+        return variations
+
+    def _conditionals_of(
+        self, codes: List[str], constructs: Optional[List[SnippetConstructs]], language: str
+    ) -> List[List[Dict[str, Any]]]:
+        if constructs is None:
+            return [self._extract_conditionals_regex(code, language) for code in codes]
+        return [c.conditionals for c in constructs]
+
     def detect_conditional_variations(self, code1: str, code2: str, language: str = "python") -> List[Dict[str, Any]]:
         """
         Detect variations in conditional statements between two code blocks.
@@ -622,77 +585,13 @@ class PatternAnalyzer:
         """
         self.logger.info("detecting_conditional_variations", language=language)
 
-        conditionals1 = self._extract_conditionals(code1, language)
-        conditionals2 = self._extract_conditionals(code2, language)
-        max_len = max(len(conditionals1), len(conditionals2), 0)
-
-        variations: List[Dict[str, Any]] = []
-        for i in range(max_len):
-            c1 = conditionals1[i] if i < len(conditionals1) else None
-            c2 = conditionals2[i] if i < len(conditionals2) else None
-            v = self._compare_conditional_pair(i, c1, c2, language)
-            if v is not None:
-                variations.append(v)
+        codes = [code1, code2]
+        conditionals1, conditionals2 = self._conditionals_of(codes, self.extract_constructs(codes, language), language)
+        variations = self._conditional_variations_between(conditionals1, conditionals2, language)
 
         self.logger.info("conditional_variations_found", count=len(variations))
         return variations
 
-    _CONDITIONAL_RULE_PYTHON = {"rule": {"any": [{"kind": "if_statement"}, {"kind": "elif_clause"}, {"kind": "comparison_operator"}]}}
-    _CONDITIONAL_RULE_OTHER = {"rule": {"any": [{"kind": "if_statement"}, {"kind": "binary_expression"}, {"kind": "ternary_expression"}]}}
-    _CONDITIONAL_EXT_MAP = {"python": ".py", "javascript": ".js", "typescript": ".ts", "java": ".java"}
-
-    def _run_conditional_scan(self, temp_path: str, rule: Dict[str, Any], code: str, language: str) -> List[Dict[str, Any]]:
-        try:
-            result = subprocess.run(
-                ["ast-grep", "scan", "--rule", "-", "--json", temp_path],
-                input=yaml.dump(rule),
-                capture_output=True,
-                text=True,
-                timeout=SubprocessDefaults.GREP_TIMEOUT_SECONDS,
-            )
-            if result.returncode == 0 and result.stdout.strip():
-                return self._parse_conditional_matches(result.stdout, language)
-            return []
-        except subprocess.TimeoutExpired:
-            self.logger.warning("conditional_extraction_timeout", language=language)
-            return []
-        except FileNotFoundError:
-            return self._extract_conditionals_regex(code, language)
-        except Exception as e:
-            self.logger.error("conditional_extraction_error", error=str(e))
-            return self._extract_conditionals_regex(code, language)
-
-    def _extract_conditionals(self, code: str, language: str) -> List[Dict[str, Any]]:
-        """Extract conditional statements from code using ast-grep."""
-        ext = self._CONDITIONAL_EXT_MAP.get(language, ".py")
-        rule = self._CONDITIONAL_RULE_PYTHON if language == "python" else self._CONDITIONAL_RULE_OTHER
-        with tempfile.NamedTemporaryFile(mode="w", suffix=ext, delete=False) as f:
-            f.write(code)
-            temp_path = f.name
-        try:
-            return self._run_conditional_scan(temp_path, rule, code, language)
-        finally:
-            try:
-                os.unlink(temp_path)
-            except Exception:
-                pass
-
-    def _parse_conditional_matches(self, stdout: str, language: str) -> List[Dict[str, Any]]:
-        """Parse ast-grep JSON output into conditional match dicts."""
-        try:
-            matches = json.loads(stdout)
-        except json.JSONDecodeError:
-            self.logger.warning("conditional_parse_error", language=language)
-            return []
-        return [
-            {
-                "line": m.get("range", {}).get("start", {}).get("line", 0),
-                "text": m.get("text", "").strip(),
-                "kind": m.get("kind", "unknown"),
-            }
-            for m in matches
-        ]
-
     def _extract_conditionals_regex(self, code: str, language: str) -> List[Dict[str, Any]]:
         """Fallback regex-based extraction for conditionals."""
         import re
@@ -705,22 +604,6 @@ class PatternAnalyzer:
             if m
         ]
 
-    def _get_language_extension(self, language: str) -> str:
-        """Get file extension for a programming language."""
-        ext_map = {
-            "python": ".py",
-            "javascript": ".js",
-            "typescript": ".ts",
-            "java": ".java",
-        }
-        return ext_map.get(language, ".py")
-
-    def _get_call_rule(self, language: str) -> Dict[str, Any]:
-        """Get ast-grep rule for call expressions based on language."""
-        if language == "python":
-            return {"rule": {"kind": "call"}}
-        return {"rule": {"kind": "call_expression"}}
-
     def _build_nested_call_result(self, match: Dict[str, Any], identifier: str, nesting_depth: int) -> Dict[str, Any]:
         return {
             "identifier": identifier,
@@ -740,41 +623,6 @@ class PatternAnalyzer:
                 return self._build_nested_call_result(match, identifier, depth)
         return None
 
-    def _run_ast_grep_for_calls(self, temp_path: str, language: str, identifier: str) -> Optional[Dict[str, Any]]:
-        """Run ast-grep to find nested function calls."""
-        rule = self._get_call_rule(language)
-        rule_yaml = yaml.dump(rule)
-
-        result = subprocess.run(
-            ["ast-grep", "scan", "--rule", "-", "--json", temp_path],
-            input=rule_yaml,
-            capture_output=True,
-            text=True,
-            timeout=SubprocessDefaults.GREP_TIMEOUT_SECONDS,
-        )
-
-        if result.returncode != 0 or not result.stdout.strip():
-            return None
-
-        try:
-            matches = json.loads(result.stdout)
-            return self._find_nested_call_in_matches(matches, identifier)
-        except json.JSONDecodeError:
-            self.logger.warning("nested_call_parse_error", language=language)
-            return None
-
-    def _run_nested_call_detection(self, temp_path: str, code: str, identifier: str, language: str) -> Optional[Dict[str, Any]]:
-        try:
-            return self._run_ast_grep_for_calls(temp_path, language, identifier)
-        except subprocess.TimeoutExpired:
-            self.logger.warning("nested_call_detection_timeout", language=language)
-            return None
-        except FileNotFoundError:
-            return self._detect_nested_call_regex(code, identifier)
-        except Exception as e:
-            self.logger.error("nested_call_detection_error", error=str(e))
-            return None
-
     def detect_nested_function_call(self, code: str, identifier: str, language: str = "python") -> Optional[Dict[str, Any]]:
         """
         Detect if an identifier is used within nested function calls.
@@ -788,17 +636,10 @@ class PatternAnalyzer:
             Dict with nesting info if found, None otherwise
         """
         self.logger.info("detecting_nested_function_call", identifier=identifier, language=language)
-        ext = self._get_language_extension(language)
-        with tempfile.NamedTemporaryFile(mode="w", suffix=ext, delete=False) as f:
-            f.write(code)
-            temp_path = f.name
-        try:
-            return self._run_nested_call_detection(temp_path, code, identifier, language)
-        finally:
-            try:
-                os.unlink(temp_path)
-            except Exception:
-                pass
+        constructs = self.extract_constructs([code], language)
+        if constructs is None:
+            return self._detect_nested_call_regex(code, identifier)
+        return self._find_nested_call_in_matches(constructs[0].calls, identifier)
 
     def _calculate_call_nesting_depth(self, expression: str, identifier: str) -> int:
         """Calculate the nesting depth of function calls around an identifier."""
@@ -917,8 +758,12 @@ def _detect_nested_function_call(code: str, identifier: str, language: str = "py
 
 
 def _collect_all_variations(analyzer: "PatternAnalyzer", code1: str, code2: str, language: str) -> List[Dict[str, Any]]:
-    literal_variations = analyzer.identify_varying_literals(code1, code2, language)
-    cond_variations = analyzer.detect_conditional_variations(code1, code2, language)
+    # One extraction serves both the literal and the conditional comparison
+    codes = [code1, code2]
+    constructs = analyzer.extract_constructs(codes, language)
+    literal_variations = analyzer._varying_literals_between(*constructs) if constructs else []
+    conditionals1, conditionals2 = analyzer._conditionals_of(codes, constructs, language)
+    cond_variations = analyzer._conditional_variations_between(conditionals1, conditionals2, language)
     identifier_variations = identify_varying_identifiers(code1, code2, language)
     return (
         [
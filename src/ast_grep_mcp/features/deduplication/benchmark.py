@@ -1,20 +1,36 @@
 """Performance benchmarking for deduplication functions.
 
 Includes benchmark execution, report generation, baseline management,
-and regression detection.
+and regression detection. Two modes are available: "micro" times scoring,
+ranking and code generation on small fixed inputs, "corpus" runs the full
+find -> rank -> enrich pipeline on synthetic projects with known clones.
 """
 
 import json
+import multiprocessing
 import os
 import statistics
+import sys
+import tempfile
 import time
-from typing import Any, Callable, Dict, List, cast
-
-from ...constants import ConversionFactors, DeduplicationDefaults, FormattingDefaults, ReportingDefaults
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Literal, Optional, Sequence, cast
+
+from ...constants import (
+    ConversionFactors,
+    DeduplicationDefaults,
+    FormattingDefaults,
+    ReportingDefaults,
+    SyntheticCorpusDefaults,
+)
 from ...core.logging import get_logger
+from .analysis_orchestrator import DeduplicationAnalysisOrchestrator
 from .ranker import DuplicationRanker
 from .recommendations import RecommendationEngine
 from .reporting import DuplicationReporter
+from .synthetic_corpus import CloneType, SyntheticCorpusSpec, generate_synthetic_corpus, score_detection
+
+BenchmarkMode = Literal["micro", "corpus"]
 
 BENCHMARK_HIGH_SIMILARITY_SCORE = 85.0
 BENCHMARK_MEDIUM_SIMILARITY_SCORE = 45.0
@@ -37,6 +53,8 @@ BENCHMARK_SCORING_MODULE_BUCKET_COUNT = 5
 BENCHMARK_PATTERN_CANDIDATE_COUNT = 50
 PATTERN_ANALYSIS_ITERATION_MULTIPLIER = 5
 CODE_GENERATION_ITERATION_MULTIPLIER = 5
+CORPUS_BENCHMARK_NAME = "synthetic_corpus"
+BYTES_PER_KILOBYTE = 1024
 
 
 class BenchmarkExecutor:
@@ -251,6 +269,149 @@ class BenchmarkExecutor:
         return results
 
 
+def _peak_rss_mb() -> Optional[float]:
+    """High-water resident set size of this process or its largest child (ast-grep), in MB.
+
+    None where the resource module is unavailable (Windows).
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    kilobytes = peak / BYTES_PER_KILOBYTE if sys.platform == "darwin" else peak
+    return round(kilobytes / BYTES_PER_KILOBYTE, FormattingDefaults.ROUNDING_PRECISION)
+
+
+def _run_corpus_pipeline(root: str, min_similarity: float, include_test_coverage: bool, max_candidates: int) -> Dict[str, Any]:
+    """Run find -> rank -> enrich on a generated corpus; executed in a fresh worker process per corpus."""
+    marks: Dict[str, float] = {}
+
+    def record_stage(stage: str, _percent: float) -> None:
+        marks.setdefault(stage, time.perf_counter())
+
+    t_start = time.perf_counter()
+    analysis = DeduplicationAnalysisOrchestrator().analyze_candidates(
+        project_path=root,
+        language="python",
+        min_similarity=min_similarity,
+        include_test_coverage=include_test_coverage,
+        max_candidates=max_candidates,
+        progress_callback=record_stage,
+        max_constructs=0,
+    )
+    return {
+        "elapsed": time.perf_counter() - t_start,
+        "marks": marks,
+        "candidates": analysis.get("candidates", []),
+        "total_groups_analyzed": analysis.get("total_groups_analyzed", 0),
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+
+class CorpusBenchmarkExecutor:
+    """Runs the full deduplication pipeline on synthetic corpora and scores it against their ground truth."""
+
+    # Progress stages of DeduplicationAnalysisOrchestrator that start each timed pipeline stage
+    _STAGE_STARTS = (
+        ("find", "Finding duplicate code"),
+        ("rank", "Ranking candidates by value"),
+        ("enrich", "Enriching candidates"),
+        ("", "Analysis complete"),
+    )
+
+    def __init__(self, min_similarity: float = DeduplicationDefaults.MIN_SIMILARITY, include_test_coverage: bool = True) -> None:
+        """Initialize the corpus benchmark executor.
+
+        Args:
+            min_similarity: Similarity threshold passed to duplicate detection
+            include_test_coverage: Run the test coverage step of enrichment
+        """
+        self.logger = get_logger("deduplication.corpus_benchmark_executor")
+        self.min_similarity = min_similarity
+        self.include_test_coverage = include_test_coverage
+
+    def _stage_seconds(self, marks: Dict[str, float]) -> Dict[str, float]:
+        stages: Dict[str, float] = {}
+        for (stage, start), (_, end) in zip(self._STAGE_STARTS, self._STAGE_STARTS[1:]):
+            if start in marks and end in marks:
+                stages[stage] = round(marks[end] - marks[start], FormattingDefaults.BENCHMARK_PRECISION)
+        return stages
+
+    def benchmark_corpus(self, spec: SyntheticCorpusSpec) -> Dict[str, Any]:
+        """Generate a corpus, run find -> rank -> enrich on it and measure the run.
+
+        Corpus generation is not timed. The pipeline runs in a freshly spawned
+        process with no construct cap, so peak_rss_mb covers this corpus only
+        and every generated function is analyzed.
+
+        Args:
+            spec: Shape of the synthetic corpus
+
+        Returns:
+            Benchmark result with timings, throughput, peak RSS and
+            precision/recall against the corpus ground truth
+        """
+        with tempfile.TemporaryDirectory(prefix="dedup_corpus_") as root:
+            corpus = generate_synthetic_corpus(root, spec)
+            with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+                run = pool.submit(_run_corpus_pipeline, root, self.min_similarity, self.include_test_coverage, spec.function_count).result()
+            accuracy = score_detection(corpus, run["candidates"])
+        elapsed = run["elapsed"]
+
+        result = {
+            "name": f"{CORPUS_BENCHMARK_NAME}[{spec.label}]",
+            "iterations": 1,
+            "function_count": spec.function_count,
+            "clone_type": spec.clone_type,
+            "clone_rate": spec.clone_rate,
+            "clones": corpus.clone_count,
+            "mean_seconds": round(elapsed, FormattingDefaults.BENCHMARK_PRECISION),
+            "stage_seconds": self._stage_seconds(run["marks"]),
+            "throughput_functions_per_second": round(spec.function_count / elapsed, FormattingDefaults.ROUNDING_PRECISION),
+            "peak_rss_mb": run["peak_rss_mb"],
+            "duplicate_groups": run["total_groups_analyzed"],
+            **accuracy,
+        }
+        self.logger.info(
+            "corpus_benchmark_complete",
+            name=result["name"],
+            seconds=result["mean_seconds"],
+            precision=accuracy["precision"],
+            recall=accuracy["recall"],
+        )
+        return result
+
+    def run_corpus_benchmarks(
+        self,
+        function_counts: Sequence[int],
+        clone_types: Sequence[CloneType],
+        clone_rate: float = SyntheticCorpusDefaults.CLONE_RATE,
+        seed: int = SyntheticCorpusDefaults.SEED,
+    ) -> List[Dict[str, Any]]:
+        """Benchmark every combination of corpus size and clone type, smallest corpora first.
+
+        Args:
+            function_counts: Corpus sizes in functions
+            clone_types: Clone types (1, 2 or 3)
+            clone_rate: Fraction of functions that are clones
+            seed: Random seed for corpus generation
+
+        Returns:
+            List of benchmark results
+
+        Raises:
+            ValueError: If a corpus spec is invalid
+        """
+        specs = [
+            SyntheticCorpusSpec(function_count=count, clone_rate=clone_rate, clone_type=clone_type, seed=seed)
+            for count in sorted(set(function_counts))
+            for clone_type in clone_types
+        ]
+        return [self.benchmark_corpus(spec) for spec in specs]
+
+
 class BenchmarkReporter:
     """Generates benchmark reports and manages baselines."""
 
@@ -359,6 +520,13 @@ class RegressionDetector:
         "full_workflow": DeduplicationDefaults.REGRESSION_FULL_WORKFLOW,
         "scoring": DeduplicationDefaults.REGRESSION_SCORING,
         "test_coverage": DeduplicationDefaults.REGRESSION_TEST_COVERAGE,
+        CORPUS_BENCHMARK_NAME: DeduplicationDefaults.REGRESSION_SYNTHETIC_CORPUS,
+    }
+
+    # Accuracy metrics of corpus benchmarks and the absolute drop allowed for each
+    ACCURACY_DROP_LIMITS = {
+        "precision": DeduplicationDefaults.REGRESSION_PRECISION_DROP,
+        "recall": DeduplicationDefaults.REGRESSION_RECALL_DROP,
     }
 
     def __init__(self, thresholds: Dict[str, float] | None = None) -> None:
@@ -379,8 +547,17 @@ class RegressionDetector:
             regression_info = self._check_single_regression(name, result, baseline_map[name])
             if regression_info:
                 errors.append(regression_info)
+            errors.extend(self._check_accuracy_regressions(name, result, baseline_map[name]))
+            memory_info = self._check_memory_regression(name, result, baseline_map[name])
+            if memory_info:
+                errors.append(memory_info)
         return errors
 
+    def _threshold_for(self, name: str) -> float:
+        """Threshold for a benchmark, falling back to its family ("synthetic_corpus[...]" -> "synthetic_corpus")."""
+        family = name.split("[", 1)[0]
+        return self.thresholds.get(name, self.thresholds.get(family, DeduplicationDefaults.REGRESSION_CODE_GENERATION))
+
     def check_regressions(self, results: List[Dict[str, Any]], baseline_map: Dict[str, Dict[str, Any]]) -> tuple[bool, List[str]]:
         """Check for performance regressions against baseline.
 
@@ -415,7 +592,7 @@ class RegressionDetector:
         """
         baseline_mean = baseline_result.get("mean_seconds", 0)
         current_mean = current_result["mean_seconds"]
-        threshold = self.thresholds.get(name, DeduplicationDefaults.REGRESSION_CODE_GENERATION)
+        threshold = self._threshold_for(name)
 
         if baseline_mean <= 0:
             self.logger.warning("invalid_baseline_mean", name=name, baseline_mean=baseline_mean)
@@ -442,6 +619,59 @@ class RegressionDetector:
 
         return None
 
+    def _check_accuracy_regressions(self, name: str, current_result: Dict[str, Any], baseline_result: Dict[str, Any]) -> List[str]:
+        """Check precision and recall of a corpus benchmark against its baseline.
+
+        Args:
+            name: Benchmark name
+            current_result: Current benchmark result
+            baseline_result: Baseline benchmark result
+
+        Returns:
+            Regression error messages, one per metric that dropped too far
+        """
+        errors: List[str] = []
+        for metric, allowed_drop in self.ACCURACY_DROP_LIMITS.items():
+            if metric not in current_result or metric not in baseline_result:
+                continue
+            baseline_value = baseline_result[metric]
+            current_value = current_result[metric]
+            drop = baseline_value - current_value
+            if drop > allowed_drop:
+                errors.append(
+                    f"{name}: {metric} dropped by {drop:.3f} ({baseline_value:.3f} -> {current_value:.3f}, allowed: {allowed_drop:.3f})"
+                )
+                self.logger.warning(
+                    "accuracy_regression_detected", name=name, metric=metric, baseline=baseline_value, current=current_value
+                )
+        return errors
+
+    def _check_memory_regression(self, name: str, current_result: Dict[str, Any], baseline_result: Dict[str, Any]) -> str | None:
+        """Check peak RSS of a benchmark against its baseline.
+
+        Args:
+            name: Benchmark name
+            current_result: Current benchmark result
+            baseline_result: Baseline benchmark result
+
+        Returns:
+            Regression error message if peak RSS grew past the threshold, None otherwise
+        """
+        baseline_rss = baseline_result.get("peak_rss_mb")
+        current_rss = current_result.get("peak_rss_mb")
+        if not baseline_rss or current_rss is None:
+            return None
+
+        growth = (current_rss - baseline_rss) / baseline_rss
+        if growth <= DeduplicationDefaults.REGRESSION_PEAK_RSS:
+            return None
+
+        self.logger.warning("memory_regression_detected", name=name, baseline_mb=baseline_rss, current_mb=current_rss)
+        return (
+            f"{name}: peak RSS {growth * 100:.1f}% higher ({baseline_rss:.1f}MB -> {current_rss:.1f}MB, "
+            f"threshold: {DeduplicationDefaults.REGRESSION_PEAK_RSS * 100:.0f}%)"
+        )
+
     def set_threshold(self, name: str, threshold: float) -> None:
         """Set regression threshold for a specific benchmark.
 
@@ -472,15 +702,19 @@ class DeduplicationBenchmark:
         self.executor = BenchmarkExecutor()
         self.reporter = BenchmarkReporter()
         self.detector = RegressionDetector()
+        self.corpus_executor = CorpusBenchmarkExecutor()
+        self.corpus_reporter = BenchmarkReporter(SyntheticCorpusDefaults.BASELINE_FILE)
 
         # Keep thresholds reference for backward compatibility
         self.thresholds = self.detector.thresholds
         self.baseline_file = self.reporter.baseline_file
 
-    def _check_regressions_if_requested(self, results: List[Dict[str, Any]], check_regression: bool) -> tuple[bool, List[str]]:
+    def _check_regressions_if_requested(
+        self, results: List[Dict[str, Any]], check_regression: bool, reporter: Optional[BenchmarkReporter] = None
+    ) -> tuple[bool, List[str]]:
         if not check_regression:
             return False, []
-        baseline_map = self.reporter.load_baseline()
+        baseline_map = (reporter or self.reporter).load_baseline()
         return self.detector.check_regressions(results, baseline_map)
 
     def benchmark_deduplication(self, iterations: int = 10, save_baseline: bool = False, check_regression: bool = True) -> Dict[str, Any]:
@@ -522,3 +756,49 @@ class DeduplicationBenchmark:
         return self.reporter.format_benchmark_report(
             results, regression_detected, regression_errors, self.thresholds, save_baseline, execution_time
         )
+
+    def benchmark_synthetic_corpora(
+        self,
+        function_counts: Optional[Sequence[int]] = None,
+        clone_types: Optional[Sequence[CloneType]] = None,
+        clone_rate: float = SyntheticCorpusDefaults.CLONE_RATE,
+        save_baseline: bool = False,
+        check_regression: bool = True,
+    ) -> Dict[str, Any]:
+        """Run the find -> rank -> enrich pipeline on synthetic corpora with known clones.
+
+        Each result records end-to-end and per-stage seconds, throughput in
+        functions per second, peak RSS, and pairwise precision/recall of the
+        ranked candidates against the corpus ground truth. Results use their own
+        baseline file next to the micro-benchmark baseline.
+
+        Args:
+            function_counts: Corpus sizes in functions (default: one corpus of
+                SyntheticCorpusDefaults.FUNCTION_COUNT functions)
+            clone_types: Clone types to generate (default: 1, 2 and 3)
+            clone_rate: Fraction of functions that are clones
+            save_baseline: Save results as new baseline for regression detection
+            check_regression: Check timings, accuracy and memory against the baseline
+
+        Returns:
+            Dict with benchmark results, regression detection, and statistics
+
+        Raises:
+            ValueError: If a corpus size, clone type or clone rate is invalid
+        """
+        start_time = time.time()
+        counts = list(function_counts or [SyntheticCorpusDefaults.FUNCTION_COUNT])
+        types: List[CloneType] = list(clone_types or [1, 2, 3])
+
+        self.logger.info("corpus_benchmark_start", function_counts=counts, clone_types=types, clone_rate=clone_rate)
+
+        results = self.corpus_executor.run_corpus_benchmarks(counts, types, clone_rate)
+        regression_detected, regression_errors = self._check_regressions_if_requested(results, check_regression, self.corpus_reporter)
+
+        if save_baseline:
+            self.corpus_reporter.save_baseline(results)
+
+        execution_time = time.time() - start_time
+        return self.corpus_reporter.format_benchmark_report(
+            results, regression_detected, regression_errors, self.thresholds, save_baseline, execution_time
+        )
@@ -0,0 +1,379 @@
+"""
+Persistent clone index for incremental duplicate detection.
+
+Keeps, per project, language and construct pattern, everything a
+DuplicationDetector run derives from the source files:
+- per-file construct lists (the ast-grep matches) with content digests
+- MinHash signatures per distinct construct digest
+- LSH band tables (one bucket key per band per digest) for each band layout used
+
+A sync stats the project's files, re-extracts only added or modified files and
+drops deleted ones, so repeated runs pay for the delta. Candidate pairs read
+from the band tables are exactly the pairs an in-memory MinHashLSH over the same
+constructs would return.
+"""
+
+import json
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from itertools import combinations
+from pathlib import Path
+from typing import Any, Dict, Generator, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from ...constants import LANGUAGE_EXTENSIONS, CacheDefaults, DetectorDefaults, FormattingDefaults, PerformanceDefaults
+from ...core.content_cache import content_digest
+from ...core.executor import stream_ast_grep_results
+from ...core.file_discovery import discover_files
+from ...core.logging import get_logger
+from .similarity import MinHashSimilarity
+
+logger = get_logger("deduplication.clone_index")
+
+CLONE_INDEX_DB_SCHEMA = """
+CREATE TABLE IF NOT EXISTS clone_indexes (
+    id INTEGER PRIMARY KEY,
+    project TEXT NOT NULL,
+    language TEXT NOT NULL,
+    pattern TEXT NOT NULL,
+    signature_namespace TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    UNIQUE (project, language, pattern, signature_namespace)
+);
+
+CREATE TABLE IF NOT EXISTS clone_files (
+    index_id INTEGER NOT NULL,
+    path TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    PRIMARY KEY (index_id, path)
+);
+
+CREATE TABLE IF NOT EXISTS clone_constructs (
+    index_id INTEGER NOT NULL,
+    path TEXT NOT NULL,
+    ordinal INTEGER NOT NULL,
+    digest TEXT NOT NULL,
+    match TEXT NOT NULL,
+    PRIMARY KEY (index_id, path, ordinal)
+);
+
+CREATE INDEX IF NOT EXISTS idx_clone_constructs_digest ON clone_constructs(index_id, digest);
+
+CREATE TABLE IF NOT EXISTS clone_signatures (
+    index_id INTEGER NOT NULL,
+    digest TEXT NOT NULL,
+    signature BLOB NOT NULL,
+    PRIMARY KEY (index_id, digest)
+);
+
+CREATE TABLE IF NOT EXISTS clone_band_layouts (
+    index_id INTEGER NOT NULL,
+    layout TEXT NOT NULL,
+    PRIMARY KEY (index_id, layout)
+);
+
+CREATE TABLE IF NOT EXISTS clone_bands (
+    index_id INTEGER NOT NULL,
+    layout TEXT NOT NULL,
+    band INTEGER NOT NULL,
+    bucket BLOB NOT NULL,
+    digest TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_clone_bands_bucket ON clone_bands(index_id, layout, band, bucket);
+CREATE INDEX IF NOT EXISTS idx_clone_bands_digest ON clone_bands(index_id, digest);
+"""
+
+# Distinct digest pairs that share at least one band bucket
+_COLLISIONS_SQL = """
+    SELECT DISTINCT a.digest, b.digest
+    FROM clone_bands a
+    JOIN clone_bands b
+        ON b.index_id = a.index_id AND b.layout = a.layout AND b.band = a.band AND b.bucket = a.bucket AND b.digest > a.digest
+    WHERE a.index_id = ? AND a.layout = ?
+"""
+
+_ORPHAN_FILTER = "digest NOT IN (SELECT digest FROM clone_constructs WHERE index_id = ?)"
+
+_SIGNATURE_DTYPE = np.dtype("<u8")
+
+
+@dataclass
+class CloneIndexSnapshot:
+    """Constructs of a project after a sync.
+
+    Attributes:
+        matches: ast-grep matches ordered by file path, then position in the file
+        changed_files: Files (re-)extracted by this sync
+        removed_files: Files dropped by this sync
+        total_files: Files tracked by the index
+    """
+
+    matches: List[Dict[str, Any]]
+    changed_files: int
+    removed_files: int
+    total_files: int
+
+
+class CloneIndex:
+    """SQLite-backed clone index for one project, language and construct pattern."""
+
+    def __init__(
+        self,
+        project_folder: str,
+        language: str,
+        pattern: str,
+        minhash: MinHashSimilarity,
+        db_path: Optional[Path] = None,
+    ) -> None:
+        """Initialize the index.
+
+        Args:
+            project_folder: Project root
+            language: ast-grep language; must have known file extensions
+            pattern: ast-grep pattern that selects the constructs
+            minhash: Calculator whose settings the stored signatures follow
+            db_path: Path to SQLite database. Defaults to ~/.ast-grep-mcp/clone_index.db
+        """
+        extensions = LANGUAGE_EXTENSIONS.get(language.lower())
+        if not extensions:
+            raise ValueError(f"Clone index does not support language '{language}'. Supported: {', '.join(LANGUAGE_EXTENSIONS)}")
+        self.project_folder = os.path.abspath(project_folder)
+        self.language = language
+        self.pattern = pattern
+        self.extensions = extensions
+        self.minhash = minhash
+        self.db_path = db_path or self._get_default_db_path()
+        self._init_db()
+        self._index_id = self._get_index_id()
+
+    def _get_default_db_path(self) -> Path:
+        """Get default database path next to the query cache database."""
+        base = Path.home() / ".ast-grep-mcp"
+        base.mkdir(parents=True, exist_ok=True)
+        return base / "clone_index.db"
+
+    @contextmanager
+    def _get_connection(self) -> Generator[sqlite3.Connection, None, None]:
+        """Context manager for database connections."""
+        conn = sqlite3.connect(str(self.db_path), timeout=PerformanceDefaults.DATABASE_TIMEOUT_SECONDS)
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        ok = False
+        try:
+            yield conn
+            ok = True
+        finally:
+            if ok:
+                conn.commit()
+            else:
+                conn.rollback()
+            conn.close()
+
+    def _init_db(self) -> None:
+        """Initialize database schema."""
+        with self._get_connection() as conn:
+            conn.executescript(CLONE_INDEX_DB_SCHEMA)
+
+    def _get_index_id(self) -> int:
+        key = (self.project_folder, self.language, self.pattern, self.minhash.signature_namespace(self.minhash.config))
+        with self._get_connection() as conn:
+            conn.execute(
+                "INSERT OR IGNORE INTO clone_indexes (project, language, pattern, signature_namespace, updated_at) VALUES (?, ?, ?, ?, 0)",
+                key,
+            )
+            row = conn.execute(
+                "SELECT id FROM clone_indexes WHERE project = ? AND language = ? AND pattern = ? AND signature_namespace = ?",
+                key,
+            ).fetchone()
+        return int(row[0])
+
+    def _current_files(self) -> Dict[str, Tuple[int, int]]:
+        """Stat every source file ast-grep would search, as path -> (mtime_ns, size)."""
+        files: Dict[str, Tuple[int, int]] = {}
+        for found in discover_files(self.project_folder, extensions=self.extensions):
+            # Stat afresh: discovery listings only notice in-place edits when the directory changes
+            try:
+                st = os.stat(found.path)
+            except OSError:
+                continue
+            files[found.path] = (st.st_mtime_ns, st.st_size)
+        return files
+
+    def _extract(self, paths: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """Run the construct pattern over paths in chunks, grouping matches by file."""
+        by_file: Dict[str, List[Dict[str, Any]]] = {path: [] for path in paths}
+        chunk_size = DetectorDefaults.CLONE_INDEX_RESCAN_CHUNK
+        for start in range(0, len(paths), chunk_size):
+            args = ["--pattern", self.pattern, "--lang", self.language, "--json=stream", *paths[start : start + chunk_size]]
+            for match in stream_ast_grep_results("run", args):
+                by_file.setdefault(os.path.abspath(match.get("file", "")), []).append(match)
+        return by_file
+
+    def _stored_digests(self, conn: sqlite3.Connection, digests: Sequence[str]) -> Set[str]:
+        found: Set[str] = set()
+        chunk_size = CacheDefaults.CONTENT_SPILL_QUERY_CHUNK
+        for start in range(0, len(digests), chunk_size):
+            chunk = digests[start : start + chunk_size]
+            placeholders = ",".join("?" * len(chunk))
+            rows = conn.execute(
+                f"SELECT digest FROM clone_signatures WHERE index_id = ? AND digest IN ({placeholders})", (self._index_id, *chunk)
+            )
+            found.update(digest for (digest,) in rows)
+        return found
+
+    def _band_rows(self, layout: str, signatures: Iterable[Tuple[str, np.ndarray]]) -> Generator[Tuple[Any, ...], None, None]:
+        bands, rows = (int(part) for part in layout.split("x"))
+        for digest, signature in signatures:
+            for band, bucket in enumerate(self.minhash.band_keys(signature, bands, rows)):
+                yield (self._index_id, layout, band, bucket, digest)
+
+    def sync(self) -> CloneIndexSnapshot:
+        """Bring the index up to date with the project and return its constructs."""
+        start_time = time.time()
+        current = self._current_files()
+        with self._get_connection() as conn:
+            stored = {
+                path: (mtime_ns, size)
+                for path, mtime_ns, size in conn.execute(
+                    "SELECT path, mtime_ns, size FROM clone_files WHERE index_id = ?", (self._index_id,)
+                )
+            }
+        changed = sorted(path for path, stamp in current.items() if stored.get(path) != stamp)
+        removed = sorted(path for path in stored if path not in current)
+        if changed or removed:
+            self._apply_changes(current, changed, removed)
+        matches = self._load_matches()
+        logger.info(
+            "clone_index_synced",
+            project_folder=self.project_folder,
+            changed_files=len(changed),
+            removed_files=len(removed),
+            total_files=len(current),
+            constructs=len(matches),
+            execution_time_seconds=round(time.time() - start_time, FormattingDefaults.ROUNDING_PRECISION),
+        )
+        return CloneIndexSnapshot(matches=matches, changed_files=len(changed), removed_files=len(removed), total_files=len(current))
+
+    def _apply_changes(self, current: Dict[str, Tuple[int, int]], changed: List[str], removed: List[str]) -> None:
+        """Replace the constructs of changed files, drop removed files and garbage-collect signatures and bands."""
+        extracted = self._extract(changed) if changed else {}
+        construct_rows = []
+        codes: Dict[str, str] = {}
+        for path in changed:
+            for ordinal, match in enumerate(extracted.get(path, [])):
+                text = match.get("text", "")
+                digest = content_digest(text)
+                codes[digest] = text
+                construct_rows.append((self._index_id, path, ordinal, digest, json.dumps(match, separators=(",", ":"))))
+
+        with self._get_connection() as conn:
+            stored = self._stored_digests(conn, list(codes))
+            missing = [digest for digest in codes if digest not in stored]
+            matrix = self.minhash.signature_matrix([codes[digest] for digest in missing])
+            new_signatures = list(zip(missing, matrix))
+            layouts = [layout for (layout,) in conn.execute("SELECT layout FROM clone_band_layouts WHERE index_id = ?", (self._index_id,))]
+
+            conn.execute("BEGIN IMMEDIATE")
+            stale = [(self._index_id, path) for path in (*changed, *removed)]
+            conn.executemany("DELETE FROM clone_constructs WHERE index_id = ? AND path = ?", stale)
+            conn.executemany("DELETE FROM clone_files WHERE index_id = ? AND path = ?", stale)
+            conn.executemany(
+                "INSERT INTO clone_files (index_id, path, mtime_ns, size) VALUES (?, ?, ?, ?)",
+                [(self._index_id, path, *current[path]) for path in changed],
+            )
+            conn.executemany("INSERT INTO clone_constructs (index_id, path, ordinal, digest, match) VALUES (?, ?, ?, ?, ?)", construct_rows)
+            conn.executemany(
+                "INSERT INTO clone_signatures (index_id, digest, signature) VALUES (?, ?, ?)",
+                [(self._index_id, digest, signature.astype(_SIGNATURE_DTYPE).tobytes()) for digest, signature in new_signatures],
+            )
+            for layout in layouts:
+                conn.executemany(
+                    "INSERT INTO clone_bands (index_id, layout, band, bucket, digest) VALUES (?, ?, ?, ?, ?)",
+                    self._band_rows(layout, new_signatures),
+                )
+            conn.execute(f"DELETE FROM clone_signatures WHERE index_id = ? AND {_ORPHAN_FILTER}", (self._index_id, self._index_id))
+            conn.execute(f"DELETE FROM clone_bands WHERE index_id = ? AND {_ORPHAN_FILTER}", (self._index_id, self._index_id))
+            conn.execute("UPDATE clone_indexes SET updated_at = ? WHERE id = ?", (time.time(), self._index_id))
+
+        logger.info("clone_index_updated", changed_files=len(changed), removed_files=len(removed), new_signatures=len(new_signatures))
+
+    def _load_matches(self) -> List[Dict[str, Any]]:
+        with self._get_connection() as conn:
+            rows = conn.execute("SELECT match FROM clone_constructs WHERE index_id = ? ORDER BY path, ordinal", (self._index_id,))
+            return [json.loads(match) for (match,) in rows]
+
+    def _load_signatures(self, conn: sqlite3.Connection, digests: Optional[Set[str]] = None) -> List[Tuple[str, np.ndarray]]:
+        rows = conn.execute("SELECT digest, signature FROM clone_signatures WHERE index_id = ?", (self._index_id,))
+        return [
+            (digest, np.frombuffer(blob, dtype=_SIGNATURE_DTYPE).astype(np.uint64))
+            for digest, blob in rows
+            if digests is None or digest in digests
+        ]
+
+    def _ensure_layout(self, layout: str) -> None:
+        """Materialize band tables for a layout from the stored signatures on first use."""
+        with self._get_connection() as conn:
+            known = conn.execute("SELECT 1 FROM clone_band_layouts WHERE index_id = ? AND layout = ?", (self._index_id, layout)).fetchone()
+            if known:
+                return
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany(
+                "INSERT INTO clone_bands (index_id, layout, band, bucket, digest) VALUES (?, ?, ?, ?, ?)",
+                self._band_rows(layout, self._load_signatures(conn)),
+            )
+            conn.execute("INSERT INTO clone_band_layouts (index_id, layout) VALUES (?, ?)", (self._index_id, layout))
+        logger.info("clone_index_layout_built", layout=layout)
+
+    def candidate_pairs(self, codes: Sequence[str], min_similarity: float) -> Set[Tuple[str, str]]:
+        """Return LSH candidate pairs among codes, keyed like MinHashSimilarity.find_candidate_pairs.
+
+        Keys are str(position in codes). Codes must come from this index's
+        constructs. Signatures of paired codes are loaded into the calculator's
+        cache so verification does not recompute them.
+        """
+        bands, rows = self.minhash.lsh_band_params(min_similarity)
+        layout = f"{bands}x{rows}"
+        self._ensure_layout(layout)
+
+        positions: Dict[str, List[str]] = {}
+        for i, code in enumerate(codes):
+            positions.setdefault(content_digest(code), []).append(str(i))
+
+        digest_pairs = [(digest, digest) for digest, keys in positions.items() if len(keys) > 1]
+        with self._get_connection() as conn:
+            digest_pairs.extend(
+                (d1, d2) for d1, d2 in conn.execute(_COLLISIONS_SQL, (self._index_id, layout)) if d1 in positions and d2 in positions
+            )
+            involved = {digest for pair in digest_pairs for digest in pair}
+            self.minhash.prime_signatures(self._load_signatures(conn, involved))
+
+        candidates: Set[Tuple[str, str]] = set()
+        for d1, d2 in digest_pairs:
+            keys = combinations(positions[d1], 2) if d1 == d2 else ((k1, k2) for k1 in positions[d1] for k2 in positions[d2])
+            candidates.update((min(k1, k2), max(k1, k2)) for k1, k2 in keys)
+        return candidates
+
+    def clear(self) -> None:
+        """Remove everything stored for this index."""
+        with self._get_connection() as conn:
+            for table in ("clone_files", "clone_constructs", "clone_signatures", "clone_band_layouts", "clone_bands"):
+                conn.execute(f"DELETE FROM {table} WHERE index_id = ?", (self._index_id,))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get index statistics.
+
+        Returns:
+            Dictionary with file, construct, signature and band counts
+        """
+        with self._get_connection() as conn:
+            counts = {
+                table: conn.execute(f"SELECT COUNT(*) FROM clone_{table} WHERE index_id = ?", (self._index_id,)).fetchone()[0]
+                for table in ("files", "constructs", "signatures", "bands")
+            }
+        return {"path": str(self.db_path), "project": self.project_folder, **counts}
@@ -60,6 +60,8 @@ class AnalysisConfig:
         include_test_coverage: Whether to check test coverage. Default: True
         min_lines: Minimum lines to consider for duplication. Default: 5
         max_candidates: Maximum candidates to return. Default: 100
+        max_constructs: Maximum functions passed to duplicate detection
+            (0 for unlimited). Default: 1000
         exclude_patterns: Path patterns to exclude from analysis. Default: None
         parallel: Enable parallel execution for enrichment. Default: True
         max_workers: Maximum worker threads for parallel execution. Default: 4
@@ -76,6 +78,7 @@ class AnalysisConfig:
     include_test_coverage: bool = True
     min_lines: int = DeduplicationDefaults.MIN_LINES
     max_candidates: int = DeduplicationDefaults.MAX_CANDIDATES
+    max_constructs: int = DeduplicationDefaults.MAX_CONSTRUCTS
 
     # Optional fields
     exclude_patterns: Optional[List[str]] = None
@@ -101,6 +104,8 @@ class AnalysisConfig:
 
         _require_positive(self.min_lines, "min_lines")
         _require_positive(self.max_candidates, "max_candidates")
+        if self.max_constructs < 0:
+            raise ValueError(f"max_constructs must be 0 (unlimited) or positive, got {self.max_constructs}")
         _require_positive_workers(self.max_workers)
 
     def to_dict(self) -> dict[str, Any]:
@@ -116,6 +121,7 @@ class AnalysisConfig:
             "include_test_coverage": self.include_test_coverage,
             "min_lines": self.min_lines,
             "max_candidates": self.max_candidates,
+            "max_constructs": self.max_constructs,
             "exclude_patterns": self.exclude_patterns,
             "parallel": self.parallel,
             "max_workers": self.max_workers,
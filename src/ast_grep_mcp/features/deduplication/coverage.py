@@ -3,14 +3,18 @@
 import glob as glob_module
 import os
 import re as regex_module
+import threading
+from collections import OrderedDict
 from concurrent.futures import Future, ThreadPoolExecutor, as_completed
-from typing import Callable, Dict, List, Optional, Set, Tuple
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
 
-from ...constants import ParallelProcessing
+from ...constants import CacheDefaults, ParallelProcessing
 from ...core.logging import get_logger
 
 __all__ = [
     "CoverageDetector",
+    "CoverageReferenceIndex",
+    "clear_test_reference_cache",
 ]
 
 
@@ -209,6 +213,108 @@ _TEST_FILE_PATTERNS["cs"] = _TEST_FILE_PATTERNS["csharp"]
 _TEST_FILE_PATTERNS["c#"] = _TEST_FILE_PATTERNS["csharp"]
 
 
+# Identifiers, including dash-joined module names such as my-component
+_REFERENCE_NAME_RE = regex_module.compile(r"\w+(?:-\w+)*")
+# Quoted module paths in import/require/load statements
+_IMPORT_PATH_RE = regex_module.compile(r"""(?:from|import|require|require_relative|load)\s*\(?\s*['"]([^'"\n]+)['"]""")
+
+# Test file path -> ((mtime_ns, size), referenced names), shared by every CoverageDetector
+_reference_cache: "OrderedDict[str, Tuple[Tuple[int, int], FrozenSet[str]]]" = OrderedDict()
+_reference_cache_lock = threading.Lock()
+
+
+def _extract_reference_names(content: str) -> FrozenSet[str]:
+    """Collect the lowercased names a test file mentions: identifiers, their dash-separated parts and import path stems."""
+    lowered = content.lower()
+    names: Set[str] = set()
+    for token in _REFERENCE_NAME_RE.findall(lowered):
+        names.add(token)
+        if "-" in token:
+            names.update(token.split("-"))
+    for spec in _IMPORT_PATH_RE.findall(lowered):
+        base = os.path.basename(spec.rstrip("/"))
+        names.add(base)
+        names.add(os.path.splitext(base)[0])
+    return frozenset(names)
+
+
+def _load_test_references(path: str) -> Optional[FrozenSet[str]]:
+    """Return the names a test file references, re-reading it only when its mtime or size changed."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    stamp = (st.st_mtime_ns, st.st_size)
+    with _reference_cache_lock:
+        cached = _reference_cache.get(path)
+        if cached is not None and cached[0] == stamp:
+            _reference_cache.move_to_end(path)
+            return cached[1]
+
+    try:
+        with open(path, "r", encoding="utf-8", errors="ignore") as f:
+            names = _extract_reference_names(f.read())
+    except (IOError, OSError):
+        return None
+
+    with _reference_cache_lock:
+        _reference_cache[path] = (stamp, names)
+        _reference_cache.move_to_end(path)
+        while len(_reference_cache) > CacheDefaults.TEST_REFERENCE_CACHE_MAX_FILES:
+            _reference_cache.popitem(last=False)
+    return names
+
+
+def clear_test_reference_cache() -> None:
+    """Drop all parsed test files."""
+    with _reference_cache_lock:
+        _reference_cache.clear()
+
+
+class CoverageReferenceIndex:
+    """Inverted index from referenced names to the test files that mention them.
+
+    Each test file is parsed once (or served from the mtime-validated cache),
+    so looking up the tests that reference a source file is a dictionary hit
+    on the source file's lowercased module name. A source name matches a
+    whole identifier or import path stem, not an arbitrary substring.
+    """
+
+    def __init__(self, test_files: Iterable[str]) -> None:
+        """Build the index.
+
+        Args:
+            test_files: Paths of the test files to index; unreadable files are skipped
+        """
+        self._by_name: Dict[str, List[str]] = {}
+        self._by_directory: Dict[str, List[str]] = {}
+        self.indexed_files = 0
+        for path in sorted(test_files):
+            names = _load_test_references(path)
+            if names is None:
+                continue
+            self.indexed_files += 1
+            self._by_directory.setdefault(os.path.normpath(os.path.dirname(path)), []).append(path)
+            for name in names:
+                self._by_name.setdefault(name, []).append(path)
+
+    def tests_referencing(self, source_file: str, language: str) -> List[str]:
+        """Return the indexed test files that reference source_file.
+
+        Args:
+            source_file: Path to the source file
+            language: Programming language; Go test files also cover every file in their directory
+
+        Returns:
+            Test file paths, possibly empty
+        """
+        source_name = os.path.splitext(os.path.basename(source_file))[0].lower()
+        found = list(self._by_name.get(source_name, []))
+        if language.lower() == "go":
+            found.extend(self._by_directory.get(os.path.normpath(os.path.dirname(source_file)), []))
+        return found
+
+
 class CoverageDetector:
     """Detects test coverage for source files to assess refactoring risk."""
 
@@ -405,7 +511,14 @@ class CoverageDetector:
 
         return test_files
 
-    def _has_test_coverage_optimized(self, file_path: str, language: str, project_root: str, test_files: Set[str]) -> bool:
+    def _has_test_coverage_optimized(
+        self,
+        file_path: str,
+        language: str,
+        project_root: str,
+        test_files: Set[str],
+        reference_index: Optional[CoverageReferenceIndex] = None,
+    ) -> bool:
         """Optimized test coverage check using pre-computed test file set.
 
         Args:
@@ -413,6 +526,7 @@ class CoverageDetector:
             language: Programming language
             project_root: Root directory of the project
             test_files: Pre-computed set of all test files
+            reference_index: Pre-built index over test_files; built on the fly if omitted
 
         Returns:
             True if test coverage exists for the file
@@ -428,10 +542,12 @@ class CoverageDetector:
                 return True
 
         # Check if any test file references our source
-        for test_file in test_files:
-            if self._check_test_file_references_source(test_file, file_path, language):
-                self.logger.debug("found_test_by_reference", source_file=file_path, test_file=test_file)
-                return True
+        if reference_index is None:
+            reference_index = CoverageReferenceIndex(test_files)
+        referencing = reference_index.tests_referencing(file_path, language)
+        if referencing:
+            self.logger.debug("found_test_by_reference", source_file=file_path, test_file=referencing[0])
+            return True
 
         self.logger.debug("no_test_coverage", source_file=file_path)
         return False
@@ -482,8 +598,9 @@ class CoverageDetector:
         This method provides significant performance improvements over the
         sequential version by:
         1. Pre-computing all test files once (instead of per-file glob searches)
-        2. Optionally using parallel execution for file processing
-        3. Reusing the test file set across all files
+        2. Reading each test file once into an index of the names it references
+           (cached between calls and revalidated by mtime)
+        3. Optionally using parallel execution for file processing
 
         Args:
             file_paths: List of source file paths
@@ -496,27 +613,42 @@ class CoverageDetector:
             Dictionary mapping file paths to their test coverage status
 
         Performance:
-            - Sequential: O(n * m) where n=files, m=test patterns
-            - Batch: O(m + n) - 60-80% faster for large file sets
+            - Sequential: O(n * t) test file reads where n=files, t=test files
+            - Batch: O(t) test file reads, then one dictionary lookup per file
+
+        Note:
+            Reference matching is by whole name: a test mentioning "helpers"
+            does not cover helper.py, unlike the substring check used by
+            has_test_coverage().
         """
         if not file_paths:
             return {}
 
-        # Pre-compute all test files once (major optimization)
+        # Pre-compute all test files and the names they reference once (major optimization)
         test_files = self._find_all_test_files(language, project_root)
+        reference_index = CoverageReferenceIndex(test_files)
 
         # Process files using appropriate strategy
         if parallel and len(file_paths) > 1:
-            coverage_map, covered_count = self._process_parallel_batch(file_paths, language, project_root, test_files, max_workers)
+            coverage_map, covered_count = self._process_parallel_batch(
+                file_paths, language, project_root, test_files, max_workers, reference_index
+            )
         else:
-            coverage_map, covered_count = self._process_sequential_batch(file_paths, language, project_root, test_files)
+            coverage_map, covered_count = self._process_sequential_batch(file_paths, language, project_root, test_files, reference_index)
 
         # Log final results
         self._log_batch_results(len(file_paths), covered_count, parallel, len(test_files))
 
         return coverage_map
 
-    def _process_file_coverage(self, file_path: str, language: str, project_root: str, test_files: Set[str]) -> bool:
+    def _process_file_coverage(
+        self,
+        file_path: str,
+        language: str,
+        project_root: str,
+        test_files: Set[str],
+        reference_index: Optional[CoverageReferenceIndex] = None,
+    ) -> bool:
         """Process coverage check for a single file with error handling.
 
         Args:
@@ -524,18 +656,25 @@ class CoverageDetector:
             language: Programming language
             project_root: Root directory
             test_files: Pre-computed set of test files
+            reference_index: Pre-built index over test_files
 
         Returns:
             True if test coverage exists, False otherwise or on error
         """
         try:
-            return self._has_test_coverage_optimized(file_path, language, project_root, test_files)
+            return self._has_test_coverage_optimized(file_path, language, project_root, test_files, reference_index)
         except Exception as e:
             self.logger.error("test_coverage_check_failed", file_path=file_path, error=str(e))
             return False
 
     def _process_parallel_batch(
-        self, file_paths: List[str], language: str, project_root: str, test_files: Set[str], max_workers: int
+        self,
+        file_paths: List[str],
+        language: str,
+        project_root: str,
+        test_files: Set[str],
+        max_workers: int,
+        reference_index: Optional[CoverageReferenceIndex] = None,
     ) -> Tuple[Dict[str, bool], int]:
         """Process files in parallel for coverage checking.
 
@@ -545,6 +684,7 @@ class CoverageDetector:
             project_root: Root directory
             test_files: Pre-computed set of test files
             max_workers: Maximum number of threads
+            reference_index: Pre-built index over test_files; built once here if omitted
 
         Returns:
             Tuple of (coverage_map, covered_count)
@@ -553,11 +693,15 @@ class CoverageDetector:
 
         coverage_map: Dict[str, bool] = {}
         covered_count = 0
+        if reference_index is None:
+            reference_index = CoverageReferenceIndex(test_files)
 
         with ThreadPoolExecutor(max_workers=max_workers) as executor:
             # Submit all tasks
             futures = {
-                executor.submit(self._has_test_coverage_optimized, file_path, language, project_root, test_files): file_path
+                executor.submit(
+                    self._has_test_coverage_optimized, file_path, language, project_root, test_files, reference_index
+                ): file_path
                 for file_path in file_paths
             }
 
@@ -572,7 +716,12 @@ class CoverageDetector:
         return coverage_map, covered_count
 
     def _process_sequential_batch(
-        self, file_paths: List[str], language: str, project_root: str, test_files: Set[str]
+        self,
+        file_paths: List[str],
+        language: str,
+        project_root: str,
+        test_files: Set[str],
+        reference_index: Optional[CoverageReferenceIndex] = None,
     ) -> Tuple[Dict[str, bool], int]:
         """Process files sequentially for coverage checking.
 
@@ -581,6 +730,7 @@ class CoverageDetector:
             language: Programming language
             project_root: Root directory
             test_files: Pre-computed set of test files
+            reference_index: Pre-built index over test_files; built once here if omitted
 
         Returns:
             Tuple of (coverage_map, covered_count)
@@ -589,9 +739,11 @@ class CoverageDetector:
 
         coverage_map: Dict[str, bool] = {}
         covered_count = 0
+        if reference_index is None:
+            reference_index = CoverageReferenceIndex(test_files)
 
         for file_path in file_paths:
-            has_coverage = self._process_file_coverage(file_path, language, project_root, test_files)
+            has_coverage = self._process_file_coverage(file_path, language, project_root, test_files, reference_index)
             coverage_map[file_path] = has_coverage
             if has_coverage:
                 covered_count += 1
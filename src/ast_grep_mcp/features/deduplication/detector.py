@@ -17,13 +17,15 @@ Hybrid Pipeline (v0.3.0):
 
 import re
 import time
+from dataclasses import replace
 from difflib import SequenceMatcher
-from typing import Any, Dict, List, Literal, Optional
+from typing import Any, Dict, List, Literal, Optional, Tuple
 
 from ...constants import DeduplicationDefaults, DetectorDefaults, DisplayDefaults, FormattingDefaults, IndentationDefaults, StreamDefaults
 from ...core.executor import stream_ast_grep_results
 from ...core.logging import get_logger
 from ...core.usage_tracking import OperationType, track_operation
+from .clone_index import CloneIndex
 from .similarity import (
     EnhancedStructureHash,
     HybridSimilarity,
@@ -35,6 +37,10 @@ from .similarity import (
 
 # Type alias for similarity mode selection
 SimilarityMode = Literal["minhash", "hybrid", "sequence_matcher"]
+# "bucket": anchor groups within structure-hash buckets; "lsh": anchor groups over one MinHash LSH index;
+# "auto": lsh once there are DetectorDefaults.LSH_GROUPING_MIN_ITEMS constructs
+GroupingEngine = Literal["auto", "bucket", "lsh"]
+GROUPING_ENGINES = ("auto", "bucket", "lsh")
 _MANDATORY_ENV_EXCLUDE_PATTERNS = ["site-packages", ".venv", "venv", "virtualenv"]
 
 
@@ -48,9 +54,18 @@ class DuplicationDetector:
         similarity_mode: SimilarityMode = "hybrid",
         similarity_config: Optional[SimilarityConfig] = None,
         hybrid_config: Optional[HybridSimilarityConfig] = None,
+        grouping_engine: GroupingEngine = "auto",
+        verification_workers: Optional[int] = None,
     ) -> None:
-        """Initialize the duplication detector."""
+        """Initialize the duplication detector.
+
+        verification_workers, if given, overrides the similarity config's number of
+        worker processes for verifying large candidate batches.
+        """
+        if grouping_engine not in GROUPING_ENGINES:
+            raise ValueError(f"Unsupported grouping engine '{grouping_engine}'. Supported: {', '.join(GROUPING_ENGINES)}")
         self.language = language
+        self.grouping_engine = grouping_engine
         self.logger = get_logger("deduplication.detector")
 
         # Handle legacy use_minhash parameter
@@ -59,6 +74,9 @@ class DuplicationDetector:
         self.similarity_mode = similarity_mode
         self.use_minhash = similarity_mode != "sequence_matcher"
 
+        if verification_workers is not None:
+            similarity_config = replace(similarity_config or SimilarityConfig(), verification_workers=verification_workers)
+
         # Initialize similarity calculators
         self._minhash = MinHashSimilarity(similarity_config)
         self._hybrid = HybridSimilarity(similarity_config, hybrid_config)
@@ -68,6 +86,7 @@ class DuplicationDetector:
             "detector_initialized",
             language=language,
             similarity_mode=similarity_mode,
+            grouping_engine=grouping_engine,
         )
 
     @staticmethod
@@ -92,16 +111,22 @@ class DuplicationDetector:
         max_constructs: int,
         exclude_patterns: List[str],
         start_time: float,
+        use_clone_index: bool = False,
     ) -> Dict[str, Any]:
         """Inner detection logic, separated from tracking/error handling."""
         self._validate_parameters(min_similarity, min_lines, max_constructs)
         pattern = self._get_construct_pattern(construct_type)
-        all_matches = self._find_constructs(project_folder, pattern, max_constructs, exclude_patterns)
+        clone_index = None
+        if use_clone_index:
+            clone_index = CloneIndex(project_folder, self.language, pattern, self._minhash)
+            all_matches = self._find_constructs_indexed(clone_index, max_constructs, exclude_patterns)
+        else:
+            all_matches = self._find_constructs(project_folder, pattern, max_constructs, exclude_patterns)
 
         if not all_matches:
             return self._empty_result(construct_type, time.time() - start_time)
 
-        raw_groups = self.group_duplicates(all_matches, min_similarity, min_lines)
+        raw_groups = self.group_duplicates(all_matches, min_similarity, min_lines, clone_index=clone_index)
         duplication_groups = self._apply_precision_filters(raw_groups)
         suggestions = self.generate_refactoring_suggestions(duplication_groups, construct_type)
         stats = self._calculate_statistics(all_matches, duplication_groups, suggestions)
@@ -113,8 +138,9 @@ class DuplicationDetector:
         construct_type: str = "function_definition",
         min_similarity: float = DeduplicationDefaults.MIN_SIMILARITY,
         min_lines: int = DeduplicationDefaults.MIN_LINES,
-        max_constructs: int = 1000,
+        max_constructs: int = DeduplicationDefaults.MAX_CONSTRUCTS,
         exclude_patterns: Optional[List[str]] = None,
+        use_clone_index: bool = False,
     ) -> Dict[str, Any]:
         """
         Detect duplicate code in a project.
@@ -126,6 +152,8 @@ class DuplicationDetector:
             min_lines: Minimum number of lines to consider
             max_constructs: Maximum number of constructs to analyze (0 for unlimited)
             exclude_patterns: Path patterns to exclude from analysis
+            use_clone_index: Read constructs, signatures and LSH buckets from the persistent
+                clone index, re-extracting only files changed since the last indexed run
 
         Returns:
             Dict containing duplication analysis results
@@ -142,6 +170,7 @@ class DuplicationDetector:
             min_lines=min_lines,
             max_constructs=max_constructs,
             exclude_patterns=exclude_patterns,
+            use_clone_index=use_clone_index,
         )
 
         with track_operation(
@@ -156,6 +185,7 @@ class DuplicationDetector:
                 exclude_patterns,
                 start_time,
                 tracker,
+                use_clone_index,
             )
 
     def _tracked_detection(
@@ -168,6 +198,7 @@ class DuplicationDetector:
         exclude_patterns: List[str],
         start_time: float,
         tracker: Any,
+        use_clone_index: bool = False,
     ) -> Dict[str, Any]:
         """Run detection inside a tracking context with error logging."""
         try:
@@ -179,6 +210,7 @@ class DuplicationDetector:
                 max_constructs,
                 exclude_patterns,
                 start_time,
+                use_clone_index,
             )
             summary = result.get("summary", {})
             tracker.lines_analyzed = summary.get("total_constructs", 0)
@@ -271,6 +303,21 @@ class DuplicationDetector:
 
         return all_matches
 
+    def _find_constructs_indexed(self, clone_index: CloneIndex, max_constructs: int, exclude_patterns: List[str]) -> List[Dict[str, Any]]:
+        """Find constructs through the clone index, which re-extracts only changed files.
+
+        Matches come back ordered by file path, so max_constructs keeps the first
+        constructs in path order rather than whichever a full scan streamed first.
+        """
+        snapshot = clone_index.sync()
+        all_matches = self._apply_exclude_patterns(snapshot.matches, exclude_patterns)
+
+        if max_constructs > 0 and len(all_matches) >= max_constructs:
+            self.logger.info("construct_limit_reached", total_found=len(all_matches), max_constructs=max_constructs)
+            all_matches = all_matches[:max_constructs]
+
+        return all_matches
+
     def calculate_similarity(self, code1: str, code2: str) -> float:
         """Calculate similarity between two code snippets.
 
@@ -294,6 +341,28 @@ class DuplicationDetector:
             return self._minhash.estimate_similarity(code1, code2)
         return self.calculate_similarity_precise(code1, code2)
 
+    def calculate_similarities(self, pairs: List[Tuple[str, str]]) -> List[float]:
+        """Score many pairs; in hybrid mode Stage 3 embeddings are computed in one batch.
+
+        Large batches are verified by worker processes when the similarity config
+        sets verification_workers.
+        """
+        if self.similarity_mode == "hybrid":
+            return self._hybrid.estimate_similarities(pairs)
+        if self.similarity_mode == "minhash":
+            return self._minhash.estimate_similarities(pairs)
+        return [self.calculate_similarity(code1, code2) for code1, code2 in pairs]
+
+    def _prefers_batched_verification(self, pair_count: int) -> bool:
+        """True if scoring all pair_count candidates up front beats verifying them one at a time.
+
+        Stage 3 batches model inference and worker processes need many pairs per
+        batch, both of which outweigh the pairs anchor grouping would have skipped.
+        """
+        if self.similarity_mode == "hybrid" and self._hybrid.semantic_enabled:
+            return True
+        return self.similarity_mode != "sequence_matcher" and self._minhash.uses_verification_pool(pair_count)
+
     def calculate_similarity_detailed(
         self,
         code1: str,
@@ -347,8 +416,18 @@ class DuplicationDetector:
                 lines.append(normalized_line)
         return "\n".join(lines)
 
-    def group_duplicates(self, matches: List[Dict[str, Any]], min_similarity: float, min_lines: int) -> List[List[Dict[str, Any]]]:
-        """Group similar code constructs together."""
+    def group_duplicates(
+        self,
+        matches: List[Dict[str, Any]],
+        min_similarity: float,
+        min_lines: int,
+        clone_index: Optional[CloneIndex] = None,
+    ) -> List[List[Dict[str, Any]]]:
+        """Group similar code constructs together.
+
+        With a clone_index the LSH engine reads candidate pairs from its stored
+        band tables instead of building an in-memory index.
+        """
         if not matches:
             return []
 
@@ -357,6 +436,9 @@ class DuplicationDetector:
         if not filtered_matches:
             return []
 
+        if self._use_lsh_grouping(len(filtered_matches)):
+            return self._group_with_lsh(filtered_matches, min_similarity, clone_index)
+
         # Use hash-based bucketing for initial grouping (optimization)
         buckets = self._create_hash_buckets(filtered_matches)
 
@@ -372,6 +454,65 @@ class DuplicationDetector:
         # Filter out single-item groups
         return [group for group in merged_groups if len(group) > 1]
 
+    def _use_lsh_grouping(self, item_count: int) -> bool:
+        """Return True if group_duplicates should use the LSH engine for item_count constructs."""
+        if self.grouping_engine == "auto":
+            return item_count >= DetectorDefaults.LSH_GROUPING_MIN_ITEMS
+        return self.grouping_engine == "lsh"
+
+    def _group_with_lsh(
+        self, matches: List[Dict[str, Any]], min_similarity: float, clone_index: Optional[CloneIndex] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """Group matches around anchors using one LSH index over all constructs.
+
+        Like the bucket engine, each construct in order anchors a group of the
+        not yet grouped constructs similar to it, so every member is within
+        min_similarity of its anchor. Only LSH candidate pairs are verified, and
+        pairs whose second member is already grouped are skipped, so dense
+        clusters of same-shape functions cost near-linear verifications.
+        """
+        start_time = time.time()
+        codes = [m.get("text", "") for m in matches]
+        lsh_candidates = clone_index.candidate_pairs(codes, min_similarity) if clone_index is not None else None
+        candidates = self._minhash.find_candidate_pairs([(str(i), code) for i, code in enumerate(codes)], min_similarity, lsh_candidates)
+
+        ordered = sorted((min(int(k1), int(k2)), max(int(k1), int(k2))) for k1, k2 in candidates)
+        scores = None
+        if self._prefers_batched_verification(len(ordered)):
+            scores = dict(zip(ordered, self.calculate_similarities([(codes[i], codes[j]) for i, j in ordered])))
+        neighbours: Dict[int, List[int]] = {}
+        for i, j in ordered:
+            neighbours.setdefault(i, []).append(j)
+
+        grouped = [False] * len(matches)
+        groups: List[List[Dict[str, Any]]] = []
+        verified = 0
+        for anchor, later in sorted(neighbours.items()):
+            if grouped[anchor]:
+                continue
+            members = [anchor]
+            for j in later:
+                if grouped[j]:
+                    continue
+                verified += 1
+                score = scores[(anchor, j)] if scores is not None else self.calculate_similarity(codes[anchor], codes[j])
+                if score >= min_similarity:
+                    grouped[j] = True
+                    members.append(j)
+            if len(members) > 1:
+                grouped[anchor] = True
+                groups.append([matches[k] for k in members])
+
+        self.logger.info(
+            "lsh_grouping_completed",
+            constructs=len(matches),
+            candidate_pairs=len(candidates),
+            pairs_verified=verified,
+            groups=len(groups),
+            execution_time_seconds=round(time.time() - start_time, FormattingDefaults.ROUNDING_PRECISION),
+        )
+        return groups
+
     def _create_hash_buckets(self, matches: List[Dict[str, Any]]) -> Dict[int, List[Dict[str, Any]]]:
         """Create hash buckets for initial grouping (reduces O(n²) comparisons)."""
         buckets: Dict[int, List[Dict[str, Any]]] = {}
@@ -398,14 +539,10 @@ class DuplicationDetector:
         self, anchor: Dict[str, Any], candidates: List[Dict[str, Any]], candidate_indices: List[int], used: set[int], min_similarity: float
     ) -> List[int]:
         """Return indices (into candidates) that are similar to anchor and not yet used."""
-        matches = []
-        for offset, item in enumerate(candidates):
-            j = candidate_indices[offset]
-            if j in used:
-                continue
-            if self.calculate_similarity(anchor.get("text", ""), item.get("text", "")) >= min_similarity:
-                matches.append(offset)
-        return matches
+        offsets = [offset for offset in range(len(candidates)) if candidate_indices[offset] not in used]
+        anchor_text = anchor.get("text", "")
+        scores = self.calculate_similarities([(anchor_text, candidates[offset].get("text", "")) for offset in offsets])
+        return [offset for offset, score in zip(offsets, scores) if score >= min_similarity]
 
     def _find_similar_in_bucket(self, bucket: List[Dict[str, Any]], min_similarity: float) -> List[List[Dict[str, Any]]]:
         """Find similar items within a bucket."""
@@ -0,0 +1,314 @@
+"""
+Float16 embedding matrix keyed by content digest.
+
+Embeddings live in one contiguous matrix so scores for many snippets reduce to
+a matrix product. With a path the matrix is a memory-mapped file plus a digest
+sidecar, so embeddings survive restarts without being read into memory:
+- ``<name>.f16``: raw float16 rows, grown geometrically up to the byte budget
+- ``<name>.keys``: a JSON header line, then one digest per stored row
+
+Rows are written before their digests are appended, so an interrupted write
+never maps a digest to a missing vector. Several server processes can share the
+files: every access holds an exclusive ``fcntl`` lock on ``<name>.lock`` and
+remaps the index first if another process changed the sidecar. Windows has no
+``fcntl``, so there the index is only persisted when given an explicit path and
+assumes a single process.
+"""
+
+import json
+import os
+import sys
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ...constants import CacheDefaults, FileConstants, FormattingDefaults
+from ...core.content_cache import content_digest, get_content_spill_store
+from ...core.logging import get_logger
+
+if sys.platform != "win32":
+    import fcntl
+
+logger = get_logger("deduplication.embedding_index")
+
+_DTYPE = np.float16
+_INITIAL_ROWS = 1024
+
+
+class EmbeddingIndex:
+    """Thread-safe digest -> embedding store bounded by matrix bytes.
+
+    When full, the least-recently-used half of the rows is dropped and the rest
+    are compacted to the front of the matrix.
+    """
+
+    def __init__(self, namespace: str, max_bytes: int, path: Optional[Path] = None) -> None:
+        """Initialize the index.
+
+        Args:
+            namespace: Settings the embeddings depend on; a persisted index with another namespace is discarded
+            max_bytes: Upper bound on matrix bytes
+            path: Optional .f16 file to memory-map; loaded if it exists
+        """
+        self.namespace = namespace
+        self.max_bytes = max_bytes
+        self.path = path
+        self._lock = threading.Lock()
+        self._matrix: Optional[np.ndarray] = None
+        self._digests: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._last_used = np.zeros(0, dtype=np.int64)
+        # (inode, size, mtime) of the sidecar as this process last read or wrote it
+        self._disk_state: Optional[Tuple[int, int, int]] = None
+        self._clock = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if path is not None:
+            with self._file_lock():
+                self._load()
+
+    def __len__(self) -> int:
+        return len(self._digests)
+
+    def __contains__(self, digest: object) -> bool:
+        return digest in self._rows
+
+    @property
+    def dim(self) -> Optional[int]:
+        """Embedding width, known once the first vector is stored."""
+        return None if self._matrix is None else int(self._matrix.shape[1])
+
+    @property
+    def _keys_path(self) -> Path:
+        assert self.path is not None
+        return self.path.with_suffix(".keys")
+
+    def _max_rows(self, dim: int) -> int:
+        return max(1, self.max_bytes // (dim * np.dtype(_DTYPE).itemsize))
+
+    def _header(self, dim: int) -> str:
+        return json.dumps({"namespace": self.namespace, "dim": dim})
+
+    @contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        """Hold the cross-process lock on a persisted index (no-op in memory and on Windows)."""
+        if self.path is None or sys.platform == "win32":
+            yield
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path.with_suffix(".lock"), "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _keys_state(self) -> Optional[Tuple[int, int, int]]:
+        try:
+            st = self._keys_path.stat()
+        except OSError:
+            return None
+        return (st.st_ino, st.st_size, st.st_mtime_ns)
+
+    def _sync(self) -> None:
+        """Remap the index if another process appended, compacted or cleared it (file lock held)."""
+        if self.path is not None and self._keys_state() != self._disk_state:
+            self._load()
+
+    def _load(self) -> None:
+        """Map the index on disk, discarding it if it does not match.
+
+        Recency of rows already known to this process is kept across a reload.
+        """
+        assert self.path is not None
+        last_used = dict(zip(self._digests, self._last_used.tolist()))
+        self._matrix = None
+        self._digests = []
+        self._rows = {}
+        self._last_used = np.zeros(0, dtype=np.int64)
+        self._disk_state = None
+        if not (self._keys_path.exists() and self.path.exists()):
+            return
+        try:
+            lines = self._keys_path.read_text().splitlines()
+            header = json.loads(lines[0])
+            dim = int(header["dim"])
+            digests = lines[1:]
+            capacity = self.path.stat().st_size // (dim * np.dtype(_DTYPE).itemsize)
+            if header["namespace"] != self.namespace or capacity < len(digests):
+                raise ValueError("index does not match its sidecar")
+        except (OSError, ValueError, KeyError, IndexError) as e:
+            logger.warning("embedding_index_discarded", path=str(self.path), error=str(e))
+            self.path.unlink(missing_ok=True)
+            self._keys_path.unlink(missing_ok=True)
+            return
+        self._matrix = np.memmap(self.path, dtype=_DTYPE, mode="r+", shape=(capacity, dim))
+        self._digests = digests
+        self._rows = {digest: row for row, digest in enumerate(digests)}
+        self._last_used = np.zeros(capacity, dtype=np.int64)
+        self._last_used[: len(digests)] = [last_used.get(digest, 0) for digest in digests]
+        self._disk_state = self._keys_state()
+        logger.info("embedding_index_loaded", path=str(self.path), rows=len(digests), dim=dim)
+
+    def _allocate(self, dim: int, capacity: int) -> None:
+        """Grow (or create) the matrix to capacity rows, keeping stored rows."""
+        count = len(self._digests)
+        last_used = np.zeros(capacity, dtype=np.int64)
+        last_used[:count] = self._last_used[:count]
+        if self.path is None:
+            matrix = np.zeros((capacity, dim), dtype=_DTYPE)
+            if self._matrix is not None:
+                matrix[:count] = self._matrix[:count]
+        else:
+            if isinstance(self._matrix, np.memmap):
+                self._matrix.flush()
+            self._matrix = None
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            if count == 0:
+                self._keys_path.write_text(self._header(dim) + "\n")
+            with open(self.path, "ab") as f:
+                f.truncate(capacity * dim * np.dtype(_DTYPE).itemsize)
+            matrix = np.memmap(self.path, dtype=_DTYPE, mode="r+", shape=(capacity, dim))
+        self._matrix = matrix
+        self._last_used = last_used
+
+    def _evict(self, keep: int) -> None:
+        """Keep the keep most recently used rows, compacted in their original order."""
+        assert self._matrix is not None
+        count = len(self._digests)
+        order = np.sort(np.argsort(self._last_used[:count], kind="stable")[count - keep :]) if keep else np.zeros(0, dtype=np.int64)
+        if self.path is not None:
+            # Empty the sidecar first: a crash mid-compaction leaves an empty index, never a wrong one
+            self._keys_path.write_text(self._header(self._matrix.shape[1]) + "\n")
+        self._matrix[:keep] = self._matrix[order]
+        self._last_used[:keep] = self._last_used[order]
+        self._digests = [self._digests[row] for row in order]
+        self._rows = {digest: row for row, digest in enumerate(self._digests)}
+        self.evictions += count - keep
+        if self.path is not None:
+            self._flush()
+            self._rewrite_keys()
+
+    def _flush(self) -> None:
+        if isinstance(self._matrix, np.memmap):
+            self._matrix.flush()
+
+    def _rewrite_keys(self) -> None:
+        assert self._matrix is not None
+        tmp = self._keys_path.with_suffix(".keys.tmp")
+        tmp.write_text("\n".join([self._header(self._matrix.shape[1]), *self._digests]) + "\n")
+        os.replace(tmp, self._keys_path)
+
+    def get_many(self, digests: Sequence[str]) -> Dict[str, np.ndarray]:
+        """Return float32 copies of the stored embeddings for the digests that are present."""
+        unique = list(dict.fromkeys(digests))
+        with self._lock, self._file_lock():
+            self._sync()
+            self._clock += 1
+            present = [digest for digest in unique if digest in self._rows]
+            self.hits += len(present)
+            self.misses += len(unique) - len(present)
+            if not present:
+                return {}
+            assert self._matrix is not None
+            rows = np.fromiter((self._rows[digest] for digest in present), dtype=np.int64, count=len(present))
+            self._last_used[rows] = self._clock
+            vectors = np.asarray(self._matrix[rows], dtype=np.float32)
+        return dict(zip(present, vectors))
+
+    def add_many(self, digests: Sequence[str], vectors: np.ndarray) -> None:
+        """Store embeddings (one row per digest), evicting old rows over the byte budget."""
+        with self._lock, self._file_lock():
+            self._sync()
+            new = {digest: row for row, digest in enumerate(digests) if digest not in self._rows}
+            if not new:
+                return
+            dim = int(vectors.shape[1])
+            if self._matrix is not None and self._matrix.shape[1] != dim:
+                raise ValueError(f"Embedding width {dim} does not match index width {self._matrix.shape[1]}")
+            max_rows = self._max_rows(dim)
+            selected = list(new.items())[-max_rows:]
+            count = len(self._digests)
+            if count + len(selected) > max_rows:
+                self._evict(min(count, max_rows // 2, max_rows - len(selected)))
+                count = len(self._digests)
+            capacity = 0 if self._matrix is None else self._matrix.shape[0]
+            if count + len(selected) > capacity:
+                self._allocate(dim, min(max_rows, max(_INITIAL_ROWS, 2 * capacity, count + len(selected))))
+            assert self._matrix is not None
+            self._clock += 1
+            end = count + len(selected)
+            self._matrix[count:end] = vectors[[row for _, row in selected]].astype(_DTYPE)
+            self._last_used[count:end] = self._clock
+            added = [digest for digest, _ in selected]
+            self._digests.extend(added)
+            self._rows.update((digest, count + offset) for offset, digest in enumerate(added))
+            if self.path is not None:
+                self._flush()
+                with open(self._keys_path, "a") as f:
+                    f.write("".join(f"{digest}\n" for digest in added))
+                self._disk_state = self._keys_state()
+
+    def clear(self) -> None:
+        """Remove every embedding, including the persisted files."""
+        with self._lock, self._file_lock():
+            self._matrix = None
+            self._digests = []
+            self._rows = {}
+            self._last_used = np.zeros(0, dtype=np.int64)
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+            if self.path is not None:
+                self.path.unlink(missing_ok=True)
+                self._keys_path.unlink(missing_ok=True)
+            self._disk_state = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get index statistics.
+
+        Returns:
+            Dictionary with index stats
+        """
+        total = self.hits + self.misses
+        hit_rate = self.hits / total if total > 0 else 0
+        dim = self.dim or 0
+        return {
+            "namespace": self.namespace,
+            "size": len(self._digests),
+            "dim": dim,
+            "bytes": len(self._digests) * dim * np.dtype(_DTYPE).itemsize,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(hit_rate, FormattingDefaults.ROUNDING_PRECISION),
+            "path": str(self.path) if self.path is not None else None,
+        }
+
+
+# Process-wide indexes, one per namespace, shared by every SemanticSimilarity with the same settings
+_embedding_indexes: Dict[str, EmbeddingIndex] = {}
+_registry_lock = threading.Lock()
+
+
+def get_embedding_index(
+    namespace: str, max_bytes: int = CacheDefaults.EMBEDDING_CACHE_MAX_MB * FileConstants.BYTES_PER_MB
+) -> EmbeddingIndex:
+    """Return the shared index for namespace, creating it on first use.
+
+    The index is memory-mapped next to the content-cache spill store when
+    content caches persist (see init_content_caches) and file locks are
+    available, and in memory otherwise.
+    """
+    with _registry_lock:
+        index = _embedding_indexes.get(namespace)
+        if index is None:
+            store = get_content_spill_store() if sys.platform != "win32" else None
+            path = store.db_path.parent / "embeddings" / f"{content_digest(namespace)}.f16" if store is not None else None
+            index = _embedding_indexes[namespace] = EmbeddingIndex(namespace, max_bytes, path)
+        return index
@@ -1,13 +1,12 @@
 """Impact analysis for deduplication refactoring."""
 
-import json
 import os
 import re
-import subprocess
-from typing import Any, Dict, List, Tuple, TypedDict, Union, cast
+from typing import Any, Dict, List, Tuple, TypedDict, Union
 
 from ...constants import SemanticVolumeDefaults
-from ...core import run_ast_grep
+from ...core import run_ast_grep_batch
+from ...core.exceptions import AstGrepError
 from ...core.logging import get_logger
 
 __all__ = [
@@ -173,15 +172,67 @@ class ImpactAnalyzer:
     def _find_all_external_refs(
         self, function_names: List[str], project_root: str, language: str, exclude_files: List[str]
     ) -> List[Dict[str, Any]]:
-        """Find all external call sites and import references combined."""
-        call_sites = self._find_external_call_sites(
-            function_names=function_names, project_root=project_root, language=language, exclude_files=exclude_files
-        )
-        import_sites = self._find_import_references(
-            function_names=function_names, project_root=project_root, language=language, exclude_files=exclude_files
-        )
+        """Find all external call sites and import references with one ast-grep scan.
+
+        Every call and import pattern for every name becomes one inline rule, so
+        the project is traversed once regardless of how many names the group has.
+        If the batch scan fails, each rule is retried in its own scan.
+        """
+        rules, routes = self._build_reference_rules(function_names, language)
+        if not rules:
+            return []
+        try:
+            matches_by_rule = run_ast_grep_batch(rules, [project_root])
+        except AstGrepError as e:
+            self.logger.warning("reference_search_batch_failed", rules=len(rules), error=str(e))
+            matches_by_rule = self._run_rules_individually(rules, project_root)
+
+        call_sites: List[Dict[str, Any]] = []
+        import_sites: List[Dict[str, Any]] = []
+        for rule_id, (kind, func_name) in routes.items():
+            matches = matches_by_rule.get(rule_id, [])
+            if kind == "call":
+                call_sites.extend(
+                    self._to_call_site_record(match, func_name, project_root)
+                    for match in matches
+                    if match.get("file", "") not in exclude_files
+                )
+            else:
+                import_sites.extend(self._process_import_matches(matches, func_name, project_root, exclude_files))
+
+        self.logger.debug("reference_search_complete", rules=len(rules), call_sites=len(call_sites), import_refs=len(import_sites))
         return call_sites + import_sites
 
+    def _run_rules_individually(self, rules: List[Dict[str, Any]], project_root: str) -> Dict[str, List[Dict[str, Any]]]:
+        """Run one scan per rule, so a rule ast-grep rejects only loses its own matches."""
+        matches_by_rule: Dict[str, List[Dict[str, Any]]] = {}
+        for rule in rules:
+            try:
+                matches_by_rule.update(run_ast_grep_batch([rule], [project_root]))
+            except AstGrepError as e:
+                self.logger.debug("reference_search_error", rule_id=rule["id"], error=str(e))
+        return matches_by_rule
+
+    def _build_reference_rules(self, function_names: List[str], language: str) -> Tuple[List[Dict[str, Any]], Dict[str, Tuple[str, str]]]:
+        """Build one inline rule per call pattern and import rule per name.
+
+        Returns:
+            Tuple of (rule documents, rule id -> (reference kind, function name));
+            routes list every call rule before any import rule
+        """
+        rules: List[Dict[str, Any]] = []
+        routes: Dict[str, Tuple[str, str]] = {}
+        for i, func_name in enumerate(function_names):
+            rule_id = f"call-{i}"
+            rules.append({"id": rule_id, "language": language, "rule": {"pattern": f"{func_name}($$$)"}})
+            routes[rule_id] = ("call", func_name)
+        for i, func_name in enumerate(function_names):
+            for j, rule in enumerate(self._get_import_rules(func_name, language.lower())):
+                rule_id = f"import-{i}-{j}"
+                rules.append({"id": rule_id, "language": language, "rule": rule})
+                routes[rule_id] = ("import", func_name)
+        return rules, routes
+
     def _extract_function_names_from_code(self, code: str, language: str) -> List[str]:
         """Extract function/method/class names from code sample.
 
@@ -236,32 +287,6 @@ class ImpactAnalyzer:
                 result.append(name)
         return result
 
-    def _find_external_call_sites(
-        self, function_names: List[str], project_root: str, language: str, exclude_files: List[str]
-    ) -> List[Dict[str, Any]]:
-        """Find call sites for functions outside the duplicate locations."""
-        call_sites: List[Dict[str, Any]] = []
-        for func_name in function_names[:10]:  # Limit to prevent too many searches
-            try:
-                call_sites.extend(self._search_call_sites_for_name(func_name, project_root, language, exclude_files))
-            except (json.JSONDecodeError, subprocess.SubprocessError) as e:
-                self.logger.debug("call_site_search_error", function=func_name, error=str(e))
-        return call_sites
-
-    def _search_call_sites_for_name(
-        self, func_name: str, project_root: str, language: str, exclude_files: List[str]
-    ) -> List[Dict[str, Any]]:
-        """Run ast-grep for one function name and return filtered call-site records."""
-        args = ["--pattern", f"{func_name}($$$)", "--lang", language, "--json", project_root]
-        result = run_ast_grep("run", args)
-        if not (result.returncode == 0 and result.stdout.strip()):
-            return []
-        return [
-            self._to_call_site_record(match, func_name, project_root)
-            for match in json.loads(result.stdout)
-            if match.get("file", "") not in exclude_files
-        ]
-
     def _to_call_site_record(self, match: Dict[str, Any], func_name: str, project_root: str) -> Dict[str, Any]:
         """Shape a single ast-grep match into a call-site dict."""
         file_path = match.get("file", "")
@@ -276,99 +301,36 @@ class ImpactAnalyzer:
             "type": "function_call",
         }
 
-    def _find_import_references(
-        self, function_names: List[str], project_root: str, language: str, exclude_files: List[str]
-    ) -> List[Dict[str, Any]]:
-        """Find import statements that reference the duplicated code."""
-        if not function_names:
-            return []
-
-        import_refs: List[Dict[str, Any]] = []
-        lang = language.lower()
-
-        # Process up to 10 function names
-        for func_name in function_names[:10]:
-            patterns = self._get_import_patterns(func_name, lang)
-            if not patterns:
-                continue
-
-            refs = self._search_import_patterns(patterns, func_name, language, project_root, exclude_files)
-            import_refs.extend(refs)
-
-        return import_refs
-
-    def _get_import_patterns(self, func_name: str, language: str) -> List[str]:
-        """Get language-specific import patterns for a function name.
+    def _get_import_rules(self, func_name: str, language: str) -> List[Dict[str, Any]]:
+        """Get language-specific ast-grep rules matching imports of a function name.
 
         Args:
             func_name: Function name to search for
             language: Language (lowercase)
 
         Returns:
-            List of ast-grep patterns to search for
+            List of ast-grep rule bodies to search for
         """
-        # Configuration-driven pattern mapping
-        pattern_map = {
-            "python": [f"from $MODULE import {func_name}", f"from $MODULE import $$$, {func_name}, $$$"],
-            "javascript": [f"import {{ {func_name} }} from $MODULE", f"import {{ $$$, {func_name}, $$$ }} from $MODULE"],
-            "typescript": [f"import {{ {func_name} }} from $MODULE", f"import {{ $$$, {func_name}, $$$ }} from $MODULE"],
-            "jsx": [f"import {{ {func_name} }} from $MODULE", f"import {{ $$$, {func_name}, $$$ }} from $MODULE"],
-            "tsx": [f"import {{ {func_name} }} from $MODULE", f"import {{ $$$, {func_name}, $$$ }} from $MODULE"],
-            "java": [f"import $$$$.{func_name}"],
+        # `import { $$$, name, $$$ } from $M` is not a valid rule for the JS family
+        # (ast-grep cannot infer its node kind), so match the named specifier instead
+        js_rules: List[Dict[str, Any]] = [
+            {
+                "kind": "import_statement",
+                "has": {"stopBy": "end", "kind": "import_specifier", "has": {"field": "name", "regex": f"^{re.escape(func_name)}$"}},
+            }
+        ]
+        # Configuration-driven rule mapping
+        rule_map: Dict[str, List[Dict[str, Any]]] = {
+            "python": [{"pattern": f"from $MODULE import {func_name}"}, {"pattern": f"from $MODULE import $$$, {func_name}, $$$"}],
+            "javascript": js_rules,
+            "typescript": js_rules,
+            "jsx": js_rules,
+            "tsx": js_rules,
+            "java": [{"pattern": f"import $$$$.{func_name}"}],
             "go": [],  # Go imports are package-level, not function-level
         }
 
-        return pattern_map.get(language, [])
-
-    def _search_import_patterns(
-        self, patterns: List[str], func_name: str, language: str, project_root: str, exclude_files: List[str]
-    ) -> List[Dict[str, Any]]:
-        """Search for import patterns using ast-grep.
-
-        Args:
-            patterns: List of patterns to search for
-            func_name: Function name being searched
-            language: Programming language
-            project_root: Project root path
-            exclude_files: Files to exclude from results
-
-        Returns:
-            List of import reference info dicts
-        """
-        import_refs = []
-
-        for pattern in patterns:
-            matches = self._execute_import_search(pattern, language, project_root)
-            if not matches:
-                continue
-
-            refs = self._process_import_matches(matches, func_name, project_root, exclude_files)
-            import_refs.extend(refs)
-
-        return import_refs
-
-    def _execute_import_search(self, pattern: str, language: str, project_root: str) -> List[Dict[str, Any]]:
-        """Execute ast-grep search for a specific pattern.
-
-        Args:
-            pattern: ast-grep pattern to search for
-            language: Programming language
-            project_root: Project root path
-
-        Returns:
-            List of match dictionaries from ast-grep
-        """
-        try:
-            args = ["--pattern", pattern, "--lang", language, "--json", project_root]
-            result = run_ast_grep("run", args)
-
-            if result.returncode != 0 or not result.stdout.strip():
-                return []
-
-            return cast(List[Dict[str, Any]], json.loads(result.stdout))
-
-        except (json.JSONDecodeError, subprocess.SubprocessError):
-            return []
+        return rule_map.get(language, [])
 
     def _process_import_matches(
         self, matches: List[Dict[str, Any]], func_name: str, project_root: str, exclude_files: List[str]
@@ -6,30 +6,68 @@ Stage 2: AST structural verification for Stage 1 candidates.
 Stage 3: Optional CodeBERT semantic similarity for Type-4 clone detection.
 """
 
+import math
 import re
 import time
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from difflib import SequenceMatcher
-from typing import Any, Dict, List, Literal, Optional, Set, Tuple
+from functools import lru_cache, partial
+from typing import Any, Dict, List, Literal, Optional, Protocol, Sequence, Set, Tuple
 
+import numpy as np
 from datasketch import MinHash, MinHashLSH
+from datasketch.hashfunc import sha1_hash32
 
 from ...constants import (
     ASTFingerprintDefaults,
+    CacheDefaults,
     ConversionFactors,
     DeduplicationDefaults,
+    FileConstants,
     FormattingDefaults,
     HybridSimilarityDefaults,
     IndentationDefaults,
     LogBucketThresholds,
     MinHashDefaults,
     SemanticSimilarityDefaults,
+    VerificationPoolDefaults,
 )
+from ...core.content_cache import ArrayCodec, ContentCache, content_digest, get_content_cache
 from ...core.logging import get_logger
+from .embedding_index import get_embedding_index
 from .scoring_scales import SimilarityDiscreteBand
+from .verification_pool import PairScorer, ScorerFactory, score_pairs
 
 COSINE_UNIT_INTERVAL_DIVISOR = 2.0
 
+# datasketch MinHash permutation constants, so batched rows equal MinHash.hashvalues
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+
+@lru_cache(maxsize=None)
+def _permutations_for(num_perm: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Return the (a, b) permutation parameters shared by every num_perm-sized signature."""
+    a, b = MinHash(num_perm=num_perm).permutations
+    return a, b
+
+
+@lru_cache(maxsize=None)
+def _lsh_band_params(threshold: float, num_perm: int) -> Tuple[int, int]:
+    """Return (bands, rows per band) that MinHashLSH picks for threshold."""
+    lsh = MinHashLSH(threshold=threshold, num_perm=num_perm)
+    return lsh.b, lsh.r
+
+
+def _minhash_from_array(hashvalues: np.ndarray) -> MinHash:
+    return MinHash(hashvalues=hashvalues, permutations=_permutations_for(len(hashvalues)))
+
+
+MINHASH_CODEC = ArrayCodec(to_array=lambda m: m.hashvalues, from_array=_minhash_from_array)
+TOKEN_COUNT_CODEC = ArrayCodec(to_array=lambda count: np.array([count], dtype=np.int64), from_array=lambda array: int(array[0]))
+# Tokenization does not depend on the similarity config, so every calculator shares one namespace
+TOKEN_COUNT_NAMESPACE = "token_count"
+
 
 @dataclass
 class SimilarityConfig:
@@ -65,6 +103,13 @@ class SimilarityConfig:
     use_small_code_fallback: bool = True
     """Use SequenceMatcher for code below small_code_threshold tokens."""
 
+    verification_workers: int = 0
+    """Worker processes that verify large candidate batches; 0 or 1 verifies in-process."""
+
+    def __post_init__(self) -> None:
+        if self.verification_workers < 0:
+            raise ValueError(f"verification_workers must be >= 0, got {self.verification_workers}")
+
 
 @dataclass
 class SimilarityResult:
@@ -103,6 +148,8 @@ class HybridSimilarityConfig:
     """Minimum AST similarity to proceed to Stage 3."""
     semantic_model_name: str = SemanticSimilarityDefaults.MODEL_NAME
     semantic_device: str = SemanticSimilarityDefaults.DEFAULT_DEVICE
+    semantic_batch_size: int = SemanticSimilarityDefaults.DEFAULT_BATCH_SIZE
+    semantic_num_threads: int = SemanticSimilarityDefaults.DEFAULT_NUM_THREADS
 
     def __post_init__(self) -> None:
         self._apply_semantic_rebalance_if_needed()
@@ -207,41 +254,130 @@ class MinHashSimilarity:
     signatures, versus SequenceMatcher's O(n²).
     """
 
-    def __init__(self, config: Optional[SimilarityConfig] = None) -> None:
+    def __init__(self, config: Optional[SimilarityConfig] = None, signature_cache: Optional[ContentCache] = None) -> None:
+        """Initialize the calculator.
+
+        Args:
+            config: MinHash settings
+            signature_cache: Cache for signatures; defaults to the process-wide cache for this config
+        """
         self.config = config or SimilarityConfig()
         self.logger = get_logger("deduplication.similarity")
-        self._signature_cache: Dict[int, MinHash] = {}
+        if signature_cache is None:
+            signature_cache = get_content_cache(
+                self.signature_namespace(self.config), CacheDefaults.SIGNATURE_CACHE_MAX_MB * FileConstants.BYTES_PER_MB, MINHASH_CODEC
+            )
+        self._signature_cache = signature_cache
+        self._token_counts = get_content_cache(
+            TOKEN_COUNT_NAMESPACE, CacheDefaults.TOKEN_COUNT_CACHE_MAX_MB * FileConstants.BYTES_PER_MB, TOKEN_COUNT_CODEC
+        )
         self._lsh_index: Optional[MinHashLSH] = None
         self._lsh_keys: Dict[str, int] = {}
 
     def create_minhash(self, code: str) -> MinHash:
         """Create a MinHash signature from code."""
-        code_hash = hash(code)
-        if code_hash in self._signature_cache:
-            return self._signature_cache[code_hash]
+        return self.create_minhash_batch([code])[0]
+
+    @staticmethod
+    def signature_namespace(config: SimilarityConfig) -> str:
+        """Cache namespace covering every setting that changes a signature."""
+        shingles = "token" if config.use_token_shingles else "char"
+        return f"minhash:{config.num_permutations}:{config.shingle_size}:{shingles}"
+
+    def create_minhash_batch(self, codes: List[str]) -> List[MinHash]:
+        """Create MinHash signatures for many snippets, computing uncached ones in one batch."""
+        digests = [content_digest(code) for code in codes]
+        found = self._signature_cache.get_many(digests)
+        missing = {digest: code for digest, code in zip(digests, codes) if digest not in found}
+        if missing:
+            matrix = self.signature_matrix(list(missing.values()))
+            computed = [(digest, _minhash_from_array(row)) for digest, row in zip(missing, matrix)]
+            self._signature_cache.put_many(computed)
+            found.update(computed)
+        return [found[digest] for digest in digests]
+
+    def signature_matrix(self, codes: List[str]) -> np.ndarray:
+        """Compute MinHash signatures for many snippets with vectorized NumPy passes.
+
+        Shingle hashes of consecutive snippets are stacked, permuted together and
+        min-reduced per snippet, in chunks of MinHashDefaults.BATCH_MAX_SHINGLES rows.
+
+        Returns:
+            uint64 matrix of shape (len(codes), num_permutations). Row i equals
+            ``create_minhash(codes[i]).hashvalues`` and rows can be compared with
+            signature_jaccard. Snippets without shingles keep the empty signature.
+        """
+        a, b = self._get_permutations()
+        matrix = np.full((len(codes), self.config.num_permutations), _MAX_HASH, dtype=np.uint64)
+        hash_memo: Dict[str, int] = {}
+        rows: List[int] = []
+        offsets: List[int] = []
+        hashes: List[int] = []
+        for row, code in enumerate(codes):
+            shingle_hashes = self._hash_shingles(code, hash_memo)
+            if not shingle_hashes:
+                continue
+            rows.append(row)
+            offsets.append(len(hashes))
+            hashes.extend(shingle_hashes)
+            if len(hashes) >= MinHashDefaults.BATCH_MAX_SHINGLES:
+                self._reduce_signature_chunk(matrix, rows, offsets, hashes, a, b)
+                rows, offsets, hashes = [], [], []
+        if rows:
+            self._reduce_signature_chunk(matrix, rows, offsets, hashes, a, b)
+        return matrix
 
-        m = MinHash(num_perm=self.config.num_permutations)
+    @staticmethod
+    def _reduce_signature_chunk(
+        matrix: np.ndarray, rows: List[int], offsets: List[int], hashes: List[int], a: np.ndarray, b: np.ndarray
+    ) -> None:
+        """Apply all permutations to a chunk of shingle hashes and min-reduce them into matrix rows."""
+        hv = np.array(hashes, dtype=np.uint64).reshape(-1, 1)
+        permuted = np.bitwise_and((hv * a + b) % _MERSENNE_PRIME, _MAX_HASH)
+        matrix[rows] = np.minimum.reduceat(permuted, offsets, axis=0)
 
-        if self.config.use_token_shingles:
-            tokens = self._tokenize(code)
-            shingles = self._create_token_shingles(tokens, self.config.shingle_size)
-        else:
-            shingles = self._create_char_shingles(code, self.config.shingle_size)
+    @staticmethod
+    def signature_jaccard(sig1: np.ndarray, sig2: np.ndarray) -> float:
+        """Estimate Jaccard similarity from two signature rows (as MinHash.jaccard)."""
+        return float(np.count_nonzero(sig1 == sig2)) / len(sig1)
 
-        for shingle in shingles:
-            m.update(shingle.encode("utf8"))
+    def _get_permutations(self) -> Tuple[np.ndarray, np.ndarray]:
+        return _permutations_for(self.config.num_permutations)
 
-        self._signature_cache[code_hash] = m
-        return m
+    def _shingles(self, code: str) -> List[str]:
+        if self.config.use_token_shingles:
+            return self._create_token_shingles(self._tokenize(code), self.config.shingle_size)
+        return self._create_char_shingles(code, self.config.shingle_size)
+
+    def _hash_shingles(self, code: str, memo: Dict[str, int]) -> List[int]:
+        """Hash the distinct shingles of code, reusing hashes already computed in this batch."""
+        hashes = []
+        for shingle in set(self._shingles(code)):
+            value = memo.get(shingle)
+            if value is None:
+                value = memo[shingle] = sha1_hash32(shingle.encode("utf8"))
+            hashes.append(value)
+        return hashes
+
+    def _token_count(self, code: str) -> int:
+        return self._token_counts_for([code])[0]
+
+    def _token_counts_for(self, codes: Sequence[str]) -> List[int]:
+        """Token counts of many snippets, tokenizing only those not in the shared cache."""
+        digests = [content_digest(code) for code in codes]
+        found = self._token_counts.get_many(digests)
+        missing = {digest: len(self._tokenize(code)) for digest, code in zip(digests, codes) if digest not in found}
+        if missing:
+            self._token_counts.put_many(missing.items())
+            found.update(missing)
+        return [found[digest] for digest in digests]
 
     def estimate_similarity(self, code1: str, code2: str) -> float:
         """Estimate similarity using MinHash, with SequenceMatcher fallback for small code."""
         if not code1 or not code2:
             return 0.0
 
-        tokens1 = self._tokenize(code1)
-        tokens2 = self._tokenize(code2)
-        min_tokens = min(len(tokens1), len(tokens2))
+        min_tokens = min(self._token_count(code1), self._token_count(code2))
 
         if self.config.use_small_code_fallback and min_tokens < self.config.small_code_threshold:
             self.logger.debug(
@@ -250,7 +386,7 @@ class MinHashSimilarity:
                 threshold=self.config.small_code_threshold,
                 method="SequenceMatcher",
             )
-            return SequenceMatcher(None, tokens1, tokens2).ratio()
+            return SequenceMatcher(None, self._tokenize(code1), self._tokenize(code2)).ratio()
 
         self.logger.debug(
             "minhash_standard_path",
@@ -261,6 +397,32 @@ class MinHashSimilarity:
         m2 = self.create_minhash(code2)
         return float(m1.jaccard(m2))
 
+    def estimate_similarities(self, pairs: Sequence[Tuple[str, str]]) -> List[float]:
+        """Batch form of estimate_similarity, scored by worker processes when configured."""
+        scores = self.score_pairs_in_pool(pairs, partial(_minhash_pair_scorer, self.config))
+        if scores is None:
+            self._token_counts_for([code for pair in pairs for code in pair if code])
+            return [self.estimate_similarity(code1, code2) for code1, code2 in pairs]
+        return [float(score) for score in scores[:, 0]]
+
+    def uses_verification_pool(self, pair_count: int) -> bool:
+        """True if a batch of pair_count pairs is scored by worker processes."""
+        return self.config.verification_workers > 1 and pair_count >= VerificationPoolDefaults.MIN_PAIRS
+
+    def score_pairs_in_pool(self, pairs: Sequence[Tuple[str, str]], build_scorer: ScorerFactory) -> Optional[np.ndarray]:
+        """Score pairs with build_scorer in worker processes, or return None to score in-process.
+
+        Signatures are computed (or read from the cache) here, once per distinct
+        snippet, and shared with the workers together with the snippets.
+        """
+        if not self.uses_verification_pool(len(pairs)):
+            return None
+        index: Dict[str, int] = {}
+        index_pairs = [(index.setdefault(code1, len(index)), index.setdefault(code2, len(index))) for code1, code2 in pairs]
+        codes = list(index)
+        signatures = np.stack([m.hashvalues for m in self.create_minhash_batch(codes)])
+        return score_pairs(codes, signatures, index_pairs, build_scorer, self.config.verification_workers)
+
     def calculate_similarity(self, code1: str, code2: str) -> SimilarityResult:
         """Calculate similarity with full result details."""
         if not code1 or not code2:
@@ -283,8 +445,8 @@ class MinHashSimilarity:
         )
         self._lsh_keys = {}
 
-        for key, code in code_items:
-            m = self.create_minhash(code)
+        signatures = self.create_minhash_batch([code for _, code in code_items])
+        for (key, code), m in zip(code_items, signatures):
             self._insert_lsh_key(key, code, m)
 
         self.logger.info(
@@ -319,15 +481,7 @@ class MinHashSimilarity:
         if not code_items:
             return []
 
-        small_code_count = self._count_small_code_items(code_items)
-        lsh_threshold = self._calculate_adaptive_threshold(min_similarity)
-        self.build_lsh_index(code_items, threshold=lsh_threshold)
-        candidates = self._find_lsh_candidates(code_items, lsh_threshold)
-
-        use_fallback = self._should_use_fallback(candidates, code_items, small_code_count)
-        if use_fallback:
-            candidates = self._generate_all_pairs(code_items)
-
+        candidates, use_fallback = self._candidate_pairs_with_fallback(code_items, min_similarity)
         similar_pairs = self._verify_candidates(candidates, code_items, min_similarity)
         self.logger.info(
             "similar_pairs_verified",
@@ -338,9 +492,62 @@ class MinHashSimilarity:
         )
         return similar_pairs
 
+    def find_candidate_pairs(
+        self,
+        code_items: List[Tuple[str, str]],
+        min_similarity: float = DeduplicationDefaults.MIN_SIMILARITY,
+        lsh_candidates: Optional[Set[Tuple[str, str]]] = None,
+    ) -> Set[Tuple[str, str]]:
+        """Return unverified (key1, key2) candidate pairs from one LSH index over all items.
+
+        Uses the same adaptive threshold and small-code fallback as
+        find_all_similar_pairs, but leaves verification to the caller.
+        lsh_candidates, if given, are band collisions computed elsewhere (see
+        band_keys) and replace building the in-memory index.
+        """
+        if not code_items:
+            return set()
+        candidates, _ = self._candidate_pairs_with_fallback(code_items, min_similarity, lsh_candidates)
+        return candidates
+
+    def lsh_band_params(self, min_similarity: float) -> Tuple[int, int]:
+        """Return the (bands, rows per band) LSH layout used for min_similarity."""
+        return _lsh_band_params(self._calculate_adaptive_threshold(min_similarity), self.config.num_permutations)
+
+    @staticmethod
+    def band_keys(signature: np.ndarray, bands: int, rows: int) -> List[bytes]:
+        """Return the LSH bucket key of each band; two signatures are LSH candidates iff one key matches."""
+        return [signature[band * rows : (band + 1) * rows].tobytes() for band in range(bands)]
+
+    def prime_signatures(self, items: List[Tuple[str, np.ndarray]]) -> None:
+        """Seed the signature cache with (content digest, hash values) computed earlier."""
+        self._signature_cache.put_many([(digest, _minhash_from_array(hashvalues)) for digest, hashvalues in items])
+
+    def _candidate_pairs_with_fallback(
+        self,
+        code_items: List[Tuple[str, str]],
+        min_similarity: float,
+        lsh_candidates: Optional[Set[Tuple[str, str]]] = None,
+    ) -> Tuple[Set[Tuple[str, str]], bool]:
+        """Build the LSH index and collect candidates, falling back to all pairs when LSH finds none."""
+        small_code_count = self._count_small_code_items(code_items)
+        if lsh_candidates is None:
+            lsh_threshold = self._calculate_adaptive_threshold(min_similarity)
+            self.build_lsh_index(code_items, threshold=lsh_threshold)
+            candidates = self._find_lsh_candidates(code_items, lsh_threshold)
+        else:
+            candidates = lsh_candidates
+
+        use_fallback = self._should_use_fallback(candidates, code_items, small_code_count)
+        if use_fallback:
+            candidates = self._generate_all_pairs(code_items)
+        return candidates, use_fallback
+
     def _count_small_code_items(self, code_items: List[Tuple[str, str]]) -> int:
         """Count items below the small code token threshold."""
-        small_code_count = sum(1 for _, code in code_items if len(self._tokenize(code)) < self.config.small_code_token_threshold)
+        small_code_count = sum(
+            1 for count in self._token_counts_for([code for _, code in code_items]) if count < self.config.small_code_token_threshold
+        )
 
         if small_code_count > 0:
             self.logger.info(
@@ -411,12 +618,9 @@ class MinHashSimilarity:
     ) -> List[Tuple[str, str, float]]:
         """Filter candidate pairs to those meeting the minimum similarity threshold."""
         code_map = dict(code_items)
-        return [
-            (k1, k2, sim)
-            for k1, k2 in candidates
-            for sim in (self.estimate_similarity(code_map[k1], code_map[k2]),)
-            if sim >= min_similarity
-        ]
+        ordered = sorted(candidates)
+        scores = self.estimate_similarities([(code_map[k1], code_map[k2]) for k1, k2 in ordered])
+        return [(k1, k2, sim) for (k1, k2), sim in zip(ordered, scores) if sim >= min_similarity]
 
     def _generate_all_pairs(
         self,
@@ -433,8 +637,9 @@ class MinHashSimilarity:
         return pairs
 
     def clear_cache(self) -> None:
-        """Clear the signature cache and LSH index."""
+        """Clear the signature cache (shared by calculators with the same config) and LSH index."""
         self._signature_cache.clear()
+        self._token_counts.clear()
         self._lsh_index = None
         self._lsh_keys.clear()
 
@@ -472,7 +677,14 @@ class HybridSimilarity:
         self,
         minhash_config: Optional[SimilarityConfig] = None,
         hybrid_config: Optional[HybridSimilarityConfig] = None,
+        semantic: Optional["SemanticSimilarity"] = None,
+        signature_cache: Optional[ContentCache] = None,
     ) -> None:
+        """Initialize the pipeline.
+
+        semantic replaces the lazily built CodeBERT calculator for Stage 3, and
+        signature_cache the process-wide MinHash signature cache.
+        """
         # Backward compatibility: some callers pass HybridSimilarityConfig as first arg.
         if isinstance(minhash_config, HybridSimilarityConfig) and hybrid_config is None:
             hybrid_config = minhash_config
@@ -481,15 +693,17 @@ class HybridSimilarity:
         self.minhash_config = minhash_config or SimilarityConfig()
         self.hybrid_config = hybrid_config or HybridSimilarityConfig()
         self.logger = get_logger("deduplication.hybrid_similarity")
-        self._minhash = MinHashSimilarity(self.minhash_config)
-        self._semantic: Optional["SemanticSimilarity"] = None
-        self._semantic_available: Optional[bool] = None
+        self._minhash = MinHashSimilarity(self.minhash_config, signature_cache)
+        self._semantic: Optional["SemanticSimilarity"] = semantic
+        self._semantic_available: Optional[bool] = True if semantic is not None else None
 
     def _try_init_semantic(self) -> Optional["SemanticSimilarity"]:
         try:
             semantic_config = SemanticSimilarityConfig(
                 model_name=self.hybrid_config.semantic_model_name,
                 device=self.hybrid_config.semantic_device,
+                batch_size=self.hybrid_config.semantic_batch_size,
+                num_threads=self.hybrid_config.semantic_num_threads,
             )
             self._semantic = SemanticSimilarity(semantic_config)
             self._semantic_available = True
@@ -529,30 +743,38 @@ class HybridSimilarity:
             semantic_model=None,
         )
 
-    def _run_stage1_filter(
-        self,
-        code1: str,
-        code2: str,
-        tokens1: List[str],
-        tokens2: List[str],
-        avg_token_count: int,
-    ) -> Tuple[float, Optional[HybridSimilarityResult]]:
-        """Run Stage 1 MinHash filter. Returns (score, early_exit_result or None)."""
+    def _stage1_similarity(self, code1: str, code2: str, tokens1: List[str], tokens2: List[str]) -> float:
+        """Run the Stage 1 MinHash filter; small-code pairs below the exit threshold get a token SequenceMatcher second look."""
         minhash_sim = self._minhash.estimate_similarity(code1, code2)
-
         below_threshold = minhash_sim < self.hybrid_config.minhash_early_exit_threshold
         if below_threshold and self.hybrid_config.enable_semantic and self.minhash_config.use_small_code_fallback:
             minhash_sim = max(minhash_sim, SequenceMatcher(None, tokens1, tokens2).ratio())
+        return minhash_sim
 
-        if minhash_sim >= self.hybrid_config.minhash_early_exit_threshold:
-            return minhash_sim, None
-
+    def _stage_scores(self, code1: str, code2: str) -> Tuple[float, float, int]:
+        """Return the Stage 1 score, the Stage 2 score (NaN after an early exit) and the average token count."""
+        tokens1 = self._minhash._tokenize(code1)
+        tokens2 = self._minhash._tokenize(code2)
+        avg_token_count = (len(tokens1) + len(tokens2)) // 2
+        minhash_sim = self._stage1_similarity(code1, code2, tokens1, tokens2)
+        if minhash_sim < self.hybrid_config.minhash_early_exit_threshold:
+            return minhash_sim, math.nan, avg_token_count
+        return minhash_sim, self._calculate_ast_similarity(code1, code2), avg_token_count
+
+    def _stage_scores_batch(self, pairs: Sequence[Tuple[str, str]]) -> List[Tuple[float, float, int]]:
+        """Stage 1 and 2 scores of every pair, from worker processes when the MinHash config enables them."""
+        scores = self._minhash.score_pairs_in_pool(pairs, partial(_hybrid_pair_scorer, self.minhash_config, self.hybrid_config))
+        if scores is None:
+            return [self._stage_scores(code1, code2) for code1, code2 in pairs]
+        return [(float(minhash_sim), float(ast_sim), int(tokens)) for minhash_sim, ast_sim, tokens in scores]
+
+    def _build_early_exit_result(self, minhash_sim: float, avg_token_count: int) -> HybridSimilarityResult:
         self.logger.debug(
             "hybrid_early_exit",
             minhash_similarity=round(minhash_sim, FormattingDefaults.SIMILARITY_PRECISION),
             threshold=self.hybrid_config.minhash_early_exit_threshold,
         )
-        return minhash_sim, HybridSimilarityResult(
+        return HybridSimilarityResult(
             similarity=minhash_sim,
             method="minhash",
             verified=False,
@@ -600,55 +822,86 @@ class HybridSimilarity:
         code2: str,
     ) -> HybridSimilarityResult:
         """Calculate similarity using the hybrid two/three-stage pipeline."""
-        if not code1 or not code2:
-            return self._build_empty_similarity_result()
-
-        tokens1 = self._minhash._tokenize(code1)
-        tokens2 = self._minhash._tokenize(code2)
-        avg_token_count = (len(tokens1) + len(tokens2)) // 2
+        return self.calculate_hybrid_similarity_batch([(code1, code2)])[0]
 
-        minhash_sim, early_exit_result = self._run_stage1_filter(code1, code2, tokens1, tokens2, avg_token_count)
-        if early_exit_result is not None:
-            return early_exit_result
+    def calculate_hybrid_similarity_batch(self, pairs: Sequence[Tuple[str, str]]) -> List[HybridSimilarityResult]:
+        """Run the pipeline over many pairs, batching Stage 3 for every pair that reaches it.
 
-        ast_sim = self._calculate_ast_similarity(code1, code2)
+        Stages 1 and 2 run per pair, in worker processes for large batches when
+        the MinHash config sets verification_workers; the snippets of all pairs
+        that pass Stage 2 are embedded together, so each distinct snippet is
+        encoded at most once.
+        """
+        results: List[Optional[HybridSimilarityResult]] = []
+        stage3: List[Tuple[int, float, float, int]] = []
         semantic_calc = self._get_semantic_calculator()
+        scored = [index for index, (code1, code2) in enumerate(pairs) if code1 and code2]
+        stage_scores = dict(zip(scored, self._stage_scores_batch([pairs[index] for index in scored])))
+        for index in range(len(pairs)):
+            if index not in stage_scores:
+                results.append(self._build_empty_similarity_result())
+                continue
+            minhash_sim, ast_sim, avg_token_count = stage_scores[index]
+            if math.isnan(ast_sim):
+                results.append(self._build_early_exit_result(minhash_sim, avg_token_count))
+                continue
+
+            if semantic_calc is not None and ast_sim >= self.hybrid_config.semantic_stage_threshold:
+                stage3.append((index, minhash_sim, ast_sim, avg_token_count))
+                results.append(None)
+            else:
+                results.append(self._build_two_stage_result(minhash_sim, ast_sim, avg_token_count))
 
-        if semantic_calc is not None and ast_sim >= self.hybrid_config.semantic_stage_threshold:
-            return self._calculate_with_semantic(code1, code2, minhash_sim, ast_sim, avg_token_count, semantic_calc)
+        if stage3 and semantic_calc is not None:
+            for index, result in self._calculate_with_semantic(pairs, stage3, semantic_calc):
+                results[index] = result
+        return [result for result in results if result is not None]
 
-        return self._build_two_stage_result(minhash_sim, ast_sim, avg_token_count)
+    def estimate_similarities(self, pairs: Sequence[Tuple[str, str]]) -> List[float]:
+        """Batch form of estimate_similarity."""
+        return [result.similarity for result in self.calculate_hybrid_similarity_batch(pairs)]
+
+    @property
+    def semantic_enabled(self) -> bool:
+        """True if Stage 3 is configured; batching pairs then saves model inference."""
+        return self.hybrid_config.enable_semantic
 
     def _calculate_with_semantic(
         self,
-        code1: str,
-        code2: str,
-        minhash_sim: float,
-        ast_sim: float,
-        token_count: int,
+        pairs: Sequence[Tuple[str, str]],
+        stage3: List[Tuple[int, float, float, int]],
         semantic_calc: "SemanticSimilarity",
-    ) -> HybridSimilarityResult:
-        """Run Stage 3 semantic similarity, falling back to two-stage on error."""
+    ) -> List[Tuple[int, HybridSimilarityResult]]:
+        """Run Stage 3 semantic similarity for (index, minhash, ast, tokens) entries, falling back to two-stage on error."""
         try:
-            semantic_sim = semantic_calc.calculate_similarity(code1, code2)
-            return self._build_three_stage_result(minhash_sim, ast_sim, semantic_sim, token_count, semantic_calc)
+            semantic_sims = semantic_calc.calculate_similarities([pairs[index] for index, _, _, _ in stage3])
         except Exception as e:
-            self.logger.warning("semantic_similarity_failed", error=str(e), fallback="two_stage")
-            combined = self.hybrid_config.minhash_weight * minhash_sim + self.hybrid_config.ast_weight * ast_sim
-            return HybridSimilarityResult(
-                similarity=combined,
-                method="hybrid",
-                verified=True,
-                minhash_similarity=minhash_sim,
-                ast_similarity=ast_sim,
-                semantic_similarity=None,
-                stage1_passed=True,
-                stage2_passed=True,
-                early_exit=False,
-                semantic_skipped=True,
-                token_count=token_count,
-                semantic_model=None,
-            )
+            self.logger.warning("semantic_similarity_failed", error=str(e), fallback="two_stage", pairs=len(stage3))
+            return [
+                (index, self._build_semantic_fallback_result(minhash_sim, ast_sim, tokens))
+                for index, minhash_sim, ast_sim, tokens in stage3
+            ]
+        return [
+            (index, self._build_three_stage_result(minhash_sim, ast_sim, semantic_sim, tokens, semantic_calc))
+            for (index, minhash_sim, ast_sim, tokens), semantic_sim in zip(stage3, semantic_sims)
+        ]
+
+    def _build_semantic_fallback_result(self, minhash_sim: float, ast_sim: float, token_count: int) -> HybridSimilarityResult:
+        combined = self.hybrid_config.minhash_weight * minhash_sim + self.hybrid_config.ast_weight * ast_sim
+        return HybridSimilarityResult(
+            similarity=combined,
+            method="hybrid",
+            verified=True,
+            minhash_similarity=minhash_sim,
+            ast_similarity=ast_sim,
+            semantic_similarity=None,
+            stage1_passed=True,
+            stage2_passed=True,
+            early_exit=False,
+            semantic_skipped=True,
+            token_count=token_count,
+            semantic_model=None,
+        )
 
     def _build_three_stage_result(
         self,
@@ -823,6 +1076,29 @@ class HybridSimilarity:
         self._minhash.clear_cache()
 
 
+def _worker_signature_cache(config: SimilarityConfig, codes: List[str], signatures: np.ndarray) -> ContentCache:
+    """Build a worker-private signature cache primed with the batch's signatures."""
+    cache = ContentCache(
+        MinHashSimilarity.signature_namespace(config), CacheDefaults.SIGNATURE_CACHE_MAX_MB * FileConstants.BYTES_PER_MB, MINHASH_CODEC
+    )
+    cache.put_many([(content_digest(code), _minhash_from_array(row)) for code, row in zip(codes, signatures)])
+    return cache
+
+
+def _minhash_pair_scorer(config: SimilarityConfig, codes: List[str], signatures: np.ndarray) -> PairScorer:
+    """Worker scorer for MinHashSimilarity.estimate_similarities."""
+    calculator = MinHashSimilarity(replace(config, verification_workers=0), _worker_signature_cache(config, codes, signatures))
+    return lambda code1, code2: (calculator.estimate_similarity(code1, code2),)
+
+
+def _hybrid_pair_scorer(
+    minhash_config: SimilarityConfig, hybrid_config: HybridSimilarityConfig, codes: List[str], signatures: np.ndarray
+) -> PairScorer:
+    """Worker scorer for the Stage 1 and 2 scores of HybridSimilarity; Stage 3 stays in the parent."""
+    config = replace(minhash_config, verification_workers=0)
+    return HybridSimilarity(config, hybrid_config, signature_cache=_worker_signature_cache(config, codes, signatures))._stage_scores
+
+
 @dataclass
 class SimilarityBucket:
     """A bucket of potentially similar code items."""
@@ -1104,6 +1380,9 @@ class SemanticSimilarityConfig:
     device: str = "auto"
     """Device for inference: 'auto', 'cpu', 'cuda', or 'mps'."""
     batch_size: int = SemanticSimilarityDefaults.DEFAULT_BATCH_SIZE
+    """Snippets per padded inference mini-batch."""
+    num_threads: int = SemanticSimilarityDefaults.DEFAULT_NUM_THREADS
+    """torch intra-op threads for CPU inference (0 keeps torch's default)."""
     cache_embeddings: bool = True
     normalize_embeddings: bool = True
     """L2-normalize embeddings (recommended for cosine similarity)."""
@@ -1156,6 +1435,19 @@ class SemanticSimilarityResult:
         }
 
 
+class EmbeddingEncoder(Protocol):
+    """Turns code snippets into embedding rows; lets a small local model stand in for CodeBERT."""
+
+    def encode(self, codes: Sequence[str]) -> np.ndarray:
+        """Return a (len(codes), dim) float array."""
+        ...
+
+
+def _unit_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms == 0, 1.0, norms)
+
+
 class SemanticSimilarity:
     """
     CodeBERT-based semantic similarity for Type-4 clone detection.
@@ -1165,18 +1457,20 @@ class SemanticSimilarity:
     Requires optional deps: `pip install transformers torch`
     """
 
-    def __init__(self, config: Optional[SemanticSimilarityConfig] = None) -> None:
+    def __init__(self, config: Optional[SemanticSimilarityConfig] = None, encoder: Optional[EmbeddingEncoder] = None) -> None:
         """
-        Raises ImportError if transformers or torch are not installed.
+        The CodeBERT model is loaded on first use unless an encoder is given;
+        loading raises ImportError if transformers or torch are not installed.
         """
         self.config = config or SemanticSimilarityConfig()
         self.logger = get_logger("deduplication.semantic_similarity")
+        self._encoder = encoder
         self._model: Any = None
         self._tokenizer: Any = None
         self._device: Optional[str] = None
-        self._embedding_cache: Dict[int, Any] = {}
-        self._cache_hits = 0
-        self._cache_misses = 0
+        self._embedding_index = get_embedding_index(
+            self.embedding_namespace(self.config, encoder), CacheDefaults.EMBEDDING_CACHE_MAX_MB * FileConstants.BYTES_PER_MB
+        )
         self._initialized = False
 
     @staticmethod
@@ -1221,53 +1515,91 @@ class SemanticSimilarity:
             return "mps"
         return "cpu"
 
-    def _run_model_inference(self, code: str) -> Any:
+    def _run_model_inference(self, codes: Sequence[str]) -> np.ndarray:
+        """Embed codes with CodeBERT in padded mini-batches of similar-length snippets."""
         import torch
 
-        inputs = self._tokenizer(
-            code,
-            return_tensors="pt",
-            truncation=True,
-            max_length=self.config.max_length,
-            padding=True,
-        )
-        inputs = {k: v.to(self._device) for k, v in inputs.items()}
-        with torch.no_grad():
-            outputs = self._model(**inputs)
-            embedding = outputs.last_hidden_state[:, 0, :].squeeze(0)
-        if self.config.normalize_embeddings:
-            embedding = torch.nn.functional.normalize(embedding, p=2, dim=0)
-        return embedding
-
-    def get_embedding(self, code: str) -> Any:
-        """Generate a (768,) embedding tensor for code using CodeBERT."""
+        if self.config.num_threads > 0:
+            torch.set_num_threads(self.config.num_threads)
+        # Sorting by length keeps padding within each mini-batch small
+        order = sorted(range(len(codes)), key=lambda i: len(codes[i]))
+        chunks = []
+        for start in range(0, len(order), self.config.batch_size):
+            batch = [codes[i] for i in order[start : start + self.config.batch_size]]
+            inputs = self._tokenizer(batch, return_tensors="pt", truncation=True, max_length=self.config.max_length, padding=True)
+            inputs = {k: v.to(self._device) for k, v in inputs.items()}
+            with torch.no_grad():
+                embeddings = self._model(**inputs).last_hidden_state[:, 0, :]
+            if self.config.normalize_embeddings:
+                embeddings = torch.nn.functional.normalize(embeddings, p=2, dim=1)
+            chunks.append(embeddings.float().cpu().numpy())
+        result = np.empty((len(codes), chunks[0].shape[1]), dtype=np.float32)
+        result[order] = np.concatenate(chunks)
+        return result
+
+    def _encode(self, codes: Sequence[str]) -> np.ndarray:
+        if self._encoder is not None:
+            return np.asarray(self._encoder.encode(codes), dtype=np.float32)
         self._load_model()
-        code_hash = hash(code)
-        if self.config.cache_embeddings and code_hash in self._embedding_cache:
-            self._cache_hits += 1
-            return self._embedding_cache[code_hash]
-        self._cache_misses += 1
-        embedding = self._run_model_inference(code)
-        if self.config.cache_embeddings:
-            self._embedding_cache[code_hash] = embedding
-        return embedding
+        return self._run_model_inference(codes)
 
-    def calculate_similarity(self, code1: str, code2: str) -> float:
-        """Cosine similarity between CodeBERT embeddings, blended with lexical overlap."""
-        if not code1 or not code2:
-            return 0.0
+    @staticmethod
+    def embedding_namespace(config: SemanticSimilarityConfig, encoder: Optional[EmbeddingEncoder] = None) -> str:
+        """Index namespace covering every setting that changes an embedding."""
+        model = type(encoder).__qualname__ if encoder is not None else config.model_name
+        return f"embedding:{model}:{config.max_length}:{int(config.normalize_embeddings)}"
 
-        import torch.nn.functional as functional
+    def embed_batch(self, codes: Sequence[str]) -> np.ndarray:
+        """Return a (len(codes), dim) float32 embedding matrix, encoding only snippets not yet indexed.
 
-        emb1 = self.get_embedding(code1)
-        emb2 = self.get_embedding(code2)
+        Vectors are rounded through float16 whether or not they came from the
+        index, so scores do not depend on cache state.
+        """
+        if not codes:
+            return np.zeros((0, 0), dtype=np.float32)
+        digests = [content_digest(code) for code in codes]
+        found = self._embedding_index.get_many(digests) if self.config.cache_embeddings else {}
+        missing = {digest: code for digest, code in zip(digests, codes) if digest not in found}
+        if missing:
+            vectors = self._encode(list(missing.values())).astype(np.float16)
+            if self.config.cache_embeddings:
+                self._embedding_index.add_many(list(missing), vectors)
+            found.update(zip(missing, vectors.astype(np.float32)))
+            self.logger.debug("embeddings_computed", computed=len(missing), cached=len(set(digests)) - len(missing))
+        return np.stack([found[digest] for digest in digests])
+
+    def get_embedding(self, code: str) -> np.ndarray:
+        """Generate an embedding vector for code (768 floats with CodeBERT)."""
+        embedding: np.ndarray = self.embed_batch([code])[0]
+        return embedding
 
-        embedding_cosine: float = functional.cosine_similarity(
-            emb1.unsqueeze(0),
-            emb2.unsqueeze(0),
-            dim=1,
-        ).item()
+    def similarity_matrix(self, codes: Sequence[str]) -> np.ndarray:
+        """Cosine similarity between every pair of codes, as one matrix product."""
+        embeddings = _unit_rows(self.embed_batch(codes))
+        matrix: np.ndarray = embeddings @ embeddings.T
+        return matrix
 
+    def calculate_similarity(self, code1: str, code2: str) -> float:
+        """Cosine similarity between CodeBERT embeddings, blended with lexical overlap."""
+        return self.calculate_similarities([(code1, code2)])[0]
+
+    def calculate_similarities(self, pairs: Sequence[Tuple[str, str]]) -> List[float]:
+        """Score many pairs, embedding their distinct snippets in one batched pass."""
+        scores = [0.0] * len(pairs)
+        live = [i for i, (code1, code2) in enumerate(pairs) if code1 and code2]
+        if not live:
+            return scores
+        codes = list(dict.fromkeys(code for i in live for code in pairs[i]))
+        position = {code: row for row, code in enumerate(codes)}
+        embeddings = _unit_rows(self.embed_batch(codes))
+        left = embeddings[[position[pairs[i][0]] for i in live]]
+        right = embeddings[[position[pairs[i][1]] for i in live]]
+        cosines = np.einsum("ij,ij->i", left, right)
+        for i, cosine in zip(live, cosines):
+            scores[i] = self._blend_scores(pairs[i][0], pairs[i][1], float(cosine))
+        return scores
+
+    def _blend_scores(self, code1: str, code2: str, embedding_cosine: float) -> float:
         # Normalize cosine to [0,1] and blend with lexical score.
         # CodeBERT cosine is anisotropic for short snippets; lexical signal improves separation.
         semantic_score = (embedding_cosine + 1.0) / COSINE_UNIT_INTERVAL_DIVISOR
@@ -1323,16 +1655,11 @@ class SemanticSimilarity:
         )
 
     def clear_cache(self) -> None:
-        """Clear the embedding cache."""
-        self._embedding_cache.clear()
-        self._cache_hits = 0
-        self._cache_misses = 0
+        """Clear the embedding index (shared by calculators with the same model settings)."""
+        self._embedding_index.clear()
         self.logger.debug("embedding_cache_cleared")
 
-    def get_cache_stats(self) -> Dict[str, int]:
-        """Return cache size, hits, and misses."""
-        return {
-            "cache_size": len(self._embedding_cache),
-            "hits": self._cache_hits,
-            "misses": self._cache_misses,
-        }
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Return index size, hits, misses, bytes and evictions."""
+        stats = self._embedding_index.get_stats()
+        return {"cache_size": stats["size"], **stats}
@@ -0,0 +1,328 @@
+"""
+Batched extraction of literals, conditionals and calls from code snippets.
+
+PatternAnalyzer compares these constructs across the instances of a duplicate
+group. Python snippets are parsed in-process with ``ast``; snippets in other
+languages (and Python snippets ``ast`` cannot mirror exactly) are written to
+one temporary directory and matched by a single ast-grep scan that carries one
+rule per construct, with matches routed back by file and rule id.
+
+Both paths report the same shape as ast-grep: 0-based lines, character
+columns, node text, nested nodes included, outer nodes before inner ones.
+"""
+
+import ast
+import io
+import os
+import re
+import tempfile
+import tokenize
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from ...core.executor import run_ast_grep_batch
+from ...core.logging import get_logger
+
+logger = get_logger("deduplication.snippet_constructs")
+
+LITERAL_TYPES = ("string", "number", "boolean")
+
+_JS_KINDS: Dict[str, Tuple[str, ...]] = {
+    "string": ("string", "template_string"),
+    "number": ("number",),
+    "boolean": ("true", "false", "null", "undefined"),
+    "conditional": ("if_statement", "binary_expression", "ternary_expression"),
+    "call": ("call_expression",),
+}
+
+_C_KINDS: Dict[str, Tuple[str, ...]] = {
+    "string": ("string_literal",),
+    "number": ("number_literal",),
+    "boolean": ("true", "false", "null"),
+    "conditional": ("if_statement", "binary_expression", "conditional_expression"),
+    "call": ("call_expression",),
+}
+
+# Tree-sitter node kinds of each construct, per grammar; an inline rule naming a
+# kind its grammar lacks fails to parse, so every language needs its own table
+_CONSTRUCT_KINDS: Dict[str, Dict[str, Tuple[str, ...]]] = {
+    "python": {
+        "string": ("string",),
+        "number": ("integer", "float"),
+        "boolean": ("true", "false", "none"),
+        "conditional": ("if_statement", "elif_clause", "comparison_operator"),
+        "call": ("call",),
+    },
+    "javascript": _JS_KINDS,
+    "typescript": _JS_KINDS,
+    "tsx": _JS_KINDS,
+    "java": {
+        "string": ("string_literal",),
+        "number": ("decimal_integer_literal", "decimal_floating_point_literal", "hex_integer_literal"),
+        "boolean": ("true", "false", "null_literal"),
+        "conditional": ("if_statement", "binary_expression", "ternary_expression"),
+        "call": ("method_invocation",),
+    },
+    "csharp": {
+        "string": ("string_literal", "raw_string_literal"),
+        "number": ("integer_literal", "real_literal"),
+        "boolean": ("boolean_literal", "null_literal"),
+        "conditional": ("if_statement", "binary_expression", "conditional_expression"),
+        "call": ("invocation_expression",),
+    },
+    "c": _C_KINDS,
+    "cpp": {**_C_KINDS, "string": ("string_literal", "raw_string_literal")},
+    "go": {
+        "string": ("interpreted_string_literal", "raw_string_literal"),
+        "number": ("int_literal", "float_literal"),
+        "boolean": ("true", "false", "nil"),
+        "conditional": ("if_statement", "binary_expression"),
+        "call": ("call_expression",),
+    },
+}
+
+# language -> (ast-grep rule language, snippet file extension)
+_SCAN_LANGUAGES: Dict[str, Tuple[str, str]] = {
+    "python": ("python", ".py"),
+    "javascript": ("javascript", ".js"),
+    "jsx": ("javascript", ".js"),
+    "typescript": ("typescript", ".ts"),
+    "tsx": ("tsx", ".tsx"),
+    "java": ("java", ".java"),
+    "csharp": ("csharp", ".cs"),
+    "c": ("c", ".c"),
+    "cpp": ("cpp", ".cpp"),
+    "go": ("go", ".go"),
+}
+
+_NEWLINE_RE = re.compile(r"\r\n|\r|\n")
+
+_Located = Union[ast.expr, ast.stmt, ast.pattern]
+
+
+@dataclass
+class SnippetConstructs:
+    """Constructs found in one snippet.
+
+    Attributes:
+        literals: Literal type -> [{line, column, value, type}]
+        conditionals: [{line, text, kind}] for if/elif statements and comparisons
+        calls: ast-grep style matches ({text, range}) for every call expression
+    """
+
+    literals: Dict[str, List[Dict[str, Any]]] = field(default_factory=lambda: {t: [] for t in LITERAL_TYPES})
+    conditionals: List[Dict[str, Any]] = field(default_factory=list)
+    calls: List[Dict[str, Any]] = field(default_factory=list)
+
+
+class _UnsupportedSnippetError(Exception):
+    """The snippet has a construct the ast fast path cannot report like tree-sitter."""
+
+
+def _span_key(item: Tuple[Tuple[int, int, int, int], Dict[str, Any]]) -> Tuple[int, int, int, int]:
+    start_line, start_col, end_line, end_col = item[0]
+    return (start_line, start_col, -end_line, -end_col)
+
+
+def _call_match(span: Tuple[int, int, int, int], text: str) -> Dict[str, Any]:
+    return {"text": text, "range": {"start": {"line": span[0], "column": span[1]}, "end": {"line": span[2], "column": span[3]}}}
+
+
+class _PythonConstructCollector(ast.NodeVisitor):
+    """Collects literals, conditionals and calls with tree-sitter positions and kinds."""
+
+    def __init__(self, code: str) -> None:
+        self.code = code
+        self.line_starts = [0] + [m.end() for m in _NEWLINE_RE.finditer(code)]
+        self.literals: Dict[str, List[Tuple[Tuple[int, int, int, int], Dict[str, Any]]]] = {t: [] for t in LITERAL_TYPES}
+        self.conditionals: List[Tuple[Tuple[int, int, int, int], Dict[str, Any]]] = []
+        self.calls: List[Tuple[Tuple[int, int, int, int], Dict[str, Any]]] = []
+
+    def _char_column(self, lineno: int, byte_col: int) -> int:
+        start = self.line_starts[lineno - 1]
+        end = self.line_starts[lineno] if lineno < len(self.line_starts) else len(self.code)
+        line = self.code[start:end]
+        if line.isascii():
+            return byte_col
+        return len(line.encode("utf-8")[:byte_col].decode("utf-8", errors="ignore"))
+
+    def _span(self, start: _Located, end: _Located) -> Tuple[Tuple[int, int, int, int], str]:
+        """Return (0-based start line, start column, end line, end column) and the text from start to end."""
+        end_lineno = end.end_lineno or end.lineno
+        start_col = self._char_column(start.lineno, start.col_offset)
+        end_col = self._char_column(end_lineno, end.end_col_offset or 0)
+        first = self.line_starts[start.lineno - 1] + start_col
+        last = self.line_starts[end_lineno - 1] + end_col
+        return (start.lineno - 1, start_col, end_lineno - 1, end_col), self.code[first:last]
+
+    def _add_literal(self, node: _Located, literal_type: str) -> None:
+        span, text = self._span(node, node)
+        if literal_type == "string" and _string_token_count(text) != 1:
+            # Implicit concatenation is one ast node but one tree-sitter string per part
+            raise _UnsupportedSnippetError(text)
+        self.literals[literal_type].append((span, {"line": span[0], "column": span[1], "value": text, "type": literal_type}))
+
+    def visit_Constant(self, node: ast.Constant) -> None:
+        value = node.value
+        if value is None or isinstance(value, bool):
+            self._add_literal(node, "boolean")
+        elif isinstance(value, (int, float, complex)):
+            self._add_literal(node, "number")
+        elif isinstance(value, (str, bytes)):
+            self._add_literal(node, "string")
+
+    def visit_MatchSingleton(self, node: ast.MatchSingleton) -> None:
+        self._add_literal(node, "boolean")
+
+    def visit_JoinedStr(self, node: ast.JoinedStr) -> None:
+        self._add_literal(node, "string")
+        self._visit_interpolations(node)
+
+    def _visit_interpolations(self, node: ast.JoinedStr) -> None:
+        # The constant parts of an f-string are not string nodes in tree-sitter
+        for value in node.values:
+            if isinstance(value, ast.FormattedValue):
+                self.visit(value.value)
+                if isinstance(value.format_spec, ast.JoinedStr):
+                    self._visit_interpolations(value.format_spec)
+
+    def visit_If(self, node: ast.If) -> None:
+        self._visit_if(node, "if_statement")
+
+    def _visit_if(self, node: ast.If, kind: str) -> None:
+        # An if_statement spans its elif/else clauses; an elif_clause ends with its own body
+        span, text = self._span(node, node if kind == "if_statement" else node.body[-1])
+        self.conditionals.append((span, {"line": span[0], "text": text.strip(), "kind": kind}))
+        self.visit(node.test)
+        for stmt in node.body:
+            self.visit(stmt)
+        orelse = node.orelse
+        if len(orelse) == 1 and isinstance(orelse[0], ast.If) and self._span(orelse[0], orelse[0])[1].startswith("elif"):
+            self._visit_if(orelse[0], "elif_clause")
+            return
+        for stmt in orelse:
+            self.visit(stmt)
+
+    def visit_Compare(self, node: ast.Compare) -> None:
+        span, text = self._span(node, node)
+        self.conditionals.append((span, {"line": span[0], "text": text.strip(), "kind": "comparison_operator"}))
+        self.generic_visit(node)
+
+    def visit_Call(self, node: ast.Call) -> None:
+        span, text = self._span(node, node)
+        self.calls.append((span, _call_match(span, text)))
+        self.generic_visit(node)
+
+    def result(self) -> SnippetConstructs:
+        return SnippetConstructs(
+            literals={t: [item for _, item in sorted(found, key=_span_key)] for t, found in self.literals.items()},
+            conditionals=[item for _, item in sorted(self.conditionals, key=_span_key)],
+            calls=[item for _, item in sorted(self.calls, key=_span_key)],
+        )
+
+
+def _string_token_count(text: str) -> int:
+    """Count the top-level string tokens (plain or f-string) in a string literal's source."""
+    count = depth = 0
+    try:
+        for token in tokenize.generate_tokens(io.StringIO(f"({text})").readline):
+            if token.type == tokenize.FSTRING_START:
+                count += depth == 0
+                depth += 1
+            elif token.type == tokenize.FSTRING_END:
+                depth -= 1
+            elif token.type == tokenize.STRING and depth == 0:
+                count += 1
+    except (tokenize.TokenError, SyntaxError):
+        return 0
+    return count
+
+
+def _extract_python(code: str) -> Optional[SnippetConstructs]:
+    """Extract constructs with ast, or None when the snippet needs tree-sitter."""
+    try:
+        tree = ast.parse(code)
+        collector = _PythonConstructCollector(code)
+        collector.visit(tree)
+    except (SyntaxError, ValueError, _UnsupportedSnippetError):
+        return None
+    return collector.result()
+
+
+def _match_span(match: Dict[str, Any]) -> Tuple[int, int, int, int]:
+    start = match.get("range", {}).get("start", {})
+    end = match.get("range", {}).get("end", {})
+    return (start.get("line", 0), start.get("column", 0), end.get("line", 0), end.get("column", 0))
+
+
+def _construct_rules(rule_language: str) -> List[Dict[str, Any]]:
+    kinds = _CONSTRUCT_KINDS[rule_language]
+    # Matches do not report their node kind, so each conditional kind gets its own rule id
+    return [
+        {"id": construct, "language": rule_language, "rule": {"any": [{"kind": k} for k in ks]}}
+        for construct, ks in kinds.items()
+        if construct != "conditional"
+    ] + [{"id": f"conditional:{k}", "language": rule_language, "rule": {"kind": k}} for k in kinds["conditional"]]
+
+
+def _add_scanned(constructs: SnippetConstructs, rule_id: str, span: Tuple[int, int, int, int], text: str) -> None:
+    construct, _, kind = rule_id.partition(":")
+    if construct == "call":
+        constructs.calls.append(_call_match(span, text))
+    elif construct == "conditional":
+        constructs.conditionals.append({"line": span[0], "text": text.strip(), "kind": kind})
+    else:
+        constructs.literals[construct].append({"line": span[0], "column": span[1], "value": text, "type": construct})
+
+
+def _scan_snippets(codes: Sequence[str], language: str) -> List[SnippetConstructs]:
+    """Match every construct rule against every snippet in one ast-grep scan."""
+    rule_language, extension = _SCAN_LANGUAGES[language]
+    with tempfile.TemporaryDirectory(prefix="ast-grep-mcp-snippets-") as tmpdir:
+        paths = [os.path.join(tmpdir, f"snippet_{i}{extension}") for i in range(len(codes))]
+        for path, code in zip(paths, codes):
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(code)
+        by_rule = run_ast_grep_batch(_construct_rules(rule_language), paths)
+    index = {os.path.basename(path): i for i, path in enumerate(paths)}
+    found: List[List[Tuple[Tuple[int, int, int, int], Dict[str, Any]]]] = [[] for _ in codes]
+    for rule_id, matches in by_rule.items():
+        for match in matches:
+            i = index.get(os.path.basename(match.get("file", "")))
+            if i is not None:
+                found[i].append((_match_span(match), {"rule_id": rule_id, "text": match.get("text", "")}))
+    results = [SnippetConstructs() for _ in codes]
+    for constructs, items in zip(results, found):
+        for span, match in sorted(items, key=_span_key):
+            _add_scanned(constructs, match["rule_id"], span, match["text"])
+    logger.debug("snippet_constructs_scanned", language=language, snippets=len(codes))
+    return results
+
+
+def extract_snippet_constructs(codes: Sequence[str], language: str) -> List[SnippetConstructs]:
+    """Extract literals, conditionals and calls from every snippet in one pass.
+
+    Identical snippets are extracted once and share a result, so callers must
+    not mutate the returned objects.
+
+    Args:
+        codes: Code snippets, e.g. every instance of a duplicate group
+        language: Programming language of the snippets
+
+    Returns:
+        One SnippetConstructs per snippet, in input order
+
+    Raises:
+        ValueError: If the language has no construct rules
+        AstGrepNotFoundError: If a scan is needed and ast-grep is not installed
+        AstGrepExecutionError: If the scan fails
+    """
+    language = language.lower()
+    if language not in _SCAN_LANGUAGES:
+        raise ValueError(f"Construct extraction does not support language: {language}")
+    unique = list(dict.fromkeys(codes))
+    extracted: Dict[str, Optional[SnippetConstructs]] = {code: _extract_python(code) if language == "python" else None for code in unique}
+    pending = [code for code, constructs in extracted.items() if constructs is None]
+    if pending:
+        extracted.update(zip(pending, _scan_snippets(pending, language)))
+    return [extracted[code] or SnippetConstructs() for code in codes]
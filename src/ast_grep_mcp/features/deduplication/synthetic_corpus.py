@@ -0,0 +1,351 @@
+"""
+Synthetic corpora with known clones for deduplication benchmarks.
+
+generate_synthetic_corpus writes a Python project of unrelated generated
+functions in which a controlled fraction are clones of another function:
+- Type 1: identical apart from layout and comments
+- Type 2: Type 1 plus consistently renamed variables and changed literals
+- Type 3: Type 2 plus inserted, deleted or replaced statements
+
+Clones always get their own function name, and functions are shuffled across
+files so clone families rarely share a file. The file and start line of every
+function are recorded, so score_detection can measure precision and recall of
+detected duplication groups against the ground truth.
+"""
+
+import os
+import random
+from dataclasses import dataclass, replace
+from itertools import combinations
+from typing import Any, Dict, Iterable, List, Literal, Optional, Set, Tuple
+
+from ...constants import FormattingDefaults, SyntheticCorpusDefaults
+from ...core.logging import get_logger
+
+CloneType = Literal[1, 2, 3]
+
+_WORDS = tuple(
+    "account amount balance batch buffer cache client config count cursor delta entry event field filter header index item key limit "
+    "line margin node offset order owner page price queue record region result score session source status target token total value".split()
+)
+_HELPERS = tuple(
+    "normalize validate compute resolve lookup merge render parse encode decode "
+    "publish schedule transform aggregate dispatch refresh collect measure reconcile archive".split()
+)
+
+# Statement templates, one tuple of lines each; {a} {b} {c} are variables, {n} {m} literals, {f} a helper name
+_TEMPLATES: Tuple[Tuple[str, ...], ...] = (
+    ("{a} = {b} + {n}",),
+    ("{a} = {f}({b}, {c})",),
+    ("if {a} > {n}:", "    {b} = {a} - {c}"),
+    ("for item in range({n}):", "    {a} += item * {m}"),
+    ("{a} = [x * {n} for x in {b} if x % {m}]",),
+    ('{a} = {b}.get("{f}", {n})',),
+    ("while {a} < {n}:", "    {a} += {b} or {m}"),
+    ("{a} = {f}({b})",),
+    ("{a} = {b} if {c} else {n}",),
+    ("{a}.append({b} * {n})",),
+    ("try:", "    {a} = {f}({b}, {n})", "except ValueError:", "    {a} = {m}"),
+    ("{a} = max({b}, {c}) // {n}",),
+    ("with open({b}) as handle:", "    {a} = handle.read({n})"),
+    ('{a} = {{"{f}": {b}, "limit": {n}}}',),
+    ("{a} = sorted({b}, key=lambda x: x % {n})",),
+    ("assert {a} != {n}, {b}",),
+)
+_MAX_LITERAL = 999
+_MIN_VARIABLES = 3
+_MAX_VARIABLES = 6
+_MAX_PARAMS = 3
+_FILES_PER_PACKAGE = 50
+
+logger = get_logger("deduplication.synthetic_corpus")
+
+
+@dataclass(frozen=True)
+class SyntheticCorpusSpec:
+    """Shape of a synthetic corpus.
+
+    Attributes:
+        function_count: Total number of functions, originals and clones included
+        clone_rate: Fraction of functions that are clones of another function
+        clone_type: Clone type (1, 2 or 3) applied to every clone
+        functions_per_file: Functions written to each module
+        seed: Random seed; the same spec always produces the same corpus
+    """
+
+    function_count: int = SyntheticCorpusDefaults.FUNCTION_COUNT
+    clone_rate: float = SyntheticCorpusDefaults.CLONE_RATE
+    clone_type: CloneType = 1
+    functions_per_file: int = SyntheticCorpusDefaults.FUNCTIONS_PER_FILE
+    seed: int = SyntheticCorpusDefaults.SEED
+
+    def __post_init__(self) -> None:
+        if not SyntheticCorpusDefaults.MIN_FUNCTION_COUNT <= self.function_count <= SyntheticCorpusDefaults.MAX_FUNCTION_COUNT:
+            raise ValueError(
+                f"function_count must be between {SyntheticCorpusDefaults.MIN_FUNCTION_COUNT} and "
+                f"{SyntheticCorpusDefaults.MAX_FUNCTION_COUNT}, got {self.function_count}"
+            )
+        if not 0.0 <= self.clone_rate < 1.0:
+            raise ValueError(f"clone_rate must be in [0.0, 1.0), got {self.clone_rate}")
+        if self.clone_type not in (1, 2, 3):
+            raise ValueError(f"clone_type must be 1, 2 or 3, got {self.clone_type}")
+        if self.functions_per_file < 1:
+            raise ValueError(f"functions_per_file must be a positive integer, got {self.functions_per_file}")
+
+    @property
+    def label(self) -> str:
+        """Compact description used in benchmark names."""
+        return f"n={self.function_count},type={self.clone_type},rate={self.clone_rate}"
+
+
+@dataclass
+class SyntheticCorpus:
+    """A generated corpus and its ground truth.
+
+    Attributes:
+        root: Project folder the modules were written to
+        spec: Spec the corpus was generated from
+        locations: (relative file path, 1-based start line) of each function, by function id
+        families: Function ids of each clone family, original first
+    """
+
+    root: str
+    spec: SyntheticCorpusSpec
+    locations: List[Tuple[str, int]]
+    families: List[List[int]]
+
+    @property
+    def clone_count(self) -> int:
+        """Number of functions that are clones of another function."""
+        return sum(len(family) - 1 for family in self.families)
+
+    def expected_pairs(self) -> Set[Tuple[int, int]]:
+        """Every (smaller id, larger id) pair of functions in the same clone family."""
+        return {pair for family in self.families for pair in combinations(sorted(family), 2)}
+
+
+@dataclass(frozen=True)
+class _Statement:
+    template: int
+    slots: Tuple[int, int, int]  # Indices into the function's variables for {a} {b} {c}
+    numbers: Tuple[int, int]
+    helper: str
+
+
+@dataclass(frozen=True)
+class _FunctionSpec:
+    variables: Tuple[str, ...]  # The first `params` variables are the parameters
+    params: int
+    statements: Tuple[_Statement, ...]
+
+
+def _variable_names(rng: random.Random, count: int, taken: Tuple[str, ...] = ()) -> Tuple[str, ...]:
+    names: List[str] = []
+    while len(names) < count:
+        name = f"{rng.choice(_WORDS)}_{rng.choice(_WORDS)}"
+        if name not in names and name not in taken:
+            names.append(name)
+    return tuple(names)
+
+
+def _literal(rng: random.Random) -> int:
+    return rng.randint(1, _MAX_LITERAL)
+
+
+def _random_statement(rng: random.Random, variable_count: int) -> _Statement:
+    return _Statement(
+        template=rng.randrange(len(_TEMPLATES)),
+        slots=(rng.randrange(variable_count), rng.randrange(variable_count), rng.randrange(variable_count)),
+        numbers=(_literal(rng), _literal(rng)),
+        helper=rng.choice(_HELPERS),
+    )
+
+
+def _random_function(rng: random.Random) -> _FunctionSpec:
+    variables = _variable_names(rng, rng.randint(_MIN_VARIABLES, _MAX_VARIABLES))
+    count = rng.randint(SyntheticCorpusDefaults.MIN_STATEMENTS, SyntheticCorpusDefaults.MAX_STATEMENTS)
+    return _FunctionSpec(
+        variables=variables,
+        params=rng.randint(1, _MAX_PARAMS),
+        statements=tuple(_random_statement(rng, len(variables)) for _ in range(count)),
+    )
+
+
+def _rename(rng: random.Random, function: _FunctionSpec) -> _FunctionSpec:
+    """Type 2 edit: rename every variable consistently and change every literal."""
+    statements = tuple(replace(s, numbers=(_literal(rng), _literal(rng))) for s in function.statements)
+    variables = _variable_names(rng, len(function.variables), taken=function.variables)
+    return replace(function, variables=variables, statements=statements)
+
+
+def _edit_statements(rng: random.Random, function: _FunctionSpec) -> _FunctionSpec:
+    """Type 3 edit: insert, delete or replace statements."""
+    statements = list(function.statements)
+    for _ in range(SyntheticCorpusDefaults.TYPE3_EDITS):
+        position = rng.randrange(len(statements))
+        edit = rng.choice(("insert", "delete", "replace") if len(statements) > 1 else ("insert", "replace"))
+        if edit == "insert":
+            statements.insert(position, _random_statement(rng, len(function.variables)))
+        elif edit == "delete":
+            del statements[position]
+        else:
+            statements[position] = _random_statement(rng, len(function.variables))
+    return replace(function, statements=tuple(statements))
+
+
+def _make_clone(rng: random.Random, original: _FunctionSpec, clone_type: CloneType) -> _FunctionSpec:
+    clone = original
+    if clone_type >= 2:
+        clone = _rename(rng, clone)
+    if clone_type >= 3:
+        clone = _edit_statements(rng, clone)
+    return clone
+
+
+def _render(name: str, function: _FunctionSpec, comment: Optional[str]) -> List[str]:
+    """Render a function; a comment line and blank lines between statements change its layout."""
+    variables = function.variables
+    lines = [f"def {name}({', '.join(variables[: function.params])}):"]
+    if comment is not None:
+        lines.append(f"    # {comment}")
+    for position, statement in enumerate(function.statements):
+        if comment is not None and position and position % 3 == 0:
+            lines.append("")
+        a, b, c = (variables[slot] for slot in statement.slots)
+        values = {"a": a, "b": b, "c": c, "n": statement.numbers[0], "m": statement.numbers[1], "f": statement.helper}
+        lines.extend(f"    {line.format(**values)}" for line in _TEMPLATES[statement.template])
+    lines.append(f"    return {variables[function.statements[-1].slots[0]]}")
+    return lines
+
+
+def _plan_families(rng: random.Random, spec: SyntheticCorpusSpec) -> List[int]:
+    """Return the clone count of each family, within function_count slots."""
+    target = round(spec.function_count * spec.clone_rate)
+    sizes: List[int] = []
+    clones = used = 0
+    while clones < target:
+        size = min(rng.randint(1, SyntheticCorpusDefaults.MAX_FAMILY_SIZE - 1), target - clones)
+        if used + size + 1 > spec.function_count:
+            break
+        sizes.append(size)
+        clones += size
+        used += size + 1
+    return sizes
+
+
+def _build_functions(rng: random.Random, spec: SyntheticCorpusSpec) -> Tuple[List[Tuple[_FunctionSpec, Optional[str]]], List[List[int]]]:
+    """Build (function, layout comment) per function id and the clone families."""
+    functions: List[Tuple[_FunctionSpec, Optional[str]]] = []
+    families: List[List[int]] = []
+    for clone_count in _plan_families(rng, spec):
+        original = _random_function(rng)
+        family = [len(functions)]
+        functions.append((original, None))
+        for k in range(clone_count):
+            family.append(len(functions))
+            functions.append((_make_clone(rng, original, spec.clone_type), f"copy {k + 1} of a shared routine"))
+        families.append(family)
+    while len(functions) < spec.function_count:
+        functions.append((_random_function(rng), None))
+    return functions, families
+
+
+def _module_path(file_index: int) -> str:
+    return os.path.join(f"pkg_{file_index // _FILES_PER_PACKAGE:03d}", f"module_{file_index:05d}.py")
+
+
+def _write_modules(
+    root: str, functions: List[Tuple[_FunctionSpec, Optional[str]]], order: List[int], per_file: int
+) -> List[Tuple[str, int]]:
+    locations: List[Tuple[str, int]] = [("", 0)] * len(functions)
+    for file_index, start in enumerate(range(0, len(order), per_file)):
+        rel_path = _module_path(file_index)
+        lines: List[str] = []
+        for function_id in order[start : start + per_file]:
+            if lines:
+                lines.extend(["", ""])
+            locations[function_id] = (rel_path, len(lines) + 1)
+            function, comment = functions[function_id]
+            lines.extend(_render(f"func_{function_id:06d}", function, comment))
+        path = os.path.join(root, rel_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+    return locations
+
+
+def generate_synthetic_corpus(root: str, spec: Optional[SyntheticCorpusSpec] = None) -> SyntheticCorpus:
+    """Write a synthetic Python project with known clone families under root.
+
+    Args:
+        root: Project folder to write modules to (created if missing)
+        spec: Corpus shape (defaults to SyntheticCorpusSpec())
+
+    Returns:
+        The corpus with the location of every function and its clone families
+    """
+    spec = spec or SyntheticCorpusSpec()
+    rng = random.Random(spec.seed)
+    functions, families = _build_functions(rng, spec)
+    order = list(range(len(functions)))
+    rng.shuffle(order)
+    locations = _write_modules(root, functions, order, spec.functions_per_file)
+    corpus = SyntheticCorpus(root=root, spec=spec, locations=locations, families=families)
+    logger.info(
+        "synthetic_corpus_generated",
+        root=root,
+        functions=len(functions),
+        clones=corpus.clone_count,
+        families=len(families),
+        clone_type=spec.clone_type,
+    )
+    return corpus
+
+
+def _instance_key(root: str, instance: Dict[str, Any]) -> Tuple[str, int]:
+    rel_path = os.path.relpath(os.path.realpath(instance.get("file", "")), root)
+    start = str(instance.get("lines", "0")).split("-", 1)[0]
+    return rel_path, int(start)
+
+
+def _detected_pairs(corpus: SyntheticCorpus, groups: Iterable[Dict[str, Any]]) -> Tuple[Set[Tuple[int, int]], int]:
+    """Return the function-id pairs grouped together, and the number of pairs involving unknown instances."""
+    root = os.path.realpath(corpus.root)
+    ids = {location: function_id for function_id, location in enumerate(corpus.locations)}
+    pairs: Set[Tuple[int, int]] = set()
+    stray = 0
+    for group in groups:
+        keys = {_instance_key(root, instance) for instance in group.get("instances", [])}
+        known = sorted({ids[key] for key in keys if key in ids})
+        unknown = len(keys) - len(known)
+        pairs.update(combinations(known, 2))
+        stray += unknown * (unknown - 1) // 2 + unknown * len(known)
+    return pairs, stray
+
+
+def score_detection(corpus: SyntheticCorpus, groups: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """Score duplication groups against the corpus ground truth, pair by pair.
+
+    Args:
+        corpus: Corpus the groups were detected in
+        groups: Duplication groups (or ranked candidates) with "instances"
+            carrying "file" and "lines" ("start-end")
+
+    Returns:
+        Dictionary with precision, recall, f1 and the pair counts they come from
+    """
+    detected, stray = _detected_pairs(corpus, groups)
+    detected_count = len(detected) + stray
+    expected = corpus.expected_pairs()
+    true_positives = len(detected & expected)
+    precision = true_positives / detected_count if detected_count else 1.0
+    recall = true_positives / len(expected) if expected else 1.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    return {
+        "precision": round(precision, FormattingDefaults.BENCHMARK_PRECISION),
+        "recall": round(recall, FormattingDefaults.BENCHMARK_PRECISION),
+        "f1": round(f1, FormattingDefaults.BENCHMARK_PRECISION),
+        "true_positive_pairs": true_positives,
+        "detected_pairs": detected_count,
+        "expected_pairs": len(expected),
+    }
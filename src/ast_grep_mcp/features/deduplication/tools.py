@@ -5,16 +5,17 @@ These functions wrap the underlying deduplication modules to provide
 a clean API for the MCP server.
 """
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, cast
 
 from mcp.server.fastmcp import FastMCP
 
-from ...constants import DeduplicationDefaults, FilePatterns
+from ...constants import DeduplicationDefaults, FilePatterns, SyntheticCorpusDefaults
 from ...core.logging import get_logger
 from .analysis_orchestrator import DeduplicationAnalysisOrchestrator
 from .applicator import DeduplicationApplicator
-from .benchmark import DeduplicationBenchmark
-from .detector import DuplicationDetector
+from .benchmark import BenchmarkMode, DeduplicationBenchmark
+from .detector import DuplicationDetector, GroupingEngine
+from .synthetic_corpus import CloneType
 
 
 def find_duplication_tool(
@@ -23,6 +24,9 @@ def find_duplication_tool(
     min_similarity: float = DeduplicationDefaults.MIN_SIMILARITY,
     min_lines: int = DeduplicationDefaults.MIN_LINES,
     exclude_patterns: Optional[List[str]] = None,
+    grouping_engine: GroupingEngine = "auto",
+    use_clone_index: bool = False,
+    verification_workers: int = 0,
 ) -> Dict[str, Any]:
     """Find duplicate functions/classes/methods in a codebase.
 
@@ -34,6 +38,12 @@ def find_duplication_tool(
         min_similarity: Minimum similarity threshold (0-1)
         min_lines: Minimum lines to consider
         exclude_patterns: Path patterns to exclude
+        grouping_engine: "bucket" (all pairs per structure-hash bucket), "lsh" (one
+            LSH index over all constructs, for large codebases) or "auto"
+        use_clone_index: Keep a persistent clone index for the project and only
+            re-extract files changed since the last run
+        verification_workers: Worker processes for verifying large candidate
+            batches (0 verifies in-process)
 
     Returns:
         Dictionary with duplication results
@@ -42,13 +52,14 @@ def find_duplication_tool(
 
     exclude_patterns = FilePatterns.normalize_excludes(exclude_patterns)
 
-    detector = DuplicationDetector(language=language)
+    detector = DuplicationDetector(language=language, grouping_engine=grouping_engine, verification_workers=verification_workers)
     results = detector.find_duplication(
         project_folder=project_folder,
         construct_type="function_definition",  # Default to functions
         min_similarity=min_similarity,
         min_lines=min_lines,
         exclude_patterns=exclude_patterns,
+        use_clone_index=use_clone_index,
     )
 
     logger.info(
@@ -130,19 +141,34 @@ def apply_deduplication_tool(
     return result
 
 
-def benchmark_deduplication_tool(iterations: int = 10, save_baseline: bool = False, check_regression: bool = True) -> Dict[str, Any]:
+def benchmark_deduplication_tool(
+    iterations: int = 10,
+    save_baseline: bool = False,
+    check_regression: bool = True,
+    mode: BenchmarkMode = "micro",
+    function_counts: Optional[List[int]] = None,
+    clone_types: Optional[List[int]] = None,
+    clone_rate: float = SyntheticCorpusDefaults.CLONE_RATE,
+) -> Dict[str, Any]:
     """Run performance benchmarks for deduplication functions.
 
-    Benchmarks the following operations:
+    "micro" mode benchmarks the following operations:
     - **scoring**: calculate_deduplication_score (should be < 1ms)
     - **pattern_analysis**: rank_deduplication_candidates and analyze variations
     - **code_generation**: generate_deduplication_recommendation
     - **full_workflow**: create_enhanced_duplication_response
 
+    "corpus" mode runs find -> rank -> enrich on generated projects with known
+    clones and records throughput, peak RSS, and precision/recall.
+
     Args:
-        iterations: Number of iterations per benchmark (default: 10)
+        iterations: Number of iterations per benchmark (default: 10, micro mode only)
         save_baseline: Save results as new baseline for regression detection
         check_regression: Check results against baseline for performance regressions
+        mode: "micro" or "corpus"
+        function_counts: Corpus sizes in functions (corpus mode only)
+        clone_types: Clone types 1-3 to generate (corpus mode only)
+        clone_rate: Fraction of functions that are clones (corpus mode only)
 
     Returns:
         Dictionary with benchmark results including:
@@ -154,7 +180,16 @@ def benchmark_deduplication_tool(iterations: int = 10, save_baseline: bool = Fal
     logger = get_logger("deduplication.tool.benchmark")
 
     benchmark = DeduplicationBenchmark()
-    results = benchmark.benchmark_deduplication(iterations=iterations, save_baseline=save_baseline, check_regression=check_regression)
+    if mode == "corpus":
+        results = benchmark.benchmark_synthetic_corpora(
+            function_counts=function_counts,
+            clone_types=cast(Optional[List[CloneType]], clone_types),
+            clone_rate=clone_rate,
+            save_baseline=save_baseline,
+            check_regression=check_regression,
+        )
+    else:
+        results = benchmark.benchmark_deduplication(iterations=iterations, save_baseline=save_baseline, check_regression=check_regression)
 
     logger.info(
         "benchmark_complete",
@@ -176,6 +211,18 @@ def _register_find_duplication(mcp: FastMCP) -> None:
         min_similarity: float = Field(default=DeduplicationDefaults.MIN_SIMILARITY, description="Minimum similarity threshold (0-1)"),
         min_lines: int = Field(default=DeduplicationDefaults.MIN_LINES, description="Minimum lines to consider"),
         exclude_patterns: Optional[List[str]] = Field(default=None, description="Path patterns to exclude"),
+        grouping_engine: GroupingEngine = Field(
+            default="auto",
+            description="'bucket' (all pairs per structure bucket), 'lsh' (one LSH index, for large codebases) or 'auto'",
+        ),
+        use_clone_index: bool = Field(
+            default=False,
+            description="Keep a persistent clone index for the project and only re-extract files changed since the last run",
+        ),
+        verification_workers: int = Field(
+            default=0,
+            description="Worker processes for verifying large candidate batches on multi-core machines (0 = in-process)",
+        ),
     ) -> Dict[str, Any]:
         """Wrapper that calls the standalone find_duplication_tool function."""
         return find_duplication_tool(
@@ -184,6 +231,9 @@ def _register_find_duplication(mcp: FastMCP) -> None:
             min_similarity=min_similarity,
             min_lines=min_lines,
             exclude_patterns=exclude_patterns,
+            grouping_engine=grouping_engine,
+            use_clone_index=use_clone_index,
+            verification_workers=verification_workers,
         )
 
 
@@ -245,9 +295,28 @@ def _register_benchmark_deduplication(mcp: FastMCP) -> None:
         iterations: int = Field(default=10, description="Number of iterations per benchmark (default: 10)"),
         save_baseline: bool = Field(default=False, description="Save results as new baseline for regression detection"),
         check_regression: bool = Field(default=True, description="Check results against baseline for performance regressions"),
+        mode: BenchmarkMode = Field(
+            default="micro",
+            description="'micro' (fixed small inputs) or 'corpus' (full pipeline on synthetic projects with known clones)",
+        ),
+        function_counts: Optional[List[int]] = Field(
+            default=None, description="Corpus sizes in functions, 2-100000 (corpus mode; default: 1000)"
+        ),
+        clone_types: Optional[List[int]] = Field(default=None, description="Clone types 1-3 to generate (corpus mode; default: all)"),
+        clone_rate: float = Field(
+            default=SyntheticCorpusDefaults.CLONE_RATE, description="Fraction of functions that are clones (corpus mode)"
+        ),
     ) -> Dict[str, Any]:
         """Wrapper that calls the standalone benchmark_deduplication_tool function."""
-        return benchmark_deduplication_tool(iterations=iterations, save_baseline=save_baseline, check_regression=check_regression)
+        return benchmark_deduplication_tool(
+            iterations=iterations,
+            save_baseline=save_baseline,
+            check_regression=check_regression,
+            mode=mode,
+            function_counts=function_counts,
+            clone_types=clone_types,
+            clone_rate=clone_rate,
+        )
 
 
 def register_deduplication_tools(mcp: FastMCP) -> None:
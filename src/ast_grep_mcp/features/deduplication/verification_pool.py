@@ -0,0 +1,179 @@
+"""
+Process-pool scoring of similarity candidate pairs.
+
+MinHash verification and the Stage 2 structural comparison are pure-Python
+CPU work, so thread pools serialize on the GIL. score_pairs shards candidate
+pairs across worker processes instead:
+- the snippets and their MinHash signatures are written once to a shared
+  memory block: int64 text offsets, then the uint64 signature matrix, then
+  the UTF-8 text of every snippet
+- each task carries only the block's name, a scorer factory and an int64
+  array of (i, j) index pairs; workers decode the block once per batch
+- each task returns a float64 array with one row of scores per pair
+
+Workers are started from a forkserver where available, so they never inherit
+the parent's threads or locks, and the pool is kept for later batches.
+"""
+
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from multiprocessing.shared_memory import SharedMemory
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ...constants import VerificationPoolDefaults
+from ...core.logging import get_logger
+
+logger = get_logger("deduplication.verification_pool")
+
+PairScorer = Callable[[str, str], Tuple[float, ...]]
+# Builds a worker's scorer from the batch's snippets and signatures; must be picklable
+ScorerFactory = Callable[[List[str], np.ndarray], PairScorer]
+
+_INDEX_DTYPE = np.dtype(np.int64)
+_SIGNATURE_DTYPE = np.dtype(np.uint64)
+
+
+@dataclass(frozen=True)
+class _SnapshotRef:
+    """Locates a batch's snippets and signatures inside a shared memory block."""
+
+    name: str
+    count: int
+    num_perm: int
+
+    @property
+    def signatures_offset(self) -> int:
+        return (self.count + 1) * _INDEX_DTYPE.itemsize
+
+    @property
+    def text_offset(self) -> int:
+        return self.signatures_offset + self.count * self.num_perm * _SIGNATURE_DTYPE.itemsize
+
+
+def _write_snapshot(codes: Sequence[str], signatures: np.ndarray) -> Tuple[SharedMemory, _SnapshotRef]:
+    encoded = [code.encode("utf-8") for code in codes]
+    offsets = np.zeros(len(codes) + 1, dtype=_INDEX_DTYPE)
+    np.cumsum([len(blob) for blob in encoded], out=offsets[1:])
+    ref = _SnapshotRef(name="", count=len(codes), num_perm=int(signatures.shape[1]))
+    shm = SharedMemory(create=True, size=max(1, ref.text_offset + int(offsets[-1])))
+    buf = shm.buf
+    assert buf is not None
+    buf[: ref.signatures_offset] = offsets.tobytes()
+    buf[ref.signatures_offset : ref.text_offset] = np.ascontiguousarray(signatures, dtype=_SIGNATURE_DTYPE).tobytes()
+    buf[ref.text_offset : ref.text_offset + int(offsets[-1])] = b"".join(encoded)
+    return shm, _SnapshotRef(name=shm.name, count=ref.count, num_perm=ref.num_perm)
+
+
+def _read_snapshot(ref: _SnapshotRef) -> Tuple[List[str], np.ndarray]:
+    shm = SharedMemory(name=ref.name, track=False)
+    try:
+        buf = shm.buf
+        assert buf is not None
+        offsets = np.frombuffer(buf[: ref.signatures_offset], dtype=_INDEX_DTYPE).tolist()
+        signatures = (
+            np.frombuffer(buf[ref.signatures_offset : ref.text_offset], dtype=_SIGNATURE_DTYPE).reshape(ref.count, ref.num_perm).copy()
+        )
+        text = bytes(buf[ref.text_offset : ref.text_offset + offsets[-1]])
+        del buf
+    finally:
+        shm.close()
+    codes = [text[start:end].decode("utf-8") for start, end in zip(offsets, offsets[1:])]
+    return codes, signatures
+
+
+# Worker-side state: the codes and scorer of the batch this worker last served
+_worker_batch: Optional[Tuple[str, List[str], PairScorer]] = None
+
+
+def _score_shard(ref: _SnapshotRef, build_scorer: ScorerFactory, pairs: np.ndarray) -> np.ndarray:
+    global _worker_batch
+    if _worker_batch is None or _worker_batch[0] != ref.name:
+        codes, signatures = _read_snapshot(ref)
+        _worker_batch = (ref.name, codes, build_scorer(codes, signatures))
+    _, codes, score = _worker_batch
+    return np.array([score(codes[i], codes[j]) for i, j in pairs.tolist()], dtype=np.float64)
+
+
+_pools: Dict[int, ProcessPoolExecutor] = {}
+_pools_lock = threading.Lock()
+
+
+def _pool_context() -> multiprocessing.context.BaseContext:
+    if "forkserver" not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context()
+    context = multiprocessing.get_context("forkserver")
+    # Import the package once in the server so each forked worker starts with it loaded
+    context.set_forkserver_preload([__package__ or "ast_grep_mcp"])
+    return context
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    with _pools_lock:
+        pool = _pools.get(workers)
+        if pool is None:
+            pool = _pools[workers] = ProcessPoolExecutor(max_workers=workers, mp_context=_pool_context())
+        return pool
+
+
+def shutdown_verification_pools() -> None:
+    """Stop every worker pool; the next batch starts a fresh one."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _discard_pool(workers: int) -> None:
+    with _pools_lock:
+        pool = _pools.pop(workers, None)
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def score_pairs(
+    codes: Sequence[str],
+    signatures: np.ndarray,
+    pairs: Sequence[Tuple[int, int]],
+    build_scorer: ScorerFactory,
+    workers: int,
+) -> Optional[np.ndarray]:
+    """Score index pairs into codes across worker processes.
+
+    Args:
+        codes: Distinct snippets referenced by pairs
+        signatures: MinHash hash values of codes, one uint64 row per snippet
+        pairs: (i, j) indices into codes
+        build_scorer: Picklable factory returning the per-pair scoring function
+        workers: Number of worker processes
+
+    Returns:
+        float64 array with one row of scores per pair, in input order, or None if
+        the pool failed and the caller should score in-process
+    """
+    if not pairs:
+        return np.zeros((0, 0), dtype=np.float64)
+    pair_array = np.asarray(pairs, dtype=_INDEX_DTYPE).reshape(-1, 2)
+    shards = np.array_split(pair_array, min(len(pair_array), workers * VerificationPoolDefaults.SHARDS_PER_WORKER))
+    try:
+        shm, ref = _write_snapshot(codes, signatures)
+    except OSError as e:
+        logger.warning("verification_snapshot_failed", snippets=len(codes), error=str(e))
+        return None
+    try:
+        pool = _get_pool(workers)
+        results = list(pool.map(_score_shard, [ref] * len(shards), [build_scorer] * len(shards), shards))
+    except (BrokenProcessPool, OSError) as e:
+        logger.warning("verification_pool_failed", workers=workers, pairs=len(pair_array), error=str(e))
+        _discard_pool(workers)
+        return None
+    finally:
+        shm.close()
+        shm.unlink()
+    logger.info("verification_pool_scored", workers=workers, pairs=len(pair_array), snippets=len(codes), shards=len(shards))
+    return np.concatenate(results).reshape(len(pair_array), -1)
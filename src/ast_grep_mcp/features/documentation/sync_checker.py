@@ -12,6 +12,7 @@ from typing import Any, Dict, List, Optional, Tuple
 import sentry_sdk
 
 from ast_grep_mcp.constants import ConversionFactors, FilePatterns, RegexCaptureGroups, SeverityRankingDefaults
+from ast_grep_mcp.core.file_discovery import discover_files, matches_any_glob
 from ast_grep_mcp.core.logging import get_logger
 from ast_grep_mcp.models.documentation import (
     DocSyncIssue,
@@ -286,6 +287,8 @@ def _find_source_files(
 ) -> List[str]:
     """Find source files to check.
 
+    Files come from the shared discovery service, so ignore files are honoured.
+
     Args:
         project_folder: Project root
         language: Programming language
@@ -295,16 +298,17 @@ def _find_source_files(
     Returns:
         List of file paths
     """
-    import glob
-
-    include_patterns = _resolve_include_patterns(language, include_patterns)
+    include_patterns = [
+        os.path.relpath(pattern, project_folder) if os.path.isabs(pattern) else pattern
+        for pattern in _resolve_include_patterns(language, include_patterns)
+    ]
     exclude_patterns = FilePatterns.normalize_excludes(exclude_patterns, defaults=_DEFAULT_EXCLUDE_PATTERNS)
 
-    files: List[str] = []
-    for pattern in include_patterns:
-        files.extend(glob.glob(os.path.join(project_folder, pattern), recursive=True))
-
-    return [f for f in set(files) if not _is_excluded(f, project_folder, exclude_patterns)]
+    return [
+        f.path
+        for f in discover_files(project_folder)
+        if matches_any_glob(f.rel_path, include_patterns) and not _is_excluded(f.path, project_folder, exclude_patterns)
+    ]
 
 
 def _find_markdown_files(project_folder: str) -> List[str]:
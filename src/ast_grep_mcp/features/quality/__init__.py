@@ -3,7 +3,7 @@
 This feature provides:
 - Code smell detection (long functions, parameter bloat, deep nesting, large classes, magic numbers)
 - Linting rule management (create, validate, save, load)
-- Standards enforcement (execute rules in parallel, report violations)
+- Standards enforcement (execute rules in one scan or in parallel, report violations)
 
 Modules:
 - smells: Code smell detection implementation
@@ -18,6 +18,7 @@ from ast_grep_mcp.features.quality.enforcer import (
     enforce_standards_impl,
     execute_rule,
     execute_rules_batch,
+    execute_rules_single_scan,
     filter_violations_by_severity,
     format_violation_report,
     group_violations_by_file,
@@ -66,6 +67,7 @@ __all__ = [
     "should_exclude_file",
     "execute_rule",
     "execute_rules_batch",
+    "execute_rules_single_scan",
     "group_violations_by_file",
     "group_violations_by_severity",
     "group_violations_by_rule",
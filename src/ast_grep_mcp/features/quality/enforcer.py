@@ -2,7 +2,7 @@
 
 This module provides functionality to execute linting rules against a codebase:
 - Rule set loading (built-in and custom)
-- Parallel rule execution with ThreadPoolExecutor
+- Rule execution in one multi-rule ast-grep scan, or one scan per rule in parallel threads
 - Violation collection and grouping
 - Severity filtering
 - Human-readable reporting
@@ -18,10 +18,19 @@ import sentry_sdk
 import yaml
 
 from ast_grep_mcp.constants import ConversionFactors, FormattingDefaults, RuleSetPriority, SeverityRankingDefaults, StreamDefaults
-from ast_grep_mcp.core.executor import stream_ast_grep_results
+from ast_grep_mcp.core.exceptions import AstGrepError
+from ast_grep_mcp.core.executor import build_inline_rules, stream_ast_grep_results
 from ast_grep_mcp.core.logging import get_logger
 from ast_grep_mcp.features.quality.rules import RULE_TEMPLATES, load_rules_from_project
-from ast_grep_mcp.models.standards import EnforcementResult, LintingRule, RuleExecutionContext, RuleSet, RuleTemplate, RuleViolation
+from ast_grep_mcp.models.standards import (
+    EnforcementResult,
+    LintingRule,
+    RuleExecutionContext,
+    RuleExecutionMode,
+    RuleSet,
+    RuleTemplate,
+    RuleViolation,
+)
 
 # =============================================================================
 # Built-in Rule Sets
@@ -426,8 +435,72 @@ def _process_rule_result(
     return True
 
 
+def _route_match(match: Dict[str, Any], rules_by_id: Dict[str, LintingRule], context: RuleExecutionContext) -> RuleViolation | None:
+    """Turn a multi-rule scan match into a violation of its rule, or None if excluded."""
+    rule = rules_by_id.get(match.get("ruleId", ""))
+    if rule is None:
+        return None
+    violation = parse_match_to_violation(match, rule)
+    if _is_excluded(violation.file, context.exclude_patterns, rule.exclude_files or []):
+        return None
+    return violation
+
+
+def _scan_rules_once(rules_by_id: Dict[str, LintingRule], context: RuleExecutionContext) -> List[RuleViolation]:
+    inline_rules = build_inline_rules([rule.to_yaml_dict() for rule in rules_by_id.values()])
+    args = ["--inline-rules", inline_rules, "--json=stream", context.project_folder]
+    violations: List[RuleViolation] = []
+    with sentry_sdk.start_span(op="execute_rules_single_scan", name=f"Rules: {len(rules_by_id)}"):
+        # Excluded matches must not count towards max_violations, so the limit is applied here
+        # and closing the stream terminates ast-grep
+        stream = stream_ast_grep_results("scan", args, progress_interval=StreamDefaults.PROGRESS_INTERVAL)
+        try:
+            for match in stream:
+                violation = _route_match(match, rules_by_id, context)
+                if violation is None:
+                    continue
+                violations.append(violation)
+                if _should_stop_execution(len(violations), context.max_violations):
+                    context.logger.info("max_violations_reached", current=len(violations))
+                    break
+        finally:
+            stream.close()
+    return violations
+
+
+def execute_rules_single_scan(rules: List[LintingRule], context: RuleExecutionContext) -> List[RuleViolation]:
+    """Execute all rules in one ast-grep scan and route matches to rules by ruleId.
+
+    The project is walked and parsed once for the whole rule set instead of once
+    per rule. Per-rule exclude_files and max_violations are applied while the
+    scan streams. If the scan fails (e.g. one rule does not compile) or rule ids
+    are not unique, the rules are executed one scan per rule instead, so a bad
+    rule only loses its own violations.
+
+    Args:
+        rules: List of LintingRule objects to execute
+        context: Execution context
+
+    Returns:
+        Combined list of all violations found
+    """
+    if not rules:
+        return []
+    rules_by_id = {rule.id: rule for rule in rules}
+    if len(rules_by_id) != len(rules):
+        context.logger.warning("single_scan_duplicate_rule_ids", rules=len(rules), unique_ids=len(rules_by_id))
+        return _execute_rules_per_rule(rules, context)
+    try:
+        violations = _scan_rules_once(rules_by_id, context)
+    except (AstGrepError, ValueError) as e:
+        context.logger.warning("single_scan_failed", rules=len(rules), error=str(e))
+        return _execute_rules_per_rule(rules, context)
+    context.logger.info("rules_executed_single_scan", rules=len(rules), violations_found=len(violations))
+    return violations
+
+
 def execute_rules_batch(rules: List[LintingRule], context: RuleExecutionContext) -> List[RuleViolation]:
-    """Execute multiple rules in parallel.
+    """Execute multiple rules using the context's execution mode.
 
     Args:
         rules: List of LintingRule objects to execute
@@ -436,6 +509,13 @@ def execute_rules_batch(rules: List[LintingRule], context: RuleExecutionContext)
     Returns:
         Combined list of all violations found
     """
+    if context.execution_mode == "single_scan":
+        return execute_rules_single_scan(rules, context)
+    return _execute_rules_per_rule(rules, context)
+
+
+def _execute_rules_per_rule(rules: List[LintingRule], context: RuleExecutionContext) -> List[RuleViolation]:
+    """Execute one ast-grep scan per rule in parallel threads."""
     all_violations: List[RuleViolation] = []
     violations_lock = threading.Lock()
 
@@ -689,6 +769,7 @@ def enforce_standards_impl(
     severity_threshold: str,
     max_violations: int,
     max_threads: int,
+    execution_mode: RuleExecutionMode = "single_scan",
 ) -> EnforcementResult:
     """Enforce coding standards by executing linting rules against a project."""
     import time
@@ -719,6 +800,7 @@ def enforce_standards_impl(
         max_violations=max_violations,
         max_threads=max_threads,
         logger=logger,
+        execution_mode=execution_mode,
     )
 
     return _run_enforcement(rule_set_obj, context, severity_threshold, start_time)
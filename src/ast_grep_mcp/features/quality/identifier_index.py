@@ -0,0 +1,161 @@
+"""Identifier occurrence index for orphan detection.
+
+Every text file of a project is tokenized once into a map of
+identifier -> {file: lines}, so checking whether a name is referenced
+becomes a dictionary lookup instead of a recursive grep per name:
+- Python files are walked with ``ast``: names, attribute names, imported
+  names and module path parts, and identifiers inside string literals
+  (``__all__``, ``getattr``, dynamic imports). Definitions and docstrings
+  are not references and are not indexed. Trees already parsed by the
+  caller can be passed in instead of parsing the file again.
+- Other files, and Python files that fail to parse, go through a regex
+  tokenizer, so JS/TS sources, configs and docs still count as references.
+"""
+
+import ast
+import re
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Set, Tuple
+
+from ast_grep_mcp.constants import FileConstants
+from ast_grep_mcp.core.file_discovery import discover_files
+from ast_grep_mcp.core.logging import get_logger
+
+logger = get_logger("identifier_index")
+
+_IDENTIFIER_RE = re.compile(r"[A-Za-z_$][\w$]*")
+
+
+def _tokenize_lines(content: str, first_line: int = 1) -> Iterator[Tuple[str, int]]:
+    for line_num, line in enumerate(content.split("\n"), first_line):
+        for token in _IDENTIFIER_RE.findall(line):
+            yield token, line_num
+
+
+def _alias_identifiers(node: ast.alias) -> Iterator[Tuple[str, int]]:
+    for part in node.name.split("."):
+        yield part, node.lineno
+    if node.asname:
+        yield node.asname, node.lineno
+
+
+_DOCSTRING_OWNERS = (ast.Module, ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)
+
+
+def _docstring(node: ast.Module | ast.ClassDef | ast.FunctionDef | ast.AsyncFunctionDef) -> Optional[ast.Constant]:
+    if node.body and isinstance(node.body[0], ast.Expr):
+        value = node.body[0].value
+        if isinstance(value, ast.Constant) and isinstance(value.value, str):
+            return value
+    return None
+
+
+def _python_identifiers(tree: ast.AST) -> Iterator[Tuple[str, int]]:
+    """Yield (identifier, line) for every reference in a parsed module."""
+    # ast.walk is breadth-first, so a docstring's owner is always visited before it
+    docstrings: Set[int] = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name):
+            yield node.id, node.lineno
+        elif isinstance(node, ast.Attribute):
+            yield node.attr, node.end_lineno or node.lineno
+        elif isinstance(node, ast.alias):
+            yield from _alias_identifiers(node)
+        elif isinstance(node, ast.ImportFrom) and node.module:
+            yield from ((part, node.lineno) for part in node.module.split("."))
+        elif isinstance(node, ast.Constant) and isinstance(node.value, str) and id(node) not in docstrings:
+            yield from _tokenize_lines(node.value, node.lineno)
+        elif isinstance(node, _DOCSTRING_OWNERS):
+            docstring = _docstring(node)
+            if docstring is not None:
+                docstrings.add(id(docstring))
+
+
+class IdentifierIndex:
+    """Where each identifier occurs in a project, keyed by relative file path."""
+
+    def __init__(self) -> None:
+        self._occurrences: Dict[str, Dict[str, Set[int]]] = {}
+
+    @classmethod
+    def build(cls, base_path: Path, exclude_dirs: Iterable[str] = (), trees: Optional[Mapping[str, ast.AST]] = None) -> "IdentifierIndex":
+        """Tokenize every text file under base_path once.
+
+        Args:
+            base_path: Project root
+            exclude_dirs: Directory names skipped at any depth
+            trees: Already parsed Python modules by "/"-separated relative path;
+                these files are indexed from the tree without being read
+
+        Returns:
+            Populated index
+        """
+        excluded = set(exclude_dirs)
+        trees = trees or {}
+        index = cls()
+        files = 0
+        for found in discover_files(str(base_path), include_hidden=True):
+            if excluded.intersection(found.rel_path.split("/")[:-1]):
+                continue
+            tree = trees.get(found.rel_path)
+            if tree is not None:
+                index.add_tree(found.rel_path, tree)
+                files += 1
+                continue
+            content = _read_text(found.path)
+            if content is not None:
+                index.add_file(found.rel_path, content)
+                files += 1
+        logger.debug("identifier_index_built", files=files, identifiers=len(index._occurrences))
+        return index
+
+    def add_file(self, rel_path: str, content: str) -> None:
+        """Index one file's identifiers, using the Python AST for .py files."""
+        if rel_path.endswith(".py"):
+            try:
+                self.add_tree(rel_path, ast.parse(content))
+                return
+            except (SyntaxError, ValueError):
+                pass
+        self._add_tokens(rel_path, _tokenize_lines(content))
+
+    def add_tree(self, rel_path: str, tree: ast.AST) -> None:
+        """Index the references in a parsed Python module."""
+        self._add_tokens(rel_path, _python_identifiers(tree))
+
+    def _add_tokens(self, rel_path: str, tokens: Iterable[Tuple[str, int]]) -> None:
+        file_lines: Dict[str, Set[int]] = {}
+        for name, line in tokens:
+            file_lines.setdefault(name, set()).add(line)
+        for name, lines in file_lines.items():
+            self._occurrences.setdefault(name, {}).setdefault(rel_path, set()).update(lines)
+
+    def occurrences(self, name: str) -> Dict[str, List[int]]:
+        """Return {file: lines} where name occurs (empty if it never does)."""
+        return {rel_path: sorted(lines) for rel_path, lines in self._occurrences.get(name, {}).items()}
+
+    def files_containing(self, name: str, prefix: Optional[str] = None) -> List[str]:
+        """Files in which every identifier of name occurs, optionally limited to a path prefix.
+
+        Names that are not plain identifiers (such as the stem "user-service")
+        are split into their identifier parts.
+        """
+        parts = _IDENTIFIER_RE.findall(name)
+        if not parts:
+            return []
+        files = set(self._occurrences.get(parts[0], ()))
+        for part in parts[1:]:
+            files.intersection_update(self._occurrences.get(part, ()))
+        return sorted(f for f in files if prefix is None or f.startswith(prefix))
+
+
+def _read_text(path: str) -> Optional[str]:
+    """Read a file as text, or None if it is unreadable or binary."""
+    try:
+        data = Path(path).read_bytes()
+    except OSError as e:
+        logger.debug("read_failed", file=path, error=str(e))
+        return None
+    if b"\0" in data[: FileConstants.BINARY_SNIFF_BYTES]:
+        return None
+    return data.decode("utf-8", errors="ignore")
@@ -7,14 +7,14 @@ in a codebase using dependency graph analysis and verification.
 import ast
 import fnmatch
 import re
-import subprocess
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import deque
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
 
-from ast_grep_mcp.constants import ConversionFactors, FilePatterns, SemanticVolumeDefaults, SubprocessDefaults
+from ast_grep_mcp.constants import ConversionFactors, FilePatterns, SemanticVolumeDefaults
 from ast_grep_mcp.core.logging import get_logger
+from ast_grep_mcp.features.quality.identifier_index import IdentifierIndex
 from ast_grep_mcp.models.orphan import (
     DependencyEdge,
     DependencyGraph,
@@ -25,7 +25,23 @@ from ast_grep_mcp.models.orphan import (
     VerificationStatus,
 )
 
-_GREP_EXCLUDE_DIRS = ("node_modules", ".git", "dist", "build", "__pycache__", ".venv", "venv", "coverage", ".next", ".turbo")
+_INDEX_EXCLUDE_DIRS = ("node_modules", ".git", "dist", "build", "__pycache__", ".venv", "venv", "coverage", ".next", ".turbo")
+_STATEMENT_FIELDS = frozenset({"body", "orelse", "finalbody", "handlers", "cases"})
+
+
+def _walk_statements(tree: ast.AST) -> Iterator[ast.AST]:
+    """Breadth-first walk like ast.walk that never descends into expressions.
+
+    Imports and function definitions are statements, so they are all found
+    without visiting the far more numerous expression nodes.
+    """
+    todo = deque([tree])
+    while todo:
+        node = todo.popleft()
+        for name, value in ast.iter_fields(node):
+            if name in _STATEMENT_FIELDS and isinstance(value, list):
+                todo.extend(value)
+        yield node
 
 
 class OrphanDetector:
@@ -35,6 +51,8 @@ class OrphanDetector:
         """Initialize the detector with optional configuration."""
         self.config = config or OrphanAnalysisConfig()
         self.logger = get_logger("orphan_detector")
+        # Python modules parsed during one analyze() run, by "/"-separated relative path
+        self._trees: Dict[str, Optional[ast.AST]] = {}
 
     def analyze(self, project_folder: str) -> OrphanAnalysisResult:
         """Analyze a project for orphan code.
@@ -49,16 +67,24 @@ class OrphanDetector:
         base_path = Path(project_folder)
         self.logger.info("orphan_analysis_started", project=project_folder)
 
-        graph = self._build_dependency_graph(base_path)
-        self._identify_entry_points(base_path, graph)
-        orphan_files = self._find_orphan_files(base_path, graph)
-        if self.config.verify_with_grep:
-            orphan_files = self._verify_orphans_with_grep(base_path, orphan_files)
-
-        orphan_functions: List[OrphanFunction] = []
-        total_functions = 0
-        if self.config.analyze_functions:
-            orphan_functions, total_functions = self._find_orphan_functions(base_path, graph)
+        self._trees = {}
+        try:
+            graph = self._build_dependency_graph(base_path)
+            self._identify_entry_points(base_path, graph)
+            orphan_files = self._find_orphan_files(base_path, graph)
+            index: Optional[IdentifierIndex] = None
+            if self.config.verify_with_grep or self.config.analyze_functions:
+                trees = {rel_path: tree for rel_path, tree in self._trees.items() if tree is not None}
+                index = IdentifierIndex.build(base_path, _INDEX_EXCLUDE_DIRS, trees)
+            if self.config.verify_with_grep and index is not None:
+                orphan_files = self._verify_orphans_with_index(base_path, orphan_files, index)
+
+            orphan_functions: List[OrphanFunction] = []
+            total_functions = 0
+            if self.config.analyze_functions and index is not None:
+                orphan_functions, total_functions = self._find_orphan_functions(base_path, graph, index)
+        finally:
+            self._trees = {}
 
         elapsed_ms = int((time.time() - start_time) * ConversionFactors.MILLISECONDS_PER_SECOND)
         result = OrphanAnalysisResult(
@@ -129,7 +155,7 @@ class OrphanDetector:
         if tree is None:
             return
         external_imports: Set[str] = set()
-        for node in ast.walk(tree):
+        for node in _walk_statements(tree):
             if isinstance(node, ast.Import):
                 self._process_import_node(node, rel_path, base_path, graph, external_imports)
             elif isinstance(node, ast.ImportFrom):
@@ -138,12 +164,15 @@ class OrphanDetector:
             graph.external_imports[rel_path] = external_imports
 
     def _parse_python_file(self, file_path: Path, rel_path: str) -> Optional[ast.AST]:
-        """Parse a Python file, returning None on failure."""
-        try:
-            return ast.parse(file_path.read_text(encoding="utf-8"))
-        except Exception as e:
-            self.logger.debug("parse_failed", file=rel_path, error=str(e))
-            return None
+        """Parse a Python file once per analysis, returning None on failure."""
+        key = Path(rel_path).as_posix()
+        if key not in self._trees:
+            try:
+                self._trees[key] = ast.parse(file_path.read_text(encoding="utf-8"))
+            except Exception as e:
+                self.logger.debug("parse_failed", file=rel_path, error=str(e))
+                self._trees[key] = None
+        return self._trees[key]
 
     def _process_import_node(
         self,
@@ -401,54 +430,21 @@ class OrphanDetector:
             reason="No direct imports found",
         )
 
-    @staticmethod
-    def _grep_exclude_args() -> List[str]:
-        """Build --exclude-dir args to skip heavy directories."""
-        args: List[str] = []
-        for d in _GREP_EXCLUDE_DIRS:
-            args.extend(["--exclude-dir", d])
-        return args
-
-    def _verify_orphans_with_grep(self, base_path: Path, orphans: List[OrphanFile]) -> List[OrphanFile]:
-        """Verify orphan candidates using parallel grep with exclude-dirs."""
-        if not orphans:
-            return orphans
-
-        exclude_args = self._grep_exclude_args()
-        max_workers = min(8, len(orphans))
-
-        with ThreadPoolExecutor(max_workers=max_workers) as pool:
-            futures = {pool.submit(self._verify_single_orphan, base_path, orphan, exclude_args): orphan for orphan in orphans}
-            for future in as_completed(futures):
-                try:
-                    future.result()
-                except Exception as e:
-                    orphan = futures[future]
-                    self.logger.debug("grep_verify_failed", file=orphan.file_path, error=str(e))
-
+    def _verify_orphans_with_index(self, base_path: Path, orphans: List[OrphanFile], index: IdentifierIndex) -> List[OrphanFile]:
+        """Verify orphan candidates by looking up references to their module names."""
+        for orphan in orphans:
+            self._verify_single_orphan(base_path, orphan, index)
         return orphans
 
-    def _verify_single_orphan(self, base_path: Path, orphan: OrphanFile, exclude_args: List[str]) -> OrphanFile:
-        """Run grep verification for one orphan with exclude-dirs."""
-        try:
-            result = subprocess.run(
-                ["grep", "-r", "-l", *exclude_args, Path(orphan.file_path).stem, str(base_path)],
-                capture_output=True,
-                text=True,
-                timeout=SubprocessDefaults.GREP_TIMEOUT_SECONDS,
-            )
-            refs = [ln for ln in result.stdout.strip().split("\n") if ln and not ln.endswith(orphan.file_path)]
-            self._apply_grep_refs(orphan, refs)
-        except subprocess.TimeoutExpired:
-            orphan.status = VerificationStatus.UNCERTAIN
-            orphan.reason = "Verification timed out"
-        except Exception as e:
-            self.logger.debug("grep_failed", file=orphan.file_path, error=str(e))
+    def _verify_single_orphan(self, base_path: Path, orphan: OrphanFile, index: IdentifierIndex) -> OrphanFile:
+        """Mark one orphan by the other files that mention its file stem."""
+        refs = [str(base_path / f) for f in index.files_containing(Path(orphan.file_path).stem) if f != Path(orphan.file_path).as_posix()]
+        self._apply_references(orphan, refs)
         return orphan
 
     @staticmethod
-    def _apply_grep_refs(orphan: OrphanFile, references: List[str]) -> None:
-        """Update orphan status based on grep reference results."""
+    def _apply_references(orphan: OrphanFile, references: List[str]) -> None:
+        """Update orphan status based on the files that reference it."""
         if not references:
             orphan.status = VerificationStatus.CONFIRMED
             orphan.reason = "No imports or string references found"
@@ -506,16 +502,14 @@ class OrphanDetector:
                 return func.attr
         return None
 
-    def _find_orphan_functions(self, base_path: Path, graph: DependencyGraph) -> Tuple[List[OrphanFunction], int]:
-        """Find functions with no call sites using parallel grep."""
+    def _find_orphan_functions(self, base_path: Path, graph: DependencyGraph, index: IdentifierIndex) -> Tuple[List[OrphanFunction], int]:
+        """Find functions whose names are never referenced."""
         candidates, total_functions = self._collect_function_candidates(base_path, graph)
         if not candidates:
             return [], total_functions
 
-        exclude_args = self._grep_exclude_args()
-        src_path = base_path / "src"
-        search_path = str(src_path) if src_path.is_dir() else str(base_path)
-        orphan_functions = self._grep_for_uncalled_functions(candidates, search_path, exclude_args)
+        search_prefix = "src/" if (base_path / "src").is_dir() else None
+        orphan_functions = self._find_uncalled_functions(candidates, search_prefix, index)
         return orphan_functions, total_functions
 
     def _collect_function_candidates(self, base_path: Path, graph: DependencyGraph) -> Tuple[List[Tuple[ast.FunctionDef, str]], int]:
@@ -526,12 +520,10 @@ class OrphanDetector:
         for file_path in graph.files:
             if not file_path.endswith(".py"):
                 continue
-            full_path = base_path / file_path
-            try:
-                tree = ast.parse(full_path.read_text(encoding="utf-8"))
-            except Exception:
+            tree = self._parse_python_file(base_path / file_path, file_path)
+            if tree is None:
                 continue
-            func_nodes = [n for n in ast.walk(tree) if isinstance(n, ast.FunctionDef)]
+            func_nodes = [n for n in _walk_statements(tree) if isinstance(n, ast.FunctionDef)]
             total_functions += len(func_nodes)
             for node in func_nodes:
                 if not self._should_skip_function(node):
@@ -548,69 +540,34 @@ class OrphanDetector:
             return True
         return cls._has_framework_decorator(node)
 
-    def _grep_for_uncalled_functions(
+    def _find_uncalled_functions(
         self,
         candidates: List[Tuple[ast.FunctionDef, str]],
-        search_path: str,
-        exclude_args: List[str],
+        search_prefix: Optional[str],
+        index: IdentifierIndex,
     ) -> List[OrphanFunction]:
-        """Run parallel grep to find functions with no call sites."""
-        orphan_functions: List[OrphanFunction] = []
-        max_workers = min(8, len(candidates))
-
-        with ThreadPoolExecutor(max_workers=max_workers) as pool:
-            futures = {
-                pool.submit(self._check_function_called_grep, node.name, search_path, rel_path, exclude_args): (node, rel_path)
-                for node, rel_path in candidates
-            }
-            for future in as_completed(futures):
-                node, rel_path = futures[future]
-                try:
-                    is_called = future.result()
-                except Exception:
-                    is_called = True  # Assume called on error
-                if not is_called:
-                    orphan_functions.append(
-                        OrphanFunction(
-                            name=node.name,
-                            file_path=rel_path,
-                            line_start=node.lineno,
-                            line_end=node.end_lineno or node.lineno,
-                            status=VerificationStatus.LIKELY,
-                            reason="No call sites found in codebase",
-                            is_private=node.name.startswith("_"),
-                        )
-                    )
-
-        return orphan_functions
-
-    def _check_function_called_grep(self, func_name: str, search_path: str, source_file: str, exclude_args: List[str]) -> bool:
-        """Check if a function is called anywhere via grep (thread-safe)."""
-        try:
-            result = subprocess.run(
-                ["grep", "-r", "-E", *exclude_args, rf"{func_name}\s*\(", search_path],
-                capture_output=True,
-                text=True,
-                timeout=SubprocessDefaults.GREP_TIMEOUT_SECONDS,
+        """Return the candidates with no references under search_prefix."""
+        return [
+            OrphanFunction(
+                name=node.name,
+                file_path=rel_path,
+                line_start=node.lineno,
+                line_end=node.end_lineno or node.lineno,
+                status=VerificationStatus.LIKELY,
+                reason="No call sites found in codebase",
+                is_private=node.name.startswith("_"),
             )
-            return self._has_call_site(result.stdout, source_file, func_name)
-        except Exception:
-            return True
+            for node, rel_path in candidates
+            if not self._is_function_referenced(node.name, search_prefix, index)
+        ]
 
-    def _has_call_site(self, grep_output: str, source_file: str, func_name: str) -> bool:
-        """Return True if grep output contains a call site (not just the definition)."""
-        def_pattern = re.compile(rf"\bdef\s+{re.escape(func_name)}\s*\(")
-        for line in grep_output.strip().split("\n"):
-            if not line or line.strip().startswith("#"):
-                continue
-            # For same-file matches, skip the definition line itself
-            if source_file in line:
-                # Extract the code portion after the file path
-                code_part = line.split(":", 1)[-1] if ":" in line else line
-                if def_pattern.search(code_part):
-                    continue
-            return True
-        return False
+    @staticmethod
+    def _is_function_referenced(func_name: str, search_prefix: Optional[str], index: IdentifierIndex) -> bool:
+        """Check if a function name is referenced anywhere under search_prefix.
+
+        Definitions are not indexed, so any occurrence is a call site or reference.
+        """
+        return bool(index.files_containing(func_name, search_prefix))
 
 
 def _build_orphan_config(
@@ -644,7 +601,7 @@ def detect_orphans_impl(
         include_patterns: Glob patterns for files to analyze
         exclude_patterns: Glob patterns for files to exclude
         analyze_functions: Whether to analyze function-level orphans
-        verify_with_grep: Whether to verify findings with grep
+        verify_with_grep: Whether to verify orphan files against an index of identifier references
 
     Returns:
         Dictionary with orphan analysis results
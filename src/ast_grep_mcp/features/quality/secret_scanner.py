@@ -0,0 +1,168 @@
+"""
+Regex engine for hardcoded-secret scanning.
+
+SecretScanner compiles every secret pattern into one alternation and runs it
+over each file's bytes to find the lines that contain any secret:
+- only those lines are matched against each pattern on its own, so every
+  pattern that matches a line reports, even where the alternation would
+  have returned just one hit for overlapping matches
+- small files are read whole; files of at least
+  SecurityScanDefaults.SECRET_MMAP_MIN_BYTES are memory-mapped, so memory stays
+  bounded by the thread count rather than the size of the tree
+- files are read and scanned in a thread pool, one file per task
+- byte offsets are mapped to line numbers only for lines with hits
+
+Patterns are matched within single lines, as when scanning line by line.
+"""
+
+import mmap
+import re
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Sequence, Tuple, Union
+
+from ast_grep_mcp.constants import PatternSuggestionConfidence, SecurityScanDefaults
+from ast_grep_mcp.core.logging import get_logger
+from ast_grep_mcp.models.standards import SecurityIssue
+
+logger = get_logger(__name__)
+
+Buffer = Union[bytes, mmap.mmap]
+
+# Newlines between hits are counted over slices of at most this many bytes
+_COUNT_CHUNK_BYTES = 1024 * 1024
+
+
+@contextmanager
+def _open_buffer(file_path: str) -> Iterator[Buffer]:
+    """Yield a file's bytes, memory-mapped when the file is large."""
+    with open(file_path, "rb") as f:
+        f.seek(0, 2)
+        size = f.tell()
+        # Empty files cannot be mapped
+        if size == 0 or size < SecurityScanDefaults.SECRET_MMAP_MIN_BYTES:
+            f.seek(0)
+            yield f.read()
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield mapped
+
+
+def _count_newlines(buf: Buffer, start: int, end: int) -> int:
+    return sum(buf[i : min(i + _COUNT_CHUNK_BYTES, end)].count(b"\n") for i in range(start, end, _COUNT_CHUNK_BYTES))
+
+
+class _LineLocator:
+    """Maps increasing byte offsets of a buffer to 1-indexed lines."""
+
+    def __init__(self, buf: Buffer) -> None:
+        self.buf = buf
+        self.offset = 0
+        self.line = 1
+
+    def line_at(self, offset: int) -> Tuple[int, int, int]:
+        """Return (line number, start offset, end offset) of the line containing offset."""
+        self.line += _count_newlines(self.buf, self.offset, offset)
+        self.offset = offset
+        line_start = self.buf.rfind(b"\n", 0, offset) + 1
+        line_end = self.buf.find(b"\n", offset)
+        if line_end < 0:
+            line_end = len(self.buf)
+        return self.line, line_start, line_end
+
+
+class SecretScanner:
+    """Scans files for every secret pattern in a single regex pass per file."""
+
+    def __init__(self, patterns: Sequence[Dict[str, Any]]) -> None:
+        """Compile the secret patterns.
+
+        Args:
+            patterns: Pattern definitions with regex, severity, title,
+                description, remediation and optional cwe; regexes are
+                matched case-insensitively
+        """
+        self.patterns = list(patterns)
+        self._compiled = [(pattern_def, re.compile(pattern_def["regex"].encode("utf-8"), re.IGNORECASE)) for pattern_def in self.patterns]
+        alternation = "|".join(f"(?:{pattern_def['regex']})" for pattern_def in self.patterns)
+        self._regex = re.compile(alternation.encode("utf-8"), re.IGNORECASE)
+
+    def scan_buffer(self, buf: Buffer, file_path: str) -> List[SecurityIssue]:
+        """Scan a file's bytes for secrets.
+
+        Args:
+            buf: File content
+            file_path: Path reported on each issue
+
+        Returns:
+            Issues in line order, in pattern order within a line
+        """
+        issues: List[SecurityIssue] = []
+        locator = _LineLocator(buf)
+        match = self._regex.search(buf)
+        while match is not None:
+            line, line_start, line_end = locator.line_at(match.start())
+            issues.extend(self._scan_line(buf[line_start:line_end].rstrip(b"\r"), line, file_path))
+            match = self._regex.search(buf, line_end + 1)
+        return issues
+
+    def _scan_line(self, line_bytes: bytes, line: int, file_path: str) -> List[SecurityIssue]:
+        """Match each pattern on its own against one line."""
+        issues: List[SecurityIssue] = []
+        text = line_bytes.decode("utf-8", errors="replace")
+        for pattern_def, regex in self._compiled:
+            for hit in regex.finditer(line_bytes):
+                column = len(line_bytes[: hit.start()].decode("utf-8", errors="replace")) + 1
+                end_column = column + len(hit.group().decode("utf-8", errors="replace"))
+                issues.append(_create_secret_issue(file_path, line, column, end_column, text, pattern_def))
+        return issues
+
+    def scan_file(self, file_path: str) -> List[SecurityIssue]:
+        """Scan a single file for secrets; unreadable files are logged and skipped.
+
+        Args:
+            file_path: Path to file to scan
+
+        Returns:
+            Issues found in the file
+        """
+        try:
+            with _open_buffer(file_path) as buf:
+                return self.scan_buffer(buf, file_path)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Secret scan failed for {file_path}: {e}")
+            return []
+
+    def scan_files(self, file_paths: Sequence[str], max_threads: int = SecurityScanDefaults.SECRET_SCAN_THREADS) -> List[SecurityIssue]:
+        """Scan files in a thread pool.
+
+        Args:
+            file_paths: Paths of files to scan
+            max_threads: Number of reader threads
+
+        Returns:
+            Issues grouped by file in input order
+        """
+        issues: List[SecurityIssue] = []
+        with ThreadPoolExecutor(max_workers=max(1, max_threads)) as executor:
+            for file_issues in executor.map(self.scan_file, file_paths):
+                issues.extend(file_issues)
+        return issues
+
+
+def _create_secret_issue(file_path: str, line: int, column: int, end_column: int, text: str, pattern_def: Dict[str, Any]) -> SecurityIssue:
+    return SecurityIssue(
+        file=file_path,
+        line=line,
+        column=column,
+        end_line=line,
+        end_column=end_column,
+        issue_type="hardcoded_secret",
+        severity=pattern_def["severity"],
+        title=pattern_def["title"],
+        description=pattern_def["description"],
+        code_snippet=text.strip(),
+        remediation=pattern_def["remediation"],
+        cwe_id=pattern_def.get("cwe"),
+        confidence=PatternSuggestionConfidence.PATTERN_MATCH,
+    )
@@ -11,17 +11,23 @@ This module provides functionality to detect common security vulnerabilities:
 """
 
 import copy
-import re
+import json
+import os
 import time
 from pathlib import Path
 from typing import Any, Dict, List, cast
 
+import numpy as np
 import sentry_sdk
 
-from ast_grep_mcp.constants import ConversionFactors, PatternSuggestionConfidence, SecurityScanDefaults, SeverityRankingDefaults
-from ast_grep_mcp.core.executor import stream_ast_grep_results
+from ast_grep_mcp.constants import CacheDefaults, ConversionFactors, FileConstants, SecurityScanDefaults, SeverityRankingDefaults
+from ast_grep_mcp.core.content_cache import ArrayCodec, ContentCache, content_digest, get_content_cache
+from ast_grep_mcp.core.exceptions import AstGrepError
+from ast_grep_mcp.core.executor import run_ast_grep_batch, stream_ast_grep_results
+from ast_grep_mcp.core.file_discovery import discover_files
 from ast_grep_mcp.core.logging import get_logger
-from ast_grep_mcp.models.standards import SecurityIssue, SecurityScanResult
+from ast_grep_mcp.features.quality.secret_scanner import SecretScanner
+from ast_grep_mcp.models.standards import SecurityIssue, SecurityScanMode, SecurityScanResult
 
 logger = get_logger(__name__)
 
@@ -239,7 +245,7 @@ SECRET_REGEX_PATTERNS = [
         "cwe": "CWE-798",
     },
     {
-        "regex": r'password\s*=\s*["\'][^"\']{8,}["\']',
+        "regex": r'password[^\S\n]*=[^\S\n]*["\'][^"\'\n]{8,}["\']',
         "severity": "high",
         "title": "Hardcoded Password",
         "description": "Password appears to be hardcoded in source code",
@@ -247,7 +253,7 @@ SECRET_REGEX_PATTERNS = [
         "cwe": "CWE-798",
     },
     {
-        "regex": r"Bearer\s+[a-zA-Z0-9_-]{20,}",
+        "regex": r"Bearer[^\S\n]+[a-zA-Z0-9_-]{20,}",
         "severity": "high",
         "title": "Hardcoded Bearer Token",
         "description": "Bearer token found in source code",
@@ -289,12 +295,15 @@ CRYPTO_PATTERNS = {
 
 
 def _match_to_issue(match: Dict[str, Any], pattern_def: Dict[str, Any]) -> SecurityIssue:
+    range_info = match.get("range", {})
+    start = range_info.get("start", {})
+    end = range_info.get("end", {})
     return SecurityIssue(
         file=match.get("file", ""),
-        line=match.get("line", 1),
-        column=match.get("column", 1),
-        end_line=match.get("end_line", match.get("line", 1)),
-        end_column=match.get("end_column", 1),
+        line=start.get("line", 0) + 1,
+        column=start.get("column", 0) + 1,
+        end_line=end.get("line", 0) + 1,
+        end_column=end.get("column", 0) + 1,
         issue_type=pattern_def.get("issue_type", "unknown"),
         severity=pattern_def["severity"],
         title=pattern_def["title"],
@@ -332,156 +341,169 @@ def scan_for_vulnerability(project_folder: str, language: str, patterns: List[Di
     return issues
 
 
-def scan_for_secrets_regex(project_folder: str, language: str) -> List[SecurityIssue]:
-    """Scan for hardcoded secrets using regex patterns.
-
-    Args:
-        project_folder: Project root directory
-        language: Programming language (for file filtering)
+# `--lang typescript` parses .tsx files too; scan needs the mapping spelled out
+_SCAN_LANGUAGE_GLOBS: Dict[str, Dict[str, List[str]]] = {"typescript": {"typescript": ["*.tsx"]}}
 
-    Returns:
-        List of SecurityIssue objects
-    """
-    issues = []
-    project_path = Path(project_folder)
-
-    # Get file extensions for language
-    exts = _get_language_extensions(language)
+# Cached findings are JSON-encoded match lists stored as byte arrays
+FINDINGS_CODEC = ArrayCodec(
+    to_array=lambda findings: np.frombuffer(json.dumps(findings).encode("utf-8"), dtype=np.uint8),
+    from_array=lambda array: json.loads(array.tobytes()),
+)
 
-    # Scan files by extension
-    for ext in exts:
-        file_issues = _scan_files_for_secrets(project_path, ext)
-        issues.extend(file_issues)
 
-    return issues
-
-
-def _get_language_extensions(language: str) -> List[str]:
-    """Get file extensions for a programming language.
+def build_vulnerability_rules(patterns: List[Dict[str, Any]], language: str) -> List[Dict[str, Any]]:
+    """Turn vulnerability patterns into scan rules keyed by their stable rule ids.
 
     Args:
-        language: Programming language name
+        patterns: Pattern definitions with a rule_id (see _patterns_for_issue_type)
+        language: Programming language
 
     Returns:
-        List of file extensions
+        Rule documents for run_ast_grep_batch
     """
-    extensions = {"python": [".py"], "javascript": [".js"], "typescript": [".ts", ".tsx"], "java": [".java"]}
-    return extensions.get(language, [".py", ".js", ".ts", ".java"])
-
-
-def _should_skip_file(file_path: Path) -> bool:
-    """Check if a file should be skipped during scanning.
-
-    Args:
-        file_path: Path to check
+    return [{"id": p["rule_id"], "language": language, "rule": {"pattern": p["pattern"]}} for p in patterns]
+
+
+def _findings_cache(language: str, rules: List[Dict[str, Any]]) -> ContentCache:
+    """Per-file findings cache; the namespace changes whenever the rule set does."""
+    rules_digest = content_digest(json.dumps(rules, sort_keys=True))
+    max_bytes = CacheDefaults.SECURITY_FINDINGS_CACHE_MAX_MB * FileConstants.BYTES_PER_MB
+    return get_content_cache(f"security_scan:{language}:{rules_digest}", max_bytes, FINDINGS_CODEC)
+
+
+def _scan_uncached_files(rules: List[Dict[str, Any]], files: List[str], language: str) -> Dict[str, List[Dict[str, Any]]]:
+    """Scan files with every rule, one ast-grep process per chunk, and group matches by file."""
+    grouped: Dict[str, List[Dict[str, Any]]] = {f: [] for f in files}
+    # ast-grep reports paths as given; normalize so both spellings land in the same bucket
+    canonical = {os.path.normpath(f): f for f in files}
+    chunk_size = SecurityScanDefaults.SCAN_CHUNK_FILES
+    for start in range(0, len(files), chunk_size):
+        by_rule = run_ast_grep_batch(rules, files[start : start + chunk_size], language_globs=_SCAN_LANGUAGE_GLOBS.get(language))
+        for matches in by_rule.values():
+            for match in matches:
+                key = canonical.get(os.path.normpath(match.get("file", "")))
+                if key is not None:
+                    grouped[key].append({"ruleId": match.get("ruleId"), "text": match.get("text", ""), "range": match.get("range", {})})
+    return grouped
+
+
+def _read_digests(files: List[str]) -> Dict[str, str]:
+    digests: Dict[str, str] = {}
+    for path in files:
+        try:
+            digests[path] = content_digest(Path(path).read_text(encoding="utf-8", errors="replace"))
+        except OSError as e:
+            logger.warning(f"Vulnerability scan skipped unreadable file {path}: {e}")
+    return digests
 
-    Returns:
-        True if file should be skipped
-    """
-    skip_dirs = ["node_modules", "__pycache__", "venv", ".venv", "dist", "build"]
-    return any(part in str(file_path) for part in skip_dirs)
 
+def scan_for_vulnerabilities_single_pass(project_folder: str, language: str, patterns: List[Dict[str, Any]]) -> List[SecurityIssue]:
+    """Scan for every vulnerability pattern with one ast-grep scan.
 
-def _scan_files_for_secrets(project_path: Path, ext: str) -> List[SecurityIssue]:
-    """Scan all files with given extension for secrets.
+    Findings are cached per file content digest, so files unchanged since an
+    earlier scan with the same rule set are not parsed again.
 
     Args:
-        project_path: Project root path
-        ext: File extension to scan
+        project_folder: Project root directory
+        language: Programming language
+        patterns: Pattern definitions with issue_type and rule_id
 
     Returns:
-        List of security issues found
-    """
-    issues = []
-
-    for file_path in project_path.rglob(f"*{ext}"):
-        if _should_skip_file(file_path):
-            continue
+        SecurityIssue objects, grouped by pattern in input order
 
-        file_issues = _scan_single_file_for_secrets(file_path)
-        issues.extend(file_issues)
+    Raises:
+        ValueError: If rule ids are missing or not unique
+        AstGrepNotFoundError: If ast-grep binary not found
+        AstGrepExecutionError: If ast-grep execution fails
+    """
+    if not patterns:
+        return []
+    rules = build_vulnerability_rules(patterns, language)
+    files = [found.path for found in discover_files(project_folder, extensions=_get_language_extensions(language))]
+    digests = _read_digests(files)
+    cache = _findings_cache(language, rules)
+    findings = cache.get_many(set(digests.values()))
+    fresh = _scan_uncached_files(rules, [path for path, digest in digests.items() if digest not in findings], language)
+    cache.put_many((digests[path], matches) for path, matches in fresh.items())
+    findings.update((digests[path], matches) for path, matches in fresh.items())
+    logger.info(f"Vulnerability scan: {len(fresh)} of {len(digests)} files scanned, {len(digests) - len(fresh)} from cache")
+
+    by_rule: Dict[str, List[SecurityIssue]] = {p["rule_id"]: [] for p in patterns}
+    pattern_by_rule = {p["rule_id"]: p for p in patterns}
+    for path, digest in digests.items():
+        for match in findings[digest]:
+            by_rule[match["ruleId"]].append(_match_to_issue({**match, "file": path}, pattern_by_rule[match["ruleId"]]))
+    return [issue for p in patterns for issue in by_rule[p["rule_id"]]]
 
-    return issues
 
+def scan_for_secrets_regex(project_folder: str, language: str) -> List[SecurityIssue]:
+    """Scan for hardcoded secrets using regex patterns.
 
-def _scan_single_file_for_secrets(file_path: Path) -> List[SecurityIssue]:
-    """Scan a single file for hardcoded secrets.
+    The tree is walked once for all of the language's extensions and every
+    pattern is matched in a single pass over each file. Ignore files are not
+    honoured: gitignored files (local settings, .env-style modules) are where
+    secrets tend to live, so only the directories in _should_skip_file are
+    left out.
 
     Args:
-        file_path: Path to file to scan
+        project_folder: Project root directory
+        language: Programming language (for file filtering)
 
     Returns:
-        List of security issues found in file
+        List of SecurityIssue objects
     """
-    issues = []
+    return _get_secret_scanner().scan_files(_walk_unignored_files(project_folder, _get_language_extensions(language)))
 
-    try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            content = f.read()
-            lines = content.splitlines()
 
-        # Check each pattern against file content
-        for pattern_def in SECRET_REGEX_PATTERNS:
-            pattern_issues = _scan_lines_for_pattern(lines, pattern_def, str(file_path))
-            issues.extend(pattern_issues)
+def _walk_unignored_files(project_folder: str, extensions: List[str]) -> List[str]:
+    """List files with the given extensions under project_folder, skipping only _should_skip_file paths."""
+    suffixes = tuple(extensions)
+    paths: List[str] = []
+    for dirpath, dirnames, filenames in os.walk(project_folder):
+        # A skipped directory's path is contained in every path below it
+        dirnames[:] = sorted(name for name in dirnames if not _should_skip_file(Path(dirpath, name)))
+        for name in sorted(filenames):
+            path = os.path.join(dirpath, name)
+            if name.endswith(suffixes) and not _should_skip_file(Path(path)):
+                paths.append(path)
+    return paths
 
-    except Exception as e:
-        logger.warning(f"Secret scan failed for {file_path}: {e}")
 
-    return issues
+_secret_scanner: SecretScanner | None = None
+
 
+def _get_secret_scanner() -> SecretScanner:
+    """Return the scanner compiled from SECRET_REGEX_PATTERNS, compiling it on first use."""
+    global _secret_scanner
+    if _secret_scanner is None:
+        _secret_scanner = SecretScanner(SECRET_REGEX_PATTERNS)
+    return _secret_scanner
 
-def _scan_lines_for_pattern(lines: List[str], pattern_def: Dict[str, Any], file_path: str) -> List[SecurityIssue]:
-    """Scan lines for a specific secret pattern.
+
+def _get_language_extensions(language: str) -> List[str]:
+    """Get file extensions for a programming language.
 
     Args:
-        lines: File lines to scan
-        pattern_def: Pattern definition with regex and metadata
-        file_path: Path to file being scanned
+        language: Programming language name
 
     Returns:
-        List of security issues found
+        List of file extensions
     """
-    issues = []
-
-    for line_num, line in enumerate(lines, start=1):
-        matches = re.finditer(pattern_def["regex"], line, re.IGNORECASE)
-
-        for match in matches:
-            issue = _create_secret_issue(file_path=file_path, line_num=line_num, line=line, match=match, pattern_def=pattern_def)
-            issues.append(issue)
-
-    return issues
+    extensions = {"python": [".py"], "javascript": [".js"], "typescript": [".ts", ".tsx"], "java": [".java"]}
+    return extensions.get(language, [".py", ".js", ".ts", ".java"])
 
 
-def _create_secret_issue(file_path: str, line_num: int, line: str, match: re.Match[str], pattern_def: Dict[str, Any]) -> SecurityIssue:
-    """Create a SecurityIssue for a found secret.
+def _should_skip_file(file_path: Path) -> bool:
+    """Check if a file should be skipped during scanning.
 
     Args:
-        file_path: Path to file containing the secret
-        line_num: Line number where secret found
-        line: The line containing the secret
-        match: Regex match object
-        pattern_def: Pattern definition with metadata
+        file_path: Path to check
 
     Returns:
-        SecurityIssue object
+        True if file should be skipped
     """
-    return SecurityIssue(
-        file=file_path,
-        line=line_num,
-        column=match.start() + 1,
-        end_line=line_num,
-        end_column=match.end() + 1,
-        issue_type="hardcoded_secret",
-        severity=pattern_def["severity"],
-        title=pattern_def["title"],
-        description=pattern_def["description"],
-        code_snippet=line.strip(),
-        remediation=pattern_def["remediation"],
-        cwe_id=pattern_def.get("cwe"),
-        confidence=PatternSuggestionConfidence.PATTERN_MATCH,
-    )
+    skip_dirs = ["node_modules", "__pycache__", "venv", ".venv", "dist", "build"]
+    return any(part in str(file_path) for part in skip_dirs)
 
 
 # =============================================================================
@@ -505,7 +527,11 @@ def _scan_for_issue_type(issue_type: str, config: Dict[str, Any], project_folder
     if config.get("use_regex"):
         return scan_for_secrets_regex(project_folder, language)
 
-    # Handle ast-grep based scanning
+    return scan_for_vulnerability(project_folder, language, _patterns_for_issue_type(issue_type, config, language))
+
+
+def _patterns_for_issue_type(issue_type: str, config: Dict[str, Any], language: str) -> List[Dict[str, Any]]:
+    """Copy an issue type's ast-grep patterns for a language, tagged with issue_type and a stable rule_id."""
     patterns_dict_name = config.get("patterns_dict")
     if not patterns_dict_name:
         return []
@@ -516,11 +542,11 @@ def _scan_for_issue_type(issue_type: str, config: Dict[str, Any], project_folder
         return []
 
     # Deep copy patterns and add issue type
-    patterns = copy.deepcopy(patterns_dict[language])
-    for p in patterns:
+    patterns: List[Dict[str, Any]] = copy.deepcopy(patterns_dict[language])
+    for index, p in enumerate(patterns):
         p["issue_type"] = issue_type
-
-    return scan_for_vulnerability(project_folder, language, patterns)
+        p["rule_id"] = f"{issue_type}-{language}-{index}"
+    return patterns
 
 
 def _filter_by_severity(issues: List[SecurityIssue], severity_threshold: str, max_issues: int) -> List[SecurityIssue]:
@@ -594,28 +620,54 @@ def _build_summary(
     }
 
 
-def _collect_issues(project_folder: str, language: str, issue_types: List[str]) -> List[SecurityIssue]:
+def _types_to_scan(issue_types: List[str]) -> List[str]:
     scan_all = "all" in issue_types
-    types_to_scan = list(SCAN_CONFIG.keys()) if scan_all else issue_types
+    return [t for t in (SCAN_CONFIG if scan_all else issue_types) if t in SCAN_CONFIG]
+
+
+def _collect_issues_per_pattern(project_folder: str, language: str, issue_types: List[str]) -> List[SecurityIssue]:
     all_issues: List[SecurityIssue] = []
-    for issue_type in types_to_scan:
-        if issue_type in SCAN_CONFIG:
-            issues = _scan_for_issue_type(
-                issue_type=issue_type,
-                config=cast(Dict[str, Any], SCAN_CONFIG[issue_type]),
-                project_folder=project_folder,
-                language=language,
-            )
-            all_issues.extend(issues)
+    for issue_type in _types_to_scan(issue_types):
+        issues = _scan_for_issue_type(
+            issue_type=issue_type,
+            config=cast(Dict[str, Any], SCAN_CONFIG[issue_type]),
+            project_folder=project_folder,
+            language=language,
+        )
+        all_issues.extend(issues)
     return all_issues
 
 
+def _collect_issues_single_scan(project_folder: str, language: str, issue_types: List[str]) -> List[SecurityIssue]:
+    """Scan every enabled ast-grep pattern at once; issues keep the per-pattern order."""
+    types = _types_to_scan(issue_types)
+    patterns = [p for t in types for p in _patterns_for_issue_type(t, cast(Dict[str, Any], SCAN_CONFIG[t]), language)]
+    by_type: Dict[str, List[SecurityIssue]] = {t: [] for t in types}
+    for issue in scan_for_vulnerabilities_single_pass(project_folder, language, patterns):
+        by_type[issue.issue_type].append(issue)
+    for t in types:
+        if cast(Dict[str, Any], SCAN_CONFIG[t]).get("use_regex"):
+            by_type[t] = scan_for_secrets_regex(project_folder, language)
+    return [issue for t in types for issue in by_type[t]]
+
+
+def _collect_issues(project_folder: str, language: str, issue_types: List[str], scan_mode: SecurityScanMode) -> List[SecurityIssue]:
+    if scan_mode == "single_scan":
+        try:
+            return _collect_issues_single_scan(project_folder, language, issue_types)
+        except (AstGrepError, ValueError) as e:
+            logger.warning(f"Single-pass vulnerability scan failed, scanning per pattern: {e}")
+            sentry_sdk.capture_exception(e)
+    return _collect_issues_per_pattern(project_folder, language, issue_types)
+
+
 def detect_security_issues_impl(
     project_folder: str,
     language: str,
     issue_types: List[str] = ["all"],
     severity_threshold: str = "low",
     max_issues: int = SecurityScanDefaults.MAX_ISSUES,
+    scan_mode: SecurityScanMode = "single_scan",
 ) -> SecurityScanResult:
     """Scan project for security vulnerabilities.
 
@@ -625,12 +677,14 @@ def detect_security_issues_impl(
         issue_types: Types to scan for or ["all"]
         severity_threshold: Minimum severity to report
         max_issues: Maximum issues to find (0 = unlimited)
+        scan_mode: "single_scan" (one ast-grep scan for all patterns, findings
+            cached per file content) or "per_pattern" (one scan per pattern)
 
     Returns:
         SecurityScanResult with all findings
     """
     start_time = time.time()
-    all_issues = _collect_issues(project_folder, language, issue_types)
+    all_issues = _collect_issues(project_folder, language, issue_types, scan_mode)
     filtered_issues = _filter_by_severity(issues=all_issues, severity_threshold=severity_threshold, max_issues=max_issues)
     by_severity, by_type = _group_issues(filtered_issues)
     summary = _build_summary(by_severity=by_severity, by_type=by_type, total_count=len(filtered_issues))
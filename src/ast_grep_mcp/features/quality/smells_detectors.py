@@ -5,18 +5,17 @@ following the strategy pattern for extensibility and maintainability.
 """
 
 import ast
-import json
 import re
-import subprocess
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from fnmatch import fnmatch
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import AbstractSet, Any, Dict, FrozenSet, List, Literal
 
-from ast_grep_mcp.constants import SemanticVolumeDefaults, SubprocessDefaults
+from ast_grep_mcp.constants import SemanticVolumeDefaults
+from ast_grep_mcp.core.exceptions import AstGrepError
 from ast_grep_mcp.core.logging import get_logger
-from ast_grep_mcp.features.complexity.analyzer import calculate_nesting_depth, extract_functions_from_file
+from ast_grep_mcp.features.complexity.analyzer import calculate_nesting_depth, extract_definitions_from_file
 from ast_grep_mcp.features.quality.smells_helpers import calculate_smell_severity
 
 
@@ -49,14 +48,96 @@ class SmellInfo:
         }
 
 
+SmellArtifact = Literal["functions", "classes"]
+
+
+@dataclass
+class FileAnalysisContext:
+    """Parse results for one file, shared by every detector that analyzes it.
+
+    functions and classes hold dicts with name, start_line, end_line and code
+    (classes also carry method_count); each list is only filled when some
+    detector requires that artifact.
+    """
+
+    file_path: str
+    content: str
+    language: str
+    project_path: Path
+    functions: List[Dict[str, Any]] = field(default_factory=list)
+    classes: List[Dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def rel_path(self) -> str:
+        return str(Path(self.file_path).relative_to(self.project_path))
+
+
+def _match_name(match: Dict[str, Any]) -> str:
+    """Read $NAME from an ast-grep match, "unknown" if it was not captured."""
+    meta_vars = match.get("metaVariables", {})
+    name_data = meta_vars.get("single", meta_vars).get("NAME")
+    if isinstance(name_data, dict):
+        name_data = name_data.get("text")
+    return str(name_data) if name_data else "unknown"
+
+
+def _match_info(match: Dict[str, Any]) -> Dict[str, Any]:
+    range_info = match.get("range", {})
+    return {
+        "name": _match_name(match),
+        "start_line": range_info.get("start", {}).get("line", 0) + 1,
+        "end_line": range_info.get("end", {}).get("line", 0) + 1,
+        "code": match.get("text", ""),
+    }
+
+
+def _count_class_methods(code: str, language: str) -> int:
+    if language.lower() == "python":
+        return len(re.findall(r"^\s+def\s+", code, re.MULTILINE))
+    return len(re.findall(r"^\s+\w+\s*\([^)]*\)\s*\{", code, re.MULTILINE))
+
+
+def build_file_context(
+    file_path: str, content: str, language: str, project_path: Path, artifacts: AbstractSet[SmellArtifact]
+) -> FileAnalysisContext:
+    """Extract the requested artifacts of a file with a single ast-grep scan.
+
+    Args:
+        file_path: Path to the file being analyzed
+        content: File content
+        language: Programming language
+        project_path: Root project path for relative path calculation
+        artifacts: Artifacts any detector will read
+
+    Returns:
+        Context with the requested artifacts filled in; extraction failures
+        are logged and leave them empty
+    """
+    context = FileAnalysisContext(file_path, content, language, project_path)
+    if not artifacts:
+        return context
+    try:
+        functions, classes = extract_definitions_from_file(
+            file_path, language, functions="functions" in artifacts, classes="classes" in artifacts
+        )
+    except (AstGrepError, ValueError) as e:
+        get_logger("smell_analyzer").warning("extract_definitions_failed", file=file_path, error=str(e))
+        return context
+    context.functions = [_match_info(match) for match in functions]
+    context.classes = [{**info, "method_count": _count_class_methods(info["code"], language)} for info in map(_match_info, classes)]
+    return context
+
+
 class SmellDetector(ABC):
     """Base class for smell detectors."""
 
+    # Parse artifacts detect_in_context reads from its FileAnalysisContext
+    requires: FrozenSet[SmellArtifact] = frozenset()
+
     def __init__(self, threshold: int | None, logger_name: str) -> None:
         self.threshold = threshold
         self.logger = get_logger(logger_name)
 
-    @abstractmethod
     def detect(self, file_path: str, content: str, language: str, project_path: Path) -> List[SmellInfo]:
         """Detect smells in the given file.
 
@@ -69,10 +150,40 @@ class SmellDetector(ABC):
         Returns:
             List of detected smell information
         """
+        return self.detect_in_context(build_file_context(file_path, content, language, project_path, self.requires))
+
+    @abstractmethod
+    def detect_in_context(self, context: FileAnalysisContext) -> List[SmellInfo]:
+        """Detect smells using a file's shared parse results.
+
+        Args:
+            context: File content and the artifacts listed in requires
+
+        Returns:
+            List of detected smell information
+        """
+        pass
+
+
+class FunctionSmellDetector(SmellDetector):
+    """Base class for detectors that check each function on its own."""
+
+    requires = frozenset({"functions"})
+
+    def detect_in_context(self, context: FileAnalysisContext) -> List[SmellInfo]:
+        rel_path = context.rel_path
+        try:
+            return [s for s in (self._check_func(f, rel_path, context.language) for f in context.functions) if s]
+        except Exception as e:
+            self.logger.warning("detection_failed", file=context.file_path, error=str(e))
+            return []
+
+    @abstractmethod
+    def _check_func(self, func: Dict[str, Any], rel_path: str, language: str) -> SmellInfo | None:
         pass
 
 
-class LongFunctionDetector(SmellDetector):
+class LongFunctionDetector(FunctionSmellDetector):
     """Detects functions that are too long."""
 
     threshold: int
@@ -80,17 +191,7 @@ class LongFunctionDetector(SmellDetector):
     def __init__(self, threshold: int) -> None:
         super().__init__(threshold, "smell_detector.long_function")
 
-    def detect(self, file_path: str, content: str, language: str, project_path: Path) -> List[SmellInfo]:
-        """Detect long functions in the file."""
-        rel_path = str(Path(file_path).relative_to(project_path))
-        try:
-            funcs = extract_functions_from_file(file_path, language)
-            return [s for s in (self._check_func(f, rel_path) for f in funcs) if s]
-        except Exception as e:
-            self.logger.warning("detection_failed", file=file_path, error=str(e))
-            return []
-
-    def _check_func(self, func: Dict[str, Any], rel_path: str) -> SmellInfo | None:
+    def _check_func(self, func: Dict[str, Any], rel_path: str, language: str) -> SmellInfo | None:
         func_name = func.get("name", "unknown")
         func_start = func.get("start_line", 1)
         func_lines = func.get("end_line", func_start) - func_start + 1
@@ -110,7 +211,7 @@ class LongFunctionDetector(SmellDetector):
         )
 
 
-class ParameterBloatDetector(SmellDetector):
+class ParameterBloatDetector(FunctionSmellDetector):
     """Detects functions with too many parameters."""
 
     threshold: int
@@ -118,16 +219,6 @@ class ParameterBloatDetector(SmellDetector):
     def __init__(self, threshold: int) -> None:
         super().__init__(threshold, "smell_detector.parameter_bloat")
 
-    def detect(self, file_path: str, content: str, language: str, project_path: Path) -> List[SmellInfo]:
-        """Detect parameter bloat in functions."""
-        rel_path = str(Path(file_path).relative_to(project_path))
-        try:
-            funcs = extract_functions_from_file(file_path, language)
-            return [s for s in (self._check_func(f, rel_path, language) for f in funcs) if s]
-        except Exception as e:
-            self.logger.warning("detection_failed", file=file_path, error=str(e))
-            return []
-
     def _check_func(self, func: Dict[str, Any], rel_path: str, language: str) -> SmellInfo | None:
         func_name = func.get("name", "unknown")
         func_start = func.get("start_line", 1)
@@ -184,7 +275,7 @@ class ParameterBloatDetector(SmellDetector):
         return count
 
 
-class DeepNestingDetector(SmellDetector):
+class DeepNestingDetector(FunctionSmellDetector):
     """Detects excessive nesting depth in functions."""
 
     threshold: int
@@ -192,16 +283,6 @@ class DeepNestingDetector(SmellDetector):
     def __init__(self, threshold: int) -> None:
         super().__init__(threshold, "smell_detector.deep_nesting")
 
-    def detect(self, file_path: str, content: str, language: str, project_path: Path) -> List[SmellInfo]:
-        """Detect deep nesting in functions."""
-        rel_path = str(Path(file_path).relative_to(project_path))
-        try:
-            funcs = extract_functions_from_file(file_path, language)
-            return [s for s in (self._check_func(f, rel_path, language) for f in funcs) if s]
-        except Exception as e:
-            self.logger.warning("detection_failed", file=file_path, error=str(e))
-            return []
-
     def _check_func(self, func: Dict[str, Any], rel_path: str, language: str) -> SmellInfo | None:
         func_name = func.get("name", "unknown")
         func_start = func.get("start_line", 1)
@@ -226,19 +307,19 @@ class LargeClassDetector(SmellDetector):
     """Detects classes that are too large."""
 
     threshold: int
+    requires = frozenset({"classes"})
 
     def __init__(self, lines_threshold: int, methods_threshold: int) -> None:
         super().__init__(lines_threshold, "smell_detector.large_class")
         self.methods_threshold = methods_threshold
 
-    def detect(self, file_path: str, content: str, language: str, project_path: Path) -> List[SmellInfo]:
+    def detect_in_context(self, context: FileAnalysisContext) -> List[SmellInfo]:
         """Detect large classes in the file."""
-        rel_path = str(Path(file_path).relative_to(project_path))
+        rel_path = context.rel_path
         try:
-            classes = self._extract_classes(file_path, language)
-            return [s for s in (self._check_class(c, rel_path) for c in classes) if s]
+            return [s for s in (self._check_class(c, rel_path) for c in context.classes) if s]
         except Exception as e:
-            self.logger.warning("detection_failed", file=file_path, error=str(e))
+            self.logger.warning("detection_failed", file=context.file_path, error=str(e))
             return []
 
     def _build_reason(self, lines_count: int, method_count: int) -> str:
@@ -272,144 +353,6 @@ class LargeClassDetector(SmellDetector):
             suggestion="Consider splitting into smaller classes following Single Responsibility Principle",
         )
 
-    def _extract_classes(self, file_path: str, language: str) -> List[Dict[str, Any]]:
-        """Extract all classes from a file using ast-grep."""
-        pattern = self._get_class_pattern(language)
-
-        try:
-            matches = self._run_ast_grep_for_classes(file_path, language, pattern)
-            return self._process_class_matches(matches, language)
-        except Exception as e:
-            self.logger.warning("extract_classes_failed", file=file_path, error=str(e))
-            return []
-
-    def _get_class_pattern(self, language: str) -> str:
-        """Get the ast-grep pattern for class detection based on language.
-
-        Args:
-            language: Programming language
-
-        Returns:
-            Pattern string for ast-grep
-        """
-        class_patterns = {
-            "python": "class $NAME($$$): $$$",
-            "typescript": "class $NAME { $$$ }",
-            "javascript": "class $NAME { $$$ }",
-            "java": "class $NAME { $$$ }",
-        }
-        return class_patterns.get(language.lower(), class_patterns["python"])
-
-    def _run_ast_grep_for_classes(self, file_path: str, language: str, pattern: str) -> List[Dict[str, Any]]:
-        """Run ast-grep to find class matches.
-
-        Args:
-            file_path: Path to file to analyze
-            language: Programming language
-            pattern: ast-grep pattern to use
-
-        Returns:
-            List of match dictionaries from ast-grep output
-        """
-        result = subprocess.run(
-            ["ast-grep", "run", "--pattern", pattern, "--lang", language, "--json", file_path],
-            capture_output=True,
-            text=True,
-            timeout=SubprocessDefaults.AST_GREP_TIMEOUT_SECONDS,
-        )
-
-        # Early return for failed or empty results
-        if result.returncode != 0 or not result.stdout.strip():
-            return []
-
-        matches = json.loads(result.stdout)
-        return matches if isinstance(matches, list) else []
-
-    def _process_class_matches(self, matches: List[Dict[str, Any]], language: str) -> List[Dict[str, Any]]:
-        """Process ast-grep matches into class information.
-
-        Args:
-            matches: Raw match data from ast-grep
-            language: Programming language
-
-        Returns:
-            List of class information dictionaries
-        """
-        classes = []
-        for match in matches:
-            cls_info = self._extract_class_info(match, language)
-            classes.append(cls_info)
-        return classes
-
-    def _extract_class_info(self, match: Dict[str, Any], language: str) -> Dict[str, Any]:
-        """Extract class information from a single ast-grep match.
-
-        Args:
-            match: Single match dictionary from ast-grep
-            language: Programming language
-
-        Returns:
-            Dictionary with class name, lines, and method count
-        """
-        cls_name = self._extract_class_name(match)
-        start_line, end_line = self._extract_line_range(match)
-        method_count = self._count_methods_in_class(match.get("text", ""), language)
-
-        return {"name": cls_name, "start_line": start_line, "end_line": end_line, "method_count": method_count}
-
-    def _extract_class_name(self, match: Dict[str, Any]) -> str:
-        """Extract class name from ast-grep match metavariables.
-
-        Args:
-            match: Match dictionary from ast-grep
-
-        Returns:
-            Class name or "unknown" if not found
-        """
-        meta_vars = match.get("metaVariables", {})
-        if "NAME" not in meta_vars:
-            return "unknown"
-
-        name_data = meta_vars["NAME"]
-
-        # Handle both dict and string formats
-        if isinstance(name_data, dict):
-            result = name_data.get("text", "unknown")
-            return str(result) if result is not None else "unknown"
-        elif isinstance(name_data, str):
-            return name_data
-        else:
-            return "unknown"
-
-    def _extract_line_range(self, match: Dict[str, Any]) -> tuple[int, int]:
-        """Extract start and end line numbers from ast-grep match.
-
-        Args:
-            match: Match dictionary from ast-grep
-
-        Returns:
-            Tuple of (start_line, end_line), 1-indexed
-        """
-        range_info = match.get("range", {})
-        start_line = range_info.get("start", {}).get("line", 0) + 1
-        end_line = range_info.get("end", {}).get("line", 0) + 1
-        return start_line, end_line
-
-    def _count_methods_in_class(self, code: str, language: str) -> int:
-        """Count the number of methods in a class.
-
-        Args:
-            code: Class code as string
-            language: Programming language
-
-        Returns:
-            Number of methods found
-        """
-        if language.lower() == "python":
-            return len(re.findall(r"^\s+def\s+", code, re.MULTILINE))
-        else:
-            return len(re.findall(r"^\s+\w+\s*\([^)]*\)\s*\{", code, re.MULTILINE))
-
 
 class MagicNumberDetector(SmellDetector):
     """Detects magic numbers in code."""
@@ -429,17 +372,17 @@ class MagicNumberDetector(SmellDetector):
                 return True
         return False
 
-    def detect(self, file_path: str, content: str, language: str, project_path: Path) -> List[SmellInfo]:
+    def detect_in_context(self, context: FileAnalysisContext) -> List[SmellInfo]:
         """Detect magic numbers in the code."""
-        if not self.enabled or self._is_excluded(file_path):
+        if not self.enabled or self._is_excluded(context.file_path):
             return []
-        rel_path = str(Path(file_path).relative_to(project_path))
+        rel_path = context.rel_path
         try:
-            lines = content.split("\n")
-            magic_numbers = self._find_magic_numbers(content, lines, language)
+            lines = context.content.split("\n")
+            magic_numbers = self._find_magic_numbers(context.content, lines, context.language)
             return [self._make_smell(m, rel_path) for m in magic_numbers]
         except Exception as e:
-            self.logger.warning("detection_failed", file=file_path, error=str(e))
+            self.logger.warning("detection_failed", file=context.file_path, error=str(e))
             return []
 
     def _make_smell(self, magic: Dict[str, Any], rel_path: str) -> SmellInfo:
@@ -591,11 +534,15 @@ class SmellAnalyzer:
             detectors: List of smell detector instances
         """
         self.detectors = detectors
+        self.requires: FrozenSet[SmellArtifact] = frozenset().union(*(detector.requires for detector in detectors))
         self.logger = get_logger("smell_analyzer")
 
     def analyze_file(self, file_path: str, language: str, project_path: Path) -> List[Dict[str, Any]]:
         """Analyze a single file for all configured smells.
 
+        The file is parsed once for the artifacts the detectors require and
+        every detector reads the same FileAnalysisContext.
+
         Args:
             file_path: Path to file to analyze
             language: Programming language
@@ -608,9 +555,10 @@ class SmellAnalyzer:
 
         try:
             content = Path(file_path).read_text(encoding="utf-8", errors="ignore")
+            context = build_file_context(file_path, content, language, project_path, self.requires)
 
             for detector in self.detectors:
-                detected = detector.detect(file_path, content, language, project_path)
+                detected = detector.detect_in_context(context)
                 smells.extend([smell.to_dict() for smell in detected])
 
         except Exception as e:
@@ -23,9 +23,11 @@ from ast_grep_mcp.features.quality.validator import validate_rule_definition
 from ast_grep_mcp.models.standards import (
     EnforcementResult,
     LintingRule,
+    RuleExecutionMode,
     RuleValidationError,
     RuleViolation,
     SecurityIssue,
+    SecurityScanMode,
 )
 from ast_grep_mcp.utils.tool_context import tool_context
 
@@ -265,6 +267,7 @@ def enforce_standards_tool(
     max_violations: int = SecurityScanDefaults.MAX_ISSUES,
     max_threads: int = ParallelProcessing.DEFAULT_WORKERS,
     output_format: str = "json",
+    execution_mode: RuleExecutionMode = "single_scan",
 ) -> Dict[str, Any]:
     """Run linting rules against a project and return violations with statistics."""
     if custom_rules is None:
@@ -283,6 +286,7 @@ def enforce_standards_tool(
         custom_rules_count=len(custom_rules),
         max_violations=max_violations,
         max_threads=max_threads,
+        execution_mode=execution_mode,
     )
 
     with tool_context("enforce_standards", project_folder=project_folder, language=language, rule_set=rule_set) as start_time:
@@ -298,6 +302,7 @@ def enforce_standards_tool(
             severity_threshold=severity_threshold,
             max_violations=max_violations,
             max_threads=max_threads,
+            execution_mode=execution_mode,
         )
 
         execution_time = time.time() - start_time
@@ -540,6 +545,7 @@ def detect_security_issues_tool(
     issue_types: List[str] | None = None,
     severity_threshold: str = "low",
     max_issues: int = SecurityScanDefaults.MAX_ISSUES,
+    scan_mode: SecurityScanMode = "single_scan",
 ) -> Dict[str, Any]:
     """Scan code for security vulnerabilities (SQL injection, XSS, hardcoded secrets, etc.)."""
     if issue_types is None:
@@ -554,6 +560,7 @@ def detect_security_issues_tool(
         issue_types=issue_types,
         severity_threshold=severity_threshold,
         max_issues=max_issues,
+        scan_mode=scan_mode,
     )
 
     with tool_context("detect_security_issues", project_folder=project_folder, language=language, issue_types=issue_types) as start_time:
@@ -563,6 +570,7 @@ def detect_security_issues_tool(
             issue_types=issue_types,
             severity_threshold=severity_threshold,
             max_issues=max_issues,
+            scan_mode=scan_mode,
         )
 
         execution_time = time.time() - start_time
@@ -690,6 +698,10 @@ def _register_enforcement_tools(mcp: FastMCP) -> None:
             default=ParallelProcessing.DEFAULT_WORKERS, description="Number of parallel threads for rule execution (default: 4)"
         ),
         output_format: str = Field(default="json", description=_OUTPUT_FORMAT_DESC),
+        execution_mode: RuleExecutionMode = Field(
+            default="single_scan",
+            description="'single_scan' (parse the project once for all rules) or 'per_rule' (one scan per rule on max_threads threads)",
+        ),
     ) -> Dict[str, Any]:
         """Enforce coding standards using ast-grep rules."""
         return enforce_standards_tool(
@@ -703,6 +715,7 @@ def _register_enforcement_tools(mcp: FastMCP) -> None:
             max_violations=max_violations,
             max_threads=max_threads,
             output_format=output_format,
+            execution_mode=execution_mode,
         )
 
     @mcp.tool()
@@ -754,6 +767,10 @@ def _register_scanning_tools(mcp: FastMCP) -> None:
         ),
         severity_threshold: str = Field(default="low", description="Minimum severity to report: 'critical', 'high', 'medium', 'low'"),
         max_issues: int = Field(default=SecurityScanDefaults.MAX_ISSUES, description="Maximum number of issues to return (0 = unlimited)"),
+        scan_mode: SecurityScanMode = Field(
+            default="single_scan",
+            description="'single_scan' (one scan for all patterns, unchanged files cached) or 'per_pattern' (one scan per pattern)",
+        ),
     ) -> Dict[str, Any]:
         """Detect security vulnerabilities using ast-grep patterns."""
         return detect_security_issues_tool(
@@ -762,6 +779,7 @@ def _register_scanning_tools(mcp: FastMCP) -> None:
             issue_types=issue_types,
             severity_threshold=severity_threshold,
             max_issues=max_issues,
+            scan_mode=scan_mode,
         )
 
     @mcp.tool()
@@ -776,7 +794,9 @@ def _register_scanning_tools(mcp: FastMCP) -> None:
             description=_EXCLUDE_PATTERNS_DESC,
         ),
         analyze_functions: bool = Field(default=True, description="Whether to analyze function-level orphans in addition to files"),
-        verify_with_grep: bool = Field(default=True, description="Whether to double-check orphans with grep to reduce false positives"),
+        verify_with_grep: bool = Field(
+            default=True, description="Whether to double-check orphans for textual references to reduce false positives"
+        ),
     ) -> Dict[str, Any]:
         """Detect orphaned files and functions in a project."""
         return detect_orphans_tool(
@@ -3,8 +3,9 @@
 import contextlib
 import json
 import re
+import threading
 import time
-from typing import Any, Dict, Generator, List, Literal, Optional, Union, cast
+from typing import Any, Callable, Dict, Generator, Iterable, List, Literal, Optional, Union, cast
 
 import sentry_sdk
 import yaml
@@ -20,7 +21,7 @@ from ast_grep_mcp.constants import (
     SemanticVolumeDefaults,
     StreamDefaults,
 )
-from ast_grep_mcp.core.cache import get_query_cache
+from ast_grep_mcp.core.cache import FileFingerprint, get_query_cache, language_extensions
 from ast_grep_mcp.core.config import CACHE_ENABLED
 from ast_grep_mcp.core.exceptions import InvalidYAMLError, NoMatchesError
 from ast_grep_mcp.core.executor import (
@@ -208,13 +209,14 @@ def _check_cache(
     output_format: str,
     logger: Any,
     language_globs: Optional[Dict[str, List[str]]] = None,
+    rescan: Optional[Callable[[List[str]], List[Dict[str, Any]]]] = None,
 ) -> Union[str, List[Dict[str, Any]], None]:
     """Return formatted cached results, or None on a cache miss."""
     if not cache or max_results != 0:
         return None
 
     cache_args = _cache_args_with_globs(stream_args, language_globs)
-    cached_result = cache.get("run", cache_args, project_folder)
+    cached_result = cache.get("run", cache_args, project_folder, rescan=rescan)
     if cached_result is None:
         logger.info("find_code_cache_miss")
         return None
@@ -233,6 +235,7 @@ def _execute_search(
     project_folder: str,
     logger: Any,
     language_globs: Optional[Dict[str, List[str]]] = None,
+    fingerprint: Optional[FileFingerprint] = None,
 ) -> List[Dict[str, Any]]:
     """Execute the search and optionally cache results."""
     # Accumulate incrementally so partial results can be logged if streaming fails mid-stream.
@@ -254,12 +257,23 @@ def _execute_search(
     # Store in cache if available
     if cache and max_results == 0:
         cache_args = _cache_args_with_globs(stream_args, language_globs)
-        cache.put("run", cache_args, project_folder, matches)
+        cache.put("run", cache_args, project_folder, matches, fingerprint=fingerprint)
         logger.info("find_code_cache_stored", stored_results=len(matches), cache_size=len(cache.cache))
 
     return matches
 
 
+def _make_find_code_rescan(
+    pattern: str, language: str, workers: int, language_globs: Optional[Dict[str, List[str]]]
+) -> Callable[[List[str]], List[Dict[str, Any]]]:
+    """Return a callback that re-runs a find_code query against specific files."""
+
+    def rescan(files: List[str]) -> List[Dict[str, Any]]:
+        return list(stream_ast_grep_results("run", _build_search_args(pattern, language, workers, files), language_globs=language_globs))
+
+    return rescan
+
+
 def _format_search_results(matches: List[Dict[str, Any]], output_format: str) -> Union[str, List[Dict[str, Any]]]:
     """Format search results based on output format."""
     if output_format == "text":
@@ -300,11 +314,20 @@ def _run_find_code_search(
     """Execute find_code search with pre-validated targets."""
     stream_args = _build_search_args(pattern, language, workers, search_targets)
     cache = get_query_cache()
-    cached_result = _check_cache(cache, stream_args, project_folder, max_results, output_format, logger, language_globs=language_globs)
+    rescan = _make_find_code_rescan(pattern, language, workers, language_globs)
+    cached_result = _check_cache(
+        cache, stream_args, project_folder, max_results, output_format, logger, language_globs=language_globs, rescan=rescan
+    )
     if cached_result is not None:
         return cached_result
 
-    matches = _execute_search(stream_args, max_results, cache, project_folder, logger, language_globs=language_globs)
+    # Fingerprint before scanning so edits made mid-scan are caught on the next lookup.
+    # Language globs can map other extensions to the language, so they fingerprint every file.
+    extensions = None if language_globs else language_extensions(language)
+    fingerprint = cache.fingerprint(search_targets, extensions) if cache and max_results == 0 else None
+    matches = _execute_search(
+        stream_args, max_results, cache, project_folder, logger, language_globs=language_globs, fingerprint=fingerprint
+    )
     result = _format_search_results(matches, output_format)
     execution_time = time.time() - start_time
     logger.info(
@@ -374,6 +397,112 @@ def find_code_impl(
         )
 
 
+# =============================================================================
+# Streaming (paged) search
+# =============================================================================
+
+
+def _validate_page_size(page_size: int) -> None:
+    """Raise ValueError if page_size is outside 1..StreamDefaults.MAX_PAGE_SIZE."""
+    if not 1 <= page_size <= StreamDefaults.MAX_PAGE_SIZE:
+        raise ValueError(f"Invalid page_size: {page_size}. Must be between 1 and {StreamDefaults.MAX_PAGE_SIZE}.")
+
+
+def _paginate(
+    matches: Iterable[Dict[str, Any]], page_size: int, cancel_event: Optional[threading.Event]
+) -> Generator[List[Dict[str, Any]], None, int]:
+    """Group a match stream into pages, holding at most one page in memory.
+
+    Returns:
+        Total match count (accessible via ``yield from``).
+    """
+    page: List[Dict[str, Any]] = []
+    match_count = 0
+    for match in matches:
+        if cancel_event is not None and cancel_event.is_set():
+            return match_count
+        page.append(match)
+        match_count += 1
+        if len(page) >= page_size:
+            yield page
+            page = []
+    if page and not (cancel_event is not None and cancel_event.is_set()):
+        yield page
+    return match_count
+
+
+def format_search_page(page: List[Dict[str, Any]], output_format: str, page_number: int) -> str:
+    """Render one streamed page as a self-contained text chunk.
+
+    Args:
+        page: Matches in this page
+        output_format: 'text' for file:line headers with match text, 'json' for a JSON array
+        page_number: 1-based page index, shown in the text header
+    """
+    _validate_output_format(output_format)
+    if output_format == "json":
+        return json.dumps(page)
+    return f"Page {page_number} ({len(page)} matches):\n\n" + format_matches_as_text(page)
+
+
+def iter_find_code_pages(
+    project_folder: str,
+    pattern: str,
+    language: str = "",
+    page_size: int = StreamDefaults.DEFAULT_PAGE_SIZE,
+    max_results: int = 0,
+    max_file_size_mb: int = 0,
+    workers: int = 0,
+    language_globs: Optional[Dict[str, List[str]]] = None,
+    cancel_event: Optional[threading.Event] = None,
+) -> Generator[List[Dict[str, Any]], None, None]:
+    """Stream find_code matches as pages of at most page_size matches.
+
+    Unlike find_code_impl, matches are never collected into one list, so memory
+    stays bounded by page_size and the first page is available as soon as
+    ast-grep emits it. The query cache is bypassed because it needs the full result.
+
+    Args:
+        cancel_event: Setting this terminates the ast-grep subprocess, even while
+            the caller is blocked waiting for the next page; the generator then ends.
+    """
+    logger = get_logger("search.find_code")
+    start_time = time.time()
+    logger.info(
+        "find_code_stream_started",
+        project_folder=project_folder,
+        pattern=pattern[:100],
+        language=language or "auto",
+        page_size=page_size,
+        max_results=max_results,
+    )
+    with _op_error_handler(
+        "find_code_stream",
+        logger,
+        start_time,
+        {"function": "iter_find_code_pages", "project_folder": project_folder, "pattern": pattern[:100], "language": language},
+    ):
+        _validate_page_size(page_size)
+        search_targets = _prepare_search_targets(project_folder, max_file_size_mb, language, logger)
+        if not search_targets:
+            return
+        matches = stream_ast_grep_results(
+            "run",
+            _build_search_args(pattern, language, workers, search_targets),
+            max_results=max_results,
+            language_globs=language_globs,
+            cancel_event=cancel_event,
+        )
+        with contextlib.closing(matches):
+            match_count = yield from _paginate(matches, page_size, cancel_event)
+        logger.info(
+            "find_code_stream_completed",
+            execution_time_seconds=round(time.time() - start_time, FormattingDefaults.ROUNDING_PRECISION),
+            match_count=match_count,
+            cancelled=cancel_event is not None and cancel_event.is_set(),
+        )
+
+
 def _validate_yaml_rule(yaml_rule: str) -> Dict[str, Any]:
     """Parse and validate YAML rule; raise InvalidYAMLError if invalid."""
     try:
@@ -497,23 +626,46 @@ def _prepend_warnings_to_result(
     return result
 
 
+def _make_rule_rescan(yaml_rule: str) -> Callable[[List[str]], List[Dict[str, Any]]]:
+    """Return a callback that re-runs a YAML rule scan against specific files."""
+
+    def rescan(files: List[str]) -> List[Dict[str, Any]]:
+        output = run_ast_grep("scan", ["--inline-rules", yaml_rule, "--json", *files]).stdout.strip()
+        return cast(List[Dict[str, Any]], json.loads(output)) if output else []
+
+    return rescan
+
+
 def _check_rule_cache(
-    cache: Any, cache_key_parts: List[str], project_folder: str, max_results: int, logger: Any, rule_id: Optional[str]
+    cache: Any,
+    cache_key_parts: List[str],
+    project_folder: str,
+    max_results: int,
+    logger: Any,
+    rule_id: Optional[str],
+    rescan: Optional[Callable[[List[str]], List[Dict[str, Any]]]] = None,
 ) -> Optional[Any]:
     """Check cache for existing rule search results."""
     if not CACHE_ENABLED or not cache or max_results != 0:
         return None
 
-    cached_result = cache.get("scan", cache_key_parts, project_folder)
+    cached_result = cache.get("scan", cache_key_parts, project_folder, rescan=rescan)
     if cached_result is not None:
         logger.info("find_code_by_rule_cache_hit", rule_id=rule_id)
     return cached_result
 
 
-def _store_rule_result_in_cache(cache: Any, cache_key_parts: List[str], project_folder: str, result: Any, max_results: int) -> None:
+def _store_rule_result_in_cache(
+    cache: Any,
+    cache_key_parts: List[str],
+    project_folder: str,
+    result: Any,
+    max_results: int,
+    fingerprint: Optional[FileFingerprint] = None,
+) -> None:
     """Store rule search result in cache if applicable."""
     if CACHE_ENABLED and cache and max_results == 0 and isinstance(result, list):
-        cache.put("scan", cache_key_parts, project_folder, result)
+        cache.put("scan", cache_key_parts, project_folder, result, fingerprint=fingerprint)
 
 
 def _log_rule_warnings(warnings: List[str], parsed_yaml: Dict[str, Any], logger: Any) -> None:
@@ -541,12 +693,16 @@ def _run_rule_search_with_cache(
     cache = get_query_cache()
     cache_key_parts = ["scan", yaml_rule, output_format, project_folder]
 
-    cached_result = _check_rule_cache(cache, cache_key_parts, project_folder, max_results, logger, parsed_yaml.get("id"))
+    cached_result = _check_rule_cache(
+        cache, cache_key_parts, project_folder, max_results, logger, parsed_yaml.get("id"), rescan=_make_rule_rescan(yaml_rule)
+    )
     if cached_result is not None:
         return _prepend_warnings_to_result(cached_result, warnings, output_format)
 
+    extensions = language_extensions(parsed_yaml.get("language"))
+    fingerprint = cache.fingerprint([project_folder], extensions) if CACHE_ENABLED and cache and max_results == 0 else None
     result = _execute_rule_search(project_folder, yaml_rule, max_results, output_format, cache, logger)
-    _store_rule_result_in_cache(cache, cache_key_parts, project_folder, result, max_results)
+    _store_rule_result_in_cache(cache, cache_key_parts, project_folder, result, max_results, fingerprint=fingerprint)
 
     execution_time = time.time() - start_time
     match_count = len(result) if isinstance(result, list) else result.count("\n")
@@ -594,6 +750,69 @@ def find_code_by_rule_impl(
         return _run_rule_search_with_cache(project_folder, yaml_rule, max_results, output_format, warnings, parsed_yaml, logger, start_time)
 
 
+def iter_find_code_by_rule_pages(
+    project_folder: str,
+    yaml_rule: str,
+    page_size: int = StreamDefaults.DEFAULT_PAGE_SIZE,
+    max_results: int = 0,
+    cancel_event: Optional[threading.Event] = None,
+) -> Generator[List[Dict[str, Any]], None, None]:
+    """Stream find_code_by_rule matches as pages of at most page_size matches.
+
+    The rule is validated up front (raising InvalidYAMLError) so bad rules fail
+    before any page is produced. See iter_find_code_pages for memory and
+    cancellation behaviour.
+    """
+    logger = get_logger("search.find_code_by_rule")
+    start_time = time.time()
+
+    parsed_yaml = _validate_yaml_rule(yaml_rule)
+    _log_rule_warnings(_check_yaml_rule_for_common_mistakes(parsed_yaml), parsed_yaml, logger)
+    _validate_page_size(page_size)
+    return _iter_rule_pages(project_folder, yaml_rule, parsed_yaml, page_size, max_results, cancel_event, logger, start_time)
+
+
+def _iter_rule_pages(
+    project_folder: str,
+    yaml_rule: str,
+    parsed_yaml: Dict[str, Any],
+    page_size: int,
+    max_results: int,
+    cancel_event: Optional[threading.Event],
+    logger: Any,
+    start_time: float,
+) -> Generator[List[Dict[str, Any]], None, None]:
+    """Generator body for iter_find_code_by_rule_pages."""
+    logger.info(
+        "find_code_by_rule_stream_started",
+        project_folder=project_folder,
+        rule_id=parsed_yaml.get("id"),
+        language=parsed_yaml.get("language"),
+        page_size=page_size,
+        max_results=max_results,
+    )
+    with _op_error_handler(
+        "find_code_by_rule_stream",
+        logger,
+        start_time,
+        {"function": "iter_find_code_by_rule_pages", "project_folder": project_folder, "rule_id": parsed_yaml.get("id")},
+    ):
+        matches = stream_ast_grep_results(
+            "scan",
+            ["--inline-rules", yaml_rule, "--json=stream", project_folder],
+            max_results=max_results,
+            cancel_event=cancel_event,
+        )
+        with contextlib.closing(matches):
+            match_count = yield from _paginate(matches, page_size, cancel_event)
+        logger.info(
+            "find_code_by_rule_stream_completed",
+            execution_time_seconds=round(time.time() - start_time, FormattingDefaults.ROUNDING_PRECISION),
+            match_count=match_count,
+            cancelled=cancel_event is not None and cancel_event.is_set(),
+        )
+
+
 # =============================================================================
 # Rule Builder Implementation
 # =============================================================================
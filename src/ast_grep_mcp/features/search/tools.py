@@ -1,10 +1,13 @@
 """Search feature MCP tool definitions."""
 
-from typing import Any, Dict, List, Literal, Optional
+import asyncio
+import threading
+from typing import Any, Dict, Generator, List, Literal, Optional
 
-from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp import Context, FastMCP
 from pydantic import Field
 
+from ast_grep_mcp.constants import StreamDefaults
 from ast_grep_mcp.core.executor import get_supported_languages
 from ast_grep_mcp.features.search.docs import PATTERN_CATEGORIES, PATTERN_LANGUAGES, get_docs, get_pattern_examples
 from ast_grep_mcp.features.search.service import (
@@ -14,6 +17,9 @@ from ast_grep_mcp.features.search.service import (
     dump_syntax_tree_impl,
     find_code_by_rule_impl,
     find_code_impl,
+    format_search_page,
+    iter_find_code_by_rule_pages,
+    iter_find_code_pages,
     test_match_code_rule_impl,
 )
 from ast_grep_mcp.models.base import DumpFormat
@@ -46,9 +52,14 @@ Output formats:
 
 The max_results parameter limits the number of complete matches returned (not individual lines).
 
+Streaming: with stream=true, matches are sent as log notifications of page_size matches
+each while ast-grep is still running, with a progress notification per page. The tool
+result is then only a summary. Cancelling the request stops the ast-grep process.
+
 Example usage:
   find_code(pattern="class $NAME", max_results=20)  # Returns text format
   find_code(pattern="class $NAME", output_format="json")  # Returns JSON with metadata
+  find_code(pattern="$X.unwrap()", stream=True, page_size=100)  # Pages arrive as they are found
 """
 
 _FIND_CODE_BY_RULE_DOC = """Find code in a project folder using a custom YAML rule.
@@ -76,6 +87,8 @@ rule:
 Output formats:
 - text (default): Compact text format with file:line-range headers and complete match text
 - json: Full match objects with metadata including ranges, rule ID, matched text etc.
+
+stream=true sends matches in pages as they are found (see find_code).
 """
 
 _DEBUG_PATTERN_DOC = """Debug why a pattern doesn't match code.
@@ -157,11 +170,52 @@ def _register_test_match_code_rule(mcp: FastMCP) -> None:
     test_match_code_rule.__doc__ = _TEST_MATCH_DOC
 
 
+async def _stream_pages_to_client(
+    pages: Generator[List[Dict[str, Any]], None, None],
+    ctx: Context[Any, Any],
+    cancel_event: threading.Event,
+    output_format: str,
+    max_results: int,
+) -> Dict[str, Any]:
+    """Forward pages to the client as log notifications while the search runs.
+
+    Each page is pulled on a worker thread so the event loop stays free to
+    notice a client cancellation; cancelling sets cancel_event, which kills ast-grep.
+    """
+    loop = asyncio.get_running_loop()
+    pending: Optional["asyncio.Future[Optional[List[Dict[str, Any]]]]"] = None
+    match_count = 0
+    page_count = 0
+    try:
+        while True:
+            pending = loop.run_in_executor(None, next, pages, None)
+            page = await pending
+            if page is None:
+                break
+            page_count += 1
+            match_count += len(page)
+            await ctx.info(format_search_page(page, output_format, page_count))
+            await ctx.report_progress(match_count, max_results or None)
+    finally:
+        cancel_event.set()
+        # A worker still inside next() finishes once ast-grep exits; closing now would race it
+        if pending is None or pending.done():
+            pages.close()
+    return {"streamed": True, "match_count": match_count, "page_count": page_count}
+
+
+def _stream_summary_text(summary: Dict[str, Any]) -> str:
+    if not summary["match_count"]:
+        return "No matches found"
+    return f"Streamed {summary['match_count']} matches in {summary['page_count']} pages"
+
+
 def _register_find_code(mcp: FastMCP) -> None:
     """Register find_code tool."""
 
     @mcp.tool()
-    def find_code(
+    async def find_code(
+        ctx: Context,  # type: ignore[type-arg]  # FastMCP detects the bare class
         project_folder: str = Field(description="The absolute path to the project folder. It must be absolute path."),
         pattern: str = Field(description="The ast-grep pattern to search for. Note, the pattern must have valid AST structure."),
         language: str = Field(
@@ -179,16 +233,38 @@ def _register_find_code(mcp: FastMCP) -> None:
             default=0,
             description="Number of parallel worker threads. 0 = auto (default).",
         ),
-    ) -> str | List[Dict[str, Any]]:
-        return find_code_impl(
+        stream: bool = Field(
+            default=False,
+            description="Send matches as paged log notifications while searching; the result is a summary.",
+        ),
+        page_size: int = Field(
+            default=StreamDefaults.DEFAULT_PAGE_SIZE,
+            description=f"Matches per streamed page (1-{StreamDefaults.MAX_PAGE_SIZE}). Only used with stream=true.",
+        ),
+    ) -> str | List[Dict[str, Any]] | Dict[str, Any]:
+        if not stream:
+            return find_code_impl(
+                project_folder,
+                pattern,
+                language,
+                max_results,
+                output_format,  # type: ignore[arg-type]
+                max_file_size_mb,
+                workers,
+            )
+        cancel_event = threading.Event()
+        pages = iter_find_code_pages(
             project_folder,
             pattern,
             language,
-            max_results,
-            output_format,  # type: ignore[arg-type]
-            max_file_size_mb,
-            workers,
+            page_size=page_size,
+            max_results=max_results,
+            max_file_size_mb=max_file_size_mb,
+            workers=workers,
+            cancel_event=cancel_event,
         )
+        summary = await _stream_pages_to_client(pages, ctx, cancel_event, output_format, max_results)
+        return summary if output_format == "json" else _stream_summary_text(summary)
 
     find_code.__doc__ = _FIND_CODE_DOC
 
@@ -197,18 +273,34 @@ def _register_find_code_by_rule(mcp: FastMCP) -> None:
     """Register find_code_by_rule tool."""
 
     @mcp.tool()
-    def find_code_by_rule(
+    async def find_code_by_rule(
+        ctx: Context,  # type: ignore[type-arg]  # FastMCP detects the bare class
         project_folder: str = Field(description="The absolute path to the project folder. It must be absolute path."),
         yaml_rule: str = Field(description="The ast-grep YAML rule to search. It must have id, language, rule fields."),
         max_results: int = Field(default=0, description="Maximum results to return"),
         output_format: str = Field(default="text", description="'text' or 'json'"),
+        stream: bool = Field(
+            default=False,
+            description="Send matches as paged log notifications while searching; the result is a summary.",
+        ),
+        page_size: int = Field(
+            default=StreamDefaults.DEFAULT_PAGE_SIZE,
+            description=f"Matches per streamed page (1-{StreamDefaults.MAX_PAGE_SIZE}). Only used with stream=true.",
+        ),
     ) -> str | List[Dict[str, Any]] | Dict[str, Any]:
-        return find_code_by_rule_impl(
-            project_folder,
-            yaml_rule,
-            max_results,
-            output_format,  # type: ignore[arg-type]
+        if not stream:
+            return find_code_by_rule_impl(
+                project_folder,
+                yaml_rule,
+                max_results,
+                output_format,  # type: ignore[arg-type]
+            )
+        cancel_event = threading.Event()
+        pages = iter_find_code_by_rule_pages(
+            project_folder, yaml_rule, page_size=page_size, max_results=max_results, cancel_event=cancel_event
         )
+        summary = await _stream_pages_to_client(pages, ctx, cancel_event, output_format, max_results)
+        return summary if output_format == "json" else _stream_summary_text(summary)
 
     find_code_by_rule.__doc__ = _FIND_CODE_BY_RULE_DOC
 
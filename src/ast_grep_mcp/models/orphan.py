@@ -196,7 +196,7 @@ class OrphanAnalysisConfig:
         exclude_patterns: Glob patterns for files to exclude
         entry_point_patterns: Patterns for identifying entry points
         analyze_functions: Whether to analyze function-level orphans
-        verify_with_grep: Whether to double-check with grep
+        verify_with_grep: Whether to double-check orphan files for textual references
         languages: Languages to analyze
     """
 
@@ -1,7 +1,11 @@
 """Data models for code quality standards and linting rules."""
 
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Literal, Optional
+
+# "single_scan": one ast-grep scan runs every rule; "per_rule": one scan per rule, in parallel threads
+RuleExecutionMode = Literal["single_scan", "per_rule"]
+SecurityScanMode = Literal["single_scan", "per_pattern"]
 
 
 class RuleValidationError(Exception):
@@ -206,6 +210,8 @@ class RuleExecutionContext:
         max_violations: Stop after this many violations (0 = unlimited)
         max_threads: Number of parallel threads
         logger: Structured logger instance
+        execution_mode: "single_scan" runs the whole rule set in one ast-grep scan,
+            "per_rule" runs one scan per rule on max_threads threads
     """
 
     project_folder: str
@@ -215,6 +221,7 @@ class RuleExecutionContext:
     max_violations: int
     max_threads: int
     logger: Any  # structlog logger
+    execution_mode: RuleExecutionMode = "per_rule"
 
 
 # =============================================================================
@@ -2,7 +2,10 @@
 
 from mcp.server.fastmcp import FastMCP
 
+from ast_grep_mcp.core import config as core_config
+from ast_grep_mcp.core.cache import init_query_cache
 from ast_grep_mcp.core.config import parse_args_and_get_config
+from ast_grep_mcp.core.content_cache import init_content_caches
 from ast_grep_mcp.core.sentry import init_sentry
 from ast_grep_mcp.server.registry import register_all_tools
 
@@ -15,11 +18,20 @@ def run_mcp_server() -> None:
 
     This function:
     1. Parses command-line arguments and loads configuration
-    2. Initializes Sentry error tracking (if configured)
-    3. Registers all MCP tools from all features
-    4. Starts the MCP server with stdio transport
+    2. Initializes the query and content caches from the parsed cache settings
+    3. Initializes Sentry error tracking (if configured)
+    4. Registers all MCP tools from all features
+    5. Starts the MCP server with stdio transport
     """
     parse_args_and_get_config()  # Sets CONFIG_PATH global
+    init_query_cache(
+        core_config.CACHE_SIZE,
+        core_config.CACHE_TTL,
+        validate_files=core_config.CACHE_VALIDATE_FILES,
+        persist=core_config.CACHE_PERSIST,
+        disk_max_size_mb=core_config.CACHE_DISK_MAX_MB,
+    )
+    init_content_caches(persist=core_config.CACHE_PERSIST)
     init_sentry()  # Initialize error tracking (no-op if not configured)
     register_all_tools(mcp)  # Register all tools
     mcp.run(transport="stdio")
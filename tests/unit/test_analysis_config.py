@@ -100,6 +100,11 @@ class TestAnalysisConfigValidation:
         with pytest.raises(ValueError, match="max_candidates must be a positive integer"):
             AnalysisConfig(project_path="/path", language="python", max_candidates=-10)
 
+    def test_invalid_max_constructs_negative(self):
+        """Should raise ValueError for max_constructs < 0 (0 means unlimited)."""
+        with pytest.raises(ValueError, match="max_constructs must be 0"):
+            AnalysisConfig(project_path="/path", language="python", max_constructs=-1)
+
     def test_invalid_max_workers_zero(self):
         """Should raise ValueError for max_workers = 0."""
         with pytest.raises(ValueError, match="max_workers must be positive"):
@@ -148,6 +153,7 @@ class TestAnalysisConfigSerialization:
             "include_test_coverage": True,
             "min_lines": 5,
             "max_candidates": 100,
+            "max_constructs": 1000,
             "exclude_patterns": [],
             "parallel": True,
             "max_workers": 4,
@@ -167,6 +173,7 @@ class TestAnalysisConfigSerialization:
             include_test_coverage=False,
             min_lines=10,
             max_candidates=50,
+            max_constructs=0,
             exclude_patterns=["*.test.ts"],
             parallel=False,
             max_workers=8,
@@ -182,6 +189,7 @@ class TestAnalysisConfigSerialization:
             "include_test_coverage": False,
             "min_lines": 10,
             "max_candidates": 50,
+            "max_constructs": 0,
             "exclude_patterns": ["*.test.ts"],
             "parallel": False,
             "max_workers": 8,
@@ -215,6 +215,12 @@ class TestAnalysisWorkflow:
 
         mock_orchestrator.detector.find_duplication.assert_called_once()
 
+    def test_analyze_candidates_passes_max_constructs(self, mock_orchestrator, temp_dir):
+        """Test that the construct cap reaches the detector, including 0 for unlimited."""
+        mock_orchestrator.analyze_candidates(project_path=temp_dir, language="python", max_constructs=0)
+
+        assert mock_orchestrator.detector.find_duplication.call_args.kwargs["max_constructs"] == 0
+
     def test_analyze_candidates_calls_ranker(self, mock_orchestrator, temp_dir):
         """Test that ranker.rank_deduplication_candidates is called."""
         config = AnalysisConfig(project_path=temp_dir, language="python")
@@ -0,0 +1,214 @@
+"""Tests for file-fingerprint validation in QueryCache."""
+
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from ast_grep_mcp.constants import LANGUAGE_EXTENSIONS
+from ast_grep_mcp.core import cache as core_cache
+from ast_grep_mcp.core import config as core_config
+from ast_grep_mcp.core.cache import QueryCache, compute_fingerprint, diff_fingerprints, language_extensions
+from ast_grep_mcp.features.search.service import find_code_impl
+
+
+def _bump(path: Path, content: str) -> None:
+    """Rewrite a file and move its mtime forward so the change is always visible."""
+    path.write_text(content)
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+def _match(path: Path, text: str) -> dict:
+    return {"file": str(path), "text": text, "range": {"start": {"line": 0}}}
+
+
+@pytest.fixture
+def project(tmp_path: Path) -> Path:
+    (tmp_path / "a.py").write_text("def a(): pass\n")
+    (tmp_path / "b.py").write_text("def b(): pass\n")
+    (tmp_path / "node_modules").mkdir()
+    (tmp_path / "node_modules" / "dep.py").write_text("def dep(): pass\n")
+    (tmp_path / ".hidden").mkdir()
+    (tmp_path / ".hidden" / "h.py").write_text("def h(): pass\n")
+    return tmp_path
+
+
+class TestFingerprint:
+    def test_follows_ast_grep_walk(self, project: Path) -> None:
+        (project / ".gitignore").write_text("gen/\n")
+        (project / "gen").mkdir()
+        (project / "gen" / "g.py").write_text("def g(): pass\n")
+        (project / "sub").mkdir()
+        (project / "sub" / ".ignore").write_text("skip.py\n")
+        (project / "sub" / "skip.py").write_text("def s(): pass\n")
+        searched = {str(project / "a.py"), str(project / "b.py"), str(project / "node_modules" / "dep.py")}
+
+        # Outside a git repository .gitignore is not applied; .ignore and hidden entries always are
+        assert set(compute_fingerprint([str(project)]).files) == searched | {str(project / "gen" / "g.py")}
+        (project / ".git").mkdir()
+        assert set(compute_fingerprint([str(project)]).files) == searched
+
+    def test_extension_filter(self, project: Path) -> None:
+        (project / "notes.md").write_text("x")
+        fp = compute_fingerprint([str(project)], [".py"])
+        assert str(project / "notes.md") not in fp.files
+
+    def test_file_roots(self, project: Path) -> None:
+        fp = compute_fingerprint([str(project / "a.py")])
+        assert list(fp.files) == [str(project / "a.py")]
+
+    def test_diff_detects_changed_added_removed(self, project: Path) -> None:
+        old = compute_fingerprint([str(project)])
+        _bump(project / "a.py", "def a(x): pass\n")
+        (project / "b.py").unlink()
+        (project / "c.py").write_text("def c(): pass\n")
+
+        changed, removed = diff_fingerprints(old, compute_fingerprint([str(project)]))
+
+        assert sorted(changed) == [str(project / "a.py"), str(project / "c.py")]
+        assert removed == [str(project / "b.py")]
+
+
+class TestValidatingCache:
+    def _seed(self, cache: QueryCache, project: Path) -> None:
+        fp = cache.fingerprint([str(project)])
+        cache.put("run", ["p"], str(project), [_match(project / "a.py", "a"), _match(project / "b.py", "b")], fingerprint=fp)
+
+    def test_fingerprint_disabled_when_validation_off(self, project: Path) -> None:
+        cache = QueryCache(validate_files=False)
+        assert cache.fingerprint([str(project)]) is None
+
+    def test_unchanged_files_hit_without_rescan(self, project: Path) -> None:
+        cache = QueryCache(validate_files=True)
+        self._seed(cache, project)
+
+        def rescan(files):
+            raise AssertionError("rescan should not run")
+
+        assert len(cache.get("run", ["p"], str(project), rescan=rescan)) == 2
+        assert cache.hits == 1
+
+    def test_changed_file_is_rescanned_and_patched(self, project: Path) -> None:
+        cache = QueryCache(validate_files=True)
+        self._seed(cache, project)
+        _bump(project / "a.py", "def a2(): pass\n")
+        calls = []
+
+        def rescan(files):
+            calls.append(files)
+            return [_match(project / "a.py", "a2")]
+
+        results = cache.get("run", ["p"], str(project), rescan=rescan)
+
+        assert calls == [[str(project / "a.py")]]
+        assert sorted(m["text"] for m in results) == ["a2", "b"]
+        assert cache.get_stats()["patches"] == 1
+        # Patched fingerprint is stored, so the next lookup is a clean hit
+        assert cache.get("run", ["p"], str(project), rescan=lambda files: pytest.fail("unexpected rescan")) == results
+
+    def test_patched_matches_keep_reported_path_form(self, project: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.chdir(project.parent)
+        root = project.name
+        cache = QueryCache(validate_files=True)
+        matches = [{"file": f"{root}/a.py", "text": "a"}, {"file": f"{root}/b.py", "text": "b"}]
+        cache.put("run", ["p"], root, matches, fingerprint=cache.fingerprint([root]))
+        _bump(project / "a.py", "def a2(): pass\n")
+
+        results = cache.get("run", ["p"], root, rescan=lambda files: [_match(Path(files[0]), "a2")])
+
+        assert sorted((m["file"], m["text"]) for m in results) == [(f"{root}/a.py", "a2"), (f"{root}/b.py", "b")]
+
+    def test_removed_file_drops_its_matches(self, project: Path) -> None:
+        cache = QueryCache(validate_files=True)
+        self._seed(cache, project)
+        (project / "b.py").unlink()
+
+        results = cache.get("run", ["p"], str(project), rescan=lambda files: pytest.fail("unexpected rescan"))
+
+        assert [m["text"] for m in results] == ["a"]
+
+    def test_without_rescan_entry_is_invalidated(self, project: Path) -> None:
+        cache = QueryCache(validate_files=True)
+        self._seed(cache, project)
+        _bump(project / "a.py", "changed\n")
+
+        assert cache.get("run", ["p"], str(project)) is None
+        assert cache.get_stats()["invalidations"] == 1
+        assert len(cache.cache) == 0
+
+    def test_too_many_changes_invalidate(self, project: Path) -> None:
+        cache = QueryCache(validate_files=True, max_patch_files=1)
+        self._seed(cache, project)
+        _bump(project / "a.py", "changed\n")
+        _bump(project / "b.py", "changed\n")
+
+        assert cache.get("run", ["p"], str(project), rescan=lambda files: []) is None
+        assert cache.misses == 1
+
+    def test_rescan_failure_invalidates(self, project: Path) -> None:
+        cache = QueryCache(validate_files=True)
+        self._seed(cache, project)
+        _bump(project / "a.py", "changed\n")
+
+        def rescan(files):
+            raise RuntimeError("boom")
+
+        assert cache.get("run", ["p"], str(project), rescan=rescan) is None
+        assert cache.get_stats()["invalidations"] == 1
+
+    def test_validation_off_ignores_file_changes(self, project: Path) -> None:
+        cache = QueryCache(validate_files=False)
+        cache.put("run", ["p"], str(project), [_match(project / "a.py", "a")], fingerprint=compute_fingerprint([str(project)]))
+        _bump(project / "a.py", "changed\n")
+
+        assert cache.get("run", ["p"], str(project)) == [_match(project / "a.py", "a")]
+
+
+class TestFindCodePatching:
+    @pytest.fixture
+    def validating_cache(self):
+        core_cache.init_query_cache(max_size=10, ttl_seconds=300, validate_files=True)
+        core_config.CACHE_ENABLED = True
+        yield core_cache._query_cache
+        core_cache._query_cache = None
+
+    def test_find_code_rescans_only_changed_files(self, validating_cache: QueryCache, project: Path) -> None:
+        seen_targets = []
+
+        def fake_stream(command, args, **kwargs):
+            targets = args[args.index("--json=stream") + 1 :]
+            seen_targets.append(targets)
+            for target in targets:
+                paths = [Path(target)] if Path(target).is_file() else sorted(Path(target).glob("*.py"))
+                for path in paths:
+                    yield _match(path, path.read_text().strip())
+
+        with patch("ast_grep_mcp.features.search.service.stream_ast_grep_results", side_effect=fake_stream):
+            first = find_code_impl(str(project), "def $F(): pass", language="python", output_format="json")
+            _bump(project / "b.py", "def b2(): pass\n")
+            second = find_code_impl(str(project), "def $F(): pass", language="python", output_format="json")
+
+        assert len(first) == 2
+        assert seen_targets == [[str(project)], [str(project / "b.py")]]
+        assert sorted(m["text"] for m in second) == ["def a(): pass", "def b2(): pass"]
+
+    def test_find_code_fingerprints_language_files_only(self, validating_cache: QueryCache, project: Path) -> None:
+        def fake_stream(command, args, **kwargs):
+            for path in sorted(Path(args[args.index("--json=stream") + 1]).glob("*.py")):
+                yield _match(path, path.read_text().strip())
+
+        with patch("ast_grep_mcp.features.search.service.stream_ast_grep_results", side_effect=fake_stream):
+            find_code_impl(str(project), "def $F(): pass", language="python", output_format="json")
+            _bump(project / "README.md", "docs\n")
+            find_code_impl(str(project), "def $F(): pass", language="python", output_format="json")
+
+        stats = validating_cache.get_stats()
+        assert (stats["hits"], stats["patches"]) == (1, 0)
+
+    def test_language_extensions_come_from_shared_table(self) -> None:
+        assert language_extensions("ts") == LANGUAGE_EXTENSIONS["typescript"]
+        assert ".pyi" in language_extensions("python")
+        assert language_extensions("bash") is None
+        assert language_extensions(None) is None
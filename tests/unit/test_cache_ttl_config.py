@@ -1,7 +1,8 @@
 """Tests for CACHE_TTL using correct TTL_SECONDS constant."""
 
 from ast_grep_mcp.constants import CacheDefaults
-from ast_grep_mcp.core.config import CACHE_TTL
+from ast_grep_mcp.core.cache import QueryCache
+from ast_grep_mcp.core.config import CACHE_TTL, _configure_cache_from_args, _create_argument_parser
 
 
 class TestCacheTTLConfig:
@@ -14,3 +15,22 @@ class TestCacheTTLConfig:
 
     def test_ttl_is_one_hour(self):
         assert CACHE_TTL == 3600
+
+
+class TestCacheValidateFilesConfig:
+    def _validate_files(self, argv: list[str]) -> bool:
+        args = _create_argument_parser().parse_args(argv)
+        return _configure_cache_from_args(args)[3]
+
+    def test_on_by_default(self, monkeypatch):
+        monkeypatch.delenv("CACHE_VALIDATE_FILES", raising=False)
+        assert CacheDefaults.VALIDATE_FILES is True
+        assert self._validate_files([]) is True
+        assert QueryCache().validate_files is True
+
+    def test_opt_out_by_flag_or_env(self, monkeypatch):
+        monkeypatch.delenv("CACHE_VALIDATE_FILES", raising=False)
+        assert self._validate_files(["--no-cache-validate-files"]) is False
+        monkeypatch.setenv("CACHE_VALIDATE_FILES", "0")
+        assert self._validate_files([]) is False
+        assert self._validate_files(["--cache-validate-files"]) is True
@@ -0,0 +1,161 @@
+"""Tests for the persistent, incrementally updated clone index."""
+
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+from unittest.mock import patch
+
+import pytest
+
+from ast_grep_mcp.features.deduplication.clone_index import CloneIndex
+from ast_grep_mcp.features.deduplication.detector import DuplicationDetector
+from ast_grep_mcp.features.deduplication.similarity import MinHashSimilarity
+
+PATTERN = "def $NAME($$$)"
+
+
+def _function(name: str, body: str) -> str:
+    steps = "".join(f"    total = total * {i} + len(items)\n" for i in range(2, 14))
+    return f"def {name}(items):\n    total = 0\n    for item in items:\n        {body}\n{steps}    return total"
+
+
+class FakeAstGrep:
+    """Stands in for ast-grep: every blank-line separated block of a .py file is one match."""
+
+    def __init__(self) -> None:
+        self.scanned: List[str] = []
+
+    def __call__(self, command: str, args: List[str], **kwargs: Any) -> Iterator[Dict[str, Any]]:
+        targets = args[args.index("--json=stream") + 1 :]
+        for target in targets:
+            paths = sorted(str(p) for p in Path(target).rglob("*.py")) if os.path.isdir(target) else [target]
+            for path in paths:
+                self.scanned.append(path)
+                for block in Path(path).read_text().split("\n\n"):
+                    if block.strip():
+                        yield {"file": path, "text": block, "range": {"start": {"line": 0}, "end": {"line": block.count("\n")}}}
+
+
+@pytest.fixture
+def project(tmp_path: Path) -> Path:
+    root = tmp_path / "project"
+    root.mkdir()
+    (root / "a.py").write_text(_function("add_all", "total += item") + "\n\n" + _function("add_twice", "total += 2 * item"))
+    (root / "b.py").write_text(_function("sum_all", "total += item"))
+    (root / "c.py").write_text(_function("count_all", "total += 1"))
+    return root
+
+
+@pytest.fixture
+def fake_ast_grep() -> Iterator[FakeAstGrep]:
+    fake = FakeAstGrep()
+    with patch("ast_grep_mcp.features.deduplication.clone_index.stream_ast_grep_results", fake):
+        yield fake
+
+
+def _index(project: Path, db_path: Path) -> CloneIndex:
+    return CloneIndex(str(project), "python", PATTERN, MinHashSimilarity(), db_path=db_path)
+
+
+def _keys(matches: List[Dict[str, Any]]) -> List[tuple]:
+    return [(m["file"], m["text"]) for m in matches]
+
+
+class TestCloneIndexSync:
+    def test_second_sync_rescans_nothing(self, project: Path, tmp_path: Path, fake_ast_grep: FakeAstGrep) -> None:
+        index = _index(project, tmp_path / "clone.db")
+        first = index.sync()
+        fake_ast_grep.scanned.clear()
+
+        second = index.sync()
+
+        assert (first.changed_files, len(first.matches)) == (3, 4)
+        assert (second.changed_files, second.removed_files) == (0, 0)
+        assert fake_ast_grep.scanned == []
+        assert _keys(second.matches) == _keys(first.matches)
+
+    def test_incremental_sync_matches_full_rebuild(self, project: Path, tmp_path: Path, fake_ast_grep: FakeAstGrep) -> None:
+        index = _index(project, tmp_path / "clone.db")
+        index.sync()
+        fake_ast_grep.scanned.clear()
+
+        (project / "b.py").write_text(_function("sum_all", "total -= item"))
+        (project / "c.py").unlink()
+        (project / "d.py").write_text(_function("add_again", "total += item"))
+        updated = index.sync()
+
+        assert sorted(fake_ast_grep.scanned) == [str(project / "b.py"), str(project / "d.py")]
+        assert (updated.changed_files, updated.removed_files, updated.total_files) == (2, 1, 3)
+        rebuilt = _index(project, tmp_path / "fresh.db").sync()
+        assert _keys(updated.matches) == _keys(rebuilt.matches)
+
+    def test_orphaned_signatures_are_dropped(self, project: Path, tmp_path: Path, fake_ast_grep: FakeAstGrep) -> None:
+        index = _index(project, tmp_path / "clone.db")
+        index.sync()
+        index.candidate_pairs([m["text"] for m in index.sync().matches], 0.8)
+
+        (project / "c.py").unlink()
+        index.sync()
+
+        stats = index.get_stats()
+        bands, _ = index.minhash.lsh_band_params(0.8)
+        assert (stats["files"], stats["constructs"], stats["signatures"], stats["bands"]) == (2, 3, 3, 3 * bands)
+
+    def test_first_sync_looks_up_stored_digests_once(self, tmp_path: Path, fake_ast_grep: FakeAstGrep) -> None:
+        root = tmp_path / "large"
+        root.mkdir()
+        for i in range(300):
+            (root / f"m{i}.py").write_text("\n\n".join(_function(f"f{i}_{j}", f"total += {i * 10 + j}") for j in range(10)))
+        index = _index(root, tmp_path / "clone.db")
+
+        with patch.object(CloneIndex, "_stored_digests", autospec=True, side_effect=CloneIndex._stored_digests) as stored_digests:
+            snapshot = index.sync()
+
+        assert len(snapshot.matches) == 3000
+        assert stored_digests.call_count == 1
+        assert index.get_stats()["signatures"] == 3000
+
+    def test_rejects_language_without_extensions(self, project: Path, tmp_path: Path) -> None:
+        with pytest.raises(ValueError):
+            CloneIndex(str(project), "not-a-language", PATTERN, MinHashSimilarity(), db_path=tmp_path / "clone.db")
+
+
+class TestCloneIndexCandidates:
+    def test_band_collisions_match_in_memory_lsh(self, project: Path, tmp_path: Path, fake_ast_grep: FakeAstGrep) -> None:
+        index = _index(project, tmp_path / "clone.db")
+        codes = [m["text"] for m in index.sync().matches]
+
+        for min_similarity in (0.5, 0.8):
+            minhash = MinHashSimilarity()
+            items = [(str(i), code) for i, code in enumerate(codes)]
+            threshold = minhash._calculate_adaptive_threshold(min_similarity)
+            minhash.build_lsh_index(items, threshold=threshold)
+            assert index.candidate_pairs(codes, min_similarity) == minhash._find_lsh_candidates(items, threshold)
+
+    def test_candidates_survive_incremental_update(self, project: Path, tmp_path: Path, fake_ast_grep: FakeAstGrep) -> None:
+        index = _index(project, tmp_path / "clone.db")
+        index.candidate_pairs([m["text"] for m in index.sync().matches], 0.8)
+
+        (project / "d.py").write_text(_function("add_again", "total += item"))
+        codes = [m["text"] for m in index.sync().matches]
+
+        fresh = _index(project, tmp_path / "fresh.db")
+        fresh.sync()
+        assert index.candidate_pairs(codes, 0.8) == fresh.candidate_pairs(codes, 0.8)
+        assert ("0", "2") in index.candidate_pairs(codes, 0.8)  # add_all and sum_all differ only by name
+
+
+class TestDetectorWithCloneIndex:
+    def test_groups_match_full_scan(self, project: Path, tmp_path: Path, fake_ast_grep: FakeAstGrep) -> None:
+        detector = DuplicationDetector(language="python", similarity_mode="minhash", grouping_engine="lsh")
+        with (
+            patch("ast_grep_mcp.features.deduplication.detector.stream_ast_grep_results", fake_ast_grep),
+            patch.object(CloneIndex, "_get_default_db_path", return_value=tmp_path / "clone.db"),
+        ):
+            full = detector.find_duplication(str(project), min_similarity=0.8, min_lines=3)
+            indexed = detector.find_duplication(str(project), min_similarity=0.8, min_lines=3, use_clone_index=True)
+            again = detector.find_duplication(str(project), min_similarity=0.8, min_lines=3, use_clone_index=True)
+
+        assert full["summary"]["duplicate_groups"] >= 1
+        assert indexed["duplication_groups"] == full["duplication_groups"]
+        assert again["duplication_groups"] == full["duplication_groups"]
@@ -1,16 +1,27 @@
 """Unit tests for code smell detection functions."""
 
 import os
+import shutil
 import sys
 import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
 
 # Add the parent directory to the path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
+from ast_grep_mcp.features.complexity.analyzer import extract_definitions_from_file
+from ast_grep_mcp.features.quality import smells_detectors
 from ast_grep_mcp.features.quality.smells_detectors import (
+    DeepNestingDetector,
     LargeClassDetector,
+    LongFunctionDetector,
     MagicNumberDetector,
     ParameterBloatDetector,
+    SmellAnalyzer,
+    build_file_context,
 )
 
 
@@ -188,10 +199,9 @@ class MyClass:
             f.flush()
 
             try:
-                detector = LargeClassDetector(300, 20)
-                result = detector._extract_classes(f.name, "python")
-                # May or may not find class depending on ast-grep pattern
-                assert isinstance(result, list)
+                path = Path(f.name)
+                context = build_file_context(f.name, path.read_text(), "python", path.parent, LargeClassDetector.requires)
+                assert [(c["name"], c["method_count"]) for c in context.classes] == [("MyClass", 3)]
             finally:
                 os.unlink(f.name)
 
@@ -205,9 +215,9 @@ def standalone_function():
             f.flush()
 
             try:
-                detector = LargeClassDetector(300, 20)
-                result = detector._extract_classes(f.name, "python")
-                assert isinstance(result, list)
+                path = Path(f.name)
+                context = build_file_context(f.name, path.read_text(), "python", path.parent, LargeClassDetector.requires)
+                assert context.classes == []
             finally:
                 os.unlink(f.name)
 
@@ -268,3 +278,71 @@ class TestEdgeCases:
         # 404 is in a string, should ideally be excluded
         # (simplified implementation may still catch it)
         assert isinstance(result, list)
+
+
+requires_ast_grep = pytest.mark.skipif(shutil.which("ast-grep") is None, reason="ast-grep not installed")
+
+SMELLY_SOURCE = (
+    "def long_one(a, b, c, d, e, f, g):\n"
+    + "".join(f"    x{i} = {i}\n" for i in range(60))
+    + "    return a\n\n\nclass Service:\n    def one(self):\n        pass\n\n    def two(self):\n        pass\n"
+)
+
+
+@requires_ast_grep
+class TestFileAnalysisContext:
+    """Detectors share one parse per file."""
+
+    def _detectors(self):
+        return [
+            LongFunctionDetector(50),
+            ParameterBloatDetector(5),
+            DeepNestingDetector(4),
+            LargeClassDetector(300, 1),
+            MagicNumberDetector(enabled=True),
+        ]
+
+    def test_analyzer_parses_each_file_once(self, tmp_path: Path):
+        source = tmp_path / "svc.py"
+        source.write_text(SMELLY_SOURCE)
+
+        with patch.object(smells_detectors, "extract_definitions_from_file", wraps=extract_definitions_from_file) as extract:
+            smells = SmellAnalyzer(self._detectors()).analyze_file(str(source), "python", tmp_path)
+
+        extract.assert_called_once_with(str(source), "python", functions=True, classes=True)
+        found = {(smell["type"], smell["name"], smell["line"]) for smell in smells}
+        assert ("long_function", "long_one", 1) in found
+        assert ("parameter_bloat", "long_one", 1) in found
+        assert ("large_class", "Service", 65) in found
+
+    def test_context_normalizes_functions_and_classes(self, tmp_path: Path):
+        source = tmp_path / "svc.py"
+        source.write_text(SMELLY_SOURCE)
+
+        context = build_file_context(str(source), SMELLY_SOURCE, "python", tmp_path, frozenset({"functions", "classes"}))
+
+        assert [(f["name"], f["start_line"], f["end_line"]) for f in context.functions] == [
+            ("long_one", 1, 62),
+            ("one", 66, 67),
+            ("two", 69, 70),
+        ]
+        assert [(c["name"], c["method_count"]) for c in context.classes] == [("Service", 2)]
+        assert context.rel_path == "svc.py"
+
+    def test_detectors_without_requirements_skip_parsing(self, tmp_path: Path):
+        source = tmp_path / "plain.py"
+        source.write_text("def f():\n    return compute(42)\n")
+
+        with patch.object(smells_detectors, "extract_definitions_from_file") as extract:
+            smells = SmellAnalyzer([MagicNumberDetector(enabled=True)]).analyze_file(str(source), "python", tmp_path)
+
+        extract.assert_not_called()
+        assert [smell["name"] for smell in smells] == ["42"]
+
+    def test_standalone_detect_extracts_what_it_requires(self, tmp_path: Path):
+        source = tmp_path / "svc.py"
+        source.write_text(SMELLY_SOURCE)
+
+        smells = LongFunctionDetector(50).detect(str(source), SMELLY_SOURCE, "python", tmp_path)
+
+        assert [(smell.name, smell.metric) for smell in smells] == [("long_one", 62)]
@@ -0,0 +1,169 @@
+"""Tests for the syntax-tree complexity metrics engine."""
+
+from pathlib import Path
+
+import pytest
+
+from ast_grep_mcp.features.complexity.ast_metrics import analyze_files_ast, analyze_python_source
+from ast_grep_mcp.features.complexity.tools import analyze_complexity_tool
+from ast_grep_mcp.models.complexity import ComplexityThresholds
+
+THRESHOLDS = ComplexityThresholds()
+
+
+def _by_name(source: str) -> dict:
+    return {fc.function_name: fc for fc in analyze_python_source(source, "mod.py", THRESHOLDS)}
+
+
+class TestPythonEngine:
+    def test_straight_line_function(self) -> None:
+        fc = _by_name("def f():\n    return 1\n")["f"]
+        assert (fc.metrics.cyclomatic, fc.metrics.cognitive, fc.metrics.nesting_depth) == (1, 0, 1)
+
+    def test_keywords_in_strings_and_names_are_ignored(self) -> None:
+        source = 'def f(format_if):\n    msg = "if x and y or z: while True"\n    return format_if\n'
+        fc = _by_name(source)["f"]
+        assert fc.metrics.cyclomatic == 1
+        assert fc.metrics.cognitive == 0
+
+    def test_nesting_penalties_and_elif(self) -> None:
+        source = """
+def f(items, flag):
+    for item in items:          # +1
+        if item:                # +2 (nesting 1)
+            while flag:         # +3 (nesting 2)
+                flag = False
+        elif flag:              # +1
+            pass
+        else:
+            pass
+    return None
+"""
+        fc = _by_name(source)["f"]
+        assert fc.metrics.cognitive == 7
+        assert fc.metrics.cyclomatic == 5
+        assert fc.metrics.nesting_depth == 4
+
+    def test_boolean_operator_sequences(self) -> None:
+        fc = _by_name("def f(a, b, c, d):\n    return a and b and c or d\n")["f"]
+        # One `and` sequence plus one `or` sequence; three operators
+        assert fc.metrics.cognitive == 2
+        assert fc.metrics.cyclomatic == 4
+
+    def test_except_ternary_comprehension_and_match(self) -> None:
+        source = """
+def f(x):
+    try:
+        y = [i for i in x if i]
+    except ValueError:
+        y = 1 if x else 2
+    match x:
+        case 1:
+            pass
+        case _:
+            pass
+    return y
+"""
+        fc = _by_name(source)["f"]
+        # base + except + comprehension for/if + ternary + two cases
+        assert fc.metrics.cyclomatic == 7
+        # except +1, ternary inside except +2, match +1
+        assert fc.metrics.cognitive == 4
+
+    def test_nested_functions_reported_separately(self) -> None:
+        source = """
+class C:
+    def method(self, a, *args, key=None, **kw):
+        def inner():
+            if a:
+                return 1
+        return inner
+"""
+        found = _by_name(source)
+        assert found["method"].metrics.cyclomatic == 1
+        assert found["method"].metrics.parameter_count == 4
+        assert found["inner"].metrics.cyclomatic == 2
+
+    def test_docstring_excluded_from_length(self) -> None:
+        fc = _by_name('def f():\n    """Doc\n\n    more\n    """\n    return 1\n')["f"]
+        assert fc.metrics.lines == 2
+
+    def test_thresholds_applied(self) -> None:
+        source = "def f(x):\n" + "".join(f"    if x == {i}:\n        return {i}\n" for i in range(12))
+        fc = analyze_python_source(source, "mod.py", THRESHOLDS)[0]
+        assert "cyclomatic" in fc.exceeds
+
+    def test_parse_errors_and_timings(self, tmp_path: Path) -> None:
+        good = tmp_path / "good.py"
+        good.write_text("def f():\n    pass\n")
+        bad = tmp_path / "bad.py"
+        bad.write_text("def broken(:\n")
+
+        result = analyze_files_ast([str(good), str(bad)], "python", THRESHOLDS)
+
+        assert [fc.function_name for fc in result.functions] == ["f"]
+        assert result.parse_errors == [str(bad)]
+        summary = result.summary()
+        assert summary["files_parsed"] == 1
+        assert summary["slowest_files"][0]["file"] == str(good)
+
+
+class TestAstGrepEngine:
+    def test_typescript_metrics(self, tmp_path: Path) -> None:
+        source = tmp_path / "a.ts"
+        source.write_text(
+            """function foo(a, b, c) {
+  if (a && b && c) {
+    for (const x of a) { while (b) { b-- } }
+  } else if (b || c && a) {
+    return a ? 1 : 2
+  }
+  try { x() } catch (e) { y() }
+  const inner = () => { if (a) { return 1 } }
+  return a ?? b
+}
+"""
+        )
+        result = analyze_files_ast([str(source)], "typescript", THRESHOLDS)
+        found = {fc.function_name: fc.metrics for fc in result.functions}
+
+        assert found["foo"].cyclomatic == 12
+        # if 1, && 1, for 2, while 3, else-if 1, ||/&& 2, ternary 2, catch 1, ?? 1
+        assert found["foo"].cognitive == 14
+        assert found["foo"].parameter_count == 3
+        assert found["inner"].cyclomatic == 2
+        assert result.summary()["scan_chunks"] == 1
+
+    def test_java_switch_and_else_if(self, tmp_path: Path) -> None:
+        source = tmp_path / "D.java"
+        source.write_text(
+            """class D { int f(int a, boolean b) {
+  if (a > 1) { return 1; } else if (b) { return 2; }
+  switch (a) { case 1: break; default: break; }
+  return 0; } }
+"""
+        )
+        fc = analyze_files_ast([str(source)], "java", THRESHOLDS).functions[0]
+        assert fc.metrics.cyclomatic == 4
+        assert fc.metrics.cognitive == 3
+
+    def test_unsupported_language(self) -> None:
+        with pytest.raises(ValueError):
+            analyze_files_ast([], "cobol", THRESHOLDS)
+
+
+class TestToolIntegration:
+    def test_ast_engine_reports_parse_stats(self, tmp_path: Path) -> None:
+        (tmp_path / "a.py").write_text("def f(x):\n    if x:\n        return 1\n")
+        result = analyze_complexity_tool(str(tmp_path), "python", store_results=False, metrics_engine="ast")
+
+        assert result["summary"]["total_functions"] == 1
+        assert result["parse_stats"]["files_parsed"] == 1
+
+    def test_pattern_engine_has_no_parse_stats(self, tmp_path: Path) -> None:
+        (tmp_path / "a.py").write_text("def f(x):\n    return x\n")
+        assert "parse_stats" not in analyze_complexity_tool(str(tmp_path), "python", store_results=False)
+
+    def test_invalid_engine(self, tmp_path: Path) -> None:
+        with pytest.raises(ValueError):
+            analyze_complexity_tool(str(tmp_path), "python", metrics_engine="regex")
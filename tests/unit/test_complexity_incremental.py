@@ -0,0 +1,180 @@
+"""Tests for incremental complexity analysis."""
+
+import os
+import subprocess
+import time
+from pathlib import Path
+
+import pytest
+
+from ast_grep_mcp.features.complexity import storage as storage_module
+from ast_grep_mcp.features.complexity.incremental import plan_incremental_analysis
+from ast_grep_mcp.features.complexity.storage import ComplexityStorage
+from ast_grep_mcp.features.complexity.tools import analyze_complexity_tool
+from ast_grep_mcp.models.complexity import ComplexityThresholds
+
+SIMPLE = "def {name}(x):\n    return x\n"
+BRANCHY = "def {name}(x):\n" + "".join(f"    if x == {i}:\n        return {i}\n" for i in range(12))
+
+
+@pytest.fixture
+def db_path(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    path = tmp_path / "complexity.db"
+    monkeypatch.setattr(storage_module.ComplexityStorage, "_get_default_db_path", lambda self: path)
+    return path
+
+
+def _git(cwd: Path, *args: str) -> None:
+    subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True)
+
+
+@pytest.fixture
+def repo(tmp_path: Path) -> Path:
+    project = tmp_path / "proj"
+    project.mkdir()
+    for name in ("a", "b", "c"):
+        (project / f"{name}.py").write_text(SIMPLE.format(name=name))
+    _git(project, "init", "-q")
+    _git(project, "-c", "user.email=t@example.com", "-c", "user.name=t", "add", ".")
+    _git(project, "-c", "user.email=t@example.com", "-c", "user.name=t", "commit", "-q", "-m", "init")
+    return project
+
+
+def _analyze(project: Path, **kwargs):
+    return analyze_complexity_tool(str(project), "python", incremental=True, **kwargs)
+
+
+class TestIncrementalTool:
+    def test_first_run_has_no_base(self, db_path: Path, repo: Path) -> None:
+        result = _analyze(repo)
+        assert result["incremental"]["base_run_id"] is None
+        assert result["summary"]["total_functions"] == 3
+
+    def test_git_strategy_reanalyzes_only_changed_files(self, db_path: Path, repo: Path) -> None:
+        first = _analyze(repo)
+        (repo / "b.py").write_text(BRANCHY.format(name="b"))
+        (repo / "d.py").write_text(SIMPLE.format(name="d"))  # untracked
+
+        second = _analyze(repo)
+
+        info = second["incremental"]
+        assert info["strategy"] == "git"
+        assert info["base_run_id"] == int(first["storage"]["run_id"])
+        assert info["changed_files"] == 2
+        assert info["reused_files"] == 2
+        assert second["summary"]["total_functions"] == 4
+        assert [f["file"] for f in second["functions"]] == [str(repo / "b.py")]
+
+    def test_deleted_files_drop_out(self, db_path: Path, repo: Path) -> None:
+        _analyze(repo)
+        (repo / "c.py").unlink()
+        result = _analyze(repo)
+        assert result["summary"]["total_functions"] == 2
+        assert result["incremental"]["reused_files"] == 2
+
+    def test_incremental_matches_full_analysis(self, db_path: Path, repo: Path) -> None:
+        _analyze(repo)
+        (repo / "a.py").write_text(BRANCHY.format(name="a"))
+        incremental = _analyze(repo)
+        full = analyze_complexity_tool(str(repo), "python", store_results=False)
+
+        def strip(result):
+            return {k: v for k, v in result["summary"].items() if k != "analysis_time_seconds"}
+
+        assert strip(incremental) == strip(full)
+        assert incremental["functions"] == full["functions"]
+
+    def test_thresholds_reapplied_to_reused_metrics(self, db_path: Path, repo: Path) -> None:
+        (repo / "a.py").write_text(BRANCHY.format(name="a"))
+        _git(repo, "-c", "user.email=t@example.com", "-c", "user.name=t", "commit", "-q", "-am", "branchy")
+        _analyze(repo)
+        result = _analyze(repo, cyclomatic_threshold=50, cognitive_threshold=50, length_threshold=500)
+        assert result["incremental"]["changed_files"] == 0
+        assert result["functions"] == []
+
+    def test_file_reverted_after_dirty_base_run_is_reanalyzed(self, db_path: Path, repo: Path) -> None:
+        (repo / "a.py").write_text(BRANCHY.format(name="a"))
+        _analyze(repo)  # base run sees the uncommitted edit
+        _git(repo, "checkout", "--", "a.py")
+
+        result = _analyze(repo)
+
+        assert result["incremental"]["changed_files"] == 1
+        assert result["functions"] == []
+        full = analyze_complexity_tool(str(repo), "python", store_results=False)
+        assert result["summary"]["total_functions"] == full["summary"]["total_functions"]
+
+    def test_engine_runs_are_not_mixed(self, db_path: Path, repo: Path) -> None:
+        _analyze(repo)
+        result = _analyze(repo, metrics_engine="ast")
+        assert result["incremental"]["base_run_id"] is None
+
+
+class TestMtimeStrategy:
+    def test_falls_back_to_mtime_outside_git(self, db_path: Path, tmp_path: Path) -> None:
+        project = tmp_path / "plain"
+        project.mkdir()
+        files = []
+        for name in ("a", "b"):
+            path = project / f"{name}.py"
+            path.write_text(SIMPLE.format(name=name))
+            old = time.time() - 3600
+            os.utime(path, (old, old))
+            files.append(str(path))
+        _analyze(project)
+        (project / "b.py").write_text(BRANCHY.format(name="b"))
+
+        plan = plan_incremental_analysis(str(project), files, "python", "pattern", ComplexityThresholds(), ComplexityStorage(db_path))
+
+        assert plan is not None
+        assert plan.strategy == "mtime"
+        assert plan.files_to_analyze == [str(project / "b.py")]
+        assert len(plan.reused_functions) == 1
+
+
+class TestStorageMigration:
+    def test_adds_columns_to_existing_database(self, tmp_path: Path) -> None:
+        import sqlite3
+
+        path = tmp_path / "old.db"
+        conn = sqlite3.connect(path)
+        conn.executescript(
+            """
+            CREATE TABLE analysis_runs (id INTEGER PRIMARY KEY AUTOINCREMENT, project_id INTEGER NOT NULL, commit_hash TEXT,
+                branch_name TEXT, run_timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP, total_functions INTEGER NOT NULL DEFAULT 0,
+                total_files INTEGER NOT NULL DEFAULT 0, avg_cyclomatic REAL, avg_cognitive REAL, max_cyclomatic INTEGER,
+                max_cognitive INTEGER, max_nesting INTEGER, threshold_violations INTEGER DEFAULT 0, analysis_duration_ms INTEGER);
+            """
+        )
+        conn.close()
+
+        storage = ComplexityStorage(path)
+        storage.store_analysis_run("/p", {"language": "python", "metrics_engine": "pattern"}, [], analyzed_files=["/p/a.py"])
+
+        assert storage.get_latest_run("/p", "python", "pattern") is not None
+        assert storage.get_run_files(storage.get_latest_run("/p", "python", "pattern")["id"]) == ["/p/a.py"]
+
+    def test_adds_stamp_columns_to_existing_run_files(self, tmp_path: Path) -> None:
+        import sqlite3
+
+        path = tmp_path / "old.db"
+        ComplexityStorage(path).store_analysis_run("/p", {"language": "python"}, [], analyzed_files=["/p/old.py"])
+        conn = sqlite3.connect(path)
+        conn.executescript(
+            """
+            CREATE TABLE run_files_old (run_id INTEGER NOT NULL, file_path TEXT NOT NULL);
+            INSERT INTO run_files_old SELECT run_id, file_path FROM run_files;
+            DROP TABLE run_files;
+            ALTER TABLE run_files_old RENAME TO run_files;
+            """
+        )
+        conn.close()
+
+        storage = ComplexityStorage(path)
+        storage.store_analysis_run(
+            "/p", {"language": "python"}, [], analyzed_files=["/p/a.py", "/p/b.py"], file_stamps={"/p/a.py": (10, 20)}
+        )
+
+        runs = [storage.get_run_file_stamps(run_id) for run_id in (1, 2)]
+        assert runs[0] == {"/p/old.py": None}
+        assert runs[1] == {"/p/a.py": (10, 20), "/p/b.py": None}
@@ -0,0 +1,134 @@
+"""Tests for single-pass (project-level) function extraction in complexity analysis."""
+
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from ast_grep_mcp.core.exceptions import AstGrepExecutionError
+from ast_grep_mcp.core.executor import get_executor_metrics, reset_executor_metrics
+from ast_grep_mcp.features.complexity.analyzer import analyze_files_complexity, extract_functions_from_files
+from ast_grep_mcp.features.complexity.complexity_analyzer import ParallelComplexityAnalyzer
+from ast_grep_mcp.models.complexity import ComplexityThresholds
+
+PY_SOURCE = """
+def simple():
+    return 42
+
+async def fetch(x):
+    if x:
+        return await x
+    return None
+
+class Service:
+    def method(self, a, b):
+        for item in a:
+            if item and b:
+                return item
+"""
+
+TS_SOURCE = """
+function foo(a: number) { if (a) { return 1 } return 2 }
+const bar = (x) => { return x }
+class K { meth(y) { return y } }
+"""
+
+
+@pytest.fixture
+def py_files(tmp_path: Path) -> list:
+    (tmp_path / "a.py").write_text(PY_SOURCE)
+    (tmp_path / "b.py").write_text("def other():\n    pass\n")
+    (tmp_path / "empty.py").write_text("# nothing here\n")
+    return [str(tmp_path / "a.py"), str(tmp_path / "b.py"), str(tmp_path / "empty.py")]
+
+
+class TestExtractFunctionsFromFiles:
+    def test_groups_matches_by_file(self, py_files: list) -> None:
+        grouped = extract_functions_from_files(py_files, "python")
+
+        assert set(grouped) == set(py_files)
+        assert len(grouped[py_files[0]]) == 3
+        assert len(grouped[py_files[1]]) == 1
+        assert grouped[py_files[2]] == []
+
+    def test_async_functions_counted_once(self, py_files: list) -> None:
+        starts = [m["range"]["start"]["line"] for m in extract_functions_from_files(py_files, "python")[py_files[0]]]
+        assert len(starts) == len(set(starts))
+
+    def test_one_scan_per_chunk(self, py_files: list) -> None:
+        reset_executor_metrics()
+        extract_functions_from_files(py_files, "python", chunk_size=2)
+        assert get_executor_metrics()["spawn_count"] == 2
+
+    def test_typescript_kinds_and_tsx(self, tmp_path: Path) -> None:
+        (tmp_path / "a.ts").write_text(TS_SOURCE)
+        (tmp_path / "b.tsx").write_text("function view(p) { return p }\n")
+        files = [str(tmp_path / "a.ts"), str(tmp_path / "b.tsx")]
+
+        grouped = extract_functions_from_files(files, "typescript")
+
+        assert len(grouped[files[0]]) == 3
+        assert len(grouped[files[1]]) == 1
+
+    def test_unsupported_language(self, py_files: list) -> None:
+        with pytest.raises(ValueError):
+            extract_functions_from_files(py_files, "cobol")
+
+
+JS_METHODS_SOURCE = """
+function plain(a) { return a }
+const arrow = (x) => { return x }
+class Foo {
+  method(a) { return a }
+  get value() { return 1 }
+  set value(v) { }
+  static make() { return new Foo() }
+  async load() { return 2 }
+}
+const obj = { shorthand() { return 3 } }
+"""
+
+
+class TestJsMethodExtraction:
+    """Single-pass extraction reports TS/JS methods and accessors; per-file extraction does not."""
+
+    @pytest.mark.parametrize("language,suffix", [("typescript", "ts"), ("javascript", "js")])
+    def test_methods_and_accessors_are_functions(self, tmp_path: Path, language: str, suffix: str) -> None:
+        path = tmp_path / f"m.{suffix}"
+        path.write_text(JS_METHODS_SOURCE)
+        thresholds = ComplexityThresholds()
+
+        single = analyze_files_complexity([str(path)], language, thresholds)
+        per_file = ParallelComplexityAnalyzer().analyze_files([str(path)], language, thresholds, single_pass=False)
+
+        assert single is not None
+        # plain, arrow | method, get value, set value, static make, async load | shorthand
+        assert sorted(fc.start_line for fc in per_file) == [2, 3]
+        assert sorted(fc.start_line for fc in single) == [2, 3, 5, 6, 7, 8, 9, 11]
+
+
+class TestAnalyzeFilesComplexity:
+    def test_matches_per_file_metrics(self, py_files: list) -> None:
+        thresholds = ComplexityThresholds()
+        single = analyze_files_complexity(py_files, "python", thresholds)
+        per_file = ParallelComplexityAnalyzer().analyze_files(py_files, "python", thresholds, single_pass=False)
+
+        def key(fc):
+            return (fc.file_path, fc.start_line, fc.end_line, fc.metrics.cyclomatic, fc.metrics.cognitive)
+
+        assert single is not None
+        # Per-file mode reports async functions twice (matched by both function patterns)
+        assert sorted(set(map(key, single))) == sorted(set(map(key, per_file)))
+        assert len(single) == 4
+
+    def test_unsupported_language_returns_none(self, py_files: list) -> None:
+        assert analyze_files_complexity(py_files, "cobol", ComplexityThresholds()) is None
+
+    def test_scan_failure_falls_back_to_per_file(self, py_files: list) -> None:
+        failing = patch(
+            "ast_grep_mcp.features.complexity.analyzer.run_ast_grep_batch",
+            side_effect=AstGrepExecutionError(["ast-grep"], 2, "boom"),
+        )
+        with failing:
+            results = ParallelComplexityAnalyzer().analyze_files(py_files, "python", ComplexityThresholds())
+        assert {fc.file_path for fc in results} == set(py_files[:2])
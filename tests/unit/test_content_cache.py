@@ -0,0 +1,116 @@
+"""Tests for the bounded content-addressed signature/embedding caches."""
+
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from ast_grep_mcp.constants import CacheDefaults
+from ast_grep_mcp.core.content_cache import ContentCache, ContentSpillStore, content_digest
+from ast_grep_mcp.features.deduplication.similarity import MINHASH_CODEC, MinHashSimilarity, SimilarityConfig
+
+ENTRY_SIZE = 8 * 100 + CacheDefaults.CONTENT_ENTRY_OVERHEAD_BYTES
+
+
+def _array(value: float) -> np.ndarray:
+    return np.full(100, value, dtype=np.float64)
+
+
+@pytest.fixture
+def spill(tmp_path: Path) -> ContentSpillStore:
+    return ContentSpillStore(db_path=tmp_path / "content_cache.db")
+
+
+class TestContentDigest:
+    def test_stable_and_distinct(self) -> None:
+        assert content_digest("def f(): pass") == content_digest("def f(): pass")
+        assert content_digest("def f(): pass") != content_digest("def g(): pass")
+        assert len(content_digest("x")) == CacheDefaults.CONTENT_DIGEST_BYTES * 2
+
+
+class TestContentCache:
+    def test_byte_budget_evicts_least_recently_used(self) -> None:
+        cache = ContentCache("test", max_bytes=ENTRY_SIZE * 2)
+        cache.put("a", _array(1))
+        cache.put("b", _array(2))
+        cache.get("a")  # a becomes most recently used
+        cache.put("c", _array(3))
+
+        assert "b" not in cache
+        assert "a" in cache and "c" in cache
+        assert cache.total_bytes == ENTRY_SIZE * 2
+        assert cache.get_stats()["evictions"] == 1
+
+    def test_stats_count_hits_and_misses(self) -> None:
+        cache = ContentCache("test", max_bytes=ENTRY_SIZE * 10)
+        cache.put_many([("a", _array(1)), ("b", _array(2))])
+
+        found = cache.get_many(["a", "b", "missing"])
+
+        assert set(found) == {"a", "b"}
+        stats = cache.get_stats()
+        assert (stats["hits"], stats["misses"], stats["size"]) == (2, 1, 2)
+
+    def test_spill_round_trip(self, spill: ContentSpillStore) -> None:
+        ContentCache("test", max_bytes=ENTRY_SIZE * 10, spill_store=spill).put("a", _array(1))
+        fresh = ContentCache("test", max_bytes=ENTRY_SIZE * 10, spill_store=spill)
+
+        np.testing.assert_array_equal(fresh.get("a"), _array(1))
+        assert fresh.get_stats()["spill_hits"] == 1
+        assert "a" in fresh  # promoted into memory
+
+    def test_spill_is_namespaced(self, spill: ContentSpillStore) -> None:
+        ContentCache("one", max_bytes=ENTRY_SIZE * 10, spill_store=spill).put("a", _array(1))
+
+        assert ContentCache("two", max_bytes=ENTRY_SIZE * 10, spill_store=spill).get("a") is None
+
+
+class TestContentSpillStore:
+    def test_lru_eviction_respects_byte_budget(self, spill: ContentSpillStore) -> None:
+        spill.put_many("ns", [("probe", _array(0))])
+        entry_size = spill.get_stats()["size_bytes"]
+        spill.clear()
+        spill.max_size_bytes = entry_size * 2 + entry_size // 2
+
+        spill.put_many("ns", [("a", _array(1))])
+        time.sleep(0.01)
+        spill.put_many("ns", [("b", _array(2))])
+        time.sleep(0.01)
+        spill.get_many("ns", ["a"])
+        time.sleep(0.01)
+        spill.put_many("ns", [("c", _array(3))])
+
+        assert set(spill.get_many("ns", ["a", "b", "c"])) == {"a", "c"}
+
+
+class TestMinHashSignatureCache:
+    def test_signatures_survive_restart(self, spill: ContentSpillStore) -> None:
+        code = "def add(a, b):\n    return a + b\n"
+        first = MinHashSimilarity(signature_cache=ContentCache("sig", 1 << 20, MINHASH_CODEC, spill))
+        expected = first.create_minhash(code)
+
+        second = MinHashSimilarity(signature_cache=ContentCache("sig", 1 << 20, MINHASH_CODEC, spill))
+        loaded = second.create_minhash(code)
+
+        assert loaded.jaccard(expected) == 1.0
+        assert second._signature_cache.get_stats()["spill_hits"] == 1
+
+    def test_namespace_tracks_signature_settings(self) -> None:
+        base = MinHashSimilarity.signature_namespace(SimilarityConfig())
+        assert base != MinHashSimilarity.signature_namespace(SimilarityConfig(num_permutations=64))
+        assert base != MinHashSimilarity.signature_namespace(SimilarityConfig(use_token_shingles=False))
+
+    def test_token_counts_share_bounded_content_cache(self) -> None:
+        code = "def add(a, b):\n    return a + b\n"
+        first, second = MinHashSimilarity(), MinHashSimilarity()
+        first._token_counts.clear()
+
+        count = first._token_count(code)
+
+        assert second._token_counts is first._token_counts
+        assert first._token_counts.max_bytes == CacheDefaults.TOKEN_COUNT_CACHE_MAX_MB * (1 << 20)
+        assert first._token_counts.get(content_digest(code)) == count == len(first._tokenize(code))
+        with patch.object(second, "_tokenize", side_effect=AssertionError("tokenized twice")):
+            assert second._token_count(code) == count
@@ -18,8 +18,10 @@ from unittest.mock import MagicMock, patch
 
 from ast_grep_mcp.features.deduplication.coverage import (
     CoverageDetector,
+    CoverageReferenceIndex,
     _get_javascript_patterns,
     _get_ruby_patterns,
+    clear_test_reference_cache,
 )
 
 
@@ -649,6 +651,62 @@ class TestHasTestCoverageOptimized:
             assert result is True
 
 
+class TestCoverageReferenceIndex:
+    """Tests for the inverted test-file reference index."""
+
+    def _write(self, path: str, content: str) -> str:
+        with open(path, "w") as f:
+            f.write(content)
+        return path
+
+    def test_maps_imports_and_paths_to_tests(self):
+        """Test Python imports, JS paths and dash-joined names are indexed."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            py_test = self._write(os.path.join(tmpdir, "test_a.py"), "from pkg.billing import charge\n")
+            js_test = self._write(os.path.join(tmpdir, "a.test.js"), "import x from '../ui/date-picker.component'\n")
+
+            index = CoverageReferenceIndex({py_test, js_test})
+
+            assert index.tests_referencing("/src/pkg/billing.py", "python") == [py_test]
+            assert index.tests_referencing("/src/ui/date-picker.component.js", "javascript") == [js_test]
+            assert index.tests_referencing("/src/ui/date-picker.js", "javascript") == [js_test]
+            assert index.tests_referencing("/src/bill.py", "python") == []
+
+    def test_go_tests_cover_their_directory(self):
+        """Test Go test files reference every file in their directory."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            test_file = self._write(os.path.join(tmpdir, "handler_test.go"), "package main\n")
+
+            index = CoverageReferenceIndex({test_file})
+
+            assert index.tests_referencing(os.path.join(tmpdir, "server.go"), "go") == [test_file]
+            assert index.tests_referencing(os.path.join(tmpdir, "server.go"), "python") == []
+
+    def test_each_test_file_is_read_once_until_modified(self):
+        """Test parsed test files are cached across batches and revalidated by mtime."""
+        clear_test_reference_cache()
+        detector = CoverageDetector()
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            sources = [self._write(os.path.join(tmpdir, f"mod{i}.py"), "pass\n") for i in range(5)]
+            test_file = self._write(os.path.join(tmpdir, "test_suite.py"), "import mod0\n")
+
+            with patch("builtins.open", wraps=open) as spy:
+                first = detector.get_test_coverage_for_files_batch(sources, "python", tmpdir, parallel=False)
+                second = detector.get_test_coverage_for_files_batch(sources, "python", tmpdir, parallel=False)
+            reads = [c for c in spy.call_args_list if c.args and c.args[0] == test_file]
+
+            assert first == second
+            assert [first[s] for s in sources] == [True, False, False, False, False]
+            assert len(reads) == 1
+
+            self._write(test_file, "import mod0\nimport mod3\n")
+            os.utime(test_file, ns=(os.stat(test_file).st_atime_ns, os.stat(test_file).st_mtime_ns + 1_000_000))
+            third = detector.get_test_coverage_for_files_batch(sources, "python", tmpdir, parallel=False)
+
+            assert third[sources[3]] is True
+
+
 class TestGetTestCoverageForFiles:
     """Tests for get_test_coverage_for_files method."""
 
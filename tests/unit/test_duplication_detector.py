@@ -19,7 +19,7 @@ from unittest.mock import patch
 
 import pytest
 
-from ast_grep_mcp.constants import SemanticSimilarityDefaults
+from ast_grep_mcp.constants import DeduplicationDefaults, DetectorDefaults, SemanticSimilarityDefaults
 from ast_grep_mcp.features.deduplication.detector import (
     DuplicationDetector,
 )
@@ -393,6 +393,83 @@ class TestGroupDuplicates:
         assert len(result[0]) == 2
 
 
+class TestLshGrouping:
+    """Tests for the LSH anchor grouping engine."""
+
+    @staticmethod
+    def _function(name: str, body_var: str) -> str:
+        lines = [f"def {name}(items):", "    total = 0"]
+        lines += [f"    for {body_var} in items:", f"        total += {body_var} * 2", f"        print({body_var})"]
+        lines += ["    if total > 100:", "        return total - 100", "    return total"]
+        return "\n".join(lines)
+
+    def _matches(self) -> List[Dict[str, Any]]:
+        clones = [self._function(f"clone_{i}", "value") for i in range(6)]
+        other = "class Config:\n    host = 'localhost'\n    port = 8080\n    debug = False\n    retries = 3\n    timeout = 30"
+        return [{"text": code, "file": f"f{i}.py", "range": {"start": {"line": 1}}} for i, code in enumerate(clones + [other])]
+
+    def test_rejects_unknown_engine(self):
+        """Test that an unknown grouping engine is rejected."""
+        with pytest.raises(ValueError, match="grouping engine"):
+            DuplicationDetector(grouping_engine="pairs")  # type: ignore[arg-type]
+
+    def test_groups_clones_around_anchor(self):
+        """Test that LSH grouping puts all clones in one group and leaves unrelated code out."""
+        detector = DuplicationDetector(grouping_engine="lsh")
+
+        result = detector.group_duplicates(self._matches(), 0.8, 3)
+
+        assert len(result) == 1
+        assert sorted(item["file"] for item in result[0]) == [f"f{i}.py" for i in range(6)]
+
+    def test_skips_pairs_already_grouped(self):
+        """Test that candidate pairs inside an existing group are not re-verified."""
+        detector = DuplicationDetector(grouping_engine="lsh")
+
+        with patch.object(detector, "calculate_similarity", wraps=detector.calculate_similarity) as spy:
+            detector.group_duplicates(self._matches(), 0.8, 3)
+
+        # 6 identical clones give 15 candidate pairs; 5 unions suffice
+        assert spy.call_count == 5
+
+    def test_matches_bucket_engine_groups(self):
+        """Test that both engines agree on a simple clone set."""
+        matches = self._matches()
+        lsh = DuplicationDetector(grouping_engine="lsh").group_duplicates(matches, 0.8, 3)
+        bucket = DuplicationDetector(grouping_engine="bucket").group_duplicates(matches, 0.8, 3)
+
+        assert [sorted(m["file"] for m in g) for g in lsh] == [sorted(m["file"] for m in g) for g in bucket]
+
+    def test_chained_pairs_do_not_join_anchor_group(self):
+        """Test that A~B and B~C do not put C with A when A and C are not similar."""
+        matches = [{"text": name, "file": f"{name}.py"} for name in ("a", "b", "c")]
+        scores = {("a", "b"): 0.9, ("a", "c"): 0.5, ("b", "c"): 0.9}
+        detector = DuplicationDetector(grouping_engine="lsh")
+
+        with (
+            patch.object(detector._minhash, "find_candidate_pairs", return_value={("0", "1"), ("0", "2"), ("1", "2")}),
+            patch.object(detector, "calculate_similarity", side_effect=lambda x, y: scores[(x, y)]),
+        ):
+            groups = detector._group_with_lsh(matches, 0.8)
+
+        assert [[m["file"] for m in group] for group in groups] == [["a.py", "b.py"]]
+
+    def test_auto_switches_on_size(self):
+        """Test that auto uses LSH only for large inputs."""
+        detector = DuplicationDetector()
+
+        with patch("ast_grep_mcp.features.deduplication.detector.DetectorDefaults.LSH_GROUPING_MIN_ITEMS", 3):
+            assert detector._use_lsh_grouping(3) is True
+            assert detector._use_lsh_grouping(2) is False
+
+    def test_auto_reaches_lsh_under_default_construct_cap(self):
+        """Test that a capped default run of a large project uses LSH in auto mode."""
+        detector = DuplicationDetector()
+
+        assert DetectorDefaults.LSH_GROUPING_MIN_ITEMS < DeduplicationDefaults.MAX_CONSTRUCTS
+        assert detector._use_lsh_grouping(DeduplicationDefaults.MAX_CONSTRUCTS) is True
+
+
 class TestCreateHashBuckets:
     """Tests for _create_hash_buckets method."""
 
@@ -0,0 +1,144 @@
+"""Tests for the float16 digest-keyed embedding index."""
+
+import multiprocessing
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from ast_grep_mcp.features.deduplication.embedding_index import EmbeddingIndex
+
+DIM = 8
+ROW_BYTES = DIM * 2
+
+
+def _vectors(*values: float) -> np.ndarray:
+    return np.array([np.full(DIM, value) for value in values], dtype=np.float32)
+
+
+def _add_in_batches(path: Path, prefix: str, batches: int) -> None:
+    index = EmbeddingIndex("ns", max_bytes=ROW_BYTES * 10000, path=path)
+    for batch in range(batches):
+        digests = [f"{prefix}{batch}-{i}" for i in range(5)]
+        index.add_many(digests, _vectors(*(float(ord(prefix)) for _ in digests)))
+
+
+@pytest.fixture
+def path(tmp_path: Path) -> Path:
+    return tmp_path / "embeddings" / "index.f16"
+
+
+class TestEmbeddingIndex:
+    def test_round_trip_in_float16(self) -> None:
+        index = EmbeddingIndex("ns", max_bytes=ROW_BYTES * 100)
+        index.add_many(["a", "b"], _vectors(0.1, 2.0))
+
+        found = index.get_many(["a", "b", "missing"])
+
+        assert set(found) == {"a", "b"}
+        assert found["a"].dtype == np.float32
+        np.testing.assert_array_equal(found["a"], np.float16(0.1))
+        stats = index.get_stats()
+        assert (stats["size"], stats["dim"], stats["hits"], stats["misses"]) == (2, DIM, 2, 1)
+
+    def test_grows_past_initial_capacity(self) -> None:
+        index = EmbeddingIndex("ns", max_bytes=ROW_BYTES * 5000)
+        digests = [str(i) for i in range(3000)]
+        index.add_many(digests, np.arange(3000, dtype=np.float32)[:, None].repeat(DIM, axis=1) / 3000)
+
+        assert len(index) == 3000
+        np.testing.assert_allclose(index.get_many(["2999"])["2999"], 2999 / 3000, rtol=1e-3)
+
+    def test_eviction_keeps_recently_used_rows(self) -> None:
+        index = EmbeddingIndex("ns", max_bytes=ROW_BYTES * 4)
+        index.add_many(["a", "b", "c", "d"], _vectors(1, 2, 3, 4))
+        index.get_many(["b"])
+
+        index.add_many(["e"], _vectors(5))
+
+        assert "b" in index and "e" in index
+        assert "a" not in index
+        assert len(index) <= 4
+        np.testing.assert_array_equal(index.get_many(["b"])["b"], 2.0)
+        assert index.get_stats()["evictions"] > 0
+
+    def test_rejects_width_change(self) -> None:
+        index = EmbeddingIndex("ns", max_bytes=ROW_BYTES * 10)
+        index.add_many(["a"], _vectors(1))
+
+        with pytest.raises(ValueError):
+            index.add_many(["b"], np.ones((1, DIM + 1), dtype=np.float32))
+
+
+class TestPersistedEmbeddingIndex:
+    def test_survives_restart(self, path: Path) -> None:
+        EmbeddingIndex("ns", max_bytes=ROW_BYTES * 100, path=path).add_many(["a", "b"], _vectors(1, 2))
+
+        reopened = EmbeddingIndex("ns", max_bytes=ROW_BYTES * 100, path=path)
+
+        assert len(reopened) == 2
+        np.testing.assert_array_equal(reopened.get_many(["b"])["b"], 2.0)
+
+    def test_eviction_is_persisted(self, path: Path) -> None:
+        index = EmbeddingIndex("ns", max_bytes=ROW_BYTES * 2, path=path)
+        index.add_many(["a", "b"], _vectors(1, 2))
+        index.get_many(["b"])
+        index.add_many(["c"], _vectors(3))
+
+        reopened = EmbeddingIndex("ns", max_bytes=ROW_BYTES * 2, path=path)
+
+        assert set(reopened.get_many(["a", "b", "c"])) == {"b", "c"}
+        np.testing.assert_array_equal(reopened.get_many(["c"])["c"], 3.0)
+
+    def test_other_namespace_is_discarded(self, path: Path) -> None:
+        EmbeddingIndex("one", max_bytes=ROW_BYTES * 100, path=path).add_many(["a"], _vectors(1))
+
+        assert len(EmbeddingIndex("two", max_bytes=ROW_BYTES * 100, path=path)) == 0
+
+    def test_clear_removes_files(self, path: Path) -> None:
+        index = EmbeddingIndex("ns", max_bytes=ROW_BYTES * 100, path=path)
+        index.add_many(["a"], _vectors(1))
+
+        index.clear()
+
+        assert not path.exists()
+        assert len(EmbeddingIndex("ns", max_bytes=ROW_BYTES * 100, path=path)) == 0
+
+    def test_handles_sharing_a_path_see_each_others_rows(self, path: Path) -> None:
+        first = EmbeddingIndex("ns", max_bytes=ROW_BYTES * 100, path=path)
+        second = EmbeddingIndex("ns", max_bytes=ROW_BYTES * 100, path=path)
+        first.add_many(["a", "b"], _vectors(1, 2))
+        second.add_many(["c", "d"], _vectors(3, 4))
+
+        assert first.get_many(["c"])["c"][0] == 3.0
+        reopened = EmbeddingIndex("ns", max_bytes=ROW_BYTES * 100, path=path)
+        found = reopened.get_many(["a", "b", "c", "d"])
+        assert {digest: float(vector[0]) for digest, vector in found.items()} == {"a": 1.0, "b": 2.0, "c": 3.0, "d": 4.0}
+
+    def test_compaction_by_another_handle_is_picked_up(self, path: Path) -> None:
+        first = EmbeddingIndex("ns", max_bytes=ROW_BYTES * 4, path=path)
+        second = EmbeddingIndex("ns", max_bytes=ROW_BYTES * 4, path=path)
+        first.add_many(["a", "b", "c", "d"], _vectors(1, 2, 3, 4))
+        second.get_many(["d"])
+
+        second.add_many(["e"], _vectors(5))
+
+        found = first.get_many(["a", "b", "c", "d", "e"])
+        assert "e" in found and "d" in found
+        assert all(float(vector[0]) == {"a": 1, "b": 2, "c": 3, "d": 4, "e": 5}[digest] for digest, vector in found.items())
+
+    @pytest.mark.skipif(sys.platform == "win32", reason="cross-process locking uses fcntl")
+    def test_concurrent_writer_processes(self, path: Path) -> None:
+        context = multiprocessing.get_context("fork")
+        workers = [context.Process(target=_add_in_batches, args=(path, prefix, 20)) for prefix in "pqrs"]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        assert all(worker.exitcode == 0 for worker in workers)
+
+        index = EmbeddingIndex("ns", max_bytes=ROW_BYTES * 10000, path=path)
+        assert len(index) == 4 * 20 * 5
+        found = index.get_many([f"{prefix}{batch}-{i}" for prefix in "pqrs" for batch in range(20) for i in range(5)])
+        assert all(float(vector[0]) == ord(digest[0]) for digest, vector in found.items())
@@ -0,0 +1,131 @@
+"""Tests for batched multi-rule ast-grep execution and executor metrics."""
+
+import subprocess
+import threading
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from ast_grep_mcp.core import executor
+from ast_grep_mcp.core.executor import (
+    ExecutorMetrics,
+    build_inline_rules,
+    get_executor_metrics,
+    reset_executor_metrics,
+    run_ast_grep_batch,
+    run_command,
+)
+
+
+@pytest.fixture(autouse=True)
+def _reset_metrics():
+    reset_executor_metrics()
+    yield
+    reset_executor_metrics()
+
+
+@pytest.fixture
+def project(tmp_path: Path) -> Path:
+    (tmp_path / "a.py").write_text("f(1)\ng(2)\ng(3)\n")
+    (tmp_path / "b.py").write_text("h(4)\n")
+    return tmp_path
+
+
+def _rule(rule_id: str, pattern: str) -> dict:
+    return {"id": rule_id, "language": "python", "rule": {"pattern": pattern}}
+
+
+class TestBuildInlineRules:
+    def test_joins_documents(self) -> None:
+        inline = build_inline_rules([_rule("a", "f($$$)"), _rule("b", "g($$$)")])
+        assert inline.count("---") == 1
+        assert "id: a" in inline and "id: b" in inline
+
+    def test_rejects_duplicate_ids(self) -> None:
+        with pytest.raises(ValueError):
+            build_inline_rules([_rule("a", "f($$$)"), _rule("a", "g($$$)")])
+
+    def test_rejects_missing_id(self) -> None:
+        with pytest.raises(ValueError):
+            build_inline_rules([{"language": "python", "rule": {"pattern": "f()"}}])
+
+
+class TestRunAstGrepBatch:
+    def test_routes_matches_by_rule_id(self, project: Path) -> None:
+        results = run_ast_grep_batch(
+            [_rule("calls-f", "f($$$)"), _rule("calls-g", "g($$$)"), _rule("calls-z", "z($$$)")],
+            [str(project)],
+        )
+
+        assert len(results["calls-f"]) == 1
+        assert len(results["calls-g"]) == 2
+        assert results["calls-z"] == []
+
+    def test_single_spawn_for_many_rules(self, project: Path) -> None:
+        run_ast_grep_batch([_rule(f"r{i}", f"{name}($$$)") for i, name in enumerate("fgh")], [str(project)])
+
+        metrics = get_executor_metrics()
+        assert metrics["spawn_count"] == 1
+        assert metrics["batch_calls"] == 1
+        assert metrics["batched_rules"] == 3
+        assert metrics["spawns_saved_by_batching"] == 2
+        assert metrics["call_count"] == 1
+
+    def test_empty_rules_do_not_spawn(self, project: Path) -> None:
+        assert run_ast_grep_batch([], [str(project)]) == {}
+        assert get_executor_metrics()["spawn_count"] == 0
+
+
+class TestExecutorMetrics:
+    def test_run_command_records_spawn_and_latency(self) -> None:
+        run_command(["true"])
+
+        metrics = get_executor_metrics()
+        assert metrics["spawn_count"] == 1
+        assert metrics["call_count"] == 1
+        assert metrics["active_processes"] == 0
+        assert metrics["max_latency_seconds"] >= 0
+
+    def test_percentiles(self) -> None:
+        metrics = ExecutorMetrics()
+        for i in range(1, 101):
+            metrics.record_latency(i / 100)
+
+        snapshot = metrics.snapshot()
+        assert snapshot["p50_latency_seconds"] == pytest.approx(0.51)
+        assert snapshot["p95_latency_seconds"] == pytest.approx(0.96)
+        assert snapshot["max_latency_seconds"] == pytest.approx(1.0)
+
+    def test_process_slots_queue_excess_callers(self) -> None:
+        slots = threading.BoundedSemaphore(1)
+        release = threading.Event()
+        held = threading.Event()
+
+        def slow_run(*args, **kwargs):
+            held.set()
+            release.wait(5)
+            return subprocess.CompletedProcess(args[0], 0, "", "")
+
+        with patch.object(executor, "_process_slots", slots), patch("subprocess.run", side_effect=slow_run):
+            threads = [threading.Thread(target=run_command, args=(["x"],)) for _ in range(3)]
+            for t in threads:
+                t.start()
+            held.wait(5)
+            deadline = time.time() + 5
+            while get_executor_metrics()["queue_depth"] < 2 and time.time() < deadline:
+                time.sleep(0.01)
+
+            metrics = get_executor_metrics()
+            assert metrics["active_processes"] == 1
+            assert metrics["queue_depth"] == 2
+
+            release.set()
+            for t in threads:
+                t.join(5)
+
+        metrics = get_executor_metrics()
+        assert metrics["max_queue_depth"] == 2
+        assert metrics["queue_depth"] == 0
+        assert metrics["spawn_count"] == 3
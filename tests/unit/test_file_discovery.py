@@ -0,0 +1,149 @@
+"""Tests for the shared file discovery service."""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from ast_grep_mcp.core.executor import filter_files_by_size
+from ast_grep_mcp.core.file_discovery import FileDiscovery, _is_ignored, _parse_ignore_line, matches_any_glob
+
+
+def _write(path: Path, text: str = "x\n") -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+    return path
+
+
+def _age(path: Path, seconds: float = 10.0) -> None:
+    """Push a directory's mtime into the past so it is not treated as racy."""
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns - int(seconds * 1e9)))
+
+
+def _rels(discovery: FileDiscovery, root: Path, **kwargs) -> list[str]:
+    return [f.rel_path for f in discovery.list_files(str(root), **kwargs)]
+
+
+@pytest.fixture
+def project(tmp_path: Path) -> Path:
+    _write(tmp_path / "main.py")
+    _write(tmp_path / "src" / "app.py")
+    _write(tmp_path / "src" / "app.log")
+    _write(tmp_path / "node_modules" / "lib.js")
+    _write(tmp_path / ".hidden" / "secret.py")
+    return tmp_path
+
+
+class TestIgnoreRules:
+    @pytest.mark.parametrize(
+        ("pattern", "path", "is_dir", "expected"),
+        [
+            ("*.log", "a/b/c.log", False, True),
+            ("/build", "build", True, True),
+            ("/build", "src/build", True, False),
+            ("out/", "src/out", True, True),
+            ("out/", "src/out", False, False),
+            ("docs/*.md", "docs/a.md", False, True),
+            ("docs/*.md", "docs/sub/a.md", False, False),
+            ("**/gen", "a/b/gen", True, True),
+            ("cache/**", "cache/x/y", False, True),
+        ],
+    )
+    def test_patterns(self, pattern: str, path: str, is_dir: bool, expected: bool) -> None:
+        rule = _parse_ignore_line(pattern, "")
+        assert rule is not None
+        assert _is_ignored(path, is_dir, [rule]) is expected
+
+    def test_negation_and_nested_base(self) -> None:
+        rules = [r for r in (_parse_ignore_line(p, "pkg") for p in ["*.py", "!keep.py"]) if r]
+        assert _is_ignored("pkg/drop.py", False, rules)
+        assert not _is_ignored("pkg/keep.py", False, rules)
+        assert not _is_ignored("other/drop.py", False, rules)
+
+
+class TestFileDiscovery:
+    def test_lists_files_and_skips_defaults(self, project: Path) -> None:
+        assert _rels(FileDiscovery(), project) == ["main.py", "src/app.log", "src/app.py"]
+
+    def test_hidden_and_extension_filters(self, project: Path) -> None:
+        discovery = FileDiscovery()
+        assert _rels(discovery, project, extensions=[".py"], include_hidden=True) == [".hidden/secret.py", "main.py", "src/app.py"]
+
+    def test_honours_gitignore_and_ignore_files(self, project: Path) -> None:
+        _write(project / ".gitignore", "*.log\n")
+        _write(project / "src" / ".ignore", "app.py\n")
+        assert _rels(FileDiscovery(), project) == ["main.py"]
+
+    def test_stat_reused_for_size(self, project: Path) -> None:
+        _write(project / "big.py", "a" * 1000)
+        sizes = {f.rel_path: f.size for f in FileDiscovery().list_files(str(project))}
+        assert sizes["big.py"] == 1000
+
+    def test_cache_hit_and_incremental_update(self, project: Path) -> None:
+        for directory in (project, project / "src", project / ".hidden"):
+            _age(directory)
+        discovery = FileDiscovery()
+        discovery.list_files(str(project))
+        discovery.list_files(str(project))
+        assert discovery.get_stats()["cache_hits"] == 1
+
+        _write(project / "src" / "new.py")
+        (project / "main.py").unlink()
+        assert _rels(discovery, project) == ["src/app.log", "src/app.py", "src/new.py"]
+        stats = discovery.get_stats()
+        assert stats["full_scans"] == 1
+        assert stats["incremental_updates"] == 1
+
+    def test_new_and_removed_directories(self, project: Path) -> None:
+        _age(project)
+        discovery = FileDiscovery()
+        discovery.list_files(str(project))
+
+        _write(project / "pkg" / "deep" / "mod.py")
+        assert "pkg/deep/mod.py" in _rels(discovery, project)
+
+        for path in (project / "src").iterdir():
+            path.unlink()
+        (project / "src").rmdir()
+        assert not any(rel.startswith("src/") for rel in _rels(discovery, project))
+
+    def test_ignore_file_edit_triggers_rescan(self, project: Path) -> None:
+        _write(project / ".gitignore", "")
+        _age(project)
+        discovery = FileDiscovery()
+        assert "src/app.log" in _rels(discovery, project)
+
+        _write(project / ".gitignore", "*.log\n")
+        assert "src/app.log" not in _rels(discovery, project)
+        assert discovery.get_stats()["full_scans"] == 2
+
+    def test_parallel_scan_matches_serial(self, tmp_path: Path) -> None:
+        for i in range(40):
+            _write(tmp_path / f"d{i}" / "sub" / f"f{i}.py")
+        serial = _rels(FileDiscovery(max_workers=1), tmp_path)
+        parallel = _rels(FileDiscovery(max_workers=4, parallel_threshold=2), tmp_path)
+        assert serial == parallel
+        assert len(parallel) == 40
+
+
+class TestFilterFilesBySize:
+    def test_in_place_growth_is_seen_with_cached_listing(self, tmp_path: Path) -> None:
+        source = _write(tmp_path / "big.py", "x = 1\n")
+        _age(tmp_path)
+        assert filter_files_by_size(str(tmp_path), max_size_mb=1) == ([str(source)], [])
+
+        # Rewriting a file in place leaves its directory mtime, and so the cached listing, unchanged
+        with open(source, "r+") as f:
+            f.write("#" * (2 * 1024 * 1024))
+
+        assert filter_files_by_size(str(tmp_path), max_size_mb=1) == ([], [str(source)])
+
+
+class TestMatchesAnyGlob:
+    def test_recursive_globs(self) -> None:
+        assert matches_any_glob("main.py", ["**/*.py"])
+        assert matches_any_glob("a/b/c.py", ["**/*.py"])
+        assert not matches_any_glob("a/b/c.ts", ["**/*.py"])
+        assert matches_any_glob("src/x.py", ["src/*.py"])
+        assert not matches_any_glob("src/sub/x.py", ["src/*.py"])
@@ -0,0 +1,124 @@
+"""Tests for the identifier index used by orphan detection."""
+
+import ast
+import subprocess
+from pathlib import Path
+from unittest.mock import patch
+
+from ast_grep_mcp.features.quality.identifier_index import IdentifierIndex
+from ast_grep_mcp.features.quality.orphan_detector import OrphanDetector
+from ast_grep_mcp.models.orphan import OrphanAnalysisConfig, VerificationStatus
+
+
+def _write(root: Path, rel_path: str, content: str) -> None:
+    path = root / rel_path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+
+
+class TestIdentifierIndex:
+    def test_python_references_but_not_definitions(self) -> None:
+        index = IdentifierIndex()
+        index.add_file(
+            "pkg/mod.py",
+            "import os.path as osp\nfrom pkg.helpers import load\ndef unused():\n    return obj.method(load())\n__all__ = ['exported']\n",
+        )
+
+        assert index.occurrences("unused") == {}
+        assert index.occurrences("load") == {"pkg/mod.py": [2, 4]}
+        assert index.occurrences("method") == {"pkg/mod.py": [4]}
+        assert index.occurrences("exported") == {"pkg/mod.py": [5]}
+        for name in ("os", "path", "osp", "pkg", "helpers"):
+            assert index.files_containing(name) == ["pkg/mod.py"]
+
+    def test_other_files_are_tokenized(self) -> None:
+        index = IdentifierIndex()
+        index.add_file("web/app.ts", "import { $render } from './view';\nrender_page();\n")
+        index.add_file("broken.py", "def (:\n    helper()\n")
+
+        assert index.occurrences("$render") == {"web/app.ts": [1]}
+        assert index.occurrences("render_page") == {"web/app.ts": [2]}
+        assert index.occurrences("render") == {}
+        assert index.occurrences("helper") == {"broken.py": [2]}
+
+    def test_files_containing(self) -> None:
+        index = IdentifierIndex()
+        index.add_file("src/a.py", "user_service.run()\n")
+        index.add_file("scripts/deploy.sh", "node user-service.js\n")
+        index.add_file("src/b.py", "service = user\n")
+
+        assert index.files_containing("user_service") == ["src/a.py"]
+        assert index.files_containing("user_service", prefix="scripts/") == []
+        assert index.files_containing("user-service") == ["scripts/deploy.sh", "src/b.py"]
+        assert index.files_containing("---") == []
+
+    def test_docstrings_are_not_references(self) -> None:
+        index = IdentifierIndex()
+        index.add_file(
+            "pkg/mod.py",
+            '"""Module using load_config."""\n'
+            "class Loader:\n"
+            '    """Wraps load_config."""\n'
+            "    def load_config(self):\n"
+            '        """Call load_config to read the file."""\n'
+            "        return 'load_config'\n",
+        )
+
+        assert index.occurrences("load_config") == {"pkg/mod.py": [6]}
+
+    def test_build_skips_excluded_dirs_and_binaries(self, tmp_path: Path) -> None:
+        _write(tmp_path, "src/main.py", "run()\n")
+        _write(tmp_path, "node_modules/lib/index.js", "run();\n")
+        (tmp_path / "src" / "blob.bin").write_bytes(b"run\0run")
+
+        index = IdentifierIndex.build(tmp_path, exclude_dirs=["node_modules"])
+
+        assert index.files_containing("run") == ["src/main.py"]
+
+
+class TestOrphanDetectorWithIndex:
+    def test_functions_and_files_verified_without_subprocesses(self, tmp_path: Path) -> None:
+        _write(tmp_path, "src/app/main.py", "from app.used import called\n\ncalled()\n")
+        _write(
+            tmp_path,
+            "src/app/used.py",
+            "def called():\n    return 1\n\n\ndef never_called():\n    return 2\n\n\ndef format_total():\n    return 3\n",
+        )
+        _write(tmp_path, "src/app/plugin.py", "x = 1\n")
+        _write(tmp_path, "src/app/dead.py", "y = 2\n")
+        _write(tmp_path, "config/plugins.yaml", "plugins:\n  - app.plugin\n")
+        detector = OrphanDetector(OrphanAnalysisConfig(include_patterns=["**/*.py"], entry_point_patterns=["**/main.py"]))
+
+        with patch.object(subprocess, "run", side_effect=AssertionError("subprocess used")):
+            result = detector.analyze(str(tmp_path))
+
+        assert sorted(f.name for f in result.orphan_functions) == ["format_total", "never_called"]
+        statuses = {f.file_path: f.status for f in result.orphan_files}
+        assert statuses["src/app/dead.py"] == VerificationStatus.CONFIRMED
+        assert statuses["src/app/plugin.py"] == VerificationStatus.UNCERTAIN
+        plugin = next(f for f in result.orphan_files if f.file_path == "src/app/plugin.py")
+        assert plugin.importers == [str(tmp_path / "config/plugins.yaml")]
+
+    def test_each_python_file_parsed_once(self, tmp_path: Path) -> None:
+        _write(tmp_path, "src/app/main.py", "from app.used import called\n\ncalled()\n")
+        _write(tmp_path, "src/app/used.py", "def called():\n    return 1\n")
+        _write(tmp_path, "src/app/dead.py", "def dead():\n    return 2\n")
+        detector = OrphanDetector(OrphanAnalysisConfig(include_patterns=["**/*.py"], entry_point_patterns=["**/main.py"]))
+
+        with patch.object(ast, "parse", wraps=ast.parse) as parse:
+            detector.analyze(str(tmp_path))
+
+        assert parse.call_count == 3
+
+    def test_self_describing_docstring_does_not_hide_orphan(self, tmp_path: Path) -> None:
+        _write(tmp_path, "src/app/main.py", "from app.used import called\n\ncalled()\n")
+        _write(
+            tmp_path,
+            "src/app/used.py",
+            'def called():\n    return 1\n\n\ndef stale_helper():\n    """stale_helper is kept for callers."""\n    return 2\n',
+        )
+        detector = OrphanDetector(OrphanAnalysisConfig(include_patterns=["**/*.py"], entry_point_patterns=["**/main.py"]))
+
+        result = detector.analyze(str(tmp_path))
+
+        assert [f.name for f in result.orphan_functions] == ["stale_helper"]
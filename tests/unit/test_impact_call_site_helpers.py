@@ -1,9 +1,13 @@
-"""Tests for extracted _to_call_site_record and _search_call_sites_for_name."""
+"""Tests for _to_call_site_record and the batched external reference search."""
 
-import json
 import os
+import shutil
+from pathlib import Path
 from unittest.mock import MagicMock, patch
 
+import pytest
+
+from ast_grep_mcp.core.exceptions import AstGrepExecutionError
 from ast_grep_mcp.features.deduplication.impact import ImpactAnalyzer
 
 
@@ -48,38 +52,84 @@ class TestToCallSiteRecord:
         assert result["column"] == 0
 
 
-class TestSearchCallSitesForName:
+class TestFindAllExternalRefs:
     def _make_analyzer(self):
         analyzer = ImpactAnalyzer.__new__(ImpactAnalyzer)
         analyzer.logger = MagicMock()
         return analyzer
 
-    @patch("ast_grep_mcp.features.deduplication.impact.run_ast_grep")
-    def test_filters_exclude_files(self, mock_run):
-        mock_run.return_value = MagicMock(
-            returncode=0,
-            stdout=json.dumps(
-                [
-                    {"file": "a.py", "range": {"start": {"line": 0, "column": 0}}, "text": "fn()"},
-                    {"file": "excluded.py", "range": {"start": {"line": 0, "column": 0}}, "text": "fn()"},
-                ]
-            ),
-        )
-        analyzer = self._make_analyzer()
-        results = analyzer._search_call_sites_for_name("fn", "/project", "python", ["excluded.py"])
-        assert len(results) == 1
-        assert "excluded.py" not in results[0]["file"]
-
-    @patch("ast_grep_mcp.features.deduplication.impact.run_ast_grep")
-    def test_empty_on_nonzero_return(self, mock_run):
-        mock_run.return_value = MagicMock(returncode=1, stdout="")
-        analyzer = self._make_analyzer()
-        results = analyzer._search_call_sites_for_name("fn", "/project", "python", [])
-        assert results == []
-
-    @patch("ast_grep_mcp.features.deduplication.impact.run_ast_grep")
-    def test_empty_on_no_stdout(self, mock_run):
-        mock_run.return_value = MagicMock(returncode=0, stdout="")
-        analyzer = self._make_analyzer()
-        results = analyzer._search_call_sites_for_name("fn", "/project", "python", [])
-        assert results == []
+    @staticmethod
+    def _match(file: str, line: int = 0) -> dict:
+        return {"file": file, "range": {"start": {"line": line, "column": 0}}, "text": "fn()"}
+
+    @patch("ast_grep_mcp.features.deduplication.impact.run_ast_grep_batch")
+    def test_one_scan_for_all_names(self, mock_batch):
+        mock_batch.return_value = {}
+        names = [f"name{i}" for i in range(30)]
+        self._make_analyzer()._find_all_external_refs(names, "/project", "python", [])
+
+        mock_batch.assert_called_once()
+        rules, paths = mock_batch.call_args.args
+        assert paths == ["/project"]
+        assert len(rules) == 30 * 3  # one call and two import patterns per name
+        assert len({rule["id"] for rule in rules}) == len(rules)
+
+    @patch("ast_grep_mcp.features.deduplication.impact.run_ast_grep_batch")
+    def test_routes_matches_by_rule_id(self, mock_batch):
+        mock_batch.return_value = {
+            "call-0": [self._match("a.py", 3), self._match("excluded.py")],
+            "call-1": [self._match("b.py")],
+            "import-1-0": [self._match("c.py")],
+        }
+        results = self._make_analyzer()._find_all_external_refs(["fn", "other"], "/project", "python", ["excluded.py"])
+
+        assert [(r["type"], r.get("function_called") or r.get("imported_name"), r["file"]) for r in results] == [
+            ("function_call", "fn", os.path.join("/project", "a.py")),
+            ("function_call", "other", os.path.join("/project", "b.py")),
+            ("import", "other", os.path.join("/project", "c.py")),
+        ]
+        assert results[0]["line"] == 4
+
+    @patch("ast_grep_mcp.features.deduplication.impact.run_ast_grep_batch")
+    def test_empty_on_scan_error(self, mock_batch):
+        mock_batch.side_effect = AstGrepExecutionError(["ast-grep"], 2, "boom")
+        assert self._make_analyzer()._find_all_external_refs(["fn"], "/project", "python", []) == []
+
+    @patch("ast_grep_mcp.features.deduplication.impact.run_ast_grep_batch")
+    def test_failed_batch_falls_back_to_per_rule_scans(self, mock_batch):
+        def scan(rules, paths):
+            if len(rules) > 1 or rules[0]["id"] == "import-0-1":
+                raise AstGrepExecutionError(["ast-grep"], 2, "bad rule")
+            return {rules[0]["id"]: [self._match("a.py")]}
+
+        mock_batch.side_effect = scan
+        results = self._make_analyzer()._find_all_external_refs(["fn"], "/project", "python", [])
+
+        assert mock_batch.call_count == 4
+        assert [r["type"] for r in results] == ["function_call", "import"]
+
+    @patch("ast_grep_mcp.features.deduplication.impact.run_ast_grep_batch")
+    def test_no_scan_without_names(self, mock_batch):
+        assert self._make_analyzer()._find_all_external_refs([], "/project", "python", []) == []
+        mock_batch.assert_not_called()
+
+
+@pytest.mark.skipif(shutil.which("ast-grep") is None, reason="ast-grep not installed")
+class TestFindAllExternalRefsWithAstGrep:
+    @pytest.mark.parametrize(
+        "language,ext",
+        [("python", "py"), ("javascript", "js"), ("typescript", "ts"), ("tsx", "tsx")],
+    )
+    def test_finds_calls_and_imports(self, tmp_path: Path, language: str, ext: str):
+        if language == "python":
+            source = "from lib import helper\nfrom lib import a, helper, b\nfrom lib import helpers\nhelper(1)\n"
+        else:
+            source = (
+                "import { helper } from './lib';\nimport { a, helper, b } from './lib';\nimport { helpers } from './lib';\nhelper(1);\n"
+            )
+        (tmp_path / f"use.{ext}").write_text(source)
+        analyzer = ImpactAnalyzer()
+
+        results = analyzer._find_all_external_refs(["helper"], str(tmp_path), language, [])
+
+        assert sorted((r["type"], r["line"]) for r in results) == [("function_call", 4), ("import", 1), ("import", 2)]
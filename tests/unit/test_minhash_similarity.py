@@ -4,8 +4,14 @@ Tests the O(n) MinHash similarity implementation that replaces
 the O(n²) SequenceMatcher for scalable code clone detection.
 """
 
+from unittest.mock import patch
+
+from datasketch import MinHash
+
 from ast_grep_mcp.constants import SemanticSimilarityDefaults
+from ast_grep_mcp.core.content_cache import ContentCache
 from ast_grep_mcp.features.deduplication.similarity import (
+    MINHASH_CODEC,
     EnhancedStructureHash,
     MinHashSimilarity,
     SimilarityConfig,
@@ -194,6 +200,58 @@ class Config:
         assert any(("func1", "func2") == p or ("func2", "func1") == p for p in pair_keys), f"Expected func1-func2 pair, got {pair_keys}"
 
 
+class TestBatchSignatures:
+    """Tests for vectorized batch signature generation."""
+
+    CODES = [
+        "def add(a, b):\n    return a + b\n",
+        "def add(x, y):\n    total = x + y\n    return total\n",
+        "for item in items:\n    print(item)\n" * 5,
+        "",
+    ]
+
+    @staticmethod
+    def _reference(similarity: MinHashSimilarity, code: str) -> MinHash:
+        m = MinHash(num_perm=similarity.config.num_permutations)
+        for shingle in similarity._shingles(code):
+            m.update(shingle.encode("utf8"))
+        return m
+
+    def test_matrix_matches_per_shingle_minhash(self):
+        """Batched rows equal signatures built one shingle at a time."""
+        similarity = MinHashSimilarity()
+        matrix = similarity.signature_matrix(self.CODES)
+
+        assert matrix.shape == (len(self.CODES), similarity.config.num_permutations)
+        assert str(matrix.dtype) == "uint64"
+        for code, row in zip(self.CODES, matrix):
+            assert (row == self._reference(similarity, code).hashvalues).all()
+
+    def test_chunking_does_not_change_rows(self):
+        """Small chunks give the same matrix as one chunk."""
+        similarity = MinHashSimilarity()
+        expected = similarity.signature_matrix(self.CODES)
+
+        with patch("ast_grep_mcp.features.deduplication.similarity.MinHashDefaults.BATCH_MAX_SHINGLES", 3):
+            assert (similarity.signature_matrix(self.CODES) == expected).all()
+
+    def test_signature_jaccard_matches_minhash(self):
+        """Row-based Jaccard equals MinHash.jaccard."""
+        similarity = MinHashSimilarity()
+        matrix = similarity.signature_matrix(self.CODES[:2])
+        m1, m2 = similarity.create_minhash_batch(self.CODES[:2])
+
+        assert similarity.signature_jaccard(matrix[0], matrix[1]) == m1.jaccard(m2)
+
+    def test_batch_fills_signature_cache(self):
+        """create_minhash_batch caches signatures for later create_minhash calls."""
+        similarity = MinHashSimilarity(signature_cache=ContentCache("test", 1 << 20, MINHASH_CODEC))
+        signatures = similarity.create_minhash_batch(self.CODES + self.CODES[:1])
+
+        assert len(similarity._signature_cache) == len(self.CODES)
+        assert similarity.create_minhash(self.CODES[0]) is signatures[0]
+
+
 class TestSimilarityConfig:
     """Tests for similarity configuration."""
 
@@ -0,0 +1,141 @@
+"""Tests for the persistent on-disk query cache store."""
+
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from ast_grep_mcp.core.cache import QueryCache
+from ast_grep_mcp.core.cache_store import PersistentCacheStore
+
+
+def _matches(n: int, file: str = "/p/a.py") -> list:
+    return [{"file": file, "text": f"match {i}", "range": {"start": {"line": i}}} for i in range(n)]
+
+
+@pytest.fixture
+def db_path(tmp_path: Path) -> Path:
+    return tmp_path / "query_cache.db"
+
+
+class TestPersistentCacheStore:
+    def test_round_trip(self, db_path: Path) -> None:
+        store = PersistentCacheStore(db_path=db_path)
+        store.put("k", {"results": _matches(3)}, 123.0)
+
+        payload, created_at = store.get("k")
+
+        assert payload == {"results": _matches(3)}
+        assert created_at == 123.0
+
+    def test_payloads_are_compressed(self, db_path: Path) -> None:
+        store = PersistentCacheStore(db_path=db_path)
+        store.put("k", {"results": _matches(500)}, time.time())
+
+        raw_size = len(str(_matches(500)))
+        assert 0 < store.get_stats()["size_bytes"] < raw_size // 5
+
+    def test_missing_key(self, db_path: Path) -> None:
+        assert PersistentCacheStore(db_path=db_path).get("nope") is None
+
+    def test_lru_eviction_respects_byte_budget(self, db_path: Path) -> None:
+        store = PersistentCacheStore(db_path=db_path)
+        store.put("probe", {"results": _matches(50, file="/p/probe.py")}, 0.0)
+        entry_size = store.get_stats()["size_bytes"]
+        store.clear()
+        store.max_size_bytes = entry_size * 2 + entry_size // 2
+
+        store.put("a", {"results": _matches(50, file="/p/a.py")}, 0.0)
+        time.sleep(0.01)
+        store.put("b", {"results": _matches(50, file="/p/b.py")}, 0.0)
+        time.sleep(0.01)
+        store.get("a")  # a becomes most recently used
+        time.sleep(0.01)
+        store.put("c", {"results": _matches(50, file="/p/c.py")}, 0.0)
+
+        assert store.get("b") is None
+        assert store.get("a") is not None
+        assert store.get("c") is not None
+        assert store.get_stats()["size_bytes"] <= store.max_size_bytes
+
+    def test_delete_and_clear(self, db_path: Path) -> None:
+        store = PersistentCacheStore(db_path=db_path)
+        store.put("a", {"results": []}, 0.0)
+        store.put("b", {"results": []}, 0.0)
+        store.delete("a")
+        assert store.get("a") is None
+        store.clear()
+        assert store.get_stats()["entries"] == 0
+
+    def test_concurrent_writers(self, db_path: Path) -> None:
+        stores = [PersistentCacheStore(db_path=db_path) for _ in range(4)]
+
+        def write(idx: int, store: PersistentCacheStore) -> None:
+            for j in range(20):
+                store.put(f"{idx}-{j}", {"results": _matches(5)}, time.time())
+
+        threads = [threading.Thread(target=write, args=(i, s)) for i, s in enumerate(stores)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert stores[0].get_stats()["entries"] == 80
+
+
+class TestQueryCacheWithDiskStore:
+    def test_restart_serves_disk_hit(self, db_path: Path) -> None:
+        first = QueryCache(disk_store=PersistentCacheStore(db_path=db_path))
+        first.put("run", ["p"], "/p", _matches(2))
+
+        # Simulates a server restart: fresh in-memory cache over the same database
+        second = QueryCache(disk_store=PersistentCacheStore(db_path=db_path))
+        assert second.get("run", ["p"], "/p") == _matches(2)
+        assert second.get("run", ["p"], "/p") == _matches(2)
+
+        stats = second.get_stats()
+        assert stats["disk_hits"] == 1
+        assert stats["memory_hits"] == 1
+        assert stats["hits"] == 2
+        assert stats["disk"]["entries"] == 1
+
+    def test_expired_disk_entry_is_removed(self, db_path: Path) -> None:
+        store = PersistentCacheStore(db_path=db_path)
+        QueryCache(disk_store=store).put("run", ["p"], "/p", _matches(1))
+
+        cache = QueryCache(ttl_seconds=0, disk_store=store)
+        time.sleep(0.01)
+        assert cache.get("run", ["p"], "/p") is None
+        assert store.get_stats()["entries"] == 0
+
+    def test_fingerprint_survives_restart(self, db_path: Path, tmp_path: Path) -> None:
+        project = tmp_path / "proj"
+        project.mkdir()
+        source = project / "a.py"
+        source.write_text("def a(): pass\n")
+
+        first = QueryCache(validate_files=True, disk_store=PersistentCacheStore(db_path=db_path))
+        fp = first.fingerprint([str(project)])
+        first.put("run", ["p"], str(project), _matches(1, file=str(source)), fingerprint=fp)
+
+        source.write_text("def a(): return 1\n")
+        second = QueryCache(validate_files=True, disk_store=PersistentCacheStore(db_path=db_path))
+        patched = second.get("run", ["p"], str(project), rescan=lambda files: [{"file": files[0], "text": "patched"}])
+
+        assert patched == [{"file": str(source), "text": "patched"}]
+        # The patched entry and fingerprint were written back
+        third = QueryCache(validate_files=True, disk_store=PersistentCacheStore(db_path=db_path))
+        assert third.get("run", ["p"], str(project), rescan=lambda files: pytest.fail("unexpected rescan")) == patched
+
+    def test_clear_empties_store(self, db_path: Path) -> None:
+        store = PersistentCacheStore(db_path=db_path)
+        cache = QueryCache(disk_store=store)
+        cache.put("run", ["p"], "/p", _matches(1))
+        cache.clear()
+        assert store.get_stats()["entries"] == 0
+
+    def test_memory_only_stats_have_no_disk_section(self) -> None:
+        stats = QueryCache().get_stats()
+        assert stats["disk_hits"] == 0
+        assert "disk" not in stats
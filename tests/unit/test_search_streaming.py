@@ -0,0 +1,99 @@
+"""Tests for paged streaming search and subprocess cancellation."""
+
+import json
+import sys
+import threading
+import time
+from typing import Any, Dict, Iterator, List
+from unittest.mock import patch
+
+import pytest
+
+from ast_grep_mcp.core import executor
+from ast_grep_mcp.core.exceptions import InvalidYAMLError
+from ast_grep_mcp.core.executor import stream_ast_grep_results
+from ast_grep_mcp.features.search.service import (
+    format_search_page,
+    iter_find_code_by_rule_pages,
+    iter_find_code_pages,
+)
+
+
+def _match(i: int) -> Dict[str, Any]:
+    return {"file": f"f{i}.py", "text": f"call_{i}()", "range": {"start": {"line": i}, "end": {"line": i}}}
+
+
+def _fake_stream(count: int, seen: List[Dict[str, Any]]) -> Any:
+    def fake(command: str, args: List[str], **kwargs: Any) -> Iterator[Dict[str, Any]]:
+        seen.append({"command": command, "args": args, **kwargs})
+        for i in range(count):
+            yield _match(i)
+
+    return fake
+
+
+class TestIterFindCodePages:
+    def test_pages_are_bounded(self, tmp_path: Any) -> None:
+        seen: List[Dict[str, Any]] = []
+        with patch("ast_grep_mcp.features.search.service.stream_ast_grep_results", side_effect=_fake_stream(7, seen)):
+            pages = list(iter_find_code_pages(str(tmp_path), "call_$N()", language="python", page_size=3))
+
+        assert [len(p) for p in pages] == [3, 3, 1]
+        assert seen[0]["command"] == "run"
+        assert "--json=stream" in seen[0]["args"]
+
+    def test_cancel_stops_paging(self, tmp_path: Any) -> None:
+        cancel = threading.Event()
+        seen: List[Dict[str, Any]] = []
+        with patch("ast_grep_mcp.features.search.service.stream_ast_grep_results", side_effect=_fake_stream(100, seen)):
+            pages = iter_find_code_pages(str(tmp_path), "call_$N()", page_size=10, cancel_event=cancel)
+            first = next(pages)
+            cancel.set()
+            rest = list(pages)
+
+        assert len(first) == 10
+        assert rest == []
+        assert seen[0]["cancel_event"] is cancel
+
+    def test_rejects_bad_page_size(self, tmp_path: Any) -> None:
+        with pytest.raises(ValueError):
+            list(iter_find_code_pages(str(tmp_path), "f()", page_size=0))
+
+
+class TestIterFindCodeByRulePages:
+    def test_invalid_rule_fails_before_streaming(self, tmp_path: Any) -> None:
+        with pytest.raises(InvalidYAMLError):
+            iter_find_code_by_rule_pages(str(tmp_path), "id: x\nlanguage: python\n")
+
+    def test_uses_stream_json(self, tmp_path: Any) -> None:
+        seen: List[Dict[str, Any]] = []
+        rule = "id: r\nlanguage: python\nrule:\n  pattern: call_$N()\n"
+        with patch("ast_grep_mcp.features.search.service.stream_ast_grep_results", side_effect=_fake_stream(2, seen)):
+            pages = list(iter_find_code_by_rule_pages(str(tmp_path), rule, page_size=5))
+
+        assert [len(p) for p in pages] == [2]
+        assert seen[0]["command"] == "scan"
+        assert "--json=stream" in seen[0]["args"]
+
+
+class TestFormatSearchPage:
+    def test_text_page(self) -> None:
+        text = format_search_page([_match(0), _match(1)], "text", 2)
+        assert text.startswith("Page 2 (2 matches):")
+        assert "f1.py:2" in text
+
+    def test_json_page(self) -> None:
+        assert json.loads(format_search_page([_match(0)], "json", 1)) == [_match(0)]
+
+
+class TestStreamCancellation:
+    def test_cancel_event_kills_blocked_process(self) -> None:
+        # A process that never writes to stdout: the reader blocks until the process is killed
+        command = [sys.executable, "-c", "import time; time.sleep(60)"]
+        cancel = threading.Event()
+        with patch.object(executor, "_prepare_stream_command", return_value=command):
+            threading.Timer(0.3, cancel.set).start()
+            start = time.time()
+            assert list(stream_ast_grep_results("run", [], cancel_event=cancel)) == []
+
+        assert time.time() - start < 10
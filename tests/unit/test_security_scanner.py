@@ -0,0 +1,101 @@
+"""Tests for single-pass vulnerability scanning in detect_security_issues."""
+
+import shutil
+from pathlib import Path
+from typing import Iterator, List
+from unittest.mock import patch
+
+import pytest
+
+from ast_grep_mcp.core.exceptions import AstGrepExecutionError
+from ast_grep_mcp.features.quality import security_scanner
+from ast_grep_mcp.features.quality.security_scanner import (
+    SCAN_CONFIG,
+    build_vulnerability_rules,
+    detect_security_issues_impl,
+)
+from ast_grep_mcp.models.standards import SecurityScanResult
+
+requires_ast_grep = pytest.mark.skipif(shutil.which("ast-grep") is None, reason="ast-grep not installed")
+
+VULNERABLE = """import os, subprocess
+
+def run(cmd, cursor, q, user):
+    cursor.execute("select " + q)
+    eval(user)
+    subprocess.run("ls " + cmd, shell=True)
+    return eval(q)
+"""
+
+
+def _python_patterns() -> List[dict]:
+    return [p for t in SCAN_CONFIG for p in security_scanner._patterns_for_issue_type(t, SCAN_CONFIG[t], "python")]
+
+
+def _summary(result: SecurityScanResult) -> List[tuple]:
+    return [(issue.issue_type, Path(issue.file).name, issue.line, issue.column, issue.title, issue.cwe_id) for issue in result.issues]
+
+
+@pytest.fixture
+def fresh_cache() -> Iterator[None]:
+    cache = security_scanner._findings_cache("python", build_vulnerability_rules(_python_patterns(), "python"))
+    cache.clear()
+    yield
+    cache.clear()
+
+
+class TestVulnerabilityRules:
+    def test_rule_ids_are_stable_and_unique(self) -> None:
+        rules = build_vulnerability_rules(_python_patterns(), "python")
+
+        ids = [rule["id"] for rule in rules]
+        assert len(ids) == len(set(ids))
+        assert ids[0] == "sql_injection-python-0"
+        assert rules[0]["rule"] == {"pattern": security_scanner.SQL_INJECTION_PATTERNS["python"][0]["pattern"]}
+        assert ids == [rule["id"] for rule in build_vulnerability_rules(_python_patterns(), "python")]
+
+    def test_single_scan_failure_falls_back_to_per_pattern(self, tmp_path: Path) -> None:
+        (tmp_path / "app.py").write_text(VULNERABLE)
+        error = AstGrepExecutionError(command=["ast-grep"], returncode=2, stderr="boom")
+
+        with (
+            patch.object(security_scanner, "scan_for_vulnerabilities_single_pass", side_effect=error),
+            patch.object(security_scanner, "scan_for_vulnerability", return_value=[]) as per_pattern,
+        ):
+            detect_security_issues_impl(str(tmp_path), "python", issue_types=["command_injection"])
+
+        per_pattern.assert_called_once()
+
+
+@requires_ast_grep
+class TestSingleScan:
+    def test_matches_per_pattern_scan(self, tmp_path: Path, fresh_cache: None) -> None:
+        (tmp_path / "app.py").write_text(VULNERABLE)
+
+        per_pattern = detect_security_issues_impl(str(tmp_path), "python", scan_mode="per_pattern")
+        with patch.object(security_scanner, "run_ast_grep_batch", wraps=security_scanner.run_ast_grep_batch) as batch:
+            single = detect_security_issues_impl(str(tmp_path), "python")
+
+        assert batch.call_count == 1
+        assert _summary(single) == _summary(per_pattern)
+        assert _summary(single) == [
+            ("sql_injection", "app.py", 4, 5, "SQL Injection via string concatenation", "CWE-89"),
+            ("command_injection", "app.py", 6, 5, "Command Injection via subprocess with shell=True", "CWE-78"),
+            ("command_injection", "app.py", 5, 5, "Code Injection via eval()", "CWE-95"),
+            ("command_injection", "app.py", 7, 12, "Code Injection via eval()", "CWE-95"),
+        ]
+
+    def test_unchanged_files_are_served_from_cache(self, tmp_path: Path, fresh_cache: None) -> None:
+        (tmp_path / "app.py").write_text(VULNERABLE)
+        (tmp_path / "other.py").write_text("eval(payload)\n")
+        first = detect_security_issues_impl(str(tmp_path), "python", issue_types=["command_injection"])
+
+        with patch.object(security_scanner, "run_ast_grep_batch", wraps=security_scanner.run_ast_grep_batch) as batch:
+            cached = detect_security_issues_impl(str(tmp_path), "python", issue_types=["command_injection"])
+            (tmp_path / "other.py").write_text("x = 1\n\neval(payload)\n")
+            edited = detect_security_issues_impl(str(tmp_path), "python", issue_types=["command_injection"])
+
+        assert _summary(cached) == _summary(first)
+        assert batch.call_count == 1
+        assert batch.call_args.args[1] == [str(tmp_path / "other.py")]
+        assert [(issue.file, issue.line) for issue in edited.issues if issue.file.endswith("other.py")] == [(str(tmp_path / "other.py"), 3)]
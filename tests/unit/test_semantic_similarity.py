@@ -13,8 +13,12 @@ mocking the imports. Integration tests requiring the actual model
 are marked with @pytest.mark.semantic.
 """
 
+import re
+import zlib
+from typing import List, Sequence
 from unittest.mock import MagicMock, patch
 
+import numpy as np
 import pytest
 
 from ast_grep_mcp.constants import SemanticSimilarityDefaults
@@ -28,6 +32,24 @@ from ast_grep_mcp.features.deduplication.similarity import (
     _check_transformers_available,
 )
 
+
+class TinyEncoder:
+    """Bag-of-tokens hashing encoder standing in for CodeBERT."""
+
+    DIM = 32
+
+    def __init__(self) -> None:
+        self.calls: List[List[str]] = []
+
+    def encode(self, codes: Sequence[str]) -> np.ndarray:
+        self.calls.append(list(codes))
+        matrix = np.zeros((len(codes), self.DIM), dtype=np.float32)
+        for row, code in enumerate(codes):
+            for token in re.findall(r"\w+", code):
+                matrix[row, zlib.crc32(token.encode()) % self.DIM] += 1.0
+        return matrix
+
+
 # =============================================================================
 # SemanticSimilarityConfig Tests
 # =============================================================================
@@ -220,19 +242,79 @@ class TestSemanticSimilarityMocked:
     def test_clear_cache(self):
         """Cache clearing should work."""
         semantic = SemanticSimilarity()
-        semantic._embedding_cache = {12345: MagicMock()}
-        assert len(semantic._embedding_cache) == 1
+        semantic._embedding_index.add_many(["a" * 32], np.ones((1, 4), dtype=np.float32))
+        assert len(semantic._embedding_index) == 1
 
         semantic.clear_cache()
-        assert len(semantic._embedding_cache) == 0
+        assert len(semantic._embedding_index) == 0
 
     def test_get_cache_stats(self):
         """Should return cache statistics."""
         semantic = SemanticSimilarity()
-        semantic._embedding_cache = {1: MagicMock(), 2: MagicMock()}
+        semantic.clear_cache()
+        semantic._embedding_index.add_many(["a" * 32, "b" * 32], np.ones((2, 4), dtype=np.float32))
 
         stats = semantic.get_cache_stats()
         assert stats["cache_size"] == 2
+        assert stats["bytes"] > 0
+
+
+class TestBatchedSemanticSimilarity:
+    """Tests for batched embedding with a pluggable encoder."""
+
+    CODES = [
+        "def add(a, b):\n    return a + b",
+        "def total(x, y):\n    return x + y",
+        "class Store:\n    def load(self, path):\n        return open(path).read()",
+    ]
+
+    @pytest.fixture
+    def encoder(self) -> TinyEncoder:
+        return TinyEncoder()
+
+    @pytest.fixture
+    def semantic(self, encoder: TinyEncoder) -> SemanticSimilarity:
+        semantic = SemanticSimilarity(encoder=encoder)
+        semantic.clear_cache()
+        return semantic
+
+    def test_embed_batch_encodes_each_snippet_once(self, semantic, encoder):
+        """Duplicate and already-indexed snippets are not re-encoded."""
+        first = semantic.embed_batch(self.CODES + self.CODES[:1])
+        second = semantic.embed_batch(self.CODES)
+
+        assert encoder.calls == [self.CODES]
+        assert first.shape == (4, TinyEncoder.DIM)
+        np.testing.assert_array_equal(first[:3], second)
+        assert semantic.get_cache_stats()["cache_size"] == 3
+
+    def test_batched_scores_match_pairwise(self, semantic):
+        """calculate_similarities agrees with calculate_similarity."""
+        pairs = [(self.CODES[0], self.CODES[1]), (self.CODES[0], self.CODES[2]), ("", self.CODES[0])]
+
+        batched = semantic.calculate_similarities(pairs)
+
+        assert batched == [semantic.calculate_similarity(a, b) for a, b in pairs]
+        assert batched[2] == 0.0
+        assert batched[0] > batched[1]
+
+    def test_similarity_matrix(self, semantic):
+        """Cosine matrix is symmetric with a unit diagonal."""
+        matrix = semantic.similarity_matrix(self.CODES)
+
+        np.testing.assert_allclose(np.diag(matrix), 1.0, atol=1e-3)
+        np.testing.assert_allclose(matrix, matrix.T, atol=1e-6)
+
+    def test_hybrid_batch_runs_stage3_once(self, semantic, encoder):
+        """Every pair reaching Stage 3 is embedded in a single encoder call."""
+        hybrid = HybridSimilarity(hybrid_config=HybridSimilarityConfig(enable_semantic=True), semantic=semantic)
+        pairs = [(self.CODES[0], self.CODES[1]), (self.CODES[1], self.CODES[0]), (self.CODES[0], self.CODES[0])]
+
+        results = hybrid.calculate_hybrid_similarity_batch(pairs)
+
+        assert len(encoder.calls) == 1
+        assert all(not r.semantic_skipped for r in results)
+        assert [r.similarity for r in results] == [hybrid.calculate_hybrid_similarity(a, b).similarity for a, b in pairs]
 
 
 # =============================================================================
@@ -0,0 +1,100 @@
+"""Tests for batched literal, conditional and call extraction."""
+
+import shutil
+from unittest.mock import patch
+
+import pytest
+
+from ast_grep_mcp.core.exceptions import AstGrepNotFoundError
+from ast_grep_mcp.core.executor import run_ast_grep_batch
+from ast_grep_mcp.features.deduplication import snippet_constructs
+from ast_grep_mcp.features.deduplication.analyzer import PatternAnalyzer
+from ast_grep_mcp.features.deduplication.snippet_constructs import extract_snippet_constructs
+
+requires_ast_grep = pytest.mark.skipif(shutil.which("ast-grep") is None, reason="ast-grep not installed")
+
+PYTHON_SNIPPET = '''def f(x, y="é"):
+    """doc"""
+    if x > 10 and y != "a":
+        return g(h(x), f"{d['k']:>{width}} z")
+    elif x < -2.5 < 3j:
+        return None
+    else:
+        if True:
+            pass
+    match x:
+        case False:
+            return b"raw"
+    return a.b(1).c(2)
+'''
+
+
+class TestPythonFastPath:
+    @requires_ast_grep
+    def test_matches_ast_grep_scan(self) -> None:
+        fast = snippet_constructs._extract_python(PYTHON_SNIPPET)
+        scanned = snippet_constructs._scan_snippets([PYTHON_SNIPPET], "python")[0]
+
+        assert fast is not None
+        assert fast == scanned
+
+    def test_reports_tree_sitter_kinds_and_character_columns(self) -> None:
+        result = extract_snippet_constructs([PYTHON_SNIPPET], "python")[0]
+
+        assert result.literals["string"][0] == {"line": 0, "column": 11, "value": '"é"', "type": "string"}
+        assert [c["kind"] for c in result.conditionals[:4]] == ["if_statement", "comparison_operator", "comparison_operator", "elif_clause"]
+        assert result.conditionals[3]["text"] == "elif x < -2.5 < 3j:\n        return None"
+        assert [c["text"] for c in result.calls[-2:]] == ["a.b(1).c(2)", "a.b(1)"]
+
+    def test_implicit_concatenation_falls_back_to_scan(self) -> None:
+        code = 'x = "a" "b"\n'
+        with patch.object(snippet_constructs, "_scan_snippets", return_value=[snippet_constructs.SnippetConstructs()]) as scan:
+            extract_snippet_constructs([code, "y = 1\n"], "python")
+
+        scan.assert_called_once_with([code], "python")
+
+
+class TestBatchedScan:
+    @requires_ast_grep
+    def test_whole_group_uses_one_scan(self) -> None:
+        codes = [f"function f(a) {{ if (a > {n}) {{ return g(h(a), 'v{n}'); }} return null; }}" for n in range(5)]
+        with patch.object(snippet_constructs, "run_ast_grep_batch", side_effect=run_ast_grep_batch) as batch:
+            results = extract_snippet_constructs(codes, "javascript")
+
+        assert batch.call_count == 1
+        assert [r.literals["string"][0]["value"] for r in results] == [f"'v{n}'" for n in range(5)]
+        assert [c["kind"] for c in results[0].conditionals] == ["if_statement", "binary_expression"]
+        assert [c["text"] for c in results[0].calls] == ["g(h(a), 'v0')", "h(a)"]
+
+    def test_identical_snippets_are_extracted_once(self) -> None:
+        with patch.object(
+            snippet_constructs, "_scan_snippets", side_effect=lambda codes, _: [snippet_constructs.SnippetConstructs() for _ in codes]
+        ) as scan:
+            results = extract_snippet_constructs(["f(1)", "f(2)", "f(1)"], "go")
+
+        scan.assert_called_once_with(["f(1)", "f(2)"], "go")
+        assert results[0] is results[2]
+
+    def test_rejects_unsupported_language(self) -> None:
+        with pytest.raises(ValueError):
+            extract_snippet_constructs(["x"], "cobol")
+
+
+class TestPatternAnalyzerExtraction:
+    def test_group_literals_compare_every_instance_to_the_first(self) -> None:
+        group = [{"text": f"def f():\n    return call({n}, 'name')\n"} for n in (1, 2, 3)]
+
+        result = PatternAnalyzer().analyze_duplicate_group_literals(group, "python")
+
+        assert result["variations"] == [
+            {"position": {"line": 2, "column": 16}, "type": "number", "values": ["1", "2", "3"], "unique_count": 3}
+        ]
+
+    def test_regex_fallback_without_ast_grep(self) -> None:
+        analyzer = PatternAnalyzer()
+        with patch.object(snippet_constructs, "run_ast_grep_batch", side_effect=AstGrepNotFoundError()):
+            variations = analyzer.detect_conditional_variations("if (a > 1) {}", "if (a > 2) {}", "java")
+            nested = analyzer.detect_nested_function_call("x = outer(inner(value))", "value", "java")
+
+        assert [v["type"] for v in variations] == ["modified"]
+        assert nested is not None and nested["nesting_depth"] == 2
@@ -4,14 +4,17 @@ Migrated to pytest fixtures on 2025-11-26.
 Fixtures used: mcp_main (module-scoped), enforce_standards_tool (module-scoped)
 """
 
+from typing import Any, Dict, Iterator, List
 from unittest.mock import Mock, patch
 
 import pytest
 
+from ast_grep_mcp.core.exceptions import AstGrepExecutionError
 from ast_grep_mcp.features.quality.enforcer import (
     RULE_SETS,
     execute_rule,
     execute_rules_batch,
+    execute_rules_single_scan,
     filter_violations_by_severity,
     format_violation_report,
     group_violations_by_file,
@@ -942,6 +945,104 @@ class TestExecuteRulesBatch:
         assert isinstance(violations, list)
 
 
+def _scan_match(rule_id: str, file: str, line: int = 0) -> Dict[str, Any]:
+    return {
+        "ruleId": rule_id,
+        "file": file,
+        "range": {"start": {"line": line, "column": 0}, "end": {"line": line, "column": 4}},
+        "text": "code",
+    }
+
+
+class TestExecuteRulesSingleScan:
+    """Test execute_rules_single_scan and execution mode dispatch."""
+
+    @pytest.fixture
+    def context(self) -> RuleExecutionContext:
+        return RuleExecutionContext(
+            project_folder="/fake/path",
+            language="python",
+            include_patterns=["**/*.py"],
+            exclude_patterns=[],
+            max_violations=0,
+            max_threads=4,
+            logger=Mock(),
+            execution_mode="single_scan",
+        )
+
+    @pytest.fixture
+    def rules(self) -> List[LintingRule]:
+        return [
+            LintingRule(id="no-eval", language="python", severity="error", message="No eval", pattern="eval($X)"),
+            LintingRule(
+                id="no-print",
+                language="python",
+                severity="warning",
+                message="No print",
+                pattern="print($$$)",
+                exclude_files=["**/tests/**"],
+            ),
+        ]
+
+    @patch("ast_grep_mcp.features.quality.enforcer.stream_ast_grep_results")
+    def test_one_scan_routes_matches_by_rule_id(self, mock_stream, context, rules):
+        matches = [
+            _scan_match("no-eval", "/p/a.py"),
+            _scan_match("no-print", "/p/a.py", 3),
+            _scan_match("no-print", "/p/tests/test_a.py"),
+            _scan_match("unknown", "/p/a.py"),
+        ]
+        mock_stream.return_value = (match for match in matches)
+
+        violations = execute_rules_batch(rules, context)
+
+        mock_stream.assert_called_once()
+        inline_rules = mock_stream.call_args.args[1][1]
+        assert "id: no-eval" in inline_rules and "id: no-print" in inline_rules
+        assert [(v.rule_id, v.severity, v.line) for v in violations] == [("no-eval", "error", 1), ("no-print", "warning", 4)]
+
+    @patch("ast_grep_mcp.features.quality.enforcer.stream_ast_grep_results")
+    def test_stops_streaming_at_max_violations(self, mock_stream, context, rules):
+        context.max_violations = 2
+        consumed: List[int] = []
+
+        def matches() -> Iterator[Dict[str, Any]]:
+            for i in range(10):
+                consumed.append(i)
+                # Excluded matches do not count towards the limit
+                yield _scan_match("no-print", "/p/tests/test_a.py" if i == 0 else "/p/a.py", i)
+
+        stream = matches()
+        mock_stream.return_value = stream
+
+        violations = execute_rules_single_scan(rules, context)
+
+        assert len(violations) == 2
+        assert consumed == [0, 1, 2]
+        assert stream.gi_frame is None  # Closed, which terminates ast-grep
+
+    @patch("ast_grep_mcp.features.quality.enforcer.execute_rule")
+    @patch("ast_grep_mcp.features.quality.enforcer.stream_ast_grep_results")
+    def test_failed_scan_falls_back_to_per_rule(self, mock_stream, mock_execute, context, rules):
+        mock_stream.side_effect = AstGrepExecutionError(command=["ast-grep"], returncode=2, stderr="bad rule")
+        mock_execute.return_value = [_make_violation()]
+
+        violations = execute_rules_single_scan(rules, context)
+
+        assert mock_execute.call_count == 2
+        assert len(violations) == 2
+
+    @patch("ast_grep_mcp.features.quality.enforcer.execute_rule")
+    @patch("ast_grep_mcp.features.quality.enforcer.stream_ast_grep_results")
+    def test_duplicate_rule_ids_run_per_rule(self, mock_stream, mock_execute, context, rules):
+        mock_execute.return_value = []
+
+        execute_rules_single_scan([rules[0], rules[0]], context)
+
+        mock_stream.assert_not_called()
+        assert mock_execute.call_count == 2
+
+
 class TestGroupViolationsByFile:
     """Test _group_violations_by_file function."""
 
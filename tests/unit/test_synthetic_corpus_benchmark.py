@@ -0,0 +1,167 @@
+"""Tests for synthetic-corpus deduplication benchmarks."""
+
+import json
+import os
+import re
+import shutil
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+from ast_grep_mcp.constants import DeduplicationDefaults
+from ast_grep_mcp.features.deduplication.benchmark import BenchmarkReporter, CorpusBenchmarkExecutor, RegressionDetector
+from ast_grep_mcp.features.deduplication.synthetic_corpus import (
+    SyntheticCorpus,
+    SyntheticCorpusSpec,
+    generate_synthetic_corpus,
+    score_detection,
+)
+
+requires_ast_grep = pytest.mark.skipif(shutil.which("ast-grep") is None, reason="ast-grep not installed")
+
+
+def _function_text(corpus: SyntheticCorpus, function_id: int) -> List[str]:
+    rel_path, line = corpus.locations[function_id]
+    lines = Path(corpus.root, rel_path).read_text().split("\n")[line - 1 :]
+    body = [lines[0]]
+    for text in lines[1:]:
+        if text and not text.startswith(" "):
+            break
+        body.append(text)
+    return body
+
+
+def _statements(lines: List[str]) -> List[str]:
+    """Function body without its def line, comments and blank lines."""
+    return [line for line in lines[1:] if line.strip() and not line.strip().startswith("#")]
+
+
+def _group(corpus: SyntheticCorpus, function_ids: List[int]) -> Dict[str, Any]:
+    instances = []
+    for function_id in function_ids:
+        rel_path, line = corpus.locations[function_id]
+        instances.append({"file": os.path.join(corpus.root, rel_path), "lines": f"{line}-{line + 5}"})
+    return {"instances": instances}
+
+
+class TestSyntheticCorpus:
+    def test_locations_point_at_function_definitions(self, tmp_path: Path) -> None:
+        corpus = generate_synthetic_corpus(str(tmp_path), SyntheticCorpusSpec(function_count=40, clone_rate=0.3, functions_per_file=7))
+
+        assert len(corpus.locations) == 40
+        assert corpus.clone_count == 12
+        for function_id in range(40):
+            assert _function_text(corpus, function_id)[0].startswith(f"def func_{function_id:06d}(")
+
+    def test_same_spec_generates_same_corpus(self, tmp_path: Path) -> None:
+        spec = SyntheticCorpusSpec(function_count=30, clone_type=3, seed=7)
+        first = generate_synthetic_corpus(str(tmp_path / "a"), spec)
+        second = generate_synthetic_corpus(str(tmp_path / "b"), spec)
+
+        assert first.locations == second.locations
+        assert first.families == second.families
+        assert (tmp_path / "a" / first.locations[0][0]).read_text() == (tmp_path / "b" / first.locations[0][0]).read_text()
+
+    def test_clone_types(self, tmp_path: Path) -> None:
+        for clone_type in (1, 2, 3):
+            corpus = generate_synthetic_corpus(
+                str(tmp_path / str(clone_type)), SyntheticCorpusSpec(function_count=20, clone_rate=0.4, clone_type=clone_type)
+            )
+            original, clone = (_statements(_function_text(corpus, i)) for i in corpus.families[0][:2])
+            if clone_type == 1:
+                assert clone == original
+            elif clone_type == 2:
+                # Same statements once identifiers and literals are masked
+                def mask(lines: List[str]) -> List[str]:
+                    return [re.sub(r"\b[a-z]+_[a-z]+\b|\d+", "_", line) for line in lines]
+
+                assert clone != original
+                assert mask(clone) == mask(original)
+            else:
+                assert abs(len(clone) - len(original)) <= 4
+
+    def test_rejects_invalid_spec(self) -> None:
+        with pytest.raises(ValueError):
+            SyntheticCorpusSpec(function_count=1)
+        with pytest.raises(ValueError):
+            SyntheticCorpusSpec(clone_rate=1.0)
+        with pytest.raises(ValueError):
+            SyntheticCorpusSpec(clone_type=4)  # type: ignore[arg-type]
+
+
+class TestScoreDetection:
+    def test_scores_pairs_against_families(self, tmp_path: Path) -> None:
+        corpus = generate_synthetic_corpus(str(tmp_path), SyntheticCorpusSpec(function_count=30, clone_rate=0.3))
+        families = corpus.families
+        unrelated = max(corpus.expected_pairs())[1] + 1
+
+        perfect = score_detection(corpus, [_group(corpus, family) for family in families])
+        partial = score_detection(corpus, [_group(corpus, families[0][:2] + [unrelated])])
+
+        assert (perfect["precision"], perfect["recall"]) == (1.0, 1.0)
+        assert partial["detected_pairs"] == 3
+        assert partial["true_positive_pairs"] == 1
+        assert partial["precision"] == pytest.approx(1 / 3, abs=1e-5)
+
+    def test_empty_detection(self, tmp_path: Path) -> None:
+        corpus = generate_synthetic_corpus(str(tmp_path), SyntheticCorpusSpec(function_count=10, clone_rate=0.2))
+
+        score = score_detection(corpus, [])
+
+        assert (score["precision"], score["recall"], score["f1"]) == (1.0, 0.0, 0.0)
+
+
+class TestCorpusRegressions:
+    BASELINE = {
+        "name": "synthetic_corpus[n=1000,type=1,rate=0.2]",
+        "mean_seconds": 1.0,
+        "precision": 1.0,
+        "recall": 0.9,
+        "peak_rss_mb": 200.0,
+    }
+
+    def _errors(self, **current: float) -> List[str]:
+        result = {**self.BASELINE, **current}
+        _, errors = RegressionDetector().check_regressions([result], {self.BASELINE["name"]: self.BASELINE})
+        return errors
+
+    def test_within_limits(self) -> None:
+        assert self._errors(mean_seconds=1.2, recall=0.89, peak_rss_mb=240.0) == []
+
+    def test_uses_corpus_time_threshold(self) -> None:
+        assert self._errors(mean_seconds=1.0 + DeduplicationDefaults.REGRESSION_SYNTHETIC_CORPUS + 0.05)
+
+    def test_accuracy_and_memory(self) -> None:
+        errors = self._errors(precision=0.9, recall=0.8, peak_rss_mb=300.0)
+
+        assert [error.split(": ", 1)[1].split(" ")[:2] for error in errors] == [
+            ["precision", "dropped"],
+            ["recall", "dropped"],
+            ["peak", "RSS"],
+        ]
+
+
+@requires_ast_grep
+class TestCorpusBenchmarkExecutor:
+    def test_runs_pipeline_and_stores_baseline(self, tmp_path: Path) -> None:
+        results = CorpusBenchmarkExecutor(include_test_coverage=False).run_corpus_benchmarks([60], [1])
+
+        result = results[0]
+        assert result["name"] == "synthetic_corpus[n=60,type=1,rate=0.2]"
+        assert set(result["stage_seconds"]) == {"find", "rank", "enrich"}
+        assert result["throughput_functions_per_second"] > 0
+        assert result["precision"] == 1.0
+        assert result["recall"] > 0
+
+        reporter = BenchmarkReporter(str(tmp_path / "baseline.json"))
+        reporter.save_baseline(results)
+        assert json.loads((tmp_path / "baseline.json").read_text())["benchmarks"][0]["recall"] == result["recall"]
+        assert RegressionDetector().check_regressions(results, reporter.load_baseline()) == (False, [])
+
+    def test_corpus_beyond_default_construct_cap_is_fully_analyzed(self) -> None:
+        count = DeduplicationDefaults.MAX_CONSTRUCTS + 500
+        result = CorpusBenchmarkExecutor(include_test_coverage=False).run_corpus_benchmarks([count], [1])[0]
+
+        assert result["recall"] > 0.8
+        assert result["peak_rss_mb"] is None or result["peak_rss_mb"] > 0
@@ -0,0 +1,140 @@
+"""Tests for buffered, batched usage-log writes."""
+
+import gc
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from ast_grep_mcp.core.usage_tracking import (
+    OperationType,
+    UsageDatabase,
+    UsageLogEntry,
+    _entry_to_params,
+    _UsageWriter,
+)
+
+
+def _entry(i: int) -> UsageLogEntry:
+    return UsageLogEntry(id=f"entry-{i}", tool_name=f"tool_{i % 3}", operation_type=OperationType.SEARCH_CODE)
+
+
+def _raw_count(db_path: Path) -> int:
+    with sqlite3.connect(db_path) as conn:
+        return int(conn.execute("SELECT COUNT(*) FROM usage_logs").fetchone()[0])
+
+
+@pytest.fixture
+def db_path(tmp_path: Path) -> Path:
+    return tmp_path / "usage.db"
+
+
+class TestUsageWriter:
+    def test_batch_size_triggers_single_batch(self, db_path: Path) -> None:
+        db = UsageDatabase(str(db_path))
+        assert db._writer is not None
+        db._writer.flush_interval = 60.0
+        db._writer.batch_size = 10
+
+        for i in range(10):
+            db.log_usage(_entry(i))
+
+        deadline = time.monotonic() + 5
+        while db._writer.entries_written < 10 and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        assert db._writer.entries_written == 10
+        assert db._writer.batches_written == 1
+        assert _raw_count(db_path) == 10
+        db.close()
+
+    def test_flush_interval_writes_partial_batch(self, db_path: Path) -> None:
+        writer = _UsageWriter(str(db_path), batch_size=1000, flush_interval=0.05)
+        UsageDatabase(str(db_path), async_writes=False)  # creates the schema
+
+        writer.enqueue(_entry_to_params(_entry(1)))
+        deadline = time.monotonic() + 5
+        while writer.entries_written < 1 and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        assert _raw_count(db_path) == 1
+        writer.close()
+
+    def test_readers_see_buffered_entries(self, db_path: Path) -> None:
+        db = UsageDatabase(str(db_path))
+        assert db._writer is not None
+        db._writer.flush_interval = 60.0
+
+        for i in range(3):
+            db.log_usage(_entry(i))
+
+        assert len(db.get_recent_logs()) == 3
+        assert db.get_stats().total_calls == 3
+        db.close()
+
+    def test_close_flushes_and_falls_back_to_sync(self, db_path: Path) -> None:
+        db = UsageDatabase(str(db_path))
+        assert db._writer is not None
+        db._writer.flush_interval = 60.0
+        db.log_usage(_entry(1))
+        db.close()
+        assert _raw_count(db_path) == 1
+
+        db.log_usage(_entry(2))
+        assert _raw_count(db_path) == 2
+
+    def test_collected_database_stops_its_writer(self, db_path: Path) -> None:
+        def writer_threads() -> int:
+            return sum(thread.name == "usage-writer" for thread in threading.enumerate())
+
+        threads_before = writer_threads()
+        dbs = [UsageDatabase(str(db_path)) for _ in range(20)]
+        for i, db in enumerate(dbs):
+            db.log_usage(_entry(i))
+        assert writer_threads() == threads_before + 20
+
+        del db, dbs
+        gc.collect()
+
+        assert writer_threads() <= threads_before
+        assert _raw_count(db_path) == 20
+
+    def test_idle_writer_blocks_until_an_entry_arrives(self, db_path: Path) -> None:
+        db = UsageDatabase(str(db_path))
+        assert db._writer is not None
+        db._writer.flush_interval = 0.01
+        db.log_usage(_entry(1))
+        db.flush()
+        waits = 0
+        original_wait = db._writer._cond.wait
+
+        def counting_wait(timeout: float | None = None) -> bool:
+            nonlocal waits
+            waits += 1
+            return original_wait(timeout)
+
+        db._writer._cond.wait = counting_wait  # type: ignore[method-assign]
+        time.sleep(0.2)
+
+        assert waits <= 2
+        db.close()
+
+    def test_wal_mode_enabled(self, db_path: Path) -> None:
+        UsageDatabase(str(db_path), async_writes=False)
+        with sqlite3.connect(db_path) as conn:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    def test_clean_exit_flushes_buffer(self, db_path: Path) -> None:
+        script = (
+            "from ast_grep_mcp.core.usage_tracking import UsageDatabase, UsageLogEntry\n"
+            f"db = UsageDatabase({str(db_path)!r})\n"
+            "db._writer.flush_interval = 60.0\n"
+            "for i in range(5):\n"
+            "    db.log_usage(UsageLogEntry(id=f'e{i}', tool_name='exit_tool'))\n"
+        )
+        subprocess.run([sys.executable, "-c", script], check=True, timeout=60)
+        assert _raw_count(db_path) == 5
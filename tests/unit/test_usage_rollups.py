@@ -0,0 +1,151 @@
+"""Tests for hourly/daily usage rollups and retention pruning."""
+
+import sqlite3
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from ast_grep_mcp.core.usage_tracking import (
+    AlertThresholds,
+    OperationType,
+    UsageDatabase,
+    UsageLogEntry,
+    _split_period,
+)
+
+
+def _entry(i: int, ts: datetime, tool: str = "tool_a", success: bool = True, response_time_ms: int = 100) -> UsageLogEntry:
+    return UsageLogEntry(
+        id=f"e{i}",
+        timestamp=ts,
+        tool_name=tool,
+        operation_type=OperationType.SEARCH_CODE,
+        success=success,
+        response_time_ms=response_time_ms,
+        estimated_cost=0.01,
+    )
+
+
+@pytest.fixture
+def db(tmp_path: Path) -> UsageDatabase:
+    return UsageDatabase(str(tmp_path / "usage.db"), async_writes=False)
+
+
+class TestSplitPeriod:
+    def test_partial_hours_stay_raw(self) -> None:
+        start = datetime(2025, 1, 1, 10, 15, tzinfo=UTC)
+        end = datetime(2025, 1, 1, 10, 45, tzinfo=UTC)
+        assert _split_period(start, end) == [("raw", start, end)]
+
+    def test_days_hours_and_raw_edges_cover_period(self) -> None:
+        start = datetime(2025, 1, 1, 22, 30, tzinfo=UTC)
+        end = datetime(2025, 1, 4, 1, 10, tzinfo=UTC)
+        segments = _split_period(start, end)
+
+        assert ("day", datetime(2025, 1, 2, tzinfo=UTC), datetime(2025, 1, 4, tzinfo=UTC)) in segments
+        assert ("hour", datetime(2025, 1, 1, 23, tzinfo=UTC), datetime(2025, 1, 2, tzinfo=UTC)) in segments
+        assert ("raw", start, datetime(2025, 1, 1, 23, tzinfo=UTC)) in segments
+        covered = sum(((hi - lo) for _, lo, hi in segments), timedelta())
+        assert covered == end - start
+
+    def test_pruned_edges_widen_to_retained_rollups(self) -> None:
+        start = datetime(2025, 1, 1, 22, 30, tzinfo=UTC)
+        end = datetime(2025, 1, 4, 1, 10, tzinfo=UTC)
+
+        hourly_only = _split_period(start, end, raw_since=datetime(2025, 1, 5, tzinfo=UTC))
+        assert ("hour", datetime(2025, 1, 1, 22, tzinfo=UTC), datetime(2025, 1, 2, tzinfo=UTC)) in hourly_only
+        assert ("hour", datetime(2025, 1, 4, tzinfo=UTC), datetime(2025, 1, 4, 2, tzinfo=UTC)) in hourly_only
+        assert all(source != "raw" for source, _, _ in hourly_only)
+
+        daily_start = _split_period(start, end, raw_since=datetime(2025, 1, 5, tzinfo=UTC), hourly_since=datetime(2025, 1, 3, tzinfo=UTC))
+        assert daily_start == [
+            ("hour", datetime(2025, 1, 4, tzinfo=UTC), datetime(2025, 1, 4, 2, tzinfo=UTC)),
+            ("day", datetime(2025, 1, 1, tzinfo=UTC), datetime(2025, 1, 4, tzinfo=UTC)),
+        ]
+
+
+class TestRollups:
+    def test_stats_match_raw_rows_across_days(self, db: UsageDatabase) -> None:
+        now = datetime.now(UTC)
+        for i in range(48):
+            db.log_usage(_entry(i, now - timedelta(hours=i, minutes=7), tool="tool_a" if i % 2 else "tool_b", success=i % 5 != 0))
+
+        stats = db.get_stats(start_time=now - timedelta(days=3))
+
+        assert stats.total_calls == 48
+        assert stats.failed_calls == 10
+        assert stats.calls_by_tool == {"tool_a": 24, "tool_b": 24}
+        assert stats.failures_by_tool == {"tool_a": 5, "tool_b": 5}
+        assert abs(stats.total_cost - 0.48) < 1e-9
+
+    def test_rollups_updated_per_write(self, db: UsageDatabase) -> None:
+        ts = datetime(2025, 3, 1, 12, 30, tzinfo=UTC)
+        db.log_usage(_entry(1, ts))
+        db.log_usage(_entry(2, ts + timedelta(minutes=10), success=False))
+
+        with sqlite3.connect(db.db_path) as conn:
+            rows = conn.execute("SELECT granularity, bucket, calls, failures FROM usage_rollups ORDER BY granularity").fetchall()
+        assert rows == [("day", "2025-03-01", 2, 1), ("hour", "2025-03-01T12", 2, 1)]
+
+    def test_latency_percentiles(self, db: UsageDatabase) -> None:
+        base = datetime(2025, 3, 1, 12, 0, tzinfo=UTC)
+        for i in range(100):
+            db.log_usage(_entry(i, base + timedelta(seconds=i), response_time_ms=20 if i < 90 else 4000))
+
+        stats = db.get_stats(start_time=base - timedelta(days=1), end_time=base + timedelta(days=1))
+
+        assert stats.p50_response_time_ms == 25.0
+        assert stats.p95_response_time_ms == 4000.0
+        assert stats.p95_response_time_by_tool == {"tool_a": 4000.0}
+
+    def test_backfill_for_existing_database(self, tmp_path: Path) -> None:
+        path = str(tmp_path / "usage.db")
+        db = UsageDatabase(path, async_writes=False)
+        ts = datetime(2025, 3, 1, 12, 30, tzinfo=UTC)
+        for i in range(3):
+            db.log_usage(_entry(i, ts))
+        with sqlite3.connect(path) as conn:
+            conn.execute("DELETE FROM usage_rollups")
+            conn.execute("DELETE FROM usage_latency_histogram")
+
+        reopened = UsageDatabase(path, async_writes=False)
+
+        stats = reopened.get_stats(start_time=ts - timedelta(days=2), end_time=ts + timedelta(days=2))
+        assert stats.total_calls == 3
+
+    def test_alerts_read_rollups(self, db: UsageDatabase) -> None:
+        now = datetime.now(UTC)
+        for i in range(6):
+            db.log_usage(_entry(i, now - timedelta(seconds=i), success=False))
+
+        alerts = db.get_alerts(AlertThresholds(hourly_failures_warning=5, hourly_failures_critical=50))
+        assert any(a.metric == "hourly_failures" and a.level == "warning" for a in alerts)
+
+
+class TestRetention:
+    def test_prune_keeps_daily_rollups(self, db: UsageDatabase) -> None:
+        old = datetime.now(UTC) - timedelta(days=200)
+        recent = datetime.now(UTC) - timedelta(minutes=5)
+        db.log_usage(_entry(1, old))
+        db.log_usage(_entry(2, recent))
+
+        deleted = db.prune(raw_retention_days=30, hourly_retention_days=90)
+
+        assert deleted == {"raw_rows": 1, "hourly_rollups": 1}
+        assert [log.id for log in db.get_recent_logs()] == ["e2"]
+        stats = db.get_stats(start_time=old.replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=1))
+        assert stats.total_calls == 2
+
+    @pytest.mark.parametrize("age_days", [45, 120])
+    def test_partial_edges_past_retention_are_counted(self, db: UsageDatabase, age_days: int) -> None:
+        hour = (datetime.now(UTC) - timedelta(days=age_days)).replace(minute=0, second=0, microsecond=0)
+        db.log_usage(_entry(1, hour + timedelta(minutes=40)))
+        db.log_usage(_entry(2, hour + timedelta(minutes=50)))
+        db.prune(raw_retention_days=30, hourly_retention_days=90)
+
+        from_mid_hour = db.get_stats(start_time=hour + timedelta(minutes=30))
+        within_hour = db.get_stats(start_time=hour + timedelta(minutes=30), end_time=hour + timedelta(minutes=55))
+
+        assert from_mid_hour.total_calls == 2
+        assert within_hour.total_calls == 2
@@ -0,0 +1,101 @@
+"""Tests for process-pool verification of similarity candidate pairs."""
+
+from concurrent.futures.process import BrokenProcessPool
+from typing import Iterator, List, Tuple
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from ast_grep_mcp.constants import VerificationPoolDefaults
+from ast_grep_mcp.features.deduplication import similarity, verification_pool
+from ast_grep_mcp.features.deduplication.detector import DuplicationDetector
+from ast_grep_mcp.features.deduplication.similarity import HybridSimilarity, MinHashSimilarity, SimilarityConfig
+
+
+def _function(i: int) -> str:
+    steps = "\n".join(f"    value = transform(value, {(i * k) % 7}) + offset_{k % 3}" for k in range(12))
+    return f"def handler_{i}(value):\n{steps}\n    return value"
+
+
+def _pairs() -> List[Tuple[str, str]]:
+    codes = [_function(i) for i in range(12)] + ["x = 1", ""]
+    return [(codes[i], codes[j]) for i in range(len(codes)) for j in range(i + 1, len(codes))]
+
+
+@pytest.fixture
+def small_batches() -> Iterator[None]:
+    with patch.object(VerificationPoolDefaults, "MIN_PAIRS", 1):
+        yield
+    verification_pool.shutdown_verification_pools()
+
+
+class TestSnapshot:
+    def test_round_trips_snippets_and_signatures(self) -> None:
+        codes = ["def f(): return 'é'", "", "x = 1"]
+        signatures = np.arange(12, dtype=np.uint64).reshape(3, 4)
+
+        shm, ref = verification_pool._write_snapshot(codes, signatures)
+        try:
+            read_codes, read_signatures = verification_pool._read_snapshot(ref)
+        finally:
+            shm.close()
+            shm.unlink()
+
+        assert read_codes == codes
+        np.testing.assert_array_equal(read_signatures, signatures)
+
+
+@pytest.mark.slow
+class TestPoolScoring:
+    def test_minhash_scores_match_in_process(self, small_batches: None) -> None:
+        pairs = _pairs()
+        expected = MinHashSimilarity().estimate_similarities(pairs)
+
+        pooled = MinHashSimilarity(SimilarityConfig(verification_workers=2))
+        with patch.object(similarity, "score_pairs", wraps=verification_pool.score_pairs) as score:
+            scores = pooled.estimate_similarities(pairs)
+
+        assert score.call_count == 1
+        assert scores == expected
+
+    def test_hybrid_results_match_in_process(self, small_batches: None) -> None:
+        pairs = _pairs()
+        expected = HybridSimilarity().calculate_hybrid_similarity_batch(pairs)
+
+        results = HybridSimilarity(SimilarityConfig(verification_workers=2)).calculate_hybrid_similarity_batch(pairs)
+
+        assert results == expected
+
+
+class TestPoolFallback:
+    def test_broken_pool_scores_in_process(self, small_batches: None) -> None:
+        pairs = _pairs()
+        expected = MinHashSimilarity().estimate_similarities(pairs)
+
+        pooled = MinHashSimilarity(SimilarityConfig(verification_workers=2))
+        with patch.object(verification_pool, "_get_pool", side_effect=BrokenProcessPool("worker died")):
+            assert pooled.estimate_similarities(pairs) == expected
+
+    def test_small_batches_stay_in_process(self) -> None:
+        pooled = MinHashSimilarity(SimilarityConfig(verification_workers=4))
+        with patch.object(similarity, "score_pairs") as score:
+            pooled.estimate_similarities(_pairs())
+
+        score.assert_not_called()
+        assert not pooled.uses_verification_pool(VerificationPoolDefaults.MIN_PAIRS - 1)
+        assert pooled.uses_verification_pool(VerificationPoolDefaults.MIN_PAIRS)
+
+    def test_rejects_negative_worker_count(self) -> None:
+        with pytest.raises(ValueError):
+            SimilarityConfig(verification_workers=-1)
+
+
+class TestDetectorVerificationWorkers:
+    def test_large_lsh_batches_are_scored_up_front(self) -> None:
+        detector = DuplicationDetector(similarity_mode="minhash", verification_workers=4)
+
+        assert detector._minhash.config.verification_workers == 4
+        assert detector._prefers_batched_verification(VerificationPoolDefaults.MIN_PAIRS)
+        assert not detector._prefers_batched_verification(VerificationPoolDefaults.MIN_PAIRS - 1)
+        assert not DuplicationDetector(similarity_mode="minhash")._prefers_batched_verification(VerificationPoolDefaults.MIN_PAIRS)